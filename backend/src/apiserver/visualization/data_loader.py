@@ -0,0 +1,320 @@
+"""
+data_loader.py provides utility functions for reading the data of
+visualizations in bounded memory, from CSV or Parquet files.
+"""
+
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Callable, Iterator, List, Optional, Text, Tuple
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNK_SIZE = 100000
+# Size in bytes of the blocks in which CSV files are read to count their rows.
+_COUNT_BLOCK_SIZE = 16 * 1024 * 1024
+
+
+def _open_file(path: Text, mode: Text = "rb"):
+    # tensorflow is only imported when a file is opened, so that it can read
+    # files from GCS and other file systems supported by TensorFlow.
+    from tensorflow.python.lib.io import file_io
+    return file_io.FileIO(path, mode)
+
+
+def is_parquet(path: Text) -> bool:
+    """Checks whether a file is a Parquet file based on its extension."""
+    return path.lower().endswith((".parquet", ".parq"))
+
+
+def iter_data_frames(
+    files: List[Text],
+    columns: Optional[List[Text]] = None,
+    names: Optional[List[Text]] = None,
+    header: bool = True,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    open_file: Callable = _open_file
+) -> Iterator[pd.DataFrame]:
+    """Reads CSV or Parquet files as a sequence of DataFrames.
+
+    At most chunk_size rows of a file are held in memory at a time (or a
+    single row group of a Parquet file).
+
+    Args:
+        files: Paths of the files to read, in order.
+        columns: Names of the columns to read. All columns are read if None.
+        names: Names of the columns of CSV files. If provided, the first row of
+        the CSV files is not used as the header.
+        header: Whether the first row of the CSV files is a header. Ignored if
+        names is provided.
+        chunk_size: Number of rows of CSV files to read at a time.
+        open_file: Opens a file given its path and mode.
+
+    Returns:
+        Iterator of DataFrames holding consecutive rows of the files.
+    """
+    for path in files:
+        if is_parquet(path):
+            import pyarrow.parquet as pq
+            with open_file(path, "rb") as f:
+                parquet_file = pq.ParquetFile(f)
+                for i in range(parquet_file.num_row_groups):
+                    table = parquet_file.read_row_group(i, columns=columns)
+                    yield table.to_pandas()
+        else:
+            with open_file(path, "rb") as f:
+                reader = pd.read_csv(
+                    f,
+                    header=None if names is not None or not header else 0,
+                    names=names,
+                    usecols=columns,
+                    chunksize=chunk_size)
+                for chunk in reader:
+                    if columns is not None:
+                        # usecols does not preserve the order of columns.
+                        chunk = chunk[columns]
+                    yield chunk
+
+
+def count_rows(
+    files: List[Text],
+    header: bool = True,
+    open_file: Callable = _open_file
+) -> int:
+    """Counts the rows of CSV or Parquet files without parsing them.
+
+    Rows of Parquet files are counted from their metadata, and rows of CSV
+    files by counting line breaks, so quoted values spanning several lines
+    are counted as several rows.
+
+    Args:
+        files: Paths of the files.
+        header: Whether the first row of the CSV files is a header, which is
+        not counted.
+        open_file: Opens a file given its path and mode.
+
+    Returns:
+        Total number of rows of the files.
+    """
+    total = 0
+    for path in files:
+        if is_parquet(path):
+            import pyarrow.parquet as pq
+            with open_file(path, "rb") as f:
+                total += pq.ParquetFile(f).metadata.num_rows
+            continue
+        lines = 0
+        last_block = b""
+        with open_file(path, "rb") as f:
+            while True:
+                block = f.read(_COUNT_BLOCK_SIZE)
+                if not block:
+                    break
+                lines += block.count(b"\n")
+                last_block = block
+        if last_block and not last_block.endswith(b"\n"):
+            lines += 1
+        if header and lines:
+            lines -= 1
+        total += lines
+    return total
+
+
+def read_head(
+    data_frames: Iterator[pd.DataFrame],
+    num_rows: int,
+    offset: int = 0
+) -> pd.DataFrame:
+    """Reads num_rows rows after the first offset rows of DataFrames.
+
+    Args:
+        data_frames: DataFrames holding consecutive rows, e.g. as returned by
+        iter_data_frames. They are read only until num_rows rows are found.
+        num_rows: Number of rows to read.
+        offset: Number of rows to skip.
+
+    Returns:
+        DataFrame of at most num_rows rows.
+    """
+    head = []
+    position = 0
+    needed = num_rows
+    for df in data_frames:
+        start = max(offset - position, 0)
+        position += len(df)
+        if start >= len(df):
+            continue
+        head.append(df.iloc[start:start + needed])
+        needed -= len(head[-1])
+        if needed <= 0:
+            break
+    if not head:
+        return pd.DataFrame()
+    return pd.concat(head, ignore_index=True)
+
+
+def read_sample(
+    data_frames: Iterator[pd.DataFrame],
+    num_rows: int,
+    total_rows: int,
+    seed: int = 0
+) -> pd.DataFrame:
+    """Reads a deterministic uniform sample of rows of DataFrames.
+
+    Args:
+        data_frames: DataFrames holding consecutive rows, e.g. as returned by
+        iter_data_frames.
+        num_rows: Number of rows to sample.
+        total_rows: Total number of rows of the DataFrames, e.g. as returned
+        by count_rows.
+        seed: Seed of the sample. The same rows are sampled for the same seed.
+
+    Returns:
+        DataFrame of at most num_rows rows, in their original order.
+    """
+    if total_rows <= num_rows:
+        return read_head(data_frames, total_rows)
+    indices = np.sort(
+        np.random.RandomState(seed).choice(
+            total_rows, num_rows, replace=False))
+    sample = []
+    position = 0
+    for df in data_frames:
+        start = np.searchsorted(indices, position)
+        end = np.searchsorted(indices, position + len(df))
+        if end > start:
+            sample.append(df.iloc[indices[start:end] - position])
+        position += len(df)
+        if end >= len(indices):
+            break
+    if not sample:
+        return pd.DataFrame()
+    return pd.concat(sample, ignore_index=True)
+
+
+def read_table(
+    files: List[Text],
+    max_rows: int,
+    columns: Optional[List[Text]] = None,
+    names: Optional[List[Text]] = None,
+    page: int = 0,
+    sample: bool = False,
+    seed: int = 0,
+    open_file: Callable = _open_file
+) -> Tuple[pd.DataFrame, int]:
+    """Reads the rows of CSV or Parquet files to show in a table.
+
+    Args:
+        files: Paths of the files to read, in order.
+        max_rows: Maximum number of rows to read. All rows are read if 0 or
+        less.
+        columns: Names of the columns to read. All columns are read if None.
+        names: Names of the columns of CSV files. If not provided, the first
+        row of the CSV files is used as the header.
+        page: Index of the page of max_rows rows to read.
+        sample: Whether to read a uniform sample of max_rows rows instead of
+        a page.
+        seed: Seed of the sample.
+        open_file: Opens a file given its path and mode.
+
+    Returns:
+        DataFrame of the rows read and total number of rows of the files.
+    """
+    data_frames = iter_data_frames(
+        files, columns=columns, names=names, open_file=open_file)
+    if max_rows <= 0:
+        df = pd.concat(list(data_frames) or [pd.DataFrame()],
+                       ignore_index=True)
+        return df, len(df)
+    total_rows = count_rows(files, header=names is None, open_file=open_file)
+    if sample:
+        return read_sample(data_frames, max_rows, total_rows, seed=seed), \
+            total_rows
+    return read_head(data_frames, max_rows, offset=page * max_rows), \
+        total_rows
+
+
+def count_scores(
+    data_frames: Iterator[pd.DataFrame],
+    score_column: Text,
+    get_target: Callable[[pd.DataFrame], pd.Series],
+    score_decimals: Optional[int] = None
+) -> pd.DataFrame:
+    """Counts the positive and negative rows of DataFrames for each score.
+
+    Args:
+        data_frames: DataFrames holding the rows, e.g. as returned by
+        iter_data_frames.
+        score_column: Name of the column of scores.
+        get_target: Returns 1 for each positive row of a DataFrame and 0 for
+        each negative row.
+        score_decimals: If provided, scores are rounded to this many decimals,
+        which bounds the number of distinct scores.
+
+    Returns:
+        DataFrame indexed by score with the number of positive and negative
+        rows for each score in columns "positives" and "negatives".
+    """
+    counts = pd.DataFrame({"positives": [], "negatives": []})
+    for df in data_frames:
+        scores = df[score_column]
+        if score_decimals is not None:
+            scores = scores.round(int(score_decimals))
+        target = get_target(df).to_numpy()
+        df_counts = pd.DataFrame({
+            "positives": target,
+            "negatives": 1 - target
+        }).groupby(scores.to_numpy()).sum()
+        counts = df_counts if counts.empty else counts.add(
+            df_counts, fill_value=0)
+    return counts
+
+
+def roc_curve_from_counts(
+    counts: pd.DataFrame
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Computes an ROC curve from the counts of positives and negatives.
+
+    This matches sklearn.metrics.roc_curve, including the removal of
+    thresholds that do not change the shape of the curve.
+
+    Args:
+        counts: DataFrame indexed by score with the number of positive and
+        negative rows for each score, e.g. as returned by count_scores.
+
+    Returns:
+        Arrays of false positive rates, true positive rates and thresholds.
+    """
+    counts = counts.sort_index(ascending=False)
+    tps = counts["positives"].cumsum().to_numpy()
+    fps = counts["negatives"].cumsum().to_numpy()
+    thresholds = counts.index.to_numpy()
+
+    # Points in the middle of collinear segments are dropped. Curves of one or
+    # two points have no such points.
+    if len(fps) > 2:
+        optimal_idxs = np.where(np.r_[
+            True,
+            np.logical_or(np.diff(fps, 2), np.diff(tps, 2)),
+            True
+        ])[0]
+        fps = fps[optimal_idxs]
+        tps = tps[optimal_idxs]
+        thresholds = thresholds[optimal_idxs]
+
+    tps = np.r_[0, tps]
+    fps = np.r_[0, fps]
+    thresholds = np.r_[thresholds[0] + 1, thresholds]
+    return fps / fps[-1], tps / tps[-1], thresholds
@@ -87,6 +87,23 @@ def create_cell_from_custom_code(code: list) -> NotebookNode:
     return cell
 
 
+def notebook_has_errors(nb: NotebookNode) -> bool:
+    """Checks whether any cell of an executed NotebookNode raised an error.
+
+    Args:
+        nb: NotebookNode whose outputs should be checked.
+
+    Returns:
+        True if any cell has an error output.
+
+    """
+    return any(
+        output.get("output_type") == "error"
+        for cell in nb.cells
+        for output in cell.get("outputs", [])
+    )
+
+
 class Exporter:
     """Handler for interaction with NotebookNodes, including output generation.
 
@@ -0,0 +1,301 @@
+"""
+kernel_pool.py provides a pool of pre-warmed kernels that render
+visualizations concurrently.
+"""
+
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import importlib
+import logging
+import os
+import queue
+import threading
+from typing import Callable, Optional, Text
+
+from nbformat import NotebookNode
+
+exporter = importlib.import_module("exporter")
+
+
+class PoolFullError(Exception):
+    """Raised when a request is made while the request queue is full."""
+
+
+def _discard_result(future: asyncio.Future):
+    """Retrieves the result of a future nobody awaits so it is not logged."""
+    if not future.cancelled():
+        future.exception()
+
+
+def get_kernel_memory_bytes(km) -> Optional[int]:
+    """Returns the resident memory of the kernel process of a KernelManager.
+
+    Args:
+        km: KernelManager whose kernel should be measured.
+
+    Returns:
+        Resident set size of the kernel process in bytes, or None if it can
+        not be determined (e.g. the kernel is not running or /proc is not
+        available).
+    """
+    kernel = getattr(km, "kernel", None)
+    pid = getattr(kernel, "pid", None)
+    if pid is None:
+        return None
+    try:
+        with open("/proc/{}/statm".format(pid), "r") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+class _RenderRequest:
+    """A notebook to render and the state needed to stop rendering it.
+
+    Attributes:
+        nb: NotebookNode that should be converted to HTML.
+        timed_out (bool): Whether the request timed out before it finished.
+        exporter: Exporter rendering the request, or None if it is not being
+        rendered.
+    """
+
+    def __init__(self, nb: NotebookNode):
+        self.nb = nb
+        self.timed_out = False
+        self.exporter = None
+
+
+class KernelPool:
+    """Pool of Exporters, each with its own pre-warmed kernel.
+
+    Requests are rendered concurrently on up to size kernels, and up to
+    max_queue_size further requests wait for a kernel to become available.
+    A kernel is restarted when it has died, when rendering on it failed
+    (e.g. because a cell timed out), when its memory exceeds
+    max_kernel_memory_bytes, or after max_renders_per_kernel renders.
+
+    When a request times out, the kernel rendering it is interrupted (or the
+    request is dropped if it is still waiting for a kernel). The request
+    counts against max_queue_size until its kernel is free again, so a
+    timed-out render never lets more work into the pool than it can run.
+
+    Attributes:
+        size (int): Number of kernels in the pool.
+        max_queue_size (int): Number of requests that can wait for a kernel.
+        timeout (int): Amount of time in seconds that a request can take,
+        including the time spent waiting for a kernel, before it fails.
+
+    """
+
+    def __init__(
+        self,
+        size: int = 1,
+        max_queue_size: int = 16,
+        timeout: int = 100,
+        template_type=exporter.TemplateType.FULL,
+        max_kernel_memory_bytes: int = 0,
+        max_renders_per_kernel: int = 0,
+        exporter_factory: Optional[Callable[[], "exporter.Exporter"]] = None
+    ):
+        """
+        Initializes KernelPool and starts its kernels.
+
+        Args:
+            size (int): Number of kernels in the pool.
+            max_queue_size (int): Number of requests that can wait for a
+            kernel before further requests are rejected.
+            timeout (int): Amount of time in seconds that a request can take
+            before it fails. It is also the amount of time a visualization
+            can run for on a kernel before being stopped.
+            template_type (TemplateType): Type of template to use when
+            generating visualization output.
+            max_kernel_memory_bytes (int): Resident memory of a kernel above
+            which it is restarted after a render. 0 disables the limit.
+            max_renders_per_kernel (int): Number of renders after which a
+            kernel is restarted. 0 disables the limit.
+            exporter_factory: Creates the Exporter of each kernel. Defaults to
+            creating an Exporter with the given timeout and template_type.
+        """
+        if size < 1:
+            raise ValueError("size must be at least 1, got {}.".format(size))
+        self.size = size
+        self.max_queue_size = max_queue_size
+        self.timeout = timeout
+        self._max_kernel_memory_bytes = max_kernel_memory_bytes
+        self._max_renders_per_kernel = max_renders_per_kernel
+        self._exporter_factory = exporter_factory or (
+            lambda: exporter.Exporter(timeout, template_type))
+
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._busy = 0
+        self._renders = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._failed = 0
+        self._kernel_restarts = 0
+        self._render_counts = {}
+
+        self._idle_exporters = queue.Queue()
+        for _ in range(size):
+            self._idle_exporters.put(self._exporter_factory())
+        self._executor = ThreadPoolExecutor(
+            max_workers=size, thread_name_prefix="kernel-pool")
+
+    async def generate_html_from_notebook(self, nb: NotebookNode) -> Text:
+        """Converts a provided NotebookNode to HTML on a pooled kernel.
+
+        Args:
+            nb: NotebookNode that should be converted to HTML.
+
+        Returns:
+            HTML from converted NotebookNode as a string.
+
+        Raises:
+            PoolFullError: If max_queue_size requests are already waiting for
+            a kernel.
+            asyncio.TimeoutError: If the request took longer than timeout
+            seconds.
+        """
+        with self._lock:
+            if self._pending >= self.size + self.max_queue_size:
+                self._rejected += 1
+                raise PoolFullError(
+                    "Too many visualizations are being generated. "
+                    "Please try again later.")
+            self._pending += 1
+        request = _RenderRequest(nb)
+        try:
+            future = asyncio.get_event_loop().run_in_executor(
+                self._executor, self._render, request)
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+        try:
+            # Shield the future so that a timeout does not cancel a request
+            # that still waits for a kernel: _render has to run to release
+            # the request's place in the pool.
+            return await asyncio.wait_for(
+                asyncio.shield(future), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            future.add_done_callback(_discard_result)
+            with self._lock:
+                self._timed_out += 1
+                request.timed_out = True
+                if request.exporter is not None:
+                    logging.warning("Rendering timed out. Interrupting kernel.")
+                    try:
+                        request.exporter.km.interrupt_kernel()
+                    except Exception:
+                        logging.exception("Failed to interrupt kernel.")
+            raise
+
+    def _render(self, request: _RenderRequest) -> Optional[Text]:
+        try:
+            return self._render_on_kernel(request)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def _render_on_kernel(self, request: _RenderRequest) -> Optional[Text]:
+        exporter_ = self._idle_exporters.get()
+        with self._lock:
+            if request.timed_out:
+                self._idle_exporters.put(exporter_)
+                return None
+            request.exporter = exporter_
+            self._busy += 1
+        succeeded = False
+        try:
+            if not exporter_.km.is_alive():
+                logging.warning("Kernel has died. Restarting it.")
+                self._restart_kernel(exporter_)
+            html = exporter_.generate_html_from_notebook(request.nb)
+            succeeded = True
+            return html
+        finally:
+            with self._lock:
+                request.exporter = None
+                # The kernel may have been interrupted, so it is restarted
+                # even if rendering finished.
+                succeeded = succeeded and not request.timed_out
+                self._busy -= 1
+                self._renders += 1
+                if not succeeded:
+                    self._failed += 1
+            try:
+                self._recycle_kernel_if_needed(exporter_, succeeded)
+            except Exception:
+                logging.exception("Failed to restart kernel.")
+            self._idle_exporters.put(exporter_)
+
+    def _recycle_kernel_if_needed(self, exporter_, succeeded: bool):
+        key = id(exporter_)
+        render_count = self._render_counts.get(key, 0) + 1
+        self._render_counts[key] = render_count
+        if not succeeded:
+            logging.warning("Rendering failed. Restarting kernel.")
+        elif not exporter_.km.is_alive():
+            logging.warning("Kernel has died. Restarting it.")
+        elif (self._max_renders_per_kernel and
+              render_count >= self._max_renders_per_kernel):
+            logging.info("Kernel rendered %d visualizations. Restarting it.",
+                         render_count)
+        elif self._max_kernel_memory_bytes and (
+                get_kernel_memory_bytes(exporter_.km) or 0
+        ) > self._max_kernel_memory_bytes:
+            logging.warning("Kernel uses more than %d bytes. Restarting it.",
+                            self._max_kernel_memory_bytes)
+        else:
+            return
+        self._restart_kernel(exporter_)
+
+    def _restart_kernel(self, exporter_):
+        exporter_.km.restart_kernel(now=True)
+        self._render_counts[id(exporter_)] = 0
+        with self._lock:
+            self._kernel_restarts += 1
+
+    def stats(self) -> dict:
+        """Returns health and queue-depth metrics of the pool."""
+        with self._idle_exporters.mutex:
+            idle_exporters = list(self._idle_exporters.queue)
+        dead_kernels = sum(
+            1 for exporter_ in idle_exporters if not exporter_.km.is_alive())
+        with self._lock:
+            return {
+                "healthy": dead_kernels < self.size,
+                "size": self.size,
+                "busy": self._busy,
+                "idle": len(idle_exporters),
+                "dead_idle_kernels": dead_kernels,
+                "queued": max(self._pending - self._busy, 0),
+                "max_queue_size": self.max_queue_size,
+                "renders": self._renders,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "timed_out": self._timed_out,
+                "kernel_restarts": self._kernel_restarts,
+            }
+
+    def shutdown(self):
+        """Stops accepting requests and shuts down all kernels."""
+        self._executor.shutdown(wait=True)
+        while not self._idle_exporters.empty():
+            self._idle_exporters.get().km.shutdown_kernel(now=True)
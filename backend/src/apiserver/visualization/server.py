@@ -13,11 +13,13 @@
 # limitations under the License.
 
 import argparse
+import asyncio
 import importlib
 import json
+import logging
 import os
 from pathlib import Path
-from typing import Text
+from typing import Dict, Text
 
 from nbformat import NotebookNode
 from nbformat.v4 import new_notebook, new_code_cell
@@ -25,6 +27,8 @@ import tornado.ioloop
 import tornado.web
 
 exporter = importlib.import_module("exporter")
+kernel_pool = importlib.import_module("kernel_pool")
+visualization_cache = importlib.import_module("visualization_cache")
 
 parser = argparse.ArgumentParser(description="Server Arguments")
 parser.add_argument(
@@ -34,9 +38,62 @@ parser.add_argument(
     help="Amount of time in seconds that a visualization can run for before " +
          "being stopped."
 )
+parser.add_argument(
+    "--kernel_pool_size",
+    type=int,
+    default=os.getenv('KERNEL_POOL_SIZE', 2),
+    help="Number of kernels that generate visualizations concurrently."
+)
+parser.add_argument(
+    "--max_queue_size",
+    type=int,
+    default=os.getenv('MAX_QUEUE_SIZE', 16),
+    help="Number of requests that can wait for a kernel before further " +
+         "requests are rejected."
+)
+parser.add_argument(
+    "--kernel_max_memory_mb",
+    type=int,
+    default=os.getenv('KERNEL_MAX_MEMORY_MB', 0),
+    help="Memory in MB of a kernel above which it is restarted after a " +
+         "visualization. 0 disables the limit."
+)
+parser.add_argument(
+    "--kernel_max_visualizations",
+    type=int,
+    default=os.getenv('KERNEL_MAX_VISUALIZATIONS', 0),
+    help="Number of visualizations after which a kernel is restarted. 0 " +
+         "disables the limit."
+)
+parser.add_argument(
+    "--cache_dir",
+    type=str,
+    default=os.getenv('VISUALIZATION_CACHE_DIR', '/tmp/visualization_cache'),
+    help="Directory in which generated visualizations are cached."
+)
+parser.add_argument(
+    "--cache_max_mb",
+    type=int,
+    default=os.getenv('VISUALIZATION_CACHE_MAX_MB', 1024),
+    help="Size in MB of the visualization cache above which the least " +
+         "recently used visualizations are evicted. 0 disables the cache."
+)
 
 args = parser.parse_args()
-_exporter = exporter.Exporter(args.timeout)
+_kernel_pool = kernel_pool.KernelPool(
+    size=args.kernel_pool_size,
+    max_queue_size=args.max_queue_size,
+    timeout=args.timeout,
+    max_kernel_memory_bytes=args.kernel_max_memory_mb * 1024 * 1024,
+    max_renders_per_kernel=args.kernel_max_visualizations
+)
+_cache = None
+if args.cache_max_mb > 0:
+    _cache = visualization_cache.VisualizationCache(
+        args.cache_dir, args.cache_max_mb * 1024 * 1024)
+# Renders in progress by cache key, so that concurrent requests for the same
+# visualization share a single render.
+_renders_in_flight: Dict[Text, asyncio.Future] = {}
 
 
 class VisualizationHandler(tornado.web.RequestHandler):
@@ -117,10 +174,21 @@ class VisualizationHandler(tornado.web.RequestHandler):
 
     def get(self):
         """Health check.
+
+        Responds with the health and queue-depth metrics of the kernel pool
+        as JSON if the metrics query argument is provided.
         """
-        self.write("alive")
+        stats = _kernel_pool.stats()
+        if not stats.get("healthy"):
+            self.set_status(503)
+        if _cache is not None:
+            stats["cache"] = _cache.stats()
+        if self.get_query_argument("metrics", None) is not None:
+            self.write(stats)
+        else:
+            self.write("alive")
 
-    def post(self):
+    async def post(self):
         """Generates visualization based on provided arguments.
         """
         # Validate arguments from request and return them as a dictionary.
@@ -129,16 +197,91 @@ class VisualizationHandler(tornado.web.RequestHandler):
         except Exception as e:
             return self.send_error(400, reason=str(e))
 
+        if self.get_body_argument("precompute", "false").lower() == "true":
+            # Render the visualization into the cache in the background, e.g.
+            # when the artifact it visualizes is produced.
+            if _cache is None:
+                return self.send_error(
+                    400, reason="Visualization cache is disabled.")
+            future = asyncio.ensure_future(
+                self.generate_html(request_arguments))
+            future.add_done_callback(_log_precompute_error)
+            self.set_status(202)
+            return
+
+        # Generate visualization (output for notebook) on a pooled kernel,
+        # without blocking the event loop.
+        try:
+            html = await self.generate_html(request_arguments)
+        except kernel_pool.PoolFullError as e:
+            return self.send_error(503, reason=str(e))
+        except asyncio.TimeoutError:
+            return self.send_error(
+                504,
+                reason="Visualization took longer than {} seconds.".format(
+                    _kernel_pool.timeout))
+        self.write(html)
+
+    async def generate_html(self, request_arguments: dict) -> Text:
+        """Generates a visualization, or gets it from the cache.
+
+        Args:
+            request_arguments: Arguments from the post request.
+
+        Returns:
+            HTML of the visualization.
+        """
+        key = None
+        if _cache is not None:
+            key = await asyncio.get_event_loop().run_in_executor(
+                None, _cache.get_key,
+                request_arguments.get("type"),
+                request_arguments.get("arguments"),
+                request_arguments.get("source"))
+        if key is None:
+            return await self.render(request_arguments)
+
+        html = _cache.get(key)
+        if html is not None:
+            return html
+        if key not in _renders_in_flight:
+            _renders_in_flight[key] = asyncio.ensure_future(
+                self.render_and_cache(key, request_arguments))
+        # Shield the shared render so that it is not cancelled with one of
+        # the requests waiting for it.
+        return await asyncio.shield(_renders_in_flight[key])
+
+    async def render_and_cache(self, key: Text, request_arguments: dict) -> Text:
+        try:
+            nb = self.generate_notebook_from_arguments(
+                request_arguments.get("arguments"),
+                request_arguments.get("source"),
+                request_arguments.get("type")
+            )
+            html = await _kernel_pool.generate_html_from_notebook(nb)
+            # Do not cache visualizations that failed, as the error may be
+            # transient.
+            if not exporter.notebook_has_errors(nb):
+                await asyncio.get_event_loop().run_in_executor(
+                    None, _cache.put, key, html)
+            return html
+        finally:
+            _renders_in_flight.pop(key, None)
+
+    async def render(self, request_arguments: dict) -> Text:
         # Create notebook with arguments from request.
         nb = self.generate_notebook_from_arguments(
             request_arguments.get("arguments"),
             request_arguments.get("source"),
             request_arguments.get("type")
         )
+        return await _kernel_pool.generate_html_from_notebook(nb)
 
-        # Generate visualization (output for notebook).
-        html = _exporter.generate_html_from_notebook(nb)
-        self.write(html)
+
+def _log_precompute_error(future: asyncio.Future):
+    if not future.cancelled() and future.exception() is not None:
+        logging.error("Failed to precompute visualization: %s",
+                      future.exception())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,192 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import importlib
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+data_loader = importlib.import_module("data_loader")
+
+
+class TestDataLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.files = []
+        for i in range(3):
+            path = os.path.join(self.tmp_dir.name, "data{}.csv".format(i))
+            pd.DataFrame({
+                "x": range(i * 10, i * 10 + 10),
+                "y": ["row {}".format(j) for j in range(i * 10, i * 10 + 10)]
+            }).to_csv(path, index=False)
+            self.files.append(path)
+
+    def iter_data_frames(self, **kwargs):
+        return data_loader.iter_data_frames(
+            self.files, chunk_size=4, open_file=open, **kwargs)
+
+    def test_iter_data_frames(self):
+        df = pd.concat(list(self.iter_data_frames()), ignore_index=True)
+        self.assertEqual(list(range(30)), df["x"].tolist())
+        self.assertEqual(["x", "y"], list(df.columns))
+
+    def test_iter_data_frames_with_columns_and_names(self):
+        chunks = list(
+            self.iter_data_frames(columns=["b"], names=["a", "b"]))
+        self.assertEqual(["b"], list(chunks[0].columns))
+        # The header row is read as data when names are provided.
+        self.assertEqual("y", chunks[0]["b"].iloc[0])
+
+    def test_iter_data_frames_from_parquet(self):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            self.skipTest("pyarrow is not installed.")
+        path = os.path.join(self.tmp_dir.name, "data.parquet")
+        pd.DataFrame({"x": range(5), "y": range(5)}).to_parquet(path)
+
+        df = pd.concat(
+            data_loader.iter_data_frames([path], columns=["y"], open_file=open))
+
+        self.assertEqual(["y"], list(df.columns))
+        self.assertEqual(list(range(5)), df["y"].tolist())
+        self.assertEqual(5, data_loader.count_rows([path], open_file=open))
+
+    def test_count_rows(self):
+        self.assertEqual(30, data_loader.count_rows(self.files, open_file=open))
+        self.assertEqual(
+            33,
+            data_loader.count_rows(self.files, header=False, open_file=open))
+
+    def test_read_head(self):
+        df = data_loader.read_head(self.iter_data_frames(), 12, offset=7)
+        self.assertEqual(list(range(7, 19)), df["x"].tolist())
+
+    def test_read_head_past_end(self):
+        df = data_loader.read_head(self.iter_data_frames(), 10, offset=25)
+        self.assertEqual(list(range(25, 30)), df["x"].tolist())
+
+    def test_read_sample(self):
+        df = data_loader.read_sample(self.iter_data_frames(), 8, 30, seed=1)
+        rows = df["x"].tolist()
+
+        self.assertEqual(8, len(rows))
+        self.assertEqual(sorted(set(rows)), rows)
+        self.assertEqual(
+            rows,
+            data_loader.read_sample(
+                self.iter_data_frames(), 8, 30, seed=1)["x"].tolist())
+
+    def test_read_table_page(self):
+        df, total_rows = data_loader.read_table(
+            self.files, 12, page=1, open_file=open)
+
+        self.assertEqual(30, total_rows)
+        self.assertEqual(list(range(12, 24)), df["x"].tolist())
+
+    def test_read_table_sample(self):
+        df, total_rows = data_loader.read_table(
+            self.files, 8, columns=["x"], sample=True, seed=1, open_file=open)
+
+        self.assertEqual(30, total_rows)
+        self.assertEqual(["x"], list(df.columns))
+        self.assertEqual(
+            data_loader.read_sample(
+                self.iter_data_frames(), 8, 30, seed=1)["x"].tolist(),
+            df["x"].tolist())
+
+    def test_read_table_all_rows_with_names(self):
+        df, total_rows = data_loader.read_table(
+            self.files, 0, names=["a", "b"], open_file=open)
+
+        # The header rows are read as data when names are provided.
+        self.assertEqual(33, total_rows)
+        self.assertEqual(33, len(df))
+        self.assertEqual("x", df["a"].iloc[0])
+
+
+class TestRocCurve(unittest.TestCase):
+
+    def roc_curve(self, y_true, y_score, chunk_size=7):
+        df = pd.DataFrame({"target": y_true, "score": y_score})
+        chunks = (df.iloc[i:i + chunk_size]
+                  for i in range(0, len(df), chunk_size))
+        counts = data_loader.count_scores(
+            chunks, "score", lambda chunk: chunk["target"])
+        return data_loader.roc_curve_from_counts(counts)
+
+    def assert_matches_sklearn(self, y_true, y_score):
+        from sklearn.metrics import roc_curve
+        expected_fpr, expected_tpr, expected_thresholds = roc_curve(
+            y_true, y_score)
+
+        fpr, tpr, thresholds = self.roc_curve(y_true, y_score)
+
+        np.testing.assert_allclose(expected_fpr, fpr)
+        np.testing.assert_allclose(expected_tpr, tpr)
+        # The first threshold is above every score, but its value depends on
+        # the version of scikit-learn.
+        np.testing.assert_allclose(expected_thresholds[1:], thresholds[1:])
+        self.assertGreater(thresholds[0], thresholds[1])
+
+    def test_matches_sklearn(self):
+        try:
+            import sklearn  # noqa: F401
+        except ImportError:
+            self.skipTest("scikit-learn is not installed.")
+        random_state = np.random.RandomState(0)
+        for num_scores in [2, 3, 10, 1000]:
+            y_true = random_state.randint(0, 2, size=500)
+            # Few distinct scores produce ties and collinear points.
+            y_score = random_state.randint(0, num_scores, size=500) / num_scores
+            with self.subTest(num_scores=num_scores):
+                self.assert_matches_sklearn(y_true, y_score)
+
+    def test_single_score(self):
+        fpr, tpr, thresholds = self.roc_curve([0, 1, 1, 0, 1], [0.5] * 5)
+
+        np.testing.assert_allclose([0, 1], fpr)
+        np.testing.assert_allclose([0, 1], tpr)
+        np.testing.assert_allclose([1.5, 0.5], thresholds)
+
+    def test_two_scores(self):
+        fpr, tpr, _ = self.roc_curve([0, 1, 1, 0], [0.2, 0.8, 0.8, 0.4])
+
+        np.testing.assert_allclose([0, 0, 1], fpr)
+        np.testing.assert_allclose([0, 1, 1], tpr)
+
+    def test_count_scores_with_decimals(self):
+        df = pd.DataFrame({
+            "target": [1, 0, 1, 0],
+            "score": [0.111, 0.112, 0.5, 0.9]
+        })
+
+        counts = data_loader.count_scores(
+            iter([df.iloc[:2], df.iloc[2:]]),
+            "score",
+            lambda chunk: chunk["target"],
+            score_decimals=2)
+
+        self.assertEqual([0.11, 0.5, 0.9], counts.index.tolist())
+        self.assertEqual([1, 1, 0], counts["positives"].tolist())
+        self.assertEqual([1, 0, 1], counts["negatives"].tolist())
+
+
+if __name__ == "__main__":
+    unittest.main()
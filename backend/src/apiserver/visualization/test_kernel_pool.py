@@ -0,0 +1,172 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import importlib
+import threading
+import unittest
+from unittest import mock
+
+from nbformat.v4 import new_notebook
+
+kernel_pool = importlib.import_module("kernel_pool")
+
+
+class FakeExporter:
+    """Exporter that renders a notebook once it is released."""
+
+    def __init__(self, release: threading.Event, fail: bool = False):
+        self.km = mock.Mock()
+        self.km.is_alive.return_value = True
+        self._release = release
+        self._fail = fail
+
+    def generate_html_from_notebook(self, nb) -> str:
+        self._release.wait()
+        if self._fail:
+            raise RuntimeError("Cell execution timed out")
+        return "<html></html>"
+
+
+class TestKernelPool(unittest.TestCase):
+
+    def setUp(self):
+        self.release = threading.Event()
+        self.exporters = []
+
+    def create_pool(self, fail: bool = False, **kwargs):
+        def exporter_factory():
+            exporter = FakeExporter(self.release, fail)
+            self.exporters.append(exporter)
+            return exporter
+
+        pool = kernel_pool.KernelPool(
+            exporter_factory=exporter_factory, **kwargs)
+        self.addCleanup(pool.shutdown)
+        self.addCleanup(self.release.set)
+        return pool
+
+    def test_renders_concurrently_and_queues(self):
+        pool = self.create_pool(size=2, max_queue_size=1)
+
+        async def render_all():
+            tasks = [
+                asyncio.ensure_future(
+                    pool.generate_html_from_notebook(new_notebook()))
+                for _ in range(3)
+            ]
+            await asyncio.sleep(0.1)
+            stats = pool.stats()
+            with self.assertRaises(kernel_pool.PoolFullError):
+                await pool.generate_html_from_notebook(new_notebook())
+            self.release.set()
+            return stats, await asyncio.gather(*tasks)
+
+        stats, htmls = asyncio.get_event_loop().run_until_complete(
+            render_all())
+
+        self.assertEqual(2, stats["busy"])
+        self.assertEqual(1, stats["queued"])
+        self.assertEqual(["<html></html>"] * 3, htmls)
+        self.assertEqual(1, pool.stats()["rejected"])
+        self.assertEqual(3, pool.stats()["renders"])
+
+    def test_times_out(self):
+        pool = self.create_pool(timeout=0.1)
+
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.get_event_loop().run_until_complete(
+                pool.generate_html_from_notebook(new_notebook()))
+        self.assertEqual(1, pool.stats()["timed_out"])
+        self.exporters[0].km.interrupt_kernel.assert_called_once_with()
+
+    def test_timed_out_render_holds_kernel_until_it_returns(self):
+        pool = self.create_pool(timeout=0.1, max_queue_size=1)
+
+        async def render_all():
+            tasks = [
+                asyncio.ensure_future(
+                    pool.generate_html_from_notebook(new_notebook()))
+                for _ in range(2)
+            ]
+            for task in tasks:
+                with self.assertRaises(asyncio.TimeoutError):
+                    await task
+            stats = pool.stats()
+            with self.assertRaises(kernel_pool.PoolFullError):
+                await pool.generate_html_from_notebook(new_notebook())
+            self.release.set()
+            for _ in range(100):
+                if not pool.stats()["busy"] and not pool.stats()["queued"]:
+                    break
+                await asyncio.sleep(0.05)
+            return stats
+
+        stats = asyncio.get_event_loop().run_until_complete(render_all())
+
+        self.assertEqual(1, stats["busy"])
+        self.assertEqual(1, stats["queued"])
+        self.assertEqual(2, stats["timed_out"])
+        final_stats = pool.stats()
+        self.assertEqual(0, final_stats["busy"])
+        self.assertEqual(0, final_stats["queued"])
+        # The queued request was dropped and the interrupted kernel restarted.
+        self.assertEqual(1, final_stats["renders"])
+        self.assertEqual(1, final_stats["failed"])
+        self.exporters[0].km.interrupt_kernel.assert_called_once_with()
+        self.exporters[0].km.restart_kernel.assert_called_once_with(now=True)
+
+    def test_restarts_kernel_after_failure(self):
+        pool = self.create_pool(fail=True)
+        self.release.set()
+
+        with self.assertRaises(RuntimeError):
+            asyncio.get_event_loop().run_until_complete(
+                pool.generate_html_from_notebook(new_notebook()))
+        self.exporters[0].km.restart_kernel.assert_called_once_with(now=True)
+        self.assertEqual(1, pool.stats()["kernel_restarts"])
+        self.assertEqual(1, pool.stats()["failed"])
+
+    def test_restarts_kernel_after_max_renders(self):
+        pool = self.create_pool(max_renders_per_kernel=2)
+        self.release.set()
+
+        for _ in range(3):
+            asyncio.get_event_loop().run_until_complete(
+                pool.generate_html_from_notebook(new_notebook()))
+        self.assertEqual(1, pool.stats()["kernel_restarts"])
+
+    def test_restarts_kernel_above_max_memory(self):
+        pool = self.create_pool(max_kernel_memory_bytes=1024)
+        self.release.set()
+
+        with mock.patch.object(
+                kernel_pool, "get_kernel_memory_bytes", return_value=2048):
+            asyncio.get_event_loop().run_until_complete(
+                pool.generate_html_from_notebook(new_notebook()))
+        self.exporters[0].km.restart_kernel.assert_called_once_with(now=True)
+
+    def test_restarts_dead_kernel_before_render(self):
+        pool = self.create_pool()
+        self.release.set()
+        self.exporters[0].km.is_alive.return_value = False
+
+        self.assertFalse(pool.stats()["healthy"])
+        asyncio.get_event_loop().run_until_complete(
+            pool.generate_html_from_notebook(new_notebook()))
+        self.exporters[0].km.restart_kernel.assert_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
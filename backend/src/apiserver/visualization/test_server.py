@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import importlib
+import json
 from typing import Text
 import unittest
 import tornado.testing
@@ -37,6 +38,13 @@ class TestServerEndpoints(tornado.testing.AsyncHTTPTestCase):
         self.assertEqual(200, response.code)
         self.assertEqual(b"alive", response.body)
 
+    def test_healthcheck_with_metrics(self):
+        response = self.fetch("/?metrics")
+        self.assertEqual(200, response.code)
+        metrics = json.loads(response.body)
+        self.assertTrue(metrics["healthy"])
+        self.assertEqual(0, metrics["queued"])
+
     def test_create_visualization_fails_when_nothing_is_provided(self):
         response = self.fetch(
             "/",
@@ -0,0 +1,171 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import fnmatch
+import importlib
+import os
+import sys
+import tempfile
+import types
+import unittest
+from unittest import mock
+
+visualization_cache = importlib.import_module("visualization_cache")
+
+
+class _FakeGCSFileSystem:
+    """In-memory GCS bucket mapping object paths to their generations."""
+
+    def __init__(self, generations):
+        self.generations = generations
+
+    def _files(self, path):
+        path = path[len("gs://"):] if path.startswith("gs://") else path
+        return [f for f in self.generations
+                if f == path or f.startswith(path.rstrip("/") + "/")]
+
+    def glob(self, pattern):
+        pattern = pattern[len("gs://"):]
+        return [f for f in self.generations if fnmatch.fnmatch(f, pattern)]
+
+    def info(self, path):
+        if path not in self.generations:
+            raise FileNotFoundError(path)
+        return {"size": 4, "generation": self.generations[path]}
+
+
+class FakeFsspecFileSystem(_FakeGCSFileSystem):
+    """Stand-in for the fsspec based GCSFileSystem of gcsfs 0.3 and later."""
+
+    def find(self, path):
+        return self._files(path)
+
+    def walk(self, path):
+        files = [f.rsplit("/", 1)[-1] for f in self._files(path)]
+        yield path, [], files
+
+
+class FakeLegacyFileSystem(_FakeGCSFileSystem):
+    """Stand-in for the GCSFileSystem of gcsfs 0.2, which has no find()."""
+
+    def walk(self, path):
+        return self._files(path)
+
+
+class TestVisualizationCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.data_dir = os.path.join(self.tmp_dir.name, "data")
+        os.mkdir(self.data_dir)
+        self.source = os.path.join(self.data_dir, "*.csv")
+        self.write_data("a.csv", "1,2\n")
+        self.cache = visualization_cache.VisualizationCache(
+            os.path.join(self.tmp_dir.name, "cache"), max_bytes=10)
+
+    def write_data(self, name, content):
+        with open(os.path.join(self.data_dir, name), "w") as f:
+            f.write(content)
+
+    def test_key_depends_on_type_arguments_and_source_content(self):
+        key = self.cache.get_key("table", {}, self.source)
+
+        self.assertIsNotNone(key)
+        self.assertEqual(key, self.cache.get_key("table", {}, self.source))
+        self.assertNotEqual(
+            key, self.cache.get_key("roc_curve", {}, self.source))
+        self.assertNotEqual(
+            key, self.cache.get_key("table", {"headers": ["x"]}, self.source))
+        self.write_data("b.csv", "3,4\n")
+        self.assertNotEqual(key, self.cache.get_key("table", {}, self.source))
+
+    def test_custom_and_missing_sources_are_not_cached(self):
+        self.assertIsNone(self.cache.get_key("custom", {"code": []}, ""))
+        self.assertIsNone(
+            self.cache.get_key("table", {}, "/does/not/exist.csv"))
+        self.assertIsNone(
+            self.cache.get_key("table", {}, "s3://bucket/data.csv"))
+
+    def test_get_and_put(self):
+        self.assertIsNone(self.cache.get("key"))
+        self.cache.put("key", "html")
+        self.assertEqual("html", self.cache.get("key"))
+        self.assertEqual(1, self.cache.stats()["hits"])
+        self.assertEqual(1, self.cache.stats()["misses"])
+
+    def test_evicts_least_recently_used(self):
+        self.cache.put("a", "aaaa")
+        self.cache.put("b", "bbbb")
+        self.cache.get("a")
+        self.cache.put("c", "cccc")
+
+        self.assertEqual("aaaa", self.cache.get("a"))
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual("cccc", self.cache.get("c"))
+        self.assertEqual(8, self.cache.stats()["bytes"])
+
+    def test_does_not_store_visualizations_larger_than_cache(self):
+        self.cache.put("a", "a" * 11)
+        self.assertIsNone(self.cache.get("a"))
+
+    def test_loads_stored_visualizations(self):
+        self.cache.put("a", "aaaa")
+        cache = visualization_cache.VisualizationCache(
+            self.cache.cache_dir, max_bytes=10)
+        self.assertEqual("aaaa", cache.get("a"))
+
+
+class TestFingerprintGcsSource(unittest.TestCase):
+
+    def get_key(self, fs, source):
+        gcsfs = types.ModuleType("gcsfs")
+        gcsfs.GCSFileSystem = lambda: fs
+        with tempfile.TemporaryDirectory() as cache_dir, \
+                mock.patch.dict(sys.modules, {"gcsfs": gcsfs}):
+            cache = visualization_cache.VisualizationCache(
+                cache_dir, max_bytes=10)
+            return cache.get_key("table", {}, source)
+
+    def check_key_depends_on_generation(self, fs_class):
+        generations = {
+            "bucket/data/a.csv": 1,
+            "bucket/data/b.csv": 1,
+            "bucket/other.csv": 1,
+        }
+        fs = fs_class(generations)
+        for source in ["gs://bucket/data", "gs://bucket/data/*.csv",
+                       "gs://bucket/data/a.csv"]:
+            fs.generations = dict(generations)
+            key = self.get_key(fs, source)
+
+            self.assertIsNotNone(key)
+            fs.generations["bucket/other.csv"] = 2
+            self.assertEqual(key, self.get_key(fs, source))
+            fs.generations["bucket/data/a.csv"] = 2
+            self.assertNotEqual(key, self.get_key(fs, source))
+
+    def test_key_depends_on_generation_with_fsspec(self):
+        self.check_key_depends_on_generation(FakeFsspecFileSystem)
+
+    def test_key_depends_on_generation_with_legacy_gcsfs(self):
+        self.check_key_depends_on_generation(FakeLegacyFileSystem)
+
+    def test_missing_source_is_not_cached(self):
+        fs = FakeFsspecFileSystem({})
+        self.assertIsNone(self.get_key(fs, "gs://bucket/missing.csv"))
+
+
+if __name__ == "__main__":
+    unittest.main()
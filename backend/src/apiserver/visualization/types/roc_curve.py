@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import importlib
 import json
 from pathlib import Path
 from bokeh.layouts import row
@@ -21,9 +22,10 @@ from bokeh.models import HoverTool
 # gcsfs is required for pandas GCS integration.
 import gcsfs
 import pandas as pd
-from sklearn.metrics import roc_curve
 from tensorflow.python.lib.io import file_io
 
+data_loader = importlib.import_module("data_loader")
+
 # The following variables are provided through dependency injection. These
 # variables come from the specified input path and arguments provided by the
 # API post request.
@@ -33,27 +35,57 @@ from tensorflow.python.lib.io import file_io
 # target_lambda
 # trueclass
 # true_score_column
+# score_decimals: If provided, scores are rounded to this many decimals, which
+# bounds the number of thresholds and the memory used to compute the curve.
+
+
+def get_target(df: pd.DataFrame) -> pd.Series:
+    """Computes whether each row of a DataFrame belongs to the true class."""
+    if variables.get("target_lambda", False):
+        target_lambda = eval(variables.get("target_lambda", ""))
+        # Apply the lambda to whole columns when it supports it, e.g.
+        # lambda x: (x['target'] > x['fare'] * 0.2), and row by row otherwise.
+        try:
+            target = target_lambda(df)
+            if isinstance(target, pd.Series) and len(target) == len(df):
+                return target.astype(int)
+        except Exception:
+            pass
+        return df.apply(target_lambda, axis=1).astype(int)
+    return (df["target"] == variables.get("trueclass", "true")).astype(int)
+
 
 if not variables.get("is_generated", False):
-    # Create data from specified csv file(s).
+    # Create data from specified csv or parquet file(s).
     # The schema file provides column names for the csv file that will be used
     # to generate the roc curve.
     schema_file = Path(source) / "schema.json"
     schema = json.loads(file_io.read_file_to_string(schema_file))
     names = [x["name"] for x in schema]
+    score_column = variables.get("true_score_column", "true")
+    score_decimals = variables.get("score_decimals", None)
 
-    dfs = []
+    # Only the target and score columns are read, unless the target is
+    # computed by a lambda, which may use any column. Files are read in
+    # chunks, and only the number of positives and negatives per score are
+    # kept.
+    columns = None if variables.get("target_lambda", False) else [
+        "target", score_column]
     files = file_io.get_matching_files(source)
-    for f in files:
-        dfs.append(pd.read_csv(f, names=names))
-
-    df = pd.concat(dfs)
-    if variables.get("target_lambda", False):
-        df["target"] = df.apply(eval(variables.get("target_lambda", "")), axis=1)
-    else:
-        df["target"] = df["target"].apply(lambda x: 1 if x == variables.get("trueclass", "true") else 0)
-    fpr, tpr, thresholds = roc_curve(df["target"], df[variables.get("true_score_column", "true")])
+    counts = data_loader.count_scores(
+        data_loader.iter_data_frames(files, columns=columns, names=names),
+        score_column,
+        get_target,
+        score_decimals=score_decimals
+    )
+    fpr, tpr, thresholds = data_loader.roc_curve_from_counts(counts)
     df = pd.DataFrame({"fpr": fpr, "tpr": tpr, "thresholds": thresholds})
+elif data_loader.is_parquet(source):
+    # Load data from generated parquet file.
+    df = pd.concat(
+        data_loader.iter_data_frames([source], columns=["fpr", "tpr", "thresholds"]),
+        ignore_index=True
+    )
 else:
     # Load data from generated csv file.
     df = pd.read_csv(
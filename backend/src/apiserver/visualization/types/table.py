@@ -12,39 +12,57 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import importlib
 # gcsfs is required for pandas GCS integration.
 import gcsfs
+from IPython.display import display, HTML
 from itables import show
 # itables is requires as importing it changes the way pandas DataFrames are
 # rendered.
 import itables.interactive
 from itables.javascript import load_datatables
 import itables.options as opts
-import pandas as pd
 from tensorflow.python.lib.io import file_io
 
+data_loader = importlib.import_module("data_loader")
+
+# The following variables are provided through dependency injection. These
+# variables come from the specified input path and arguments provided by the
+# API post request.
+#
+# source
+# headers: Names of the columns of the CSV files, which then have no header
+# row.
+# columns: Names of the columns to show. All columns are shown by default.
+# max_rows: Maximum number of rows to show, 10000 by default. 0 shows all rows.
+# page: Index of the page of max_rows rows to show, 0 by default.
+# sample: Whether to show a uniform sample of max_rows rows instead of a page.
+# seed: Seed of the sample, 0 by default.
+
 # Forcefully load required JavaScript and CSS for datatables.
 load_datatables()
 
 # Remove maxByte limit to prevent issues where entire table cannot be rendered
-# due to size of data.
+# due to size of data. The number of rows is bounded by max_rows instead.
 opts.maxBytes = 0
 
-dfs = []
 files = file_io.get_matching_files(source)
+headers = variables.get("headers", None) or None
+max_rows = int(variables.get("max_rows", 10000))
 
-# Read data from file and write it to a DataFrame object.
-if not variables.get("headers", False):
-    # If no headers are provided, use the first row as headers
-    for f in files:
-        dfs.append(pd.read_csv(f))
-else:
-    # If headers are provided, do not set headers for DataFrames
-    for f in files:
-        dfs.append(pd.read_csv(f, header=None))
+# Read data from files in chunks, keeping only the rows to show. If no headers
+# are provided, the first row of CSV files is used as headers.
+df, total_rows = data_loader.read_table(
+    files,
+    max_rows,
+    columns=variables.get("columns", None),
+    names=headers,
+    page=int(variables.get("page", 0)),
+    sample=variables.get("sample", False),
+    seed=int(variables.get("seed", 0))
+)
 
 # Display DataFrame as output.
-df = pd.concat(dfs)
-if variables.get("headers", False):
-    df.columns = variables.get("headers")
+if len(df) < total_rows:
+    display(HTML("<p>Showing {} of {} rows.</p>".format(len(df), total_rows)))
 show(df)
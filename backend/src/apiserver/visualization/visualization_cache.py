@@ -0,0 +1,248 @@
+"""
+visualization_cache.py provides an on-disk cache of generated visualizations
+keyed on the content of their sources and their arguments.
+"""
+
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import glob
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+import tempfile
+import threading
+from typing import List, Optional, Text, Tuple
+
+_GCS_PREFIX = "gs://"
+
+
+def _fingerprint_local_source(source: Text) -> List[Tuple]:
+    paths = glob.glob(source) or [source]
+    fingerprint = []
+    for path in sorted(paths):
+        if os.path.isdir(path):
+            files = sorted(
+                os.path.join(root, name)
+                for root, _, names in os.walk(path) for name in names)
+        else:
+            files = [path]
+        for f in files:
+            stat = os.stat(f)
+            fingerprint.append((f, stat.st_size, stat.st_mtime_ns))
+    return fingerprint
+
+
+def _find_gcs_files(fs, path: Text) -> List[Text]:
+    # gcsfs 0.3 and later are based on fsspec, whose walk() yields
+    # (root, dirs, files) tuples, and list files with find() instead.
+    if hasattr(fs, "find"):
+        return fs.find(path)
+    return fs.walk(path)
+
+
+def _fingerprint_gcs_source(source: Text) -> List[Tuple]:
+    # gcsfs is only imported when a source on GCS is fingerprinted.
+    import gcsfs
+    fs = gcsfs.GCSFileSystem()
+    paths = fs.glob(source) or [source]
+    fingerprint = []
+    for path in sorted(paths):
+        files = _find_gcs_files(fs, path) or [path]
+        for f in sorted(files):
+            info = fs.info(f)
+            fingerprint.append((f, info.get("size"),
+                                info.get("generation") or info.get("updated")))
+    return fingerprint
+
+
+def fingerprint_source(source: Text) -> Optional[List[Tuple]]:
+    """Fingerprints the files matched by a source path or path pattern.
+
+    Files are fingerprinted by their size and modification time on local disk,
+    and by their size and generation on GCS, so that their content does not
+    need to be read.
+
+    Args:
+        source: Path or path pattern of the data of a visualization. If it is
+        a directory, all files within it are fingerprinted.
+
+    Returns:
+        List of (path, size, version) tuples of the files, or None if the
+        source can not be fingerprinted.
+    """
+    try:
+        if source.startswith(_GCS_PREFIX):
+            return _fingerprint_gcs_source(source)
+        if "://" in source:
+            return None
+        return _fingerprint_local_source(source)
+    except Exception as e:
+        logging.warning("Unable to fingerprint source %s: %s", source, e)
+        return None
+
+
+def _hash_file(path: Text) -> Text:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class VisualizationCache:
+    """Size-bounded LRU cache of generated visualizations on local disk.
+
+    Visualizations are cached by a key computed from their type, arguments,
+    and source fingerprint, as well as the code of their type so that a
+    change to a visualization invalidates its cached outputs. Custom
+    visualizations are not cached because their code may read any data.
+
+    Attributes:
+        cache_dir (Path): Directory in which visualizations are stored.
+        max_bytes (int): Total size of the stored visualizations above which
+        the least recently used ones are evicted.
+
+    """
+
+    def __init__(self, cache_dir: Text, max_bytes: int):
+        """
+        Initializes VisualizationCache with the visualizations already stored
+        in cache_dir.
+
+        Args:
+            cache_dir: Directory in which visualizations are stored. It is
+            created if it does not exist.
+            max_bytes: Total size of the stored visualizations above which
+            the least recently used ones are evicted.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._type_hashes = {}
+        # Sizes of the stored visualizations by key, from least to most
+        # recently used.
+        self._entries = collections.OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        paths = sorted(
+            self.cache_dir.glob("*.html"), key=lambda p: p.stat().st_mtime)
+        for path in paths:
+            size = path.stat().st_size
+            self._entries[path.stem] = size
+            self._size += size
+        with self._lock:
+            self._evict()
+
+    def _get_type_hash(self, visualization_type: Text) -> Text:
+        type_hash = self._type_hashes.get(visualization_type)
+        if type_hash is None:
+            type_file = Path.cwd() / "types/{}.py".format(visualization_type)
+            type_hash = _hash_file(type_file) if type_file.exists() else ""
+            self._type_hashes[visualization_type] = type_hash
+        return type_hash
+
+    def get_key(
+        self,
+        visualization_type: Text,
+        arguments: dict,
+        source: Text
+    ) -> Optional[Text]:
+        """Computes the cache key of a visualization.
+
+        This fingerprints the source of the visualization, which may make
+        requests to GCS, so it should not be called from the event loop.
+
+        Args:
+            visualization_type: Name of visualization to be generated.
+            arguments: JSON object containing provided arguments.
+            source: Path or path pattern to be used as data reference for
+            visualization.
+
+        Returns:
+            Cache key of the visualization, or None if it can not be cached.
+        """
+        if visualization_type == "custom":
+            return None
+        fingerprint = fingerprint_source(source)
+        if fingerprint is None:
+            return None
+        key = {
+            "type": visualization_type,
+            "type_hash": self._get_type_hash(visualization_type),
+            "arguments": arguments,
+            "source": source,
+            "fingerprint": fingerprint,
+        }
+        return hashlib.sha256(
+            json.dumps(key, sort_keys=True, default=str).encode()).hexdigest()
+
+    def get(self, key: Text) -> Optional[Text]:
+        """Returns the visualization stored for a key, or None if missing."""
+        path = self.cache_dir / "{}.html".format(key)
+        with self._lock:
+            if key not in self._entries:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+        try:
+            html = path.read_text()
+            os.utime(str(path))
+        except OSError:
+            with self._lock:
+                self._size -= self._entries.pop(key, 0)
+            return None
+        return html
+
+    def put(self, key: Text, html: Text):
+        """Stores the visualization of a key, evicting old ones if needed."""
+        data = html.encode()
+        if len(data) > self.max_bytes:
+            return
+        path = self.cache_dir / "{}.html".format(key)
+        # Write to a temporary file first so that readers never see a
+        # partially written visualization.
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.cache_dir), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, str(path))
+        with self._lock:
+            self._size -= self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._size += len(data)
+            self._evict()
+
+    def _evict(self):
+        while self._size > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._size -= size
+            try:
+                (self.cache_dir / "{}.html".format(key)).unlink()
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        """Returns the size and hit rate metrics of the cache."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
@@ -15,13 +15,15 @@
 
 import argparse
 from collections import defaultdict
+from concurrent import futures
 import json
 import logging
 import os
 import sys
-from typing import Any, Optional, Dict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from google.api_core import gapic_v1
+from google.api_core import retry
 from google.cloud import storage
 from google.cloud import aiplatform_v1
 
@@ -29,6 +31,11 @@ from google.protobuf import json_format
 
 
 BATCH_IMPORT_LIMIT = 50
+# Number of BatchImportEvaluatedAnnotations requests sent concurrently.
+MAX_CONCURRENT_BATCH_IMPORTS = 8
+# Size of the chunks in which GCS files are downloaded.
+_GCS_READ_CHUNK_SIZE = 8 * 1024 * 1024
+_BATCH_IMPORT_RETRY = retry.Retry(predicate=retry.if_transient_error)
 EvaluatedAnnotation = (
     aiplatform_v1.types.evaluated_annotation.EvaluatedAnnotation
 )
@@ -122,24 +129,35 @@ def get_model_evaluation_slices_annotation_spec_map(
   return annotation_spec_value_to_slice_name_map
 
 
-def read_gcs_uri_as_text(gcs_uri: str) -> str:
-  """Reads the contents of a file in Google Cloud Storage as text.
-
-  Args:
-    gcs_uri (str): The GCS URI to read, e.g.
-      'gs://my-bucket/path/to/myfile.txt'.
-
-  Returns:
-      str: The contents of the file as a string.
-  """
+def _get_gcs_blob(gcs_uri: str) -> storage.Blob:
   if not gcs_uri.startswith('gs://'):
     raise ValueError(f'Invalid GCS URI: {gcs_uri}')
   bucket_name, file_path = gcs_uri.split('//')[1].split('/', 1)
 
   storage_client = storage.Client()
   bucket = storage_client.bucket(bucket_name)
-  blob = bucket.blob(file_path)
-  return blob.download_as_text()
+  return bucket.blob(file_path)
+
+
+def read_gcs_uri_lines(gcs_uri: str) -> Iterator[str]:
+  """Reads the non-blank lines of a file in Google Cloud Storage.
+
+  The file is downloaded in chunks as the lines are consumed, so that it is
+  never held in memory as a whole.
+
+  Args:
+    gcs_uri (str): The GCS URI to read, e.g.
+      'gs://my-bucket/path/to/myfile.jsonl'.
+
+  Returns:
+    An iterator of the lines of the file, without surrounding whitespace.
+  """
+  blob = _get_gcs_blob(gcs_uri)
+  with blob.open('r', chunk_size=_GCS_READ_CHUNK_SIZE) as f:
+    for line in f:
+      line = line.strip()
+      if line:
+        yield line
 
 
 def get_error_analysis_map(output_uri: str) -> Dict[str, Any]:
@@ -153,17 +171,16 @@ def get_error_analysis_map(output_uri: str) -> Dict[str, Any]:
     `ErrorAnalysisAnnotation` objects as values.
   """
   error_analysis_map = defaultdict(list)
-  error_analysis_file_contents = read_gcs_uri_as_text(output_uri)
-  if not error_analysis_file_contents:
-    raise ValueError(f'Invalid error_analysis_output_uri file: {output_uri}')
-  for line in error_analysis_file_contents.splitlines():
+  for line in read_gcs_uri_lines(output_uri):
     try:
-      json_object = json.loads(line.strip())
-      error_analysis_map[json_object['annotation_resource_name']] += [
-          json_object['annotation']
-      ]
+      json_object = json.loads(line)
     except json.JSONDecodeError as e:
       raise ValueError(f'Invalid JSONL file: {output_uri}') from e
+    error_analysis_map[json_object['annotation_resource_name']].append(
+        json_object['annotation']
+    )
+  if not error_analysis_map:
+    raise ValueError(f'Invalid error_analysis_output_uri file: {output_uri}')
   return error_analysis_map
 
 
@@ -183,12 +200,12 @@ def build_evaluated_annotation(
   return ea
 
 
-def get_evaluated_annotations_by_slice_map(
+def iter_evaluated_annotations(
     output_uri: str,
     slice_value_to_resource_name: Dict[str, str],
     error_analysis: Optional[Dict[str, Any]] = None,
-) -> Dict[str, Any]:
-  """Returns a dictionary evaluated_annotations_by_slice.
+) -> Iterator[Tuple[str, EvaluatedAnnotation]]:
+  """Reads evaluated annotations one at a time.
 
   Args:
     output_uri: The GCS URI to evaluated annotation output.
@@ -196,64 +213,109 @@ def get_evaluated_annotations_by_slice_map(
     error_analysis: Error Analysis dictionary.
 
   Returns:
-    A dictionary of evaluated annotations indexed by slice values.
+    An iterator of (slice value, evaluated annotation) pairs, in the order of
+    the evaluated annotation output.
   """
-
-  evaluated_annotation_file_contents = read_gcs_uri_as_text(output_uri)
-  evaluated_annotations_by_slice = {
-      target_slice: [] for target_slice in slice_value_to_resource_name.keys()
-  }
-  for line in evaluated_annotation_file_contents.splitlines():
+  for line in read_gcs_uri_lines(output_uri):
     try:
-      json_object = json.loads(line.strip())
+      json_object = json.loads(line)
     except json.JSONDecodeError as e:
       raise ValueError(f'Invalid JSONL file: {output_uri}') from e
     try:
       annotation_resource_names = json_object.pop('annotation_resource_names')
       if error_analysis:
-        json_object['error_analysis_annotations'] = []
-        for annotation in annotation_resource_names:
-          json_object['error_analysis_annotations'].extend(
-              error_analysis[annotation]
-          )
-      evaluated_annotations_by_slice[json_object.pop('slice_value')].append(
-          build_evaluated_annotation(json_object)
-      )
+        json_object['error_analysis_annotations'] = [
+            error_analysis_annotation
+            for annotation in annotation_resource_names
+            for error_analysis_annotation in error_analysis.get(annotation, ())
+        ]
+      slice_value = json_object.pop('slice_value')
+      if slice_value not in slice_value_to_resource_name:
+        raise KeyError(slice_value)
+      yield slice_value, build_evaluated_annotation(json_object)
     except KeyError as e:
       raise ValueError(
           f'Invalid Evaluated Annotation JSONL file: {output_uri}'
       ) from e
 
-  return evaluated_annotations_by_slice
-
 
-def batch_import(
+def import_evaluated_annotations(
     client: aiplatform_v1.ModelServiceClient,
-    evaluated_annotations_by_slice: Dict[str, Any],
+    evaluated_annotations: Iterable[Tuple[str, EvaluatedAnnotation]],
     slice_value_to_resource_name: Dict[str, str],
-) -> None:
-  """Calls ModelService.BatchImportEvaluatedAnnotations."""
-  count = 0
-  print('Starting batch import.')
-  total_num = sum([len(v) for k, v in evaluated_annotations_by_slice.items()])
-  print(f'Total number of evaluated_annotations: {total_num}')
-  for (
-      slice_value,
-      evaluated_annotations,
-  ) in evaluated_annotations_by_slice.items():
-    print(
-        f'Eval slice label: {slice_value}, Vertex resource name:'
-        f' {slice_value_to_resource_name[slice_value]}'
-    )
-    for i in range(0, len(evaluated_annotations), BATCH_IMPORT_LIMIT):
-      response = client.batch_import_evaluated_annotations(
-          parent=slice_value_to_resource_name[slice_value],
-          evaluated_annotations=evaluated_annotations[
-              i : i + BATCH_IMPORT_LIMIT
-          ],
+    max_concurrent_imports: int = MAX_CONCURRENT_BATCH_IMPORTS,
+) -> Dict[str, int]:
+  """Imports evaluated annotations in concurrent batches.
+
+  Evaluated annotations are consumed as they are imported, so that at most
+  a batch per slice and a bounded number of batches being imported are held
+  in memory. Transient errors are retried.
+
+  Args:
+    client: The Model Service client.
+    evaluated_annotations: (slice value, evaluated annotation) pairs.
+    slice_value_to_resource_name: Slice values to slice resource names map.
+    max_concurrent_imports: The maximum number of concurrent
+      BatchImportEvaluatedAnnotations requests.
+
+  Returns:
+    The number of imported evaluated annotations by slice value.
+  """
+  imported_counts = defaultdict(int)
+  batches_by_slice = defaultdict(list)
+  pending = {}
+  batch_import_fn = _BATCH_IMPORT_RETRY(
+      client.batch_import_evaluated_annotations
+  )
+
+  def wait(return_when: str) -> None:
+    done, _ = futures.wait(pending, return_when=return_when)
+    for future in done:
+      slice_value = pending.pop(future)
+      imported_counts[slice_value] += (
+          future.result().imported_evaluated_annotations_count
+      )
+      logging.info(
+          '%s evaluated annotations imported to slice %s.',
+          imported_counts[slice_value],
+          slice_value,
       )
-      count += response.imported_evaluated_annotations_count
-    print(f'{count} evaluated annotations imported.')
+
+  def submit(slice_value: str, batch: List[EvaluatedAnnotation]) -> None:
+    # Bound the number of batches waiting to be imported.
+    if len(pending) >= 2 * max_concurrent_imports:
+      wait(futures.FIRST_COMPLETED)
+    future = executor.submit(
+        batch_import_fn,
+        parent=slice_value_to_resource_name[slice_value],
+        evaluated_annotations=batch,
+    )
+    pending[future] = slice_value
+
+  logging.info('Starting batch import.')
+  with futures.ThreadPoolExecutor(
+      max_workers=max_concurrent_imports
+  ) as executor:
+    try:
+      for slice_value, evaluated_annotation in evaluated_annotations:
+        batch = batches_by_slice[slice_value]
+        batch.append(evaluated_annotation)
+        if len(batch) == BATCH_IMPORT_LIMIT:
+          submit(slice_value, batch)
+          batches_by_slice[slice_value] = []
+      for slice_value, batch in batches_by_slice.items():
+        if batch:
+          submit(slice_value, batch)
+      wait(futures.ALL_COMPLETED)
+    finally:
+      for future in pending:
+        future.cancel()
+
+  logging.info(
+      'Total number of imported evaluated_annotations: %s',
+      sum(imported_counts.values()),
+  )
+  return imported_counts
 
 
 def main(argv):
@@ -285,24 +347,23 @@ def main(argv):
       slice_value_to_resource_name,
   )
 
+  error_analysis = None
   if parsed_args.error_analysis_output_uri:
     error_analysis = get_error_analysis_map(
         parsed_args.error_analysis_output_uri
     )
-    logging.info('error_analysis: %s', error_analysis)
-    evaluated_annotations_by_slice = get_evaluated_annotations_by_slice_map(
-        parsed_args.evaluated_annotation_output_uri,
-        slice_value_to_resource_name,
-        error_analysis,
-    )
-  else:
-    evaluated_annotations_by_slice = get_evaluated_annotations_by_slice_map(
-        parsed_args.evaluated_annotation_output_uri,
-        slice_value_to_resource_name,
+    logging.info(
+        'Read error analysis of %s annotations.', len(error_analysis)
     )
 
-  batch_import(
-      client, evaluated_annotations_by_slice, slice_value_to_resource_name
+  import_evaluated_annotations(
+      client,
+      iter_evaluated_annotations(
+          parsed_args.evaluated_annotation_output_uri,
+          slice_value_to_resource_name,
+          error_analysis,
+      ),
+      slice_value_to_resource_name,
   )
 
 
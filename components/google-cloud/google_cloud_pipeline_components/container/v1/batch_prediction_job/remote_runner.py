@@ -120,8 +120,8 @@ def create_batch_prediction_job(
      preemption
   2. Deserialize the payload into the job spec and create the batch prediction
   job
-  3. Poll the batch prediction job status every
-  job_remote_runner._POLLING_INTERVAL_IN_SECONDS seconds
+  3. Poll the batch prediction job status with the adaptive
+  job_remote_runner._POLLING_BACKOFF interval
      - If the batch prediction job is succeeded, return succeeded
      - If the batch prediction job is cancelled/paused, it's an unexpected
      scenario so return failed
@@ -45,8 +45,8 @@ def bigquery_detect_anomalies_model_job(
      if the launcher container experienced unexpected termination, such as
      preemption
   2. Deserialize the payload into the job spec and create the bigquery job
-  3. Poll the bigquery job status every
-  job_remote_runner._POLLING_INTERVAL_IN_SECONDS seconds
+  3. Poll the bigquery job status with the adaptive
+  bigquery_util._POLLING_BACKOFF interval
      - If the bigquery job is succeeded, return succeeded
      - If the bigquery job is pending/running, continue polling the status
 
@@ -12,23 +12,27 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+from concurrent import futures
+import itertools
 import json
 import logging
 import os
 from os import path
 import re
-import time
-from typing import Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 import google.auth
 import google.auth.transport.requests
-from google_cloud_pipeline_components.container.utils import execution_context
 from google_cloud_pipeline_components.container.v1.gcp_launcher.utils import artifact_util
 from google_cloud_pipeline_components.container.v1.gcp_launcher.utils import gcp_labels_util
 from google_cloud_pipeline_components.container.v1.gcp_launcher.utils import json_util
+from google_cloud_pipeline_components.container.v1.gcp_launcher.utils import polling_util
 from google_cloud_pipeline_components.proto import gcp_resources_pb2
 from google_cloud_pipeline_components.types.artifact_types import BQTable
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from google.protobuf import json_format
 
@@ -37,9 +41,21 @@ ARTIFACT_PROPERTY_KEY_ROWS = 'rows'
 JOB_CONFIGURATION_KEY = 'configuration'
 LABELS_PAYLOAD_KEY = 'labels'
 
-_POLLING_INTERVAL_IN_SECONDS = 20
+# Most queries finish in seconds, but some run for hours.
+_POLLING_BACKOFF = polling_util.Backoff(floor_seconds=1, ceiling_seconds=30)
+_QUERY_RESULTS_URI_TEMPLATE = 'https://bigquery.googleapis.com/bigquery/v2/projects/{projectId}/queries/{jobId}'
+_QUERY_RESULTS_CHUNK_SIZE = 10000
+# Results returned in memory are stored in artifact metadata, so they are
+# capped. Larger results should be written with write_query_results.
+_MAX_QUERY_RESULTS_ROWS = 100000
+_HTTP_POOL_SIZE = 16
+_HTTP_RETRY_LIMIT = 5
+_HTTP_RETRY_BACKOFF_FACTOR = 1.0
 _BQ_JOB_NAME_TEMPLATE = r'(https://www.googleapis.com/bigquery/v2/projects/(?P<project>.*)/jobs/(?P<job>.*)\?location=(?P<location>.*))'
 
+# Session shared by the requests for query results, created on first use.
+_session = None
+
 
 def insert_system_labels_into_payload(job_request_json):
   if JOB_CONFIGURATION_KEY not in job_request_json:
@@ -223,50 +239,393 @@ def _send_cancel_request(job_uri, creds):
   logging.info('Cancel response: %s', response)
 
 
+def _get_job_state(job: dict) -> Optional[str]:
+  return job.get('status', {}).get('state')
+
+
+def _get_job(job_uri, creds) -> dict:
+  if not creds.valid:
+    creds.refresh(google.auth.transport.requests.Request())
+  headers = {
+      'Content-type': 'application/json',
+      'Authorization': 'Bearer ' + creds.token,
+  }
+  job = requests.get(job_uri, headers=headers).json()
+  if 'status' in job and 'errorResult' in job['status']:
+    raise RuntimeError(
+        f'The BigQuery job {job_uri} failed. Error: {job["status"]}'
+    )
+  return job
+
+
 def poll_job(job_uri, creds) -> dict:
   """Poll the bigquery job till it reaches a final state."""
-  with execution_context.ExecutionContext(
-      on_cancel=lambda: _send_cancel_request(job_uri, creds)
-  ):
-    job = {}
-    while (
-        ('status' not in job)
-        or ('state' not in job['status'])
-        or (job['status']['state'].lower() != 'done')
-    ):
-      time.sleep(_POLLING_INTERVAL_IN_SECONDS)
-      logging.info('The job is running...')
-      if not creds.valid:
-        creds.refresh(google.auth.transport.requests.Request())
-      headers = {
-          'Content-type': 'application/json',
-          'Authorization': 'Bearer ' + creds.token,
-      }
-      job = requests.get(job_uri, headers=headers).json()
-      if 'status' in job and 'errorResult' in job['status']:
-        raise RuntimeError(
-            f'The BigQuery job {job_uri} failed. Error: {job["status"]}'
-        )
+  job = polling_util.poll(
+      get_resource=lambda: _get_job(job_uri, creds),
+      is_done=lambda job: (_get_job_state(job) or '').lower() == 'done',
+      backoff=_POLLING_BACKOFF,
+      on_cancel=lambda: _send_cancel_request(job_uri, creds),
+      get_state=_get_job_state,
+      # The job was just inserted or resumed, so wait before the first poll.
+      resource={},
+      resource_name=f'BigQuery job {job_uri}',
+  )
 
   logging.info('BigQuery Job completed successfully. Job: %s.', job)
   return job
 
 
-def get_query_results(project_id, job_id, location, creds):
+def _get_session() -> requests.Session:
+  """Gets the http session shared by the requests for query results."""
+  global _session
+  if _session is None:
+    retry = Retry(
+        total=_HTTP_RETRY_LIMIT,
+        status_forcelist=[429, 500, 502, 503, 504],
+        backoff_factor=_HTTP_RETRY_BACKOFF_FACTOR,
+    )
+    adapter = HTTPAdapter(pool_maxsize=_HTTP_POOL_SIZE, max_retries=retry)
+    session = requests.Session()
+    session.headers.update({'User-Agent': 'google-cloud-pipeline-components'})
+    session.mount('https://', adapter)
+    _session = session
+  return _session
+
+
+def _get_auth_headers(creds) -> Dict[str, str]:
   if not creds.valid:
     creds.refresh(google.auth.transport.requests.Request())
-  headers = {
+  return {
       'Content-type': 'application/json',
       'Authorization': 'Bearer ' + creds.token,
   }
-  query_results_uri = 'https://bigquery.googleapis.com/bigquery/v2/projects/{projectId}/queries/{jobId}'.format(
+
+
+def _get_query_results_page(
+    project_id: str,
+    job_id: str,
+    location: str,
+    headers: Dict[str, str],
+    page_token: Optional[str] = None,
+    start_index: Optional[int] = None,
+    max_results: Optional[int] = None,
+) -> Dict[str, Any]:
+  """Gets a page of the results of a query job.
+
+  See https://cloud.google.com/bigquery/docs/reference/rest/v2/jobs/getQueryResults
+  """
+  query_results_uri = _QUERY_RESULTS_URI_TEMPLATE.format(
       projectId=project_id,
       jobId=job_id,
   )
+  params = {}
   if location:
-    query_results_uri += '?location=' + location
-  response = requests.get(query_results_uri, headers=headers).json()
-  logging.info(response)
+    params['location'] = location
+  if page_token:
+    params['pageToken'] = page_token
+  if start_index is not None:
+    params['startIndex'] = start_index
+  if max_results is not None:
+    params['maxResults'] = max_results
+  response = (
+      _get_session().get(query_results_uri, params=params, headers=headers)
+  ).json()
+  if 'error' in response:
+    raise RuntimeError(
+        f'Failed to get the results of the BigQuery job {job_id}. Error:'
+        f' {response["error"]}'
+    )
+  return response
+
+
+def _get_query_results_rows(
+    project_id: str,
+    job_id: str,
+    location: str,
+    headers: Dict[str, str],
+    start_index: int,
+    num_rows: int,
+) -> Dict[str, Any]:
+  """Gets a range of the rows of the results of a query job.
+
+  A response holds at most 10 MB of rows, so it may take several requests
+  to get the whole range.
+  """
+  rows = []
+  while len(rows) < num_rows:
+    page = _get_query_results_page(
+        project_id,
+        job_id,
+        location,
+        headers,
+        start_index=start_index + len(rows),
+        max_results=num_rows - len(rows),
+    )
+    if not page.get('rows'):
+      break
+    rows.extend(page['rows'])
+  return {'rows': rows}
+
+
+def iter_query_results_pages(
+    project_id: str,
+    job_id: str,
+    location: str,
+    creds,
+    max_results: Optional[int] = None,
+    num_workers: int = 1,
+) -> Iterator[Dict[str, Any]]:
+  """Gets the results of a completed query job, one page at a time.
+
+  Args:
+      project_id: Project of the query job.
+      job_id: ID of the query job.
+      location: Location of the query job.
+      creds: Google auth credential.
+      max_results: The maximum number of rows per page. If None, pages are
+        only limited by the 10 MB limit of a response.
+      num_workers: The number of pages to get in parallel. Pages after the
+        first one are then got by row index instead of by page token.
+
+  Returns:
+      An iterator of the pages of the QueryResponse, in order. The first page
+      holds the schema and total number of rows. For more details, see
+      https://cloud.google.com/bigquery/docs/reference/rest/v2/jobs/getQueryResults
+  """
+  page = _get_query_results_page(
+      project_id,
+      job_id,
+      location,
+      _get_auth_headers(creds),
+      max_results=max_results,
+  )
+  yield page
+
+  page_size = max_results or len(page.get('rows', []))
+  if num_workers <= 1 or not page_size:
+    while page.get('pageToken'):
+      page = _get_query_results_page(
+          project_id,
+          job_id,
+          location,
+          _get_auth_headers(creds),
+          page_token=page['pageToken'],
+          max_results=max_results,
+      )
+      yield page
+    return
+
+  total_rows = int(page.get('totalRows', 0))
+  start_indices = range(len(page.get('rows', [])), total_rows, page_size)
+  # Pages are yielded in order, so only get a bounded number of pages ahead of
+  # the consumer.
+  pending = collections.deque()
+  executor = futures.ThreadPoolExecutor(max_workers=num_workers)
+  try:
+    for start_index in start_indices:
+      pending.append(
+          executor.submit(
+              _get_query_results_rows,
+              project_id,
+              job_id,
+              location,
+              _get_auth_headers(creds),
+              start_index,
+              min(page_size, total_rows - start_index),
+          )
+      )
+      if len(pending) > num_workers:
+        yield pending.popleft().result()
+    while pending:
+      yield pending.popleft().result()
+  finally:
+    for future in pending:
+      future.cancel()
+    executor.shutdown(wait=True)
+
+
+def query_row_to_dict(
+    fields: List[Dict[str, Any]], row: Dict[str, Any]
+) -> Dict[str, Any]:
+  """Converts a row of query results to a dict keyed by column name.
+
+  Values are kept as returned by the REST API, i.e. scalars are strings.
+
+  Args:
+      fields: The fields of the schema of the query results.
+      row: The row, in the TableRow format of the REST API.
+
+  Returns:
+      A dict from the name of each field to its value. RECORD values are
+      dicts and REPEATED values are lists.
+  """
+  return {
+      field['name']: _convert_query_value(field, cell['v'])
+      for field, cell in zip(fields, row['f'])
+  }
+
+
+def _convert_query_value(field: Dict[str, Any], value: Any) -> Any:
+  if value is None:
+    return None
+  if field.get('mode') == 'REPEATED':
+    return [_convert_query_scalar(field, item['v']) for item in value]
+  return _convert_query_scalar(field, value)
+
+
+def _convert_query_scalar(field: Dict[str, Any], value: Any) -> Any:
+  if value is not None and field['type'] in ('RECORD', 'STRUCT'):
+    return query_row_to_dict(field['fields'], value)
+  return value
+
+
+def _to_arrow_type(pa, field: Dict[str, Any]):
+  if field['type'] in ('RECORD', 'STRUCT'):
+    arrow_type = pa.struct([
+        pa.field(subfield['name'], _to_arrow_type(pa, subfield))
+        for subfield in field['fields']
+    ])
+  else:
+    arrow_type = pa.string()
+  if field.get('mode') == 'REPEATED':
+    arrow_type = pa.list_(arrow_type)
+  return arrow_type
+
+
+def write_query_results(
+    project_id: str,
+    job_id: str,
+    location: str,
+    creds,
+    output_path: str,
+    file_format: str = 'jsonl',
+    max_results: Optional[int] = None,
+    num_workers: int = 1,
+    chunk_size: int = _QUERY_RESULTS_CHUNK_SIZE,
+) -> int:
+  """Writes the results of a completed query job to a local file.
+
+  Rows are written as they are received, so that at most a few pages and
+  ``chunk_size`` rows are held in memory whatever the size of the results.
+
+  Args:
+      project_id: Project of the query job.
+      job_id: ID of the query job.
+      location: Location of the query job.
+      creds: Google auth credential.
+      output_path: Path of the file to write.
+      file_format: 'jsonl' to write a JSON object per row, or 'parquet' to
+        write a Parquet file, which requires pyarrow. Values are written as
+        returned by the REST API, i.e. scalars are strings.
+      max_results: The maximum number of rows per page.
+      num_workers: The number of pages to get in parallel.
+      chunk_size: The number of rows per Parquet row group.
+
+  Returns:
+      The number of rows written.
+  """
+  if file_format not in ('jsonl', 'parquet'):
+    raise ValueError(
+        f'Unsupported file format: {file_format}. Expected "jsonl" or'
+        ' "parquet".'
+    )
+  pages = iter_query_results_pages(
+      project_id,
+      job_id,
+      location,
+      creds,
+      max_results=max_results,
+      num_workers=num_workers,
+  )
+  first_page = next(pages)
+  fields = first_page.get('schema', {}).get('fields', [])
+
+  def iter_rows():
+    for page in itertools.chain([first_page], pages):
+      for row in page.get('rows', []):
+        yield query_row_to_dict(fields, row)
+
+  num_rows = 0
+  if file_format == 'jsonl':
+    with open(output_path, 'w') as f:
+      for row in iter_rows():
+        f.write(json.dumps(row))
+        f.write('\n')
+        num_rows += 1
+  else:
+    try:
+      import pyarrow as pa
+      import pyarrow.parquet as pq
+    except ImportError as err:
+      raise ImportError(
+          'pyarrow is required to write query results as Parquet. Install'
+          ' it with `pip install pyarrow`.'
+      ) from err
+    schema = pa.schema(
+        [pa.field(field['name'], _to_arrow_type(pa, field)) for field in fields]
+    )
+    with pq.ParquetWriter(output_path, schema) as writer:
+      rows = iter_rows()
+      while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+          break
+        writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+        num_rows += len(chunk)
+
+  logging.info(
+      'Wrote %s rows of the results of job %s to %s.',
+      num_rows,
+      job_id,
+      output_path,
+  )
+  return num_rows
+
+
+def get_query_results(
+    project_id, job_id, location, creds, max_rows=_MAX_QUERY_RESULTS_ROWS
+):
+  """Gets the results of a completed query job in one QueryResponse.
+
+  Follows page tokens until max_rows rows are returned, so that memory stays
+  bounded. Use write_query_results to get larger results.
+
+  Args:
+      project_id: Project of the query job.
+      job_id: ID of the query job.
+      location: Location of the query job.
+      creds: Google auth credential.
+      max_rows: The maximum number of rows to return.
+
+  Returns:
+      The QueryResponse, with the rows of all the pages up to max_rows.
+  """
+  pages = iter_query_results_pages(project_id, job_id, location, creds)
+  try:
+    response = next(pages)
+    rows = response.get('rows', [])
+    while len(rows) < max_rows:
+      page = next(pages, None)
+      if page is None:
+        break
+      if page.get('rows'):
+        rows = response.setdefault('rows', [])
+        rows.extend(page['rows'])
+  finally:
+    pages.close()
+  if len(rows) > max_rows:
+    rows = response['rows'] = rows[:max_rows]
+  response.pop('pageToken', None)
+  total_rows = int(response.get('totalRows', len(rows)))
+  if len(rows) < total_rows:
+    logging.warning(
+        'Got only the first %s of the %s rows of the results of job %s.',
+        len(rows),
+        total_rows,
+        job_id,
+    )
+  else:
+    logging.info('Got %s rows of the results of job %s.', len(rows), job_id)
   return response
 
 
@@ -287,8 +646,8 @@ def bigquery_query_job(
      if the launcher container experienced unexpected termination, such as
      preemption
   2. Deserialize the payload into the job spec and create the bigquery job
-  3. Poll the bigquery job status every
-  job_remote_runner._POLLING_INTERVAL_IN_SECONDS seconds
+  3. Poll the bigquery job status with the adaptive
+  _POLLING_BACKOFF interval
      - If the bigquery job is succeeded, return succeeded
      - If the bigquery job is pending/running, continue polling the status
 
@@ -70,7 +70,7 @@ def create_custom_job(
        if the launcher container experienced unexpected termination, such as
        preemption
   2. Deserialize the payload into the job spec and create the custom job
-  3. Poll the custom job status every _POLLING_INTERVAL_IN_SECONDS seconds
+  3. Poll the custom job status with an adaptive interval
      - If the custom job is succeeded, return succeeded
      - If the custom job is cancelled/paused, it's an unexpected scenario so
      return failed
@@ -19,7 +19,6 @@ import logging
 import os
 from os import path
 import re
-import time
 from typing import Any, Dict, Union
 import uuid
 
@@ -29,14 +28,15 @@ import requests
 from requests.adapters import HTTPAdapter
 from requests.sessions import Session
 from urllib3.util.retry import Retry
-from google_cloud_pipeline_components.container.utils import execution_context
 from google_cloud_pipeline_components.container.v1.gcp_launcher.utils import json_util
 from google_cloud_pipeline_components.container.v1.gcp_launcher.utils import gcp_labels_util
+from google_cloud_pipeline_components.container.v1.gcp_launcher.utils import polling_util
 
 from google.protobuf import json_format
 
 
-_POLL_INTERVAL_SECONDS = 20
+# Batches take minutes to start and often run for hours.
+_POLLING_BACKOFF = polling_util.Backoff(floor_seconds=5, ceiling_seconds=60)
 _CONNECTION_ERROR_RETRY_LIMIT = 5
 _CONNECTION_RETRY_BACKOFF_FACTOR = 2.0
 _LABELS_PAYLOAD_KEY = 'labels'
@@ -242,14 +242,14 @@ class DataprocBatchRemoteRunner:
   def wait_for_batch(
       self,
       lro: Dict[str, Any],
-      poll_interval_seconds: int,
+      backoff: polling_util.Backoff,
   ) -> Dict[str, Any]:
     """Waits for a Dataproc batch workload to reach a final state.
 
     Args:
       lro: Dict of the long-running Operation resource. For more details, see:
         https://cloud.google.com/dataproc-serverless/docs/reference/rest/v1/projects.locations.operations#Operation
-      poll_interval_seconds: Seconds to wait between polls.
+      backoff: The intervals between polls.
 
     Returns:
       Dict of the long-running Operation resource. For more details, see:
@@ -260,19 +260,20 @@ class DataprocBatchRemoteRunner:
     """
     lro_name = lro['name']
     lro_uri = f'{_DATAPROC_URI_PREFIX}/{lro_name}'
-    with execution_context.ExecutionContext(
-        on_cancel=lambda: self._cancel_batch(lro_name)
-    ):
-      while ('done' not in lro) or (not lro['done']):
-        time.sleep(poll_interval_seconds)
-        lro = self._get_resource(lro_uri)
-        logging.info('Polled operation: %s', lro_name)
+    lro = polling_util.poll(
+        get_resource=lambda: self._get_resource(lro_uri),
+        is_done=lambda lro: lro.get('done', False),
+        backoff=backoff,
+        on_cancel=lambda: self._cancel_batch(lro_name),
+        resource=lro,
+        resource_name=f'Operation {lro_name}',
+    )
 
-      if 'error' in lro and lro['error']['code']:
-        raise RuntimeError('Operation failed. Error: {}'.format(lro['error']))
-      else:
-        logging.info('Operation complete: %s', lro)
-        return lro
+    if 'error' in lro and lro['error']['code']:
+      raise RuntimeError('Operation failed. Error: {}'.format(lro['error']))
+    else:
+      logging.info('Operation complete: %s', lro)
+      return lro
 
   def create_batch(
       self,
@@ -356,4 +357,4 @@ def create_batch(
       batch_id = '-'.join([type.lower(), now, uuid.uuid4().hex[:8]])
     lro = remote_runner.create_batch(batch_id, batch_request)
   # Wait for the Batch workload to finish.
-  return remote_runner.wait_for_batch(lro, _POLL_INTERVAL_SECONDS)
+  return remote_runner.wait_for_batch(lro, _POLLING_BACKOFF)
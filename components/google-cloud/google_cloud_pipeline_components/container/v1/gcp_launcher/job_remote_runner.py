@@ -19,7 +19,6 @@ import os
 from os import path
 import re
 import sys
-import time
 from typing import Optional
 
 from google.api_core import gapic_v1
@@ -29,12 +28,12 @@ from google.cloud import aiplatform
 from google.cloud.aiplatform_v1.types import job_state as gca_job_state
 from google_cloud_pipeline_components.proto.gcp_resources_pb2 import GcpResources
 import requests
-from ...utils import execution_context
-from .utils import json_util, error_util
+from .utils import json_util, error_util, polling_util
 
 from google.protobuf import json_format
 
-_POLLING_INTERVAL_IN_SECONDS = 20
+# Vertex jobs take minutes to provision, and often hours to run.
+_POLLING_BACKOFF = polling_util.Backoff(floor_seconds=5, ceiling_seconds=60)
 _CONNECTION_ERROR_RETRY_LIMIT = 5
 
 _JOB_COMPLETE_STATES = (
@@ -44,12 +43,6 @@ _JOB_COMPLETE_STATES = (
     gca_job_state.JobState.JOB_STATE_PAUSED,
 )
 
-_JOB_ERROR_STATES = (
-    gca_job_state.JobState.JOB_STATE_FAILED,
-    gca_job_state.JobState.JOB_STATE_CANCELLED,
-    gca_job_state.JobState.JOB_STATE_PAUSED,
-)
-
 # Job error codes mapping can be found in:
 # https://github.com/googleapis/googleapis/blob/master/google/rpc/code.proto
 _JOB_USER_ERROR_CODES = (
@@ -145,69 +138,45 @@ class JobRemoteRunner:
 
   def poll_job(self, get_job_fn, job_name: str):
     """Poll the job status."""
-    with execution_context.ExecutionContext(
-        on_cancel=lambda: self.send_cancel_request(job_name)
-    ):
-      retry_count = 0
-      while True:
-        try:
-          get_job_response = get_job_fn(self.job_client, job_name)
-          retry_count = 0
-        # Handle transient connection error.
-        except ConnectionError as err:
-          retry_count += 1
-          if retry_count < _CONNECTION_ERROR_RETRY_LIMIT:
-            logging.warning(
-                (
-                    'ConnectionError (%s) encountered when polling job: %s.'
-                    ' Trying to recreate the API client.'
-                ),
-                err,
-                job_name,
-            )
-            # Recreate the Python API client.
-            self.job_client = aiplatform.gapic.JobServiceClient(
-                self.client_options, self.client_info
-            )
-          else:
-            # TODO(ruifang) propagate the error.
-            """Exit with an internal error code."""
-            error_util.exit_with_internal_error(
-                'Request failed after %s retries.'.format(
-                    _CONNECTION_ERROR_RETRY_LIMIT
-                )
-            )
-
-        if get_job_response.state == gca_job_state.JobState.JOB_STATE_SUCCEEDED:
-          logging.info(
-              'Get%s response state =%s', self.job_type, get_job_response.state
-          )
-          return get_job_response
-        elif get_job_response.state in _JOB_ERROR_STATES:
-          # TODO(ruifang) propagate the error.
-          if get_job_response.error.code in _JOB_USER_ERROR_CODES:
-            raise ValueError(
-                'Job failed with value error in error state: {}.'.format(
-                    get_job_response.state
-                )
-            )
-          else:
-            raise RuntimeError(
-                'Job failed with error state: {}.'.format(
-                    get_job_response.state
-                )
-            )
-        else:
-          logging.info(
-              (
-                  'Job %s is in a non-final state %s.'
-                  ' Waiting for %s seconds for next poll.'
-              ),
-              job_name,
-              get_job_response.state,
-              _POLLING_INTERVAL_IN_SECONDS,
+
+    def recreate_job_client(_):
+      self.job_client = aiplatform.gapic.JobServiceClient(
+          client_options=self.client_options, client_info=self.client_info
+      )
+
+    try:
+      get_job_response = polling_util.poll(
+          get_resource=lambda: get_job_fn(self.job_client, job_name),
+          is_done=lambda job: job.state in _JOB_COMPLETE_STATES,
+          backoff=_POLLING_BACKOFF,
+          on_cancel=lambda: self.send_cancel_request(job_name),
+          get_state=lambda job: job.state,
+          on_connection_error=recreate_job_client,
+          connection_error_retry_limit=_CONNECTION_ERROR_RETRY_LIMIT,
+          resource_name=f'Job {job_name}',
+      )
+    except ConnectionError:
+      # TODO(ruifang) propagate the error.
+      error_util.exit_with_internal_error(
+          f'Request failed after {_CONNECTION_ERROR_RETRY_LIMIT} retries.'
+      )
+
+    if get_job_response.state == gca_job_state.JobState.JOB_STATE_SUCCEEDED:
+      logging.info(
+          'Get%s response state =%s', self.job_type, get_job_response.state
+      )
+      return get_job_response
+    # TODO(ruifang) propagate the error.
+    if get_job_response.error.code in _JOB_USER_ERROR_CODES:
+      raise ValueError(
+          'Job failed with value error in error state: {}.'.format(
+              get_job_response.state
           )
-          time.sleep(_POLLING_INTERVAL_IN_SECONDS)
+      )
+    else:
+      raise RuntimeError(
+          'Job failed with error state: {}.'.format(get_job_response.state)
+      )
 
   def send_cancel_request(self, job_name: str):
     if not job_name:
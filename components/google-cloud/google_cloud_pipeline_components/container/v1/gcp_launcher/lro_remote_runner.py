@@ -14,18 +14,19 @@
 """Common module for creating GCP launchers based on the AI Platform SDK."""
 
 import logging
-import time
 from typing import Any
 
 import google.auth
 import google.auth.transport.requests
 from google_cloud_pipeline_components.proto.gcp_resources_pb2 import GcpResources
 import requests
-from ...utils import execution_context
+from .utils import polling_util
 
 from google.protobuf import json_format
 
-_POLLING_INTERVAL_IN_SECONDS = 20
+# Operations such as creating an endpoint or deploying a model take seconds to
+# minutes.
+_POLLING_BACKOFF = polling_util.Backoff(floor_seconds=2, ceiling_seconds=30)
 
 # Job error codes mapping can be found in:
 # https://github.com/googleapis/googleapis/blob/master/google/rpc/code.proto
@@ -119,19 +120,20 @@ class LroRemoteRunner:
   def poll_lro(self, lro: Any) -> Any:
     """Poll the LRO till it reaches a final state."""
     lro_name = lro['name']
-    with execution_context.ExecutionContext(
-        on_cancel=lambda: self.send_cancel_request(lro_name)
-    ):
-      request_url = f'{self.vertex_uri_prefix}{lro_name}'
-      while ('done' not in lro) or (not lro['done']):
-        time.sleep(_POLLING_INTERVAL_IN_SECONDS)
-        logging.info('The resource is creating...')
-        lro = self.request(
+    request_url = f'{self.vertex_uri_prefix}{lro_name}'
+    lro = polling_util.poll(
+        get_resource=lambda: self.request(
             request_url=request_url,
             request_body='',
             http_request='get',
             user_agent='',
-        )
+        ),
+        is_done=lambda lro: lro.get('done', False),
+        backoff=_POLLING_BACKOFF,
+        on_cancel=lambda: self.send_cancel_request(lro_name),
+        resource=lro,
+        resource_name=f'Operation {lro_name}',
+    )
 
     logging.info('Create resource complete. %s.', lro)
     return lro
@@ -18,7 +18,6 @@ import logging
 import os
 from os import path
 import re
-import time
 from typing import Any, Callable, Optional, Union
 
 from google.api_core import client_options
@@ -35,12 +34,13 @@ import requests
 from google.rpc import code_pb2
 from google.protobuf import json_format
 
-from ...utils import execution_context
 from .utils import error_util
 from .utils import json_util
+from .utils import polling_util
 
 
-_POLLING_INTERVAL_IN_SECONDS = 20
+# Pipelines run for minutes to hours.
+_POLLING_BACKOFF = polling_util.Backoff(floor_seconds=5, ceiling_seconds=60)
 _CONNECTION_ERROR_RETRY_LIMIT = 5
 
 _PIPELINE_COMPLETE_STATES = (
@@ -50,12 +50,6 @@ _PIPELINE_COMPLETE_STATES = (
     pipeline_state.PipelineState.PIPELINE_STATE_PAUSED,
 )
 
-_PIPELINE_ERROR_STATES = (
-    pipeline_state.PipelineState.PIPELINE_STATE_FAILED,
-    pipeline_state.PipelineState.PIPELINE_STATE_CANCELLED,
-    pipeline_state.PipelineState.PIPELINE_STATE_PAUSED,
-)
-
 _PIPELINE_USER_ERROR_CODES = (
     code_pb2.INVALID_ARGUMENT,
     code_pb2.NOT_FOUND,
@@ -196,80 +190,54 @@ class PipelineRemoteRunner:
       ValueError: The pipeline failed with a user error.
       RuntimeError: The pipeline failed with an unknown error.
     """
-    with execution_context.ExecutionContext(
-        on_cancel=lambda: self.send_cancel_request(pipeline_name)
-    ):
-      retry_count = 0
-      while True:
-        try:
-          get_pipeline_response = get_pipeline_fn(
+    def recreate_pipeline_client(_):
+      self.pipeline_client = aiplatform.gapic.PipelineServiceClient(
+          client_options=self.client_options, client_info=self.client_info
+      )
+
+    try:
+      get_pipeline_response = polling_util.poll(
+          get_resource=lambda: get_pipeline_fn(
               self.pipeline_client, pipeline_name
-          )
-          retry_count = 0
-        # Handle transient connection error.
-        except ConnectionError as err:
-          retry_count += 1
-          if retry_count < _CONNECTION_ERROR_RETRY_LIMIT:
-            logging.warning(
-                (
-                    'ConnectionError (%s) encountered when polling pipeline:'
-                    ' %s. Trying to recreate the API client.'
-                ),
-                err,
-                pipeline_name,
-            )
-            # Recreate the Python API client.
-            self.pipeline_client = aiplatform.gapic.PipelineServiceClient(
-                client_options=self.client_options, client_info=self.client_info
-            )
-            logging.info(
-                'Waiting for %s seconds for next poll.',
-                _POLLING_INTERVAL_IN_SECONDS,
-            )
-            time.sleep(_POLLING_INTERVAL_IN_SECONDS)
-            continue
-          else:
-            # TODO(ruifang) propagate the error.
-            # Exit with an internal error code.
-            error_util.exit_with_internal_error(
-                f'Request failed after {_CONNECTION_ERROR_RETRY_LIMIT} retries.'
-            )
+          ),
+          is_done=lambda pipeline: pipeline.state in _PIPELINE_COMPLETE_STATES,
+          backoff=_POLLING_BACKOFF,
+          on_cancel=lambda: self.send_cancel_request(pipeline_name),
+          get_state=lambda pipeline: pipeline.state,
+          on_connection_error=recreate_pipeline_client,
+          connection_error_retry_limit=_CONNECTION_ERROR_RETRY_LIMIT,
+          resource_name=f'Pipeline {pipeline_name}',
+      )
+    except ConnectionError:
+      # TODO(ruifang) propagate the error.
+      # Exit with an internal error code.
+      error_util.exit_with_internal_error(
+          f'Request failed after {_CONNECTION_ERROR_RETRY_LIMIT} retries.'
+      )
 
-        if (
-            get_pipeline_response.state
-            == pipeline_state.PipelineState.PIPELINE_STATE_SUCCEEDED
-        ):
-          logging.info(
-              'Get%s response state =%s',
-              self.pipeline_type,
-              get_pipeline_response.state,
+    if (
+        get_pipeline_response.state
+        == pipeline_state.PipelineState.PIPELINE_STATE_SUCCEEDED
+    ):
+      logging.info(
+          'Get%s response state =%s',
+          self.pipeline_type,
+          get_pipeline_response.state,
+      )
+      return get_pipeline_response
+    # TODO(ruifang) propagate the error.
+    if get_pipeline_response.error.code in _PIPELINE_USER_ERROR_CODES:
+      raise ValueError(
+          'Pipeline failed with value error in error state: {}.'.format(
+              get_pipeline_response.state
           )
-          return get_pipeline_response
-        elif get_pipeline_response.state in _PIPELINE_ERROR_STATES:
-          # TODO(ruifang) propagate the error.
-          if get_pipeline_response.error.code in _PIPELINE_USER_ERROR_CODES:
-            raise ValueError(
-                'Pipeline failed with value error in error state: {}.'.format(
-                    get_pipeline_response.state
-                )
-            )
-          else:
-            raise RuntimeError(
-                'Pipeline failed with error state: {}.'.format(
-                    get_pipeline_response.state
-                )
-            )
-        else:
-          logging.info(
-              (
-                  'Pipeline %s is in a non-final state %s.'
-                  ' Waiting for %s seconds for next poll.'
-              ),
-              pipeline_name,
-              get_pipeline_response.state,
-              _POLLING_INTERVAL_IN_SECONDS,
+      )
+    else:
+      raise RuntimeError(
+          'Pipeline failed with error state: {}.'.format(
+              get_pipeline_response.state
           )
-          time.sleep(_POLLING_INTERVAL_IN_SECONDS)
+      )
 
   def send_cancel_request(self, pipeline_name: str):
     """Cancels a pipeline with the given name."""
@@ -0,0 +1,167 @@
+# Copyright 2023 The Kubeflow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Polling of long-running GCP resources with an adaptive interval."""
+
+import dataclasses
+import logging
+import random
+import time
+from typing import Any, Callable, Optional, TypeVar
+
+from google_cloud_pipeline_components.container.utils import execution_context
+
+_CONNECTION_ERROR_RETRY_LIMIT = 5
+
+_Resource = TypeVar('_Resource')
+
+
+@dataclasses.dataclass(frozen=True)
+class Backoff:
+  """Intervals between polls of a resource.
+
+  The first interval is ``floor_seconds``. Intervals then grow by
+  ``multiplier`` while the state of the resource does not change, up to
+  ``ceiling_seconds``, and are reset to ``floor_seconds`` when it
+  changes. Each interval is randomized by up to ``jitter`` (a fraction
+  of the interval) so that resources created together are not polled in
+  lockstep.
+  """
+
+  floor_seconds: float = 1.0
+  ceiling_seconds: float = 60.0
+  multiplier: float = 1.5
+  jitter: float = 0.1
+
+  def __post_init__(self):
+    if self.floor_seconds <= 0:
+      raise ValueError(
+          f'floor_seconds must be positive, got {self.floor_seconds}.'
+      )
+    if self.ceiling_seconds < self.floor_seconds:
+      raise ValueError(
+          f'ceiling_seconds ({self.ceiling_seconds}) must not be less than'
+          f' floor_seconds ({self.floor_seconds}).'
+      )
+    if self.multiplier < 1:
+      raise ValueError(f'multiplier must be at least 1, got {self.multiplier}.')
+    if not 0 <= self.jitter < 1:
+      raise ValueError(f'jitter must be in [0, 1), got {self.jitter}.')
+
+  def next_interval(self, previous_interval: Optional[float]) -> float:
+    """Returns the interval before the next poll, without jitter.
+
+    Args:
+      previous_interval: The previous interval, or None if the state of the
+        resource just changed.
+    """
+    if previous_interval is None:
+      return self.floor_seconds
+    return min(previous_interval * self.multiplier, self.ceiling_seconds)
+
+  def add_jitter(self, interval: float) -> float:
+    return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+def poll(
+    get_resource: Callable[[], _Resource],
+    is_done: Callable[[_Resource], bool],
+    backoff: Backoff,
+    on_cancel: Optional[Callable[[], None]] = None,
+    get_state: Optional[Callable[[_Resource], Any]] = None,
+    resource: Optional[_Resource] = None,
+    on_connection_error: Optional[Callable[[ConnectionError], None]] = None,
+    connection_error_retry_limit: int = _CONNECTION_ERROR_RETRY_LIMIT,
+    resource_name: str = '',
+) -> _Resource:
+  """Polls a resource till it reaches a final state.
+
+  A KFP cancel event received while polling is cascaded to the resource
+  through ``on_cancel``.
+
+  Args:
+    get_resource: Gets the current resource. It should reuse its client and
+      credentials across calls.
+    is_done: Whether a resource is in a final state.
+    backoff: The intervals between polls.
+    on_cancel: Cancels the resource.
+    get_state: Gets the state of a resource. The polling interval is reset
+      when the state changes. If None, the interval grows after every poll.
+    resource: The resource as last seen, e.g. as returned when it was created.
+      If given and not in a final state, the first poll waits for an interval.
+      Otherwise the resource is polled immediately.
+    on_connection_error: Called with a ConnectionError raised by get_resource
+      before retrying, e.g. to recreate the API client.
+    connection_error_retry_limit: The number of consecutive ConnectionErrors
+      after which the last one is raised.
+    resource_name: Name of the resource, for logging.
+
+  Returns:
+    The resource in a final state.
+
+  Raises:
+    ConnectionError: get_resource failed connection_error_retry_limit times
+      in a row.
+  """
+  with execution_context.ExecutionContext(on_cancel=on_cancel):
+    interval = None
+    state = None
+    connection_error_count = 0
+    should_poll = resource is None
+    while True:
+      if should_poll:
+        try:
+          resource = get_resource()
+          connection_error_count = 0
+        # Handle transient connection error.
+        except ConnectionError as err:
+          connection_error_count += 1
+          if connection_error_count >= connection_error_retry_limit:
+            raise
+          logging.warning(
+              'ConnectionError (%s) encountered when polling %s. Retrying.',
+              err,
+              resource_name,
+          )
+          if on_connection_error:
+            on_connection_error(err)
+          interval = backoff.next_interval(interval)
+          time.sleep(backoff.add_jitter(interval))
+          continue
+      should_poll = True
+
+      if is_done(resource):
+        return resource
+
+      if get_state:
+        new_state = get_state(resource)
+        if new_state != state:
+          state = new_state
+          interval = None
+      interval = backoff.next_interval(interval)
+      delay = backoff.add_jitter(interval)
+      if get_state:
+        logging.info(
+            '%s is in a non-final state %s. Waiting for %.1f seconds for next'
+            ' poll.',
+            resource_name,
+            state,
+            delay,
+        )
+      else:
+        logging.info(
+            '%s is not done. Waiting for %.1f seconds for next poll.',
+            resource_name,
+            delay,
+        )
+      time.sleep(delay)
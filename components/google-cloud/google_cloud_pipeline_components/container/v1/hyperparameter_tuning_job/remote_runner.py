@@ -68,7 +68,7 @@ def create_hyperparameter_tuning_job(
        if the launcher container experienced unexpected termination, such as
        preemption
   2. Deserialize the payload into the job spec and create the HP Tuning job
-  3. Poll the HP Tuning job status every _POLLING_INTERVAL_IN_SECONDS seconds
+  3. Poll the HP Tuning job status with an adaptive interval
      - If the HP Tuning job is succeeded, return succeeded
      - If the HP Tuning job is cancelled/paused, it's an unexpected scenario so
      return failed
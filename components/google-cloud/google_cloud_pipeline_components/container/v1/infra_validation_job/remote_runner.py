@@ -91,7 +91,7 @@ def create_infra_validation_job(
        preemption
   2. parse the executor_input into the infra validation custom job spec and
   create the custom job
-  3. Poll the custom job status every _POLLING_INTERVAL_IN_SECONDS seconds
+  3. Poll the custom job status with an adaptive interval
      - If the custom job is succeeded, return succeeded
      - If the custom job is cancelled/paused, it's an unexpected scenario so
      return failed
@@ -14,17 +14,17 @@
 
 import logging
 import re
-import time
 
 from functools import partial
 from google_cloud_pipeline_components.proto.gcp_resources_pb2 import GcpResources
 import googleapiclient.discovery as discovery
 from google_cloud_pipeline_components.container.v1.gcp_launcher.utils import error_util
-from google_cloud_pipeline_components.container.utils import execution_context
+from google_cloud_pipeline_components.container.v1.gcp_launcher.utils import polling_util
 
 from google.protobuf.json_format import Parse
 
-_POLLING_INTERVAL_IN_SECONDS = 20
+# Dataflow jobs take minutes to start and often run for hours.
+_POLLING_BACKOFF = polling_util.Backoff(floor_seconds=5, ceiling_seconds=60)
 _CONNECTION_ERROR_RETRY_LIMIT = 5
 
 _JOB_SUCCESSFUL_STATES = ['JOB_STATE_DONE']
@@ -82,69 +82,52 @@ def wait_gcp_resources(
   with open(gcp_resources, 'w') as f:
     f.write(payload)
 
-  with execution_context.ExecutionContext(
-      on_cancel=partial(
-          _send_cancel_request,
-          project,
-          job_id,
-          location,
-      )
-  ):
-    # Poll the job status
-    retry_count = 0
-    while True:
-      try:
-        df_client = discovery.build('dataflow', 'v1b3', cache_discovery=False)
-        job = (
-            df_client.projects()
-            .locations()
-            .jobs()
-            .get(projectId=project, jobId=job_id, location=location, view=None)
-            .execute()
-        )
-        retry_count = 0
-      except ConnectionError as err:
-        retry_count += 1
-        if retry_count <= _CONNECTION_ERROR_RETRY_LIMIT:
-          logging.warning(
-              (
-                  'ConnectionError (%s) encountered when polling job: %s.'
-                  ' Retrying.'
-              ),
-              err,
-              job_id,
-          )
-        else:
-          error_util.exit_with_internal_error(
-              'Request failed after %s retries.'.format(
-                  _CONNECTION_ERROR_RETRY_LIMIT
-              )
-          )
-
-      job_state = job.get('currentState', None)
-      # Write the job details as gcp_resources
-      if job_state in _JOB_SUCCESSFUL_STATES:
-        logging.info(
-            'GetDataflowJob response state =%s. Job completed', job_state
-        )
-        return
+  df_client = discovery.build('dataflow', 'v1b3', cache_discovery=False)
 
-      elif job_state in _JOB_TERMINATED_STATES:
-        # TODO(ruifang) propagate the error.
-        raise RuntimeError(
-            'Job {} failed with error state: {}.'.format(job_id, job_state)
-        )
-      else:
-        logging.info(
-            (
-                'Job %s is in a non-final state %s. Waiting for %s seconds for'
-                ' next poll.'
-            ),
+  def get_job():
+    return (
+        df_client.projects()
+        .locations()
+        .jobs()
+        .get(projectId=project, jobId=job_id, location=location, view=None)
+        .execute()
+    )
+
+  def rebuild_client(_):
+    nonlocal df_client
+    df_client = discovery.build('dataflow', 'v1b3', cache_discovery=False)
+
+  # Poll the job status
+  try:
+    job = polling_util.poll(
+        get_resource=get_job,
+        is_done=lambda job: job.get('currentState') in _JOB_TERMINATED_STATES,
+        backoff=_POLLING_BACKOFF,
+        on_cancel=partial(
+            _send_cancel_request,
+            project,
             job_id,
-            job_state,
-            _POLLING_INTERVAL_IN_SECONDS,
-        )
-        time.sleep(_POLLING_INTERVAL_IN_SECONDS)
+            location,
+        ),
+        get_state=lambda job: job.get('currentState'),
+        on_connection_error=rebuild_client,
+        connection_error_retry_limit=_CONNECTION_ERROR_RETRY_LIMIT,
+        resource_name=f'Job {job_id}',
+    )
+  except ConnectionError:
+    error_util.exit_with_internal_error(
+        f'Request failed after {_CONNECTION_ERROR_RETRY_LIMIT} retries.'
+    )
+
+  job_state = job.get('currentState', None)
+  # Write the job details as gcp_resources
+  if job_state in _JOB_SUCCESSFUL_STATES:
+    logging.info('GetDataflowJob response state =%s. Job completed', job_state)
+    return
+  # TODO(ruifang) propagate the error.
+  raise RuntimeError(
+      'Job {} failed with error state: {}.'.format(job_id, job_state)
+  )
 
 
 def _send_cancel_request(project, job_id, location):
@@ -1,4 +1,5 @@
 from collections import defaultdict
+import io
 import json
 
 from google.cloud import storage
@@ -190,34 +191,35 @@ class ImportEvaluatedAnnotationTest(unittest.TestCase):
     # Assert.
     self.assertEqual(result, expected_result)
 
-  def test_read_valid_gcs_uri(self):
+  def test_read_invalid_gcs_uri(self):
+    # Act & Assert.
+    with self.assertRaises(ValueError):
+      list(import_evaluated_annotation.read_gcs_uri_lines('invalid-gcs-uri'))
+
+  def test_read_gcs_uri_lines(self):
     # Arrange.
     bucket = mock.MagicMock(spec=storage.Bucket)
     blob = mock.MagicMock(spec=storage.Blob)
-    blob.download_as_text.return_value = 'hello, world!'
+    blob.open.return_value = io.StringIO('line 1\n\n  line 2  \nline 3')
     bucket.blob.return_value = blob
     client = mock.MagicMock(spec=storage.Client)
     client.bucket.return_value = bucket
-    storage.Client = mock.MagicMock(return_value=client)
     # Act.
-    result = import_evaluated_annotation.read_gcs_uri_as_text(
-        'gs://my-bucket/my-file.txt'
-    )
+    with mock.patch.object(storage, 'Client', return_value=client):
+      result = list(
+          import_evaluated_annotation.read_gcs_uri_lines(
+              'gs://my-bucket/my-file.jsonl'
+          )
+      )
     # Assert.
-    self.assertEqual(result, 'hello, world!')
-    client.bucket.assert_called_once_with('my-bucket')
-    bucket.blob.assert_called_once_with('my-file.txt')
-    blob.download_as_text.assert_called_once_with()
-
-  def test_read_invalid_gcs_uri(self):
-    # Act & Assert.
-    with self.assertRaises(ValueError):
-      import_evaluated_annotation.read_gcs_uri_as_text('invalid-gcs-uri')
+    self.assertEqual(result, ['line 1', 'line 2', 'line 3'])
+    bucket.blob.assert_called_once_with('my-file.jsonl')
+    blob.download_as_text.assert_not_called()
 
   @mock.patch.object(
-      import_evaluated_annotation, 'read_gcs_uri_as_text', autospec=True
+      import_evaluated_annotation, 'read_gcs_uri_lines', autospec=True
   )
-  def test_get_error_analysis_map(self, mock_read_gcs_uri_as_text):
+  def test_get_error_analysis_map(self, mock_read_gcs_uri_lines):
     # Arrange.
     output_uri = 'gs://my-bucket/path/to/error_analysis.jsonl'
     error_analysis_map = defaultdict(
@@ -227,7 +229,7 @@ class ImportEvaluatedAnnotationTest(unittest.TestCase):
             'annotation_resource_name_2': [ERROR_ANALYSIS_ANNOTATION_2],
         },
     )
-    error_analysis_file_contents = '\n'.join([
+    error_analysis_file_lines = [
         json.dumps({
             'annotation_resource_name': 'annotation_resource_name_1',
             'annotation': ERROR_ANALYSIS_ANNOTATION_1,
@@ -236,73 +238,99 @@ class ImportEvaluatedAnnotationTest(unittest.TestCase):
             'annotation_resource_name': 'annotation_resource_name_2',
             'annotation': ERROR_ANALYSIS_ANNOTATION_2,
         }),
-    ])
-    mock_read_gcs_uri_as_text.return_value = error_analysis_file_contents
+    ]
+    mock_read_gcs_uri_lines.return_value = iter(error_analysis_file_lines)
     # Act.
     result = import_evaluated_annotation.get_error_analysis_map(output_uri)
     # Assert.
     self.assertEqual(result, error_analysis_map)
-    mock_read_gcs_uri_as_text.assert_called_once_with(output_uri)
+    mock_read_gcs_uri_lines.assert_called_once_with(output_uri)
 
   @mock.patch.object(
-      import_evaluated_annotation, 'read_gcs_uri_as_text', autospec=True
+      import_evaluated_annotation, 'read_gcs_uri_lines', autospec=True
   )
-  def test_get_evaluated_annotations_by_slice_map(
-      self, mock_read_gcs_uri_as_text
-  ):
+  def test_iter_evaluated_annotations(self, mock_read_gcs_uri_lines):
     output_uri = 'gs://bucket/evaluated_annotations.jsonl'
-    slice_value_to_resource_name = SLICE_TO_RESOURCE_NAME
     error_analysis = {
         ANN_RESOURCE_NAME_1: [ERROR_ANALYSIS_ANNOTATION_1],
         ANN_RESOURCE_NAME_2: [ERROR_ANALYSIS_ANNOTATION_2],
     }
-    mock_read_evaluated_annotations_content = '\n'.join([
+    mock_read_gcs_uri_lines.return_value = iter([
         json.dumps(EVALUATED_ANNOTATION_1),
         json.dumps(EVALUATED_ANNOTATION_2),
         json.dumps(EVALUATED_ANNOTATION_3),
     ])
+    expected_result = [
+        (slice_value, evaluated_annotation)
+        for slice_value, evaluated_annotations in (
+            EVALUATED_ANNOTATIONS_BY_SLICE.items()
+        )
+        for evaluated_annotation in evaluated_annotations
+    ]
 
-    mock_read_gcs_uri_as_text.return_value = (
-        mock_read_evaluated_annotations_content
-    )
-    expected_result = EVALUATED_ANNOTATIONS_BY_SLICE
-
-    result = import_evaluated_annotation.get_evaluated_annotations_by_slice_map(
-        output_uri, slice_value_to_resource_name, error_analysis
+    result = list(
+        import_evaluated_annotation.iter_evaluated_annotations(
+            output_uri, SLICE_TO_RESOURCE_NAME, error_analysis
+        )
     )
     self.assertEqual(result, expected_result)
+    mock_read_gcs_uri_lines.assert_called_once_with(output_uri)
 
   @mock.patch.object(aiplatform_v1, 'ModelServiceClient')
-  def test_batch_import(self, mock_client):
+  def test_import_evaluated_annotations(self, mock_client):
     # Arrange.
-    expected_calls = [
-        mock.call(
-            parent=SLICE_TO_RESOURCE_NAME['roses'],
-            evaluated_annotations=EVALUATED_ANNOTATIONS_BY_SLICE['roses'],
-        ),
-        mock.call(
-            parent=SLICE_TO_RESOURCE_NAME['dandelion'],
-            evaluated_annotations=EVALUATED_ANNOTATIONS_BY_SLICE['dandelion'],
-        ),
-        mock.call(
-            parent=SLICE_TO_RESOURCE_NAME['tulips'],
-            evaluated_annotations=EVALUATED_ANNOTATIONS_BY_SLICE['tulips'],
-        ),
-    ]
+    num_annotations = {'roses': 120, 'tulips': 30}
+    evaluated_annotation = EVALUATED_ANNOTATIONS_BY_SLICE['roses'][0]
+
+    def evaluated_annotations():
+      for slice_value, count in num_annotations.items():
+        for _ in range(count):
+          yield slice_value, evaluated_annotation
+
+    def batch_import_evaluated_annotations(parent, evaluated_annotations):
+      del parent
+      response = mock.MagicMock()
+      response.imported_evaluated_annotations_count = len(
+          evaluated_annotations
+      )
+      return response
+
+    mock_client.batch_import_evaluated_annotations.side_effect = (
+        batch_import_evaluated_annotations
+    )
     # Act.
-    import_evaluated_annotation.batch_import(
-        mock_client, EVALUATED_ANNOTATIONS_BY_SLICE, SLICE_TO_RESOURCE_NAME
+    result = import_evaluated_annotation.import_evaluated_annotations(
+        mock_client,
+        evaluated_annotations(),
+        SLICE_TO_RESOURCE_NAME,
+        max_concurrent_imports=2,
     )
     # Assert.
-    mock_client.batch_import_evaluated_annotations.assert_has_calls(
-        expected_calls, any_order=True
+    self.assertEqual(result, num_annotations)
+    batch_sizes = sorted(
+        (
+            call.kwargs['parent'],
+            len(call.kwargs['evaluated_annotations']),
+        )
+        for call in (
+            mock_client.batch_import_evaluated_annotations.call_args_list
+        )
+    )
+    self.assertEqual(
+        batch_sizes,
+        [
+            (EVAL_SLICE_NAME_1, 20),
+            (EVAL_SLICE_NAME_1, 50),
+            (EVAL_SLICE_NAME_1, 50),
+            (EVAL_SLICE_NAME_3, 30),
+        ],
     )
 
-  @mock.patch.object(import_evaluated_annotation, 'batch_import', autospec=True)
   @mock.patch.object(
-      import_evaluated_annotation,
-      'get_evaluated_annotations_by_slice_map',
-      autospec=True,
+      import_evaluated_annotation, 'import_evaluated_annotations', autospec=True
+  )
+  @mock.patch.object(
+      import_evaluated_annotation, 'iter_evaluated_annotations', autospec=True
   )
   @mock.patch.object(
       import_evaluated_annotation, 'get_error_analysis_map', autospec=True
@@ -324,8 +352,8 @@ class ImportEvaluatedAnnotationTest(unittest.TestCase):
       mock_get_model_evaluation_slices_annotation_spec_map,
       mock_client,
       mock_get_error_analysis_map,
-      mock_get_evaluated_annotations_by_slice_map,
-      mock_batch_import,
+      mock_iter_evaluated_annotations,
+      mock_import_evaluated_annotations,
   ):
     # Arrange.
     parsed_args = mock.MagicMock()
@@ -343,9 +371,7 @@ class ImportEvaluatedAnnotationTest(unittest.TestCase):
         '1': EVAL_SLICE_NAME_1,
         '0': EVAL_SLICE_NAME_2,
     }
-    mock_get_evaluated_annotations_by_slice_map.return_value = (
-        EVALUATED_ANNOTATIONS_BY_SLICE
-    )
+    mock_iter_evaluated_annotations.return_value = iter([])
     # Act.
     import_evaluated_annotation.main([])
 
@@ -355,8 +381,8 @@ class ImportEvaluatedAnnotationTest(unittest.TestCase):
     mock_get_model_eval_resource_name.assert_called_once()
     mock_get_model_evaluation_slices_annotation_spec_map.assert_called_once()
     mock_get_error_analysis_map.assert_called_once()
-    mock_get_evaluated_annotations_by_slice_map.assert_called_once()
-    mock_batch_import.assert_called_once()
+    mock_iter_evaluated_annotations.assert_called_once()
+    mock_import_evaluated_annotations.assert_called_once()
 
 
 if __name__ == '__main__':
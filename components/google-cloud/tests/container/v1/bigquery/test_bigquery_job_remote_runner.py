@@ -1978,9 +1978,16 @@ class BigqueryQueryJobRemoteRunnerUtilsTests(unittest.TestCase):
   @mock.patch.object(google.auth.transport.requests, 'Request', autospec=True)
   @mock.patch.object(requests, 'post', autospec=True)
   @mock.patch.object(requests, 'get', autospec=True)
+  @mock.patch.object(requests.sessions.Session, 'get', autospec=True)
   @mock.patch.object(time, 'sleep', autospec=True)
   def test_evaluate_model_job_succeeded(
-      self, mock_time_sleep, mock_get_requests, mock_post_requests, _, mock_auth
+      self,
+      mock_time_sleep,
+      mock_session_get,
+      mock_get_requests,
+      mock_post_requests,
+      _,
+      mock_auth,
   ):
     creds = mock.Mock()
     creds.token = 'fake_token'
@@ -2000,10 +2007,8 @@ class BigqueryQueryJobRemoteRunnerUtilsTests(unittest.TestCase):
         'schema': 'mock_schema',
         'rows': 'mock_rows',
     }
-    mock_get_requests.side_effect = [
-        mock_polled_evaluate_model_job,
-        mock_get_query_results,
-    ]
+    mock_get_requests.return_value = mock_polled_evaluate_model_job
+    mock_session_get.return_value = mock_get_query_results
 
     self._payload = (
         '{"configuration": {"query": {"query": "SELECT * FROM '
@@ -2082,18 +2087,21 @@ class BigqueryQueryJobRemoteRunnerUtilsTests(unittest.TestCase):
 
     self.assertEqual(mock_post_requests.call_count, 1)
     self.assertEqual(mock_time_sleep.call_count, 1)
-    self.assertEqual(mock_get_requests.call_count, 2)
+    self.assertEqual(mock_get_requests.call_count, 1)
+    self.assertEqual(mock_session_get.call_count, 1)
 
   @mock.patch.object(google.auth, 'default', autospec=True)
   @mock.patch.object(google.auth.transport.requests, 'Request', autospec=True)
   @mock.patch.object(requests, 'post', autospec=True)
   @mock.patch.object(requests, 'get', autospec=True)
+  @mock.patch.object(requests.sessions.Session, 'get', autospec=True)
   @mock.patch.object(time, 'sleep', autospec=True)
   @mock.patch.object(ExecutionContext, '__init__', autospec=True)
   def test_evaluate_model_job_cancel(
       self,
       mock_execution_context,
       mock_time_sleep,
+      mock_session_get,
       mock_get_requests,
       mock_post_requests,
       _,
@@ -2118,10 +2126,8 @@ class BigqueryQueryJobRemoteRunnerUtilsTests(unittest.TestCase):
         'schema': 'mock_schema',
         'rows': 'mock_rows',
     }
-    mock_get_requests.side_effect = [
-        mock_polled_evaluate_model_job,
-        mock_get_query_results,
-    ]
+    mock_get_requests.return_value = mock_polled_evaluate_model_job
+    mock_session_get.return_value = mock_get_query_results
 
     self._payload = (
         '{"configuration": {"query": {"query": "SELECT * FROM '
@@ -2479,9 +2485,16 @@ class BigqueryQueryJobRemoteRunnerUtilsTests(unittest.TestCase):
   @mock.patch.object(google.auth.transport.requests, 'Request', autospec=True)
   @mock.patch.object(requests, 'post', autospec=True)
   @mock.patch.object(requests, 'get', autospec=True)
+  @mock.patch.object(requests.sessions.Session, 'get', autospec=True)
   @mock.patch.object(time, 'sleep', autospec=True)
   def test_ml_trial_info_job_succeeded(
-      self, mock_time_sleep, mock_get_requests, mock_post_requests, _, mock_auth
+      self,
+      mock_time_sleep,
+      mock_session_get,
+      mock_get_requests,
+      mock_post_requests,
+      _,
+      mock_auth,
   ):
     creds = mock.Mock()
     creds.token = 'fake_token'
@@ -2501,10 +2514,8 @@ class BigqueryQueryJobRemoteRunnerUtilsTests(unittest.TestCase):
         'schema': 'mock_schema',
         'rows': 'mock_rows',
     }
-    mock_get_requests.side_effect = [
-        mock_polled_ml_trial_info_job,
-        mock_get_query_results,
-    ]
+    mock_get_requests.return_value = mock_polled_ml_trial_info_job
+    mock_session_get.return_value = mock_get_query_results
 
     self._payload = (
         '{"configuration": {"query": {"query": "SELECT * FROM '
@@ -2576,4 +2587,5 @@ class BigqueryQueryJobRemoteRunnerUtilsTests(unittest.TestCase):
 
     self.assertEqual(mock_post_requests.call_count, 1)
     self.assertEqual(mock_time_sleep.call_count, 1)
-    self.assertEqual(mock_get_requests.call_count, 2)
+    self.assertEqual(mock_get_requests.call_count, 1)
+    self.assertEqual(mock_session_get.call_count, 1)
@@ -0,0 +1,306 @@
+# Copyright 2023 The Kubeflow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test BigQuery Util module."""
+
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import google.auth
+from google_cloud_pipeline_components.container.v1.bigquery.query_job import remote_runner as query_job_remote_runner
+from google_cloud_pipeline_components.container.v1.bigquery.utils import bigquery_util
+import requests
+
+_SCHEMA = {
+    'fields': [
+        {'name': 'id', 'type': 'INTEGER'},
+        {
+            'name': 'point',
+            'type': 'RECORD',
+            'fields': [
+                {'name': 'x', 'type': 'FLOAT'},
+                {'name': 'y', 'type': 'FLOAT'},
+            ],
+        },
+        {'name': 'tags', 'type': 'STRING', 'mode': 'REPEATED'},
+    ]
+}
+
+
+def _make_row(i):
+  return {
+      'f': [
+          {'v': str(i)},
+          {'v': {'f': [{'v': str(i / 2)}, {'v': None}]}},
+          {'v': [{'v': 'a'}, {'v': str(i)}]},
+      ]
+  }
+
+
+class FakeQueryResultsService:
+  """Serves query results like jobs.getQueryResults.
+
+  Like the real API, a response holds at most max_rows_per_response rows
+  whatever the requested maxResults.
+  """
+
+  def __init__(self, num_rows, max_rows_per_response):
+    self._rows = [_make_row(i) for i in range(num_rows)]
+    self._max_rows_per_response = max_rows_per_response
+    self._lock = threading.Lock()
+    self.requests = []
+
+  def get(self, url, params, headers):
+    del url, headers
+    with self._lock:
+      self.requests.append(dict(params))
+    if 'startIndex' in params:
+      start = params['startIndex']
+    else:
+      start = int(params.get('pageToken', 0))
+    num_rows = min(
+        params.get('maxResults', len(self._rows)), self._max_rows_per_response
+    )
+    end = min(start + num_rows, len(self._rows))
+    page = {
+        'jobComplete': True,
+        'totalRows': str(len(self._rows)),
+        'rows': self._rows[start:end],
+    }
+    if start == 0:
+      page['schema'] = _SCHEMA
+    if end < len(self._rows):
+      page['pageToken'] = str(end)
+    response = mock.Mock()
+    response.json.return_value = page
+    return response
+
+
+class BigqueryUtilTests(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self._creds = mock.Mock()
+    self._creds.valid = True
+    self._creds.token = 'fake_token'
+
+  def _use_service(self, service):
+    patcher = mock.patch.object(
+        bigquery_util, '_get_session', return_value=service
+    )
+    patcher.start()
+    self.addCleanup(patcher.stop)
+
+  def test_get_query_results_follows_page_tokens(self):
+    service = FakeQueryResultsService(num_rows=25, max_rows_per_response=10)
+    self._use_service(service)
+
+    response = bigquery_util.get_query_results(
+        'test_project', 'test_job', 'US', self._creds
+    )
+
+    self.assertEqual(response['schema'], _SCHEMA)
+    self.assertEqual(response['rows'], [_make_row(i) for i in range(25)])
+    self.assertNotIn('pageToken', response)
+    self.assertEqual(
+        [request.get('pageToken') for request in service.requests],
+        [None, '10', '20'],
+    )
+    self.assertEqual(service.requests[0]['location'], 'US')
+
+  def test_get_query_results_stops_at_max_rows(self):
+    service = FakeQueryResultsService(num_rows=45, max_rows_per_response=10)
+    self._use_service(service)
+
+    with self.assertLogs(level='WARNING'):
+      response = bigquery_util.get_query_results(
+          'test_project', 'test_job', 'US', self._creds, max_rows=15
+      )
+
+    self.assertEqual(response['rows'], [_make_row(i) for i in range(15)])
+    self.assertNotIn('pageToken', response)
+    self.assertEqual(
+        [request.get('pageToken') for request in service.requests],
+        [None, '10'],
+    )
+
+  def test_iter_query_results_pages_in_parallel(self):
+    service = FakeQueryResultsService(num_rows=95, max_rows_per_response=7)
+    self._use_service(service)
+
+    pages = list(
+        bigquery_util.iter_query_results_pages(
+            'test_project',
+            'test_job',
+            'US',
+            self._creds,
+            max_results=10,
+            num_workers=4,
+        )
+    )
+
+    rows = [row for page in pages for row in page['rows']]
+    self.assertEqual(rows, [_make_row(i) for i in range(95)])
+    self.assertEqual(len(pages), 10)
+
+  def test_query_row_to_dict(self):
+    self.assertEqual(
+        bigquery_util.query_row_to_dict(_SCHEMA['fields'], _make_row(3)),
+        {'id': '3', 'point': {'x': '1.5', 'y': None}, 'tags': ['a', '3']},
+    )
+
+  def test_write_query_results_jsonl(self):
+    service = FakeQueryResultsService(num_rows=25, max_rows_per_response=10)
+    self._use_service(service)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+      output_path = os.path.join(tmpdir, 'results.jsonl')
+      num_rows = bigquery_util.write_query_results(
+          'test_project', 'test_job', 'US', self._creds, output_path
+      )
+      with open(output_path) as f:
+        rows = [json.loads(line) for line in f]
+
+    self.assertEqual(num_rows, 25)
+    self.assertEqual(
+        rows,
+        [
+            bigquery_util.query_row_to_dict(_SCHEMA['fields'], _make_row(i))
+            for i in range(25)
+        ],
+    )
+
+  def test_write_query_results_parquet(self):
+    try:
+      import pyarrow.parquet as pq
+    except ImportError:
+      self.skipTest('pyarrow is not installed.')
+    service = FakeQueryResultsService(num_rows=25, max_rows_per_response=10)
+    self._use_service(service)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+      output_path = os.path.join(tmpdir, 'results.parquet')
+      num_rows = bigquery_util.write_query_results(
+          'test_project',
+          'test_job',
+          'US',
+          self._creds,
+          output_path,
+          file_format='parquet',
+          chunk_size=8,
+      )
+      table = pq.read_table(output_path)
+
+    self.assertEqual(num_rows, 25)
+    self.assertEqual(
+        table.to_pylist()[3],
+        {'id': '3', 'point': {'x': '1.5', 'y': None}, 'tags': ['a', '3']},
+    )
+
+  def test_write_query_results_invalid_format(self):
+    with self.assertRaises(ValueError):
+      bigquery_util.write_query_results(
+          'test_project', 'test_job', 'US', self._creds, 'results.csv', 'csv'
+      )
+
+
+class BigqueryQueryJobTests(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    temp_dir = tempfile.TemporaryDirectory()
+    self.addCleanup(temp_dir.cleanup)
+    self._gcp_resources = os.path.join(temp_dir.name, 'gcp_resources')
+    self._output_file_path = os.path.join(temp_dir.name, 'executor_output')
+    self._executor_input = json.dumps({
+        'outputs': {
+            'artifacts': {
+                'destination_table': {
+                    'artifacts': [{
+                        'metadata': {},
+                        'name': 'foobar',
+                        'type': {'schemaTitle': 'google.BQTable'},
+                    }]
+                }
+            },
+            'outputFile': self._output_file_path,
+        }
+    })
+
+  @mock.patch.object(google.auth, 'default', autospec=True)
+  @mock.patch.object(requests, 'post', autospec=True)
+  @mock.patch.object(requests, 'get', autospec=True)
+  @mock.patch.object(time, 'sleep', autospec=True)
+  def test_query_job_writes_destination_table(
+      self, mock_time_sleep, mock_get_requests, mock_post_requests, mock_auth
+  ):
+    creds = mock.Mock()
+    creds.valid = True
+    creds.token = 'fake_token'
+    mock_auth.return_value = [creds, 'project']
+    job_uri = 'https://www.googleapis.com/bigquery/v2/projects/test_project/jobs/fake_job?location=US'
+    mock_post_requests.return_value.json.return_value = {
+        'selfLink': job_uri,
+        'status': {'state': 'PENDING'},
+    }
+    mock_get_requests.return_value.json.return_value = {
+        'selfLink': job_uri,
+        'status': {'state': 'DONE'},
+        'configuration': {
+            'query': {
+                'destinationTable': {
+                    'projectId': 'test_project',
+                    'datasetId': 'test_dataset',
+                    'tableId': 'test_table',
+                }
+            }
+        },
+    }
+
+    query_job_remote_runner.bigquery_query_job(
+        'BigqueryQueryJob',
+        'test_project',
+        'US',
+        '{"configuration": {"query": {"query": "SELECT 1"}}}',
+        '{}',
+        self._gcp_resources,
+        self._executor_input,
+    )
+
+    mock_get_requests.assert_called_once_with(
+        job_uri,
+        headers={
+            'Content-type': 'application/json',
+            'Authorization': 'Bearer fake_token',
+        },
+    )
+    self.assertEqual(mock_time_sleep.call_count, 1)
+    with open(self._output_file_path) as f:
+      artifact = json.load(f)['artifacts']['destination_table']['artifacts'][0]
+    self.assertEqual(
+        artifact['metadata'],
+        {
+            'projectId': 'test_project',
+            'datasetId': 'test_dataset',
+            'tableId': 'test_table',
+        },
+    )
+    self.assertEqual(
+        artifact['uri'],
+        'https://www.googleapis.com/bigquery/v2/projects/test_project/datasets/test_dataset/tables/test_table',
+    )
@@ -26,6 +26,7 @@ from google_cloud_pipeline_components.container.utils.execution_context import E
 from google_cloud_pipeline_components.container.v1.custom_job import remote_runner as custom_job_remote_runner
 from google_cloud_pipeline_components.container.v1.gcp_launcher import job_remote_runner
 from google_cloud_pipeline_components.container.v1.gcp_launcher.utils import gcp_labels_util
+from google_cloud_pipeline_components.container.v1.gcp_launcher.utils import polling_util
 from google_cloud_pipeline_components.proto.gcp_resources_pb2 import GcpResources
 
 import requests
@@ -191,6 +192,9 @@ class CustomJobRemoteRunnerUtilsTests(unittest.TestCase):
 
   @mock.patch.object(aiplatform.gapic, "JobServiceClient", autospec=True)
   @mock.patch.object(os.path, "exists", autospec=True)
+  @mock.patch.object(
+      polling_util.Backoff, "add_jitter", lambda _, interval: interval
+  )
   @mock.patch.object(time, "sleep", autospec=True)
   def test_custom_job_remote_runner_retries_to_get_status_on_non_completed_job(
       self, mock_time_sleep, mock_path_exists, mock_job_service_client
@@ -227,7 +231,7 @@ class CustomJobRemoteRunnerUtilsTests(unittest.TestCase):
         self._gcp_resources,
     )
     mock_time_sleep.assert_called_once_with(
-        job_remote_runner._POLLING_INTERVAL_IN_SECONDS
+        job_remote_runner._POLLING_BACKOFF.floor_seconds
     )
     self.assertEqual(job_client.get_custom_job.call_count, 2)
 
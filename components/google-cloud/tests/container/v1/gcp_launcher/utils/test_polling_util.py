@@ -0,0 +1,174 @@
+# Copyright 2023 The Kubeflow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test Polling Util module."""
+
+import time
+import unittest
+from unittest import mock
+
+from google_cloud_pipeline_components.container.utils.execution_context import ExecutionContext
+from google_cloud_pipeline_components.container.v1.gcp_launcher.utils import polling_util
+
+_BACKOFF = polling_util.Backoff(
+    floor_seconds=1, ceiling_seconds=10, multiplier=2, jitter=0
+)
+
+
+class FakeJobService:
+  """A job service whose jobs go through the given states over time."""
+
+  def __init__(self, states_by_time):
+    self._states_by_time = sorted(states_by_time.items())
+    self.now = 0.0
+    self.poll_times = []
+    self.cancelled = False
+
+  def sleep(self, seconds):
+    self.now += seconds
+
+  def get_job(self):
+    self.poll_times.append(self.now)
+    state = None
+    for start_time, start_state in self._states_by_time:
+      if start_time <= self.now:
+        state = start_state
+    return {'state': state}
+
+  def cancel_job(self):
+    self.cancelled = True
+
+
+class PollingUtilTests(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self._service = FakeJobService(
+        {0: 'QUEUED', 5: 'RUNNING', 100: 'SUCCEEDED'}
+    )
+    sleep_patcher = mock.patch.object(
+        time, 'sleep', side_effect=self._service.sleep
+    )
+    self._mock_sleep = sleep_patcher.start()
+    self.addCleanup(sleep_patcher.stop)
+
+  def _poll(self, **kwargs):
+    return polling_util.poll(
+        get_resource=self._service.get_job,
+        is_done=lambda job: job['state'] == 'SUCCEEDED',
+        backoff=_BACKOFF,
+        on_cancel=self._service.cancel_job,
+        **kwargs,
+    )
+
+  def test_poll_grows_interval_up_to_ceiling(self):
+    job = self._poll()
+
+    self.assertEqual(job, {'state': 'SUCCEEDED'})
+    self.assertEqual(
+        self._service.poll_times,
+        [0, 1, 3, 7, 15, 25, 35, 45, 55, 65, 75, 85, 95, 105],
+    )
+
+  def test_poll_resets_interval_on_state_change(self):
+    self._poll(get_state=lambda job: job['state'])
+
+    self.assertEqual(
+        self._service.poll_times[:6],
+        # The job starts running at 5 seconds, which is seen at 7 seconds.
+        [0, 1, 3, 7, 8, 10],
+    )
+    self.assertEqual(self._service.poll_times[-1], 102)
+
+  def test_poll_waits_before_first_poll_of_given_resource(self):
+    self._poll(resource={'state': 'QUEUED'})
+
+    self.assertEqual(self._service.poll_times[:3], [1, 3, 7])
+
+  def test_poll_returns_given_resource_if_done(self):
+    job = self._poll(resource={'state': 'SUCCEEDED'})
+
+    self.assertEqual(job, {'state': 'SUCCEEDED'})
+    self.assertEqual(self._service.poll_times, [])
+    self._mock_sleep.assert_not_called()
+
+  def test_poll_short_job_with_low_latency(self):
+    service = FakeJobService({0: 'RUNNING', 2: 'SUCCEEDED'})
+    self._mock_sleep.side_effect = service.sleep
+
+    polling_util.poll(
+        get_resource=service.get_job,
+        is_done=lambda job: job['state'] == 'SUCCEEDED',
+        backoff=_BACKOFF,
+    )
+
+    self.assertEqual(service.poll_times, [0, 1, 3])
+
+  def test_poll_retries_on_connection_error(self):
+    get_resource = mock.Mock(
+        side_effect=[
+            ConnectionError(),
+            ConnectionError(),
+            {'state': 'SUCCEEDED'},
+        ]
+    )
+    on_connection_error = mock.Mock()
+
+    job = polling_util.poll(
+        get_resource=get_resource,
+        is_done=lambda job: job['state'] == 'SUCCEEDED',
+        backoff=_BACKOFF,
+        on_connection_error=on_connection_error,
+    )
+
+    self.assertEqual(job, {'state': 'SUCCEEDED'})
+    self.assertEqual(get_resource.call_count, 3)
+    self.assertEqual(on_connection_error.call_count, 2)
+    self.assertEqual(self._mock_sleep.call_count, 2)
+
+  def test_poll_raises_after_connection_error_retry_limit(self):
+    get_resource = mock.Mock(side_effect=ConnectionError())
+
+    with self.assertRaises(ConnectionError):
+      polling_util.poll(
+          get_resource=get_resource,
+          is_done=lambda job: True,
+          backoff=_BACKOFF,
+          connection_error_retry_limit=3,
+      )
+    self.assertEqual(get_resource.call_count, 3)
+
+  @mock.patch.object(ExecutionContext, '__init__', autospec=True)
+  def test_poll_cascades_cancel(self, mock_execution_context):
+    mock_execution_context.return_value = None
+
+    self._poll()
+    mock_execution_context.call_args[1]['on_cancel']()
+
+    self.assertTrue(self._service.cancelled)
+
+  def test_backoff_jitter(self):
+    backoff = polling_util.Backoff(jitter=0.5)
+
+    for _ in range(100):
+      self.assertTrue(5 <= backoff.add_jitter(10) <= 15)
+
+  def test_backoff_invalid(self):
+    with self.assertRaises(ValueError):
+      polling_util.Backoff(floor_seconds=0)
+    with self.assertRaises(ValueError):
+      polling_util.Backoff(floor_seconds=10, ceiling_seconds=5)
+    with self.assertRaises(ValueError):
+      polling_util.Backoff(multiplier=0.5)
+    with self.assertRaises(ValueError):
+      polling_util.Backoff(jitter=1)
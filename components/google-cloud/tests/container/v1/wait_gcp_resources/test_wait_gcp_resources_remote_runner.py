@@ -20,6 +20,7 @@ import time
 import unittest
 from unittest import mock
 from google_cloud_pipeline_components.container.utils.execution_context import ExecutionContext
+from google_cloud_pipeline_components.container.v1.gcp_launcher.utils import polling_util
 from google_cloud_pipeline_components.container.v1.wait_gcp_resources import remote_runner as wait_gcp_resources_remote_runner
 import googleapiclient.discovery as discovery
 
@@ -127,6 +128,9 @@ class WaitGcpResourcesTests(unittest.TestCase):
       )
 
   @mock.patch.object(discovery, 'build', autospec=True)
+  @mock.patch.object(
+      polling_util.Backoff, 'add_jitter', lambda _, interval: interval
+  )
   @mock.patch.object(time, 'sleep', autospec=True)
   def test_wait_gcp_resources_retries_to_get_status_on_non_completed_job(
       self, mock_time_sleep, mock_build
@@ -150,7 +154,7 @@ class WaitGcpResourcesTests(unittest.TestCase):
         self._gcp_resources_path,
     )
     mock_time_sleep.assert_called_once_with(
-        wait_gcp_resources_remote_runner._POLLING_INTERVAL_IN_SECONDS
+        wait_gcp_resources_remote_runner._POLLING_BACKOFF.floor_seconds
     )
     self.assertEqual(df_client.projects().locations().jobs().get.call_count, 2)
 
@@ -20,5 +20,28 @@ __version__ = '2.0.0-beta.15'
 
 TYPE_CHECK = True
 
-from kfp import dsl
-from kfp.client import Client
+import importlib
+from typing import Any, List
+
+# The public namespace is resolved lazily so that lightweight entry points,
+# such as `python3 -m kfp.components.executor_main` in task containers, do not
+# pay for importing the client and its dependencies (kfp_server_api,
+# kubernetes, google-auth, ...).
+_LAZY_SUBMODULES = {
+    'client', 'compiler', 'components', 'deprecated', 'dsl', 'pipeline_spec'
+}
+_LAZY_ATTRIBUTES = {'Client': 'kfp.client'}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f'{__name__}.{name}')
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | _LAZY_SUBMODULES | set(_LAZY_ATTRIBUTES))
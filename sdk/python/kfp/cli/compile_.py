@@ -13,14 +13,20 @@
 # limitations under the License.
 """KFP SDK compiler CLI tool."""
 
+import concurrent.futures
+import dataclasses
+import glob
+import hashlib
 import json
 import logging
 import os
 import sys
+import time
 import types
-from typing import Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 import click
+import kfp
 from kfp import compiler
 from kfp.components import base_component
 from kfp.components import graph_component
@@ -51,6 +57,10 @@ def is_component_func(func: Callable) -> bool:
         func, base_component.BaseComponent)
 
 
+class NoPipelineOrComponentError(ValueError):
+    """Raised when a module defines no pipeline or component."""
+
+
 def collect_pipeline_or_component_from_module(
         target_module: types.ModuleType) -> base_component.BaseComponent:
     pipelines = []
@@ -67,6 +77,9 @@ def collect_pipeline_or_component_from_module(
         return pipelines[0]
     elif not pipelines and len(components) == 1:
         return components[0]
+    elif not pipelines and not components:
+        raise NoPipelineOrComponentError(
+            f'No pipeline or component found in module {target_module}.')
     else:
         raise ValueError(
             f'Expected one pipeline or one component in module {target_module}. Got {len(pipelines)} pipeline(s): {[p.name for p in pipelines]} and {len(components)} component(s): {[c.name for c in components]}. Please specify which pipeline or component to compile using --function.'
@@ -105,17 +118,233 @@ def parse_parameters(parameters: Optional[str]) -> Dict:
         raise e
 
 
+_CACHE_FILE_NAME = '.kfp_compile_cache.json'
+
+
+def find_python_files(py: str) -> Tuple[str, List[str]]:
+    """Finds the Python files to compile in batch.
+
+    Package ``__init__.py`` files are not compiled.
+
+    Args:
+        py: A directory, which is searched recursively, or a glob pattern.
+
+    Returns:
+        The base directory of the files, relative to which their outputs are
+        written, and the sorted paths of the files.
+    """
+    if os.path.isdir(py):
+        python_files = glob.glob(os.path.join(py, '**', '*.py'), recursive=True)
+        base_dir = py
+    else:
+        python_files = [
+            path for path in glob.glob(py, recursive=True)
+            if os.path.isfile(path)
+        ]
+        base_dir = os.path.commonpath([
+            os.path.dirname(os.path.abspath(path)) for path in python_files
+        ]) if python_files else ''
+    python_files = [
+        path for path in python_files if os.path.basename(path) != '__init__.py'
+    ]
+    return base_dir, sorted(python_files)
+
+
+def get_batch_package_path(python_file: str, base_dir: str,
+                           output_dir: str) -> str:
+    """Returns the output path of a Python file compiled in batch."""
+    relative_path = os.path.relpath(
+        os.path.abspath(python_file), os.path.abspath(base_dir))
+    return os.path.join(output_dir,
+                        os.path.splitext(relative_path)[0] + '.yaml')
+
+
+def get_fingerprint(python_file: str, function_name: Optional[str],
+                    pipeline_parameters: Dict[str, Any],
+                    compile_options: Dict[str, Any]) -> str:
+    """Returns a fingerprint of the inputs of compiling a Python file.
+
+    The fingerprint covers the contents of the file, the KFP SDK
+    version, the function name, the pipeline parameters and the compiler
+    options. It does not cover other local modules that the file
+    imports.
+    """
+    fingerprint = hashlib.sha256()
+    with open(python_file, 'rb') as f:
+        fingerprint.update(f.read())
+    options = [
+        kfp.__version__, function_name, pipeline_parameters, compile_options
+    ]
+    fingerprint.update(json.dumps(options, sort_keys=True).encode())
+    return fingerprint.hexdigest()
+
+
+@dataclasses.dataclass
+class _CompileJob:
+    python_file: str
+    package_path: str
+    function_name: Optional[str]
+    pipeline_parameters: Dict[str, Any]
+    compile_options: Dict[str, Any]
+    # Whether a module without a pipeline or component, e.g. a helper module
+    # found in batch mode, is skipped rather than failed.
+    skip_if_empty: bool = False
+
+
+def _unload_modules_in(directory: str, loaded_modules: Set[str]) -> None:
+    """Removes the modules imported from a directory since loaded_modules.
+
+    Worker processes are reused across files, so helper modules of the
+    same name in different directories must not be served from the
+    module cache.
+    """
+    prefix = os.path.join(os.path.abspath(directory), '')
+    for name in set(sys.modules) - loaded_modules:
+        path = getattr(sys.modules[name], '__file__', None)
+        if path and os.path.abspath(path).startswith(prefix):
+            del sys.modules[name]
+
+
+def _compile_job(job: _CompileJob) -> Dict[str, Any]:
+    """Compiles a Python file in a worker process and reports the result."""
+    start_time = time.monotonic()
+    result = {'py': job.python_file, 'output': job.package_path}
+    loaded_modules = set(sys.modules)
+    try:
+        # Modules of the same name in different directories, or a changed
+        # module in watch mode, must not be served from the module cache.
+        module_name = os.path.splitext(os.path.basename(job.python_file))[0]
+        sys.modules.pop(module_name, None)
+        pipeline_func = collect_pipeline_or_component_func(
+            python_file=job.python_file, function_name=job.function_name)
+        os.makedirs(
+            os.path.dirname(os.path.abspath(job.package_path)), exist_ok=True)
+        compiler.Compiler().compile(
+            pipeline_func=pipeline_func,
+            pipeline_parameters=job.pipeline_parameters,
+            package_path=job.package_path,
+            **job.compile_options)
+        result['status'] = 'compiled'
+    except NoPipelineOrComponentError as e:
+        if job.skip_if_empty:
+            result['status'] = 'skipped'
+        else:
+            result['status'] = 'failed'
+            result['error'] = f'{type(e).__name__}: {e}'
+    except Exception as e:
+        result['status'] = 'failed'
+        result['error'] = f'{type(e).__name__}: {e}'
+    finally:
+        _unload_modules_in(os.path.dirname(job.python_file), loaded_modules)
+    result['seconds'] = round(time.monotonic() - start_time, 3)
+    return result
+
+
+def compile_batch(
+    jobs: List[_CompileJob],
+    fingerprints: Dict[str, str],
+    max_workers: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Compiles Python files concurrently on a process pool.
+
+    Files whose fingerprint is unchanged since they were last compiled, and
+    whose output still exists, are skipped.
+
+    Args:
+        jobs: The files to compile.
+        fingerprints: The fingerprints of the last successful compilation, by
+            output path. Updated in place.
+        max_workers: The maximum number of worker processes.
+
+    Returns:
+        A report of each file, with its status ('compiled', 'cached',
+        'skipped' if it has no pipeline or component, or 'failed'),
+        compilation time and error, if any.
+    """
+    results = {}
+    pending_jobs = []
+    for job in jobs:
+        fingerprint = get_fingerprint(job.python_file, job.function_name,
+                                      job.pipeline_parameters,
+                                      job.compile_options)
+        if fingerprints.get(job.package_path) == fingerprint and os.path.exists(
+                job.package_path):
+            results[job.package_path] = {
+                'py': job.python_file,
+                'output': job.package_path,
+                'status': 'cached',
+                'seconds': 0.0,
+            }
+        else:
+            pending_jobs.append((job, fingerprint))
+
+    if pending_jobs:
+        # A fresh pool per batch, so that modules changed in watch mode are
+        # imported again.
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=min(max_workers or os.cpu_count() or 1,
+                                len(pending_jobs))) as executor:
+            for (job, fingerprint), result in zip(
+                    pending_jobs,
+                    executor.map(_compile_job,
+                                 [job for job, _ in pending_jobs])):
+                results[job.package_path] = result
+                if result['status'] == 'compiled':
+                    fingerprints[job.package_path] = fingerprint
+                else:
+                    fingerprints.pop(job.package_path, None)
+
+    return [results[job.package_path] for job in jobs]
+
+
+def _load_fingerprints(cache_path: str) -> Dict[str, str]:
+    try:
+        with open(cache_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_fingerprints(cache_path: str, fingerprints: Dict[str, str]) -> None:
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    with open(cache_path, 'w') as f:
+        json.dump(fingerprints, f, indent=2, sort_keys=True)
+
+
+def _echo_results(results: List[Dict[str, Any]]) -> None:
+    for result in results:
+        if result['status'] == 'failed':
+            click.echo(
+                f'Failed to compile {result["py"]}: {result["error"]}',
+                err=True)
+        elif result['status'] == 'skipped':
+            click.echo(
+                f'Skipped {result["py"]}: no pipeline or component found.',
+                err=True)
+        else:
+            click.echo(result['output'])
+
+
+def _write_report(report_path: str, results: List[Dict[str, Any]],
+                  seconds: float) -> None:
+    report = {'seconds': round(seconds, 3), 'pipelines': results}
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+
 @click.command(name='compile')
 @click.option(
     '--py',
-    type=click.Path(exists=True, dir_okay=False),
+    type=click.Path(exists=False),
     required=True,
-    help='Local absolute path to a py file.')
+    help='Local absolute path to a py file. A directory, which is searched recursively, or a glob pattern of py files compiles them in batch on a process pool, skipping files that are unchanged since they were last compiled.'
+)
 @click.option(
     '--output',
-    type=click.Path(exists=False, dir_okay=False),
+    type=click.Path(exists=False),
     required=True,
-    help='Path to write the compiled result.')
+    help='Path to write the compiled result. In batch mode, the directory to write the compiled results to, at the paths of the py files relative to their base directory.'
+)
 @click.option(
     '--function',
     'function_name',
@@ -133,25 +362,132 @@ def parse_parameters(parameters: Optional[str]) -> Dict:
     is_flag=True,
     default=False,
     help='Whether to disable type checking.')
+@click.option(
+    '--deduplicate-specs',
+    is_flag=True,
+    default=False,
+    help='Whether to collapse identical component specs and executors into a single entry each.'
+)
+@click.option(
+    '--workers',
+    type=int,
+    default=None,
+    help='In batch mode, the maximum number of worker processes. Defaults to the number of CPUs.'
+)
+@click.option(
+    '--report',
+    type=click.Path(exists=False, dir_okay=False),
+    default=None,
+    help='Path to write a JSON report with the status and compilation time of each pipeline to. In watch mode, the report is rewritten for each recompilation.'
+)
+@click.option(
+    '--watch',
+    is_flag=True,
+    default=False,
+    help='Whether to keep running and recompile files when they change.')
+@click.option(
+    '--watch-interval',
+    type=float,
+    default=1.0,
+    help='In watch mode, the number of seconds between checks for changes.')
 def compile_(
     py: str,
     output: str,
     function_name: Optional[str] = None,
     pipeline_parameters: Optional[str] = None,
     disable_type_check: bool = False,
+    deduplicate_specs: bool = False,
+    workers: Optional[int] = None,
+    report: Optional[str] = None,
+    watch: bool = False,
+    watch_interval: float = 1.0,
 ) -> None:
-    """Compiles a pipeline or component written in a .py file."""
-    pipeline_func = collect_pipeline_or_component_func(
-        python_file=py, function_name=function_name)
+    """Compiles a pipeline or component written in a .py file, or all .py files
+    in a directory or matching a glob pattern."""
     parsed_parameters = parse_parameters(parameters=pipeline_parameters)
     package_path = os.path.join(os.getcwd(), output)
-    compiler.Compiler().compile(
-        pipeline_func=pipeline_func,
-        pipeline_parameters=parsed_parameters,
-        package_path=package_path,
-        type_check=not disable_type_check)
+    is_batch = not os.path.isfile(py)
+    if not is_batch and not watch and report is None:
+        pipeline_func = collect_pipeline_or_component_func(
+            python_file=py, function_name=function_name)
+        compiler.Compiler().compile(
+            pipeline_func=pipeline_func,
+            pipeline_parameters=parsed_parameters,
+            package_path=package_path,
+            type_check=not disable_type_check,
+            deduplicate_specs=deduplicate_specs)
+
+        click.echo(package_path)
+        return
+
+    compile_options = {
+        'type_check': not disable_type_check,
+        'deduplicate_specs': deduplicate_specs,
+    }
+
+    def get_jobs() -> List[_CompileJob]:
+        if not is_batch:
+            return [
+                _CompileJob(py, package_path, function_name, parsed_parameters,
+                            compile_options)
+            ]
+        base_dir, python_files = find_python_files(py)
+        return [
+            _CompileJob(
+                python_file,
+                get_batch_package_path(python_file, base_dir, package_path),
+                function_name,
+                parsed_parameters,
+                compile_options,
+                skip_if_empty=function_name is None)
+            for python_file in python_files
+        ]
 
-    click.echo(package_path)
+    jobs = get_jobs()
+    if not jobs:
+        raise click.BadParameter(
+            f'No py files found at {py!r}.', param_hint='--py')
+    # Fingerprints of single files are only kept in memory, for watch mode.
+    cache_path = os.path.join(package_path,
+                              _CACHE_FILE_NAME) if is_batch else None
+    fingerprints = _load_fingerprints(cache_path) if cache_path else {}
+
+    def run(jobs: List[_CompileJob]) -> List[Dict[str, Any]]:
+        start_time = time.monotonic()
+        results = compile_batch(jobs, fingerprints, max_workers=workers)
+        if cache_path:
+            _save_fingerprints(cache_path, fingerprints)
+        _echo_results(results)
+        if report is not None:
+            _write_report(report, results, time.monotonic() - start_time)
+        return results
+
+    results = run(jobs)
+    if not watch:
+        if any(result['status'] == 'failed' for result in results):
+            sys.exit(1)
+        return
+
+    mtimes = {
+        job.python_file: os.path.getmtime(job.python_file) for job in jobs
+    }
+    click.echo('Watching for changes. Press Ctrl+C to stop.', err=True)
+    try:
+        while True:
+            time.sleep(watch_interval)
+            changed_jobs = []
+            for job in get_jobs():
+                try:
+                    mtime = os.path.getmtime(job.python_file)
+                except OSError:
+                    continue
+                if mtimes.get(job.python_file) != mtime:
+                    mtimes[job.python_file] = mtime
+                    changed_jobs.append(job)
+            if changed_jobs:
+                run(changed_jobs)
+    except KeyboardInterrupt:
+        pass
 
 
 def main():
@@ -12,9 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Tests for `dsl compile` command group in KFP CLI."""
+import json
+import os
+import tempfile
+import textwrap
 import unittest
 
+from click import testing
 from kfp import dsl
+from kfp.cli import cli
 from kfp.cli import compile_
 
 
@@ -73,5 +79,155 @@ class TestIsPipelineOrComponent(unittest.TestCase):
         self.assertFalse(compile_.is_component_func(my_pipeline))
 
 
+_PIPELINE_MODULE = textwrap.dedent("""\
+    from kfp import dsl
+
+    @dsl.component
+    def print_op(message: str):
+        print(message)
+
+    @dsl.pipeline(name={name!r})
+    def my_pipeline():
+        print_op(message='hello')
+""")
+
+_PIPELINE_WITH_HELPER_MODULE = textwrap.dedent("""\
+    import util
+    from kfp import dsl
+
+    @dsl.component
+    def print_op(message: str):
+        print(message)
+
+    @dsl.pipeline(name=util.NAME)
+    def my_pipeline():
+        print_op(message='hello')
+""")
+
+
+class TestBatchCompile(unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.source_dir = os.path.join(tmp_dir.name, 'pipelines')
+        self.output_dir = os.path.join(tmp_dir.name, 'compiled')
+        self.report_path = os.path.join(tmp_dir.name, 'report.json')
+        # Modules of the same name in different directories.
+        for name in ['first', 'second']:
+            self.write_module(os.path.join(name, 'pipeline.py'), name)
+
+    def write_module(self, relative_path: str, pipeline_name: str) -> None:
+        path = os.path.join(self.source_dir, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(_PIPELINE_MODULE.format(name=pipeline_name))
+
+    def compile(self, py: str, workers: int = 2) -> dict:
+        result = testing.CliRunner().invoke(
+            cli.cli,
+            args=[
+                'dsl', 'compile', '--py', py, '--output', self.output_dir,
+                '--workers',
+                str(workers), '--report', self.report_path
+            ])
+        with open(self.report_path) as f:
+            report = json.load(f)
+        report['exit_code'] = result.exit_code
+        return report
+
+    def get_statuses(self, report: dict) -> dict:
+        return {
+            os.path.relpath(pipeline['output'], self.output_dir):
+            pipeline['status'] for pipeline in report['pipelines']
+        }
+
+    def test_compile_directory(self):
+        report = self.compile(self.source_dir)
+
+        self.assertEqual(0, report['exit_code'])
+        self.assertEqual(
+            {
+                os.path.join('first', 'pipeline.yaml'): 'compiled',
+                os.path.join('second', 'pipeline.yaml'): 'compiled',
+            }, self.get_statuses(report))
+        for name in ['first', 'second']:
+            with open(os.path.join(self.output_dir, name,
+                                   'pipeline.yaml')) as f:
+                self.assertIn(f'name: {name}', f.read())
+
+    def test_compile_directory_with_helper_modules(self):
+        for name in ['__init__.py', 'helpers.py']:
+            with open(os.path.join(self.source_dir, name), 'w') as f:
+                f.write('def helper():\n    pass\n')
+
+        report = self.compile(self.source_dir)
+
+        self.assertEqual(0, report['exit_code'])
+        self.assertEqual(
+            {
+                os.path.join('first', 'pipeline.yaml'): 'compiled',
+                'helpers.yaml': 'skipped',
+                os.path.join('second', 'pipeline.yaml'): 'compiled',
+            }, self.get_statuses(report))
+        self.assertFalse(
+            os.path.exists(os.path.join(self.output_dir, 'helpers.yaml')))
+
+    def test_compile_directories_with_same_named_helpers(self):
+        for name in ['first', 'second']:
+            with open(os.path.join(self.source_dir, name, 'util.py'), 'w') as f:
+                f.write(f'NAME = {name!r}\n')
+            with open(os.path.join(self.source_dir, name, 'pipeline.py'),
+                      'w') as f:
+                f.write(_PIPELINE_WITH_HELPER_MODULE)
+
+        # A single worker compiles both directories in the same process, and
+        # util.py is compiled after the pipeline that imports it.
+        report = self.compile(self.source_dir, workers=1)
+
+        self.assertEqual(0, report['exit_code'])
+        for name in ['first', 'second']:
+            with open(os.path.join(self.output_dir, name,
+                                   'pipeline.yaml')) as f:
+                self.assertIn(f'name: {name}', f.read())
+
+    def test_unchanged_files_are_cached(self):
+        self.compile(self.source_dir)
+        self.write_module(os.path.join('second', 'pipeline.py'), 'changed')
+
+        report = self.compile(self.source_dir)
+
+        self.assertEqual(
+            {
+                os.path.join('first', 'pipeline.yaml'): 'cached',
+                os.path.join('second', 'pipeline.yaml'): 'compiled',
+            }, self.get_statuses(report))
+
+    def test_compile_glob_with_failure(self):
+        with open(os.path.join(self.source_dir, 'broken.py'), 'w') as f:
+            f.write('raise RuntimeError("broken")')
+
+        report = self.compile(os.path.join(self.source_dir, '*.py'))
+
+        self.assertEqual(1, report['exit_code'])
+        [pipeline] = report['pipelines']
+        self.assertEqual('failed', pipeline['status'])
+        self.assertEqual('RuntimeError: broken', pipeline['error'])
+        self.assertFalse(os.path.exists(pipeline['output']))
+
+    def test_no_files_found(self):
+        result = testing.CliRunner().invoke(
+            cli.cli,
+            args=[
+                'dsl', 'compile', '--py',
+                os.path.join(self.source_dir, '*.txt'), '--output',
+                self.output_dir
+            ])
+
+        self.assertEqual(2, result.exit_code)
+        self.assertIn('No py files found', result.output)
+
+
 if __name__ == '__main__':
     unittest.main()
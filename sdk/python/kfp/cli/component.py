@@ -12,14 +12,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import concurrent.futures
 import contextlib
+import fnmatch
+import hashlib
 import logging
+import os
 import pathlib
 import shutil
 import subprocess
 import sys
 import tempfile
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
 import warnings
 
 import click
@@ -65,6 +69,62 @@ _DOCKERIGNORE_TEMPLATE = f'''
 # in containerized components.
 _COMPONENT_ROOT_DIR = pathlib.Path('/usr/local/src/kfp/components')
 
+# Prefix of the tag that records the fingerprint of a built image.
+_FINGERPRINT_TAG_PREFIX = 'kfp-'
+
+
+def _read_dockerignore_patterns(
+        context_directory: pathlib.Path) -> List[List[str]]:
+    """Returns the patterns of the .dockerignore file, split into path
+    segments.
+
+    No patterns are returned if the file contains exceptions (``!``), so
+    that every file that Docker may send to the daemon is accounted for.
+    """
+    dockerignore = context_directory / _DOCKERIGNORE
+    if not dockerignore.is_file():
+        return []
+    patterns = []
+    for line in dockerignore.read_text().splitlines():
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if line.startswith('!'):
+            return []
+        pattern = os.path.normpath(line.strip('/'))
+        patterns.append(pattern.split(os.sep))
+    return patterns
+
+
+def _match_path_segments(pattern: Sequence[str], path: Sequence[str]) -> bool:
+    if not pattern:
+        return not path
+    if pattern[0] == '**':
+        return any(
+            _match_path_segments(pattern[1:], path[i:])
+            for i in range(len(path) + 1))
+    return bool(path) and fnmatch.fnmatchcase(
+        path[0], pattern[0]) and _match_path_segments(pattern[1:], path[1:])
+
+
+def _is_dockerignored(relative_path: str, patterns: List[List[str]]) -> bool:
+    segments = relative_path.split('/')
+    return any(_match_path_segments(pattern, segments) for pattern in patterns)
+
+
+def _get_image_digest(client: 'docker.DockerClient', image: str) -> str:
+    """Returns the ID of an image if it is available locally, else its digest
+    in its registry, else its name."""
+    try:
+        return client.images.get(image).id
+    except docker.errors.ImageNotFound:
+        pass
+    try:
+        return client.images.get_registry_data(image).id
+    except docker.errors.APIError as e:
+        logging.warning(f'Failed to resolve the digest of image {image}: {e}')
+        return image
+
 
 @contextlib.contextmanager
 def _registered_modules():
@@ -292,12 +352,91 @@ class ComponentBuilder():
         self._maybe_write_file(_DOCKERFILE, dockerfile_contents,
                                overwrite_dockerfile)
 
+    def get_fingerprint(self, client: 'docker.DockerClient',
+                        platform: str) -> str:
+        """Returns a digest of everything the image is built from.
+
+        The digest covers the relative paths and contents of the files
+        in the build context that are not excluded by .dockerignore,
+        including the component sources, requirements and Dockerfile, as
+        well as the digest of the base image and the target platform.
+        """
+        digest = hashlib.sha256()
+        digest.update(_get_image_digest(client, self._base_image).encode())
+        digest.update(b'\0' + platform.encode() + b'\0')
+
+        patterns = _read_dockerignore_patterns(self._context_directory)
+        relative_paths = []
+        for root, dirs, files in os.walk(self._context_directory):
+            root_path = pathlib.Path(root).relative_to(self._context_directory)
+            # Files under an ignored directory are ignored too.
+            dirs[:] = [
+                name for name in dirs
+                if not _is_dockerignored((root_path /
+                                          name).as_posix(), patterns)
+            ]
+            for name in files:
+                relative_path = (root_path / name).as_posix()
+                if not _is_dockerignored(relative_path, patterns):
+                    relative_paths.append(relative_path)
+        for relative_path in sorted(relative_paths):
+            digest.update(relative_path.encode() + b'\0')
+            digest.update(
+                hashlib.sha256((self._context_directory /
+                                relative_path).read_bytes()).digest())
+        return digest.hexdigest()
+
     def build_image(self, platform: str, push_image: bool):
-        logging.info(f'Building image {self._target_image} using Docker...')
         client = docker.from_env()
 
-        docker_log_prefix = 'Docker'
+        docker_log_prefix = f'Docker ({self._target_image})'
+
+        repository, tag = docker.utils.parse_repository_tag(self._target_image)
+        fingerprint_tag = _FINGERPRINT_TAG_PREFIX + self.get_fingerprint(
+            client, platform)
+        try:
+            image = client.images.get(f'{repository}:{fingerprint_tag}')
+        except docker.errors.ImageNotFound:
+            image = None
+
+        if image is not None:
+            logging.info(f'Image {self._target_image} is up to date with tag'
+                         f' {fingerprint_tag}. Skipping build.')
+            image.tag(repository, tag)
+            if not push_image:
+                return
+            if any(
+                    repo_digest.startswith(f'{repository}@')
+                    for repo_digest in image.attrs.get('RepoDigests') or []):
+                logging.info(f'Image {self._target_image} was already pushed.'
+                             ' Skipping push.')
+                return
+        else:
+            self._build_image(client, platform, docker_log_prefix)
+            client.api.tag(self._target_image, repository, fingerprint_tag)
+            if not push_image:
+                return
+
+        logging.info(f'Pushing image {self._target_image}...')
+
+        try:
+            response = client.images.push(
+                self._target_image, stream=True, decode=True)
+            for log in response:
+                status = log.get('status', '').rstrip('\n')
+                layer = log.get('id', '')
+                if status:
+                    logging.info(f'{docker_log_prefix}: {layer} {status}')
+        except docker.errors.BuildError as e:
+            logging.error(f'{docker_log_prefix}: {e}')
+            raise e
+
+        logging.info(
+            f'Built and pushed component container {self._target_image}')
 
+    def _build_image(self, client: 'docker.DockerClient', platform: str,
+                     docker_log_prefix: str):
+        logging.info(f'Building image {self._target_image} using Docker...')
         try:
             context = str(self._context_directory)
             logs = client.api.build(
@@ -320,26 +459,6 @@ class ComponentBuilder():
             logging.error(f'{docker_log_prefix}: {e}')
             raise sys.exit(1)
 
-        if not push_image:
-            return
-
-        logging.info(f'Pushing image {self._target_image}...')
-
-        try:
-            response = client.images.push(
-                self._target_image, stream=True, decode=True)
-            for log in response:
-                status = log.get('status', '').rstrip('\n')
-                layer = log.get('id', '')
-                if status:
-                    logging.info(f'{docker_log_prefix}: {layer} {status}')
-        except docker.errors.BuildError as e:
-            logging.error(f'{docker_log_prefix}: {e}')
-            raise e
-
-        logging.info(
-            f'Built and pushed component container {self._target_image}')
-
 
 @click.group()
 def component():
@@ -348,7 +467,10 @@ def component():
 
 @component.command()
 @click.argument(
-    'components_directory', type=click.Path(exists=True, file_okay=False))
+    'components_directories',
+    type=click.Path(exists=True, file_okay=False),
+    nargs=-1,
+    required=True)
 @click.option(
     '--component-filepattern',
     type=str,
@@ -390,10 +512,22 @@ def component():
     is_flag=True,
     default=True,
     help='Push the built image to its remote repository.')
-def build(components_directory: str, component_filepattern: str, engine: str,
-          kfp_package_path: Optional[str], overwrite_dockerfile: bool,
-          build_image: bool, platform: str, push_image: bool):
-    """Builds containers for KFP v2 Python-based components."""
+@click.option(
+    '--max-parallel-builds',
+    type=click.IntRange(min=1),
+    default=4,
+    help='Maximum number of container images built concurrently when'
+    ' multiple component directories are passed.')
+def build(components_directories: Tuple[str, ...], component_filepattern: str,
+          engine: str, kfp_package_path: Optional[str],
+          overwrite_dockerfile: bool, build_image: bool, platform: str,
+          push_image: bool, max_parallel_builds: int):
+    """Builds containers for KFP v2 Python-based components.
+
+    Each of COMPONENTS_DIRECTORIES is built into the target image of its
+    components. Images that are up to date with their build context and
+    base image are not rebuilt.
+    """
 
     if build_image and engine != 'docker':
         warnings.warn(
@@ -402,13 +536,17 @@ def build(components_directory: str, component_filepattern: str, engine: str,
             stacklevel=2)
         sys.exit(1)
 
-    components_directory = pathlib.Path(components_directory)
-    components_directory = components_directory.resolve()
+    components_directories = [
+        pathlib.Path(components_directory).resolve()
+        for components_directory in components_directories
+    ]
 
-    if not components_directory.is_dir():
-        logging.error(
-            f'{components_directory} does not seem to be a valid directory.')
-        raise sys.exit(1)
+    for components_directory in components_directories:
+        if not components_directory.is_dir():
+            logging.error(
+                f'{components_directory} does not seem to be a valid directory.'
+            )
+            raise sys.exit(1)
 
     if build_image and not _DOCKER_IS_PRESENT:
         logging.error(
@@ -422,16 +560,54 @@ def build(components_directory: str, component_filepattern: str, engine: str,
 
     kfp_package_path = pathlib.Path(
         kfp_package_path) if kfp_package_path is not None else None
-    builder = ComponentBuilder(
-        context_directory=components_directory,
-        kfp_package_path=kfp_package_path,
-        component_filepattern=component_filepattern,
-    )
-    builder.write_component_files()
-    builder.generate_kfp_config()
-
-    builder.generate_requirements_txt()
-    builder.maybe_generate_dockerignore()
-    builder.maybe_generate_dockerfile(overwrite_dockerfile=overwrite_dockerfile)
-    if build_image:
-        builder.build_image(platform=platform, push_image=push_image)
+    builders = []
+    for components_directory in components_directories:
+        builder = ComponentBuilder(
+            context_directory=components_directory,
+            kfp_package_path=kfp_package_path,
+            component_filepattern=component_filepattern,
+        )
+        builder.write_component_files()
+        builder.generate_kfp_config()
+
+        builder.generate_requirements_txt()
+        builder.maybe_generate_dockerignore()
+        builder.maybe_generate_dockerfile(
+            overwrite_dockerfile=overwrite_dockerfile)
+        builders.append(builder)
+
+    target_images = [builder._target_image for builder in builders]
+    duplicate_target_images = {
+        image for image in target_images if target_images.count(image) > 1
+    }
+    if duplicate_target_images:
+        logging.error(
+            f'Found target_image values {duplicate_target_images} in more than'
+            ' one components directory. Each directory must build a different'
+            ' target_image.')
+        raise sys.exit(1)
+
+    if not build_image:
+        return
+    if len(builders) == 1:
+        builders[0].build_image(platform=platform, push_image=push_image)
+        return
+
+    with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_parallel_builds) as executor:
+        futures = {
+            executor.submit(
+                builder.build_image, platform=platform, push_image=push_image):
+            builder for builder in builders
+        }
+    failed_images = []
+    for future, builder in futures.items():
+        error = future.exception()
+        if error is not None:
+            if not isinstance(error, SystemExit):
+                logging.error(
+                    f'Failed to build image {builder._target_image}: {error}')
+            failed_images.append(builder._target_image)
+    if failed_images:
+        logging.error(f'Failed to build images: {", ".join(failed_images)}')
+        raise sys.exit(1)
@@ -18,7 +18,7 @@ import os
 import pathlib
 import subprocess
 import textwrap
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Union
 import unittest
 from unittest import mock
 
@@ -85,6 +85,10 @@ class Test(unittest.TestCase):
             'stream': 'Build logs'
         }]
         self._docker_client.images.push.return_value = [{'status': 'Pushed'}]
+        self._docker_client.images.get.side_effect = (
+            component.docker.errors.ImageNotFound('Not found'))
+        self._docker_client.images.get_registry_data.return_value.id = (
+            'sha256:base')
         self.addCleanup(patcher.stop)
 
         with contextlib.ExitStack() as stack:
@@ -611,6 +615,237 @@ class Test(unittest.TestCase):
         self.assertTrue(contents.startswith(file_start))
         self.assertRegex(contents, 'RUN pip install --no-cache-dir kfp-*')
 
+    def _get_fingerprint_tag(self) -> str:
+        repository, tag = self._docker_client.api.tag.call_args[0][1:]
+        self.assertTrue(tag.startswith('kfp-'))
+        return f'{repository}:{tag}'
+
+    def _use_local_images(self, images: Dict[str, mock.Mock]):
+
+        def get(name):
+            if name not in images:
+                raise component.docker.errors.ImageNotFound(name)
+            return images[name]
+
+        self._docker_client.images.get.side_effect = get
+
+    def test_built_image_is_tagged_with_fingerprint(self):
+        component = _make_component(
+            func_name='train', target_image='gcr.io/project/image:v1')
+        _write_components('components.py', component)
+
+        result = self.runner.invoke(
+            self.cli,
+            ['build', str(self._working_dir)],
+        )
+        self.assertEqual(result.exit_code, 0)
+
+        self._docker_client.api.tag.assert_called_once_with(
+            'gcr.io/project/image:v1', 'gcr.io/project/image', mock.ANY)
+
+    def test_up_to_date_image_is_not_rebuilt_or_pushed(self):
+        component = _make_component(
+            func_name='train', target_image='custom-image')
+        _write_components('components.py', component)
+        result = self.runner.invoke(
+            self.cli,
+            ['build', str(self._working_dir)],
+        )
+        self.assertEqual(result.exit_code, 0)
+        image = mock.Mock(attrs={'RepoDigests': ['custom-image@sha256:abc']})
+        self._use_local_images({self._get_fingerprint_tag(): image})
+        self._docker_client.reset_mock()
+
+        result = self.runner.invoke(
+            self.cli,
+            ['build', str(self._working_dir)],
+        )
+        self.assertEqual(result.exit_code, 0)
+
+        self._docker_client.api.build.assert_not_called()
+        self._docker_client.images.push.assert_not_called()
+        image.tag.assert_called_once_with('custom-image', None)
+
+    def test_up_to_date_image_is_pushed_if_not_pushed_before(self):
+        component = _make_component(
+            func_name='train', target_image='custom-image')
+        _write_components('components.py', component)
+        result = self.runner.invoke(
+            self.cli,
+            ['build', str(self._working_dir), '--no-push-image'],
+        )
+        self.assertEqual(result.exit_code, 0)
+        self._use_local_images(
+            {self._get_fingerprint_tag(): mock.Mock(attrs={'RepoDigests': []})})
+        self._docker_client.reset_mock()
+
+        result = self.runner.invoke(
+            self.cli,
+            ['build', str(self._working_dir)],
+        )
+        self.assertEqual(result.exit_code, 0)
+
+        self._docker_client.api.build.assert_not_called()
+        self._docker_client.images.push.assert_called_once_with(
+            'custom-image', stream=True, decode=True)
+
+    def test_image_is_rebuilt_when_sources_change(self):
+        component = _make_component(
+            func_name='train', target_image='custom-image')
+        _write_components('components.py', component)
+        result = self.runner.invoke(
+            self.cli,
+            ['build', str(self._working_dir)],
+        )
+        self.assertEqual(result.exit_code, 0)
+        fingerprint_tag = self._get_fingerprint_tag()
+        self._use_local_images({fingerprint_tag: mock.Mock()})
+        self._docker_client.reset_mock()
+
+        _write_components('components.py', [component, '# A comment.'])
+        result = self.runner.invoke(
+            self.cli,
+            ['build', str(self._working_dir)],
+        )
+        self.assertEqual(result.exit_code, 0)
+
+        self._docker_client.api.build.assert_called_once()
+        self.assertNotEqual(fingerprint_tag, self._get_fingerprint_tag())
+
+    def test_image_is_rebuilt_when_base_image_changes(self):
+        component = _make_component(
+            func_name='train', target_image='custom-image')
+        _write_components('components.py', component)
+        result = self.runner.invoke(
+            self.cli,
+            ['build', str(self._working_dir)],
+        )
+        self.assertEqual(result.exit_code, 0)
+        fingerprint_tag = self._get_fingerprint_tag()
+        self._use_local_images({
+            fingerprint_tag: mock.Mock(),
+            'python:3.7': mock.Mock(id='sha256:newer-base'),
+        })
+        self._docker_client.reset_mock()
+
+        result = self.runner.invoke(
+            self.cli,
+            ['build', str(self._working_dir)],
+        )
+        self.assertEqual(result.exit_code, 0)
+
+        self._docker_client.api.build.assert_called_once()
+        self.assertNotEqual(fingerprint_tag, self._get_fingerprint_tag())
+
+    def test_dockerignored_files_do_not_change_fingerprint(self):
+        component = _make_component(
+            func_name='train', target_image='custom-image')
+        _write_components('components.py', component)
+        _write_file('.dockerignore', 'component_metadata/\n*.log\ndata/**\n')
+        result = self.runner.invoke(
+            self.cli,
+            ['build', str(self._working_dir)],
+        )
+        self.assertEqual(result.exit_code, 0)
+        self._use_local_images({self._get_fingerprint_tag(): mock.Mock()})
+        self._docker_client.reset_mock()
+
+        _write_file('build.log', 'log')
+        _write_file('data/nested/file.csv', 'data')
+        result = self.runner.invoke(
+            self.cli,
+            ['build', str(self._working_dir), '--no-push-image'],
+        )
+        self.assertEqual(result.exit_code, 0)
+
+        self._docker_client.api.build.assert_not_called()
+
+    def test_is_dockerignored(self):
+        patterns = [['*.log'], ['data'], ['**', '*.tmp'], ['docs', '*', 'x']]
+
+        self.assertTrue(component._is_dockerignored('a.log', patterns))
+        self.assertFalse(component._is_dockerignored('sub/a.log', patterns))
+        self.assertTrue(component._is_dockerignored('data', patterns))
+        self.assertTrue(component._is_dockerignored('sub/a.tmp', patterns))
+        self.assertTrue(component._is_dockerignored('docs/a/x', patterns))
+        self.assertFalse(component._is_dockerignored('docs/x', patterns))
+
+    def test_multiple_directories_are_built(self):
+        for directory in ['a', 'b']:
+            _write_components(
+                f'{directory}/components.py',
+                _make_component(
+                    func_name='train', target_image=f'image-{directory}'))
+
+        result = self.runner.invoke(
+            self.cli,
+            [
+                'build',
+                str(self._working_dir / 'a'),
+                str(self._working_dir / 'b'), '--max-parallel-builds=2'
+            ],
+        )
+        self.assertEqual(result.exit_code, 0)
+
+        self.assertEqual(2, self._docker_client.api.build.call_count)
+        built_paths = [
+            call[1]['path']
+            for call in self._docker_client.api.build.call_args_list
+        ]
+        self.assertCountEqual(
+            [str(self._working_dir / 'a'),
+             str(self._working_dir / 'b')], built_paths)
+        pushed_images = [
+            call[0][0]
+            for call in self._docker_client.images.push.call_args_list
+        ]
+        self.assertCountEqual(['image-a', 'image-b'], pushed_images)
+
+    def test_multiple_directories_must_have_different_target_images(self):
+        for directory in ['a', 'b']:
+            _write_components(
+                f'{directory}/components.py',
+                _make_component(func_name='train', target_image='image'))
+
+        result = self.runner.invoke(
+            self.cli,
+            [
+                'build',
+                str(self._working_dir / 'a'),
+                str(self._working_dir / 'b')
+            ],
+        )
+        self.assertEqual(result.exit_code, 1)
+
+        self._docker_client.api.build.assert_not_called()
+
+    def test_failed_build_fails_multiple_directories(self):
+        for directory in ['a', 'b']:
+            _write_components(
+                f'{directory}/components.py',
+                _make_component(
+                    func_name='train', target_image=f'image-{directory}'))
+
+        def build(path, **kwargs):
+            if path.endswith('a'):
+                raise component.docker.errors.BuildError('Failed', [])
+            return [{'stream': 'Build logs'}]
+
+        self._docker_client.api.build.side_effect = build
+
+        result = self.runner.invoke(
+            self.cli,
+            [
+                'build',
+                str(self._working_dir / 'a'),
+                str(self._working_dir / 'b')
+            ],
+        )
+        self.assertEqual(result.exit_code, 1)
+
+        self._docker_client.images.push.assert_called_once_with(
+            'image-b', stream=True, decode=True)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -18,9 +18,12 @@ __all__ = [
 ]
 
 from kfp.client.client import Client
+from kfp.client.run_watcher import PollingBackoff
+from kfp.client.run_watcher import RunStateEvent
 from kfp.client.set_volume_credentials import \
     ServiceAccountTokenVolumeCredentials
 from kfp.client.token_credentials_base import TokenCredentialsBase
+from kfp.components.bulk import BulkOperationResult
 
 KF_PIPELINES_SA_TOKEN_ENV = 'KF_PIPELINES_SA_TOKEN_PATH'
 KF_PIPELINES_SA_TOKEN_PATH = '/var/run/secrets/kubeflow/pipelines/token'
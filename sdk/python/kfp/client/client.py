@@ -24,18 +24,20 @@ import tarfile
 import tempfile
 import time
 from types import ModuleType
-from typing import Any, Dict, List, Optional, TextIO
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO
 import warnings
 import zipfile
 
 from google.protobuf import json_format
 from kfp import compiler
 from kfp.client import auth
+from kfp.client import run_watcher
 from kfp.client import set_volume_credentials
 from kfp.components import base_component
+from kfp.components import bulk
+from kfp.components import yaml_utils
 from kfp.pipeline_spec import pipeline_spec_pb2
 import kfp_server_api
-import yaml
 
 # Operators on scalar values. Only applies to one of |int_value|,
 # |long_value|, |string_value| or |timestamp_value|.
@@ -124,6 +126,11 @@ class Client:
         ui_host: Base URL to use to open the Kubeflow Pipelines UI. This is used
             when running the client from a notebook to generate and print links.
         verify_ssl: Whether to verify the server's TLS certificate.
+        connection_pool_maxsize: The maximum number of connections to the
+            API server that are kept open for reuse. Should be at least the
+            ``max_concurrency`` of bulk operations such as ``create_runs``.
+            Defaults to the default ``max_concurrency`` of bulk operations,
+            or to the default of ``kfp_server_api`` if it is larger.
     """
 
     # in-cluster DNS name of the pipeline service
@@ -153,6 +160,7 @@ class Client:
         credentials: Optional[str] = None,
         ui_host: Optional[str] = None,
         verify_ssl: Optional[bool] = None,
+        connection_pool_maxsize: Optional[int] = None,
     ) -> None:
         """Create a new instance of kfp client."""
         warnings.warn(
@@ -173,6 +181,10 @@ class Client:
                                    other_client_secret, existing_token, proxy,
                                    ssl_ca_cert, kube_context, credentials,
                                    verify_ssl)
+        if connection_pool_maxsize is None:
+            connection_pool_maxsize = max(config.connection_pool_maxsize or 0,
+                                          bulk.DEFAULT_MAX_CONCURRENCY)
+        config.connection_pool_maxsize = connection_pool_maxsize
         # Save the loaded API client configuration, as a reference if update is
         # needed.
         self._load_context_setting_or_default()
@@ -724,6 +736,41 @@ class Client:
         Returns:
             ``V2beta1Run`` object.
         """
+        response = self._create_run(
+            experiment_id=experiment_id,
+            job_name=job_name,
+            pipeline_package_path=pipeline_package_path,
+            params=params,
+            pipeline_id=pipeline_id,
+            version_id=version_id,
+            pipeline_root=pipeline_root,
+            enable_caching=enable_caching,
+            service_account=service_account,
+        )
+
+        link = f'{self._get_url_prefix()}/#/runs/details/{response.run_id}'
+        if self._is_ipython():
+            import IPython
+            html = (f'<a href="{link}" target="_blank" >Run details</a>.')
+            IPython.display.display(IPython.display.HTML(html))
+        else:
+            print(f'Run details: {link}')
+
+        return response
+
+    def _create_run(
+        self,
+        experiment_id: str,
+        job_name: str,
+        pipeline_package_path: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+        pipeline_id: Optional[str] = None,
+        version_id: Optional[str] = None,
+        pipeline_root: Optional[str] = None,
+        enable_caching: Optional[bool] = None,
+        service_account: Optional[str] = None,
+        pipeline_doc: Optional[_PipelineDoc] = None,
+    ) -> kfp_server_api.V2beta1Run:
         job_config = self._create_job_config(
             params=params,
             pipeline_package_path=pipeline_package_path,
@@ -731,6 +778,7 @@ class Client:
             version_id=version_id,
             enable_caching=enable_caching,
             pipeline_root=pipeline_root,
+            pipeline_doc=pipeline_doc,
         )
 
         run_body = kfp_server_api.V2beta1Run(
@@ -741,17 +789,101 @@ class Client:
             runtime_config=job_config.runtime_config,
             service_account=service_account)
 
-        response = self._run_api.create_run(body=run_body)
+        return self._run_api.create_run(body=run_body)
 
-        link = f'{self._get_url_prefix()}/#/runs/details/{response.run_id}'
-        if self._is_ipython():
-            import IPython
-            html = (f'<a href="{link}" target="_blank" >Run details</a>.')
-            IPython.display.display(IPython.display.HTML(html))
-        else:
-            print(f'Run details: {link}')
+    def create_runs(
+        self,
+        runs: Iterable[Dict[str, Any]],
+        max_concurrency: int = bulk.DEFAULT_MAX_CONCURRENCY,
+    ) -> List[bulk.BulkOperationResult]:
+        """Creates runs concurrently and waits for all of them.
+
+        Each pipeline package is loaded once, however many runs use it.
+
+        Example:
+          ::
+
+            results = client.create_runs(
+                {
+                    'experiment_id': experiment_id,
+                    'job_name': f'sweep-{i}',
+                    'pipeline_package_path': 'pipeline.yaml',
+                    'params': {'learning_rate': learning_rate},
+                } for i, learning_rate in enumerate(learning_rates))
+            for result in results:
+                if not result.succeeded:
+                    print(f'Failed to create {result.item}: {result.error}')
 
-        return response
+        Args:
+            runs: The keyword arguments of ``run_pipeline`` for each run.
+                Consumed lazily.
+            max_concurrency: The maximum number of requests in flight.
+
+        Returns:
+            A ``BulkOperationResult`` for each run, in the order of ``runs``.
+            The ``item`` of a result is the keyword arguments of the run and
+            its ``result`` is the ``V2beta1Run``.
+        """
+        pipeline_docs: Dict[str, _PipelineDoc] = {}
+
+        def with_pipeline_doc(run_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+            pipeline_package_path = run_kwargs.get('pipeline_package_path')
+            if pipeline_package_path is None:
+                return run_kwargs
+            if pipeline_package_path not in pipeline_docs:
+                pipeline_docs[pipeline_package_path] = _extract_pipeline_yaml(
+                    pipeline_package_path)
+            return dict(
+                run_kwargs, pipeline_doc=pipeline_docs[pipeline_package_path])
+
+        def create_run(run_kwargs: Dict[str, Any]) -> kfp_server_api.V2beta1Run:
+            return self._create_run(**with_pipeline_doc(run_kwargs))
+
+        # Packages are loaded by the first worker that needs them. Concurrent
+        # loads of the same package only duplicate work.
+        return bulk.run_concurrently(create_run, runs, max_concurrency)
+
+    def archive_runs(
+        self,
+        run_ids: Iterable[str],
+        max_concurrency: int = bulk.DEFAULT_MAX_CONCURRENCY,
+    ) -> List[bulk.BulkOperationResult]:
+        """Archives runs concurrently and waits for all of them.
+
+        Example:
+          ::
+
+            for result in client.archive_runs(
+                    run.run_id for run in client.list_all_runs(filter=...)):
+                if not result.succeeded:
+                    print(f'Failed to archive {result.item}: {result.error}')
+
+        Args:
+            run_ids: IDs of the runs. Consumed lazily.
+            max_concurrency: The maximum number of requests in flight.
+
+        Returns:
+            A ``BulkOperationResult`` for each run, in the order of
+            ``run_ids``. The ``item`` of a result is the run ID.
+        """
+        return bulk.run_concurrently(self.archive_run, run_ids, max_concurrency)
+
+    def delete_runs(
+        self,
+        run_ids: Iterable[str],
+        max_concurrency: int = bulk.DEFAULT_MAX_CONCURRENCY,
+    ) -> List[bulk.BulkOperationResult]:
+        """Deletes runs concurrently and waits for all of them.
+
+        Args:
+            run_ids: IDs of the runs. Consumed lazily.
+            max_concurrency: The maximum number of requests in flight.
+
+        Returns:
+            A ``BulkOperationResult`` for each run, in the order of
+            ``run_ids``. The ``item`` of a result is the run ID.
+        """
+        return bulk.run_concurrently(self.delete_run, run_ids, max_concurrency)
 
     def archive_run(self, run_id: str) -> dict:
         """Archives a run.
@@ -917,13 +1049,14 @@ class Client:
         version_id: Optional[str],
         enable_caching: Optional[bool],
         pipeline_root: Optional[str],
+        pipeline_doc: Optional[_PipelineDoc] = None,
     ) -> _JobConfig:
         """Creates a JobConfig with spec and resource_references.
 
         Args:
             pipeline_package_path: Local path of the pipeline package (the
                 filename should end with one of the following .tar.gz, .tgz,
-                .zip, .yaml, .yml).
+                .zip, .yaml, .yml, .pb).
             params: A dictionary with key as param name and value as param value.
             pipeline_id: ID of a pipeline.
             version_id: ID of a pipeline version.
@@ -937,6 +1070,8 @@ class Client:
                 setting applies to all tasks in the pipeline (overrides the
                 compile time settings).
             pipeline_root: Root path of the pipeline outputs.
+            pipeline_doc: The already loaded pipeline package at
+                pipeline_package_path, if any. It is not modified.
 
         Returns:
             A _JobConfig object with attributes .pipeline_spec,
@@ -958,7 +1093,10 @@ class Client:
 
         pipeline_spec = None
         if pipeline_package_path:
-            pipeline_doc = _extract_pipeline_yaml(pipeline_package_path)
+            if pipeline_doc is None:
+                pipeline_doc = _extract_pipeline_yaml(pipeline_package_path)
+            else:
+                pipeline_doc = copy.deepcopy(pipeline_doc)
 
             # Caching option set at submission time overrides the compile time
             # settings.
@@ -1258,6 +1396,40 @@ class Client:
                 sort_by=sort_by,
                 filter=filter)
 
+    def list_all_runs(
+        self,
+        page_size: int = 100,
+        sort_by: str = '',
+        experiment_id: Optional[str] = None,
+        namespace: Optional[str] = None,
+        filter: Optional[str] = None,
+    ) -> Iterator[kfp_server_api.V2beta1Run]:
+        """Lists all runs, fetching pages as they are consumed.
+
+        Args:
+            page_size: Number of runs to fetch per request.
+            sort_by: Sort string of format ``'[field_name]', '[field_name] desc'``. For example, ``'display_name desc'``.
+            experiment_id: Experiment ID to filter upon
+            namespace: Kubernetes namespace to use. Used for multi-user deployments. For single-user deployments, this should be left as ``None``.
+            filter: A url-encoded, JSON-serialized Filter protocol buffer. See ``list_runs``.
+
+        Returns:
+            An iterator of ``V2beta1Run`` objects.
+        """
+        page_token = ''
+        while True:
+            response = self.list_runs(
+                page_token=page_token,
+                page_size=page_size,
+                sort_by=sort_by,
+                experiment_id=experiment_id,
+                namespace=namespace,
+                filter=filter)
+            yield from response.runs or []
+            page_token = response.next_page_token
+            if not page_token:
+                return
+
     def list_recurring_runs(
         self,
         page_token: str = '',
@@ -1393,6 +1565,47 @@ class Client:
             time.sleep(sleep_duration)
         return get_run_response
 
+    def watch_runs(
+        self,
+        run_ids: Iterable[str],
+        timeout: Optional[float] = None,
+        backoff: Optional[run_watcher.PollingBackoff] = None,
+    ) -> Iterator[run_watcher.RunStateEvent]:
+        """Watches the state of runs until they all complete.
+
+        The runs are polled from a single loop, at intervals that are short
+        while a run is pending and grow while it keeps running. This is
+        considerably lighter on the API server than calling
+        ``wait_for_run_completion`` for each run.
+
+        Example:
+          ::
+
+            for event in client.watch_runs(run_ids, timeout=3600):
+                print(f'{event.run_id}: {event.previous_state} -> {event.state}')
+
+        Args:
+            run_ids: IDs of the runs.
+            timeout: Time in seconds after which to stop watching. Waits
+                indefinitely if not set.
+            backoff: The polling intervals. Defaults to ``PollingBackoff()``.
+
+        Returns:
+            An iterator of ``RunStateEvent`` for every change of state of the
+            runs, starting with the state of each run when it is first
+            polled. Runs are no longer polled once in a terminal state.
+
+        Raises:
+            TimeoutError: If some runs do not complete within timeout.
+        """
+        return run_watcher.watch_runs(
+            get_run=lambda run_id: self._run_api.get_run(run_id=run_id),
+            refresh_token=self._refresh_api_client_token,
+            run_ids=run_ids,
+            timeout=timeout,
+            backoff=backoff,
+        )
+
     def upload_pipeline(
         self,
         pipeline_package_path: str,
@@ -1417,11 +1630,15 @@ class Client:
             pipeline_doc = _extract_pipeline_yaml(pipeline_package_path)
             pipeline_name = pipeline_doc.pipeline_spec.pipeline_info.name
         validate_pipeline_resource_name(pipeline_name)
-        response = self._upload_api.upload_pipeline(
-            pipeline_package_path,
-            name=pipeline_name,
-            description=description,
-            namespace=namespace)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            if pipeline_package_path.endswith('.pb'):
+                pipeline_package_path = _convert_pb_package_to_yaml(
+                    pipeline_package_path, tmpdir)
+            response = self._upload_api.upload_pipeline(
+                pipeline_package_path,
+                name=pipeline_name,
+                description=description,
+                namespace=namespace)
         link = f'{self._get_url_prefix()}/#/pipelines/details/{response.pipeline_id}'
         if self._is_ipython():
             import IPython
@@ -1468,8 +1685,12 @@ class Client:
         if description:
             kwargs['description'] = description
 
-        response = self._upload_api.upload_pipeline_version(
-            pipeline_package_path, **kwargs)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            if pipeline_package_path.endswith('.pb'):
+                pipeline_package_path = _convert_pb_package_to_yaml(
+                    pipeline_package_path, tmpdir)
+            response = self._upload_api.upload_pipeline_version(
+                pipeline_package_path, **kwargs)
 
         link = f'{self._get_url_prefix()}/#/pipelines/details/{response.pipeline_id}/version/{response.pipeline_version_id}'
         if self._is_ipython():
@@ -1648,7 +1869,7 @@ def _extract_pipeline_yaml(package_file: str) -> _PipelineDoc:
                 'are multiple yaml files.')
 
     def _safe_load_yaml(stream: TextIO) -> _PipelineDoc:
-        docs = yaml.safe_load_all(stream)
+        docs = yaml_utils.safe_load_all(stream)
         pipeline_spec_dict = None
         platform_spec_dict = {}
         for doc in docs:
@@ -1678,10 +1899,28 @@ def _extract_pipeline_yaml(package_file: str) -> _PipelineDoc:
     elif package_file.endswith('.yaml') or package_file.endswith('.yml'):
         with open(package_file, 'r') as f:
             return _safe_load_yaml(f)
+    elif package_file.endswith('.pb'):
+        with open(package_file, 'rb') as f:
+            return _PipelineDoc(
+                pipeline_spec=pipeline_spec_pb2.PipelineSpec.FromString(
+                    f.read()),
+                platform_spec=pipeline_spec_pb2.PlatformSpec())
     else:
         raise ValueError(
             f'The package_file {package_file} should end with one of the '
-            'following formats: [.tar.gz, .tgz, .zip, .yaml, .yml].')
+            'following formats: [.tar.gz, .tgz, .zip, .yaml, .yml, .pb].')
+
+
+def _convert_pb_package_to_yaml(package_file: str, output_dir: str) -> str:
+    """Writes a binary protobuf pipeline package as YAML, which the API server
+    accepts, and returns the path of the YAML file."""
+    pipeline_doc = _extract_pipeline_yaml(package_file)
+    file_name = os.path.splitext(os.path.basename(package_file))[0]
+    yaml_file = os.path.join(output_dir, f'{file_name}.yaml')
+    with open(yaml_file, 'w') as f:
+        yaml_utils.dump_all(
+            [json_format.MessageToDict(pipeline_doc.pipeline_spec)], f)
+    return yaml_file
 
 
 def _override_caching_options(
@@ -25,6 +25,7 @@ from absl.testing import parameterized
 from google.protobuf import json_format
 from kfp.client import client
 from kfp.compiler import Compiler
+from kfp.components import bulk
 from kfp.dsl import component
 from kfp.dsl import pipeline
 from kfp.pipeline_spec import pipeline_spec_pb2
@@ -385,6 +386,151 @@ class TestClient(unittest.TestCase):
                         description='description',
                         namespace='ns1')
 
+    def test_upload_pipeline_from_pb(self):
+
+        @component
+        def return_bool(boolean: bool) -> bool:
+            return boolean
+
+        @pipeline(name='test-upload-from-pb')
+        def pipeline_test_upload_from_pb(boolean: bool = True):
+            return_bool(boolean=boolean)
+
+        def check_uploaded_file(package_path, **kwargs):
+            self.assertTrue(package_path.endswith('.yaml'))
+            self.assertEqual(
+                client._extract_pipeline_yaml(package_path).pipeline_spec,
+                pipeline_test_upload_from_pb.pipeline_spec)
+            return MagicMock()
+
+        with patch.object(
+                self.client._upload_api,
+                'upload_pipeline',
+                side_effect=check_uploaded_file) as mock_upload_pipeline:
+            with patch.object(self.client, '_is_ipython', return_value=False):
+                with tempfile.TemporaryDirectory() as tmp_path:
+                    pipeline_test_path = os.path.join(tmp_path, 'test.pb')
+                    Compiler().compile(
+                        pipeline_func=pipeline_test_upload_from_pb,
+                        package_path=pipeline_test_path)
+                    self.client.upload_pipeline(
+                        pipeline_package_path=pipeline_test_path)
+
+        mock_upload_pipeline.assert_called_once()
+        self.assertEqual(mock_upload_pipeline.call_args.kwargs['name'],
+                         'test-upload-from-pb')
+
+    def test_list_all_runs(self):
+        pages = {
+            '':
+                kfp_server_api.V2beta1ListRunsResponse(
+                    runs=[
+                        kfp_server_api.V2beta1Run(run_id='a'),
+                        kfp_server_api.V2beta1Run(run_id='b')
+                    ],
+                    next_page_token='page-2'),
+            'page-2':
+                kfp_server_api.V2beta1ListRunsResponse(
+                    runs=[kfp_server_api.V2beta1Run(run_id='c')]),
+        }
+        with patch.object(
+                self.client._run_api,
+                'list_runs',
+                side_effect=lambda page_token, **kwargs: pages[page_token]
+        ) as mock_list_runs:
+            runs = self.client.list_all_runs(page_size=2, experiment_id='exp')
+            mock_list_runs.assert_not_called()
+
+            self.assertEqual([run.run_id for run in runs], ['a', 'b', 'c'])
+        self.assertEqual(mock_list_runs.call_count, 2)
+        self.assertEqual(mock_list_runs.call_args.kwargs['experiment_id'],
+                         'exp')
+
+    def test_archive_runs(self):
+
+        def archive_run(run_id):
+            if run_id == 'bad':
+                raise kfp_server_api.ApiException(status=404)
+            return {}
+
+        with patch.object(
+                self.client._run_api, 'archive_run',
+                side_effect=archive_run) as mock_archive_run:
+            results = self.client.archive_runs(['a', 'bad', 'c'])
+
+        self.assertEqual(mock_archive_run.call_count, 3)
+        self.assertEqual([result.item for result in results], ['a', 'bad', 'c'])
+        self.assertEqual([result.succeeded for result in results],
+                         [True, False, True])
+
+    def test_delete_runs_without_reading_results(self):
+        with patch.object(self.client._run_api,
+                          'delete_run') as mock_delete_run:
+            self.client.delete_runs(['a', 'b', 'c'])
+
+        self.assertCountEqual(
+            [call.kwargs['run_id'] for call in mock_delete_run.call_args_list],
+            ['a', 'b', 'c'])
+
+    def test_connection_pool_fits_bulk_operations(self):
+        self.assertGreaterEqual(
+            self.client._existing_config.connection_pool_maxsize,
+            bulk.DEFAULT_MAX_CONCURRENCY)
+
+    def test_create_runs_loads_package_once(self):
+
+        @component
+        def return_bool(boolean: bool) -> bool:
+            return boolean
+
+        @pipeline(name='test-create-runs')
+        def pipeline_test_create_runs(boolean: bool = True):
+            return_bool(boolean=boolean)
+
+        with patch.object(
+                self.client._run_api, 'create_run',
+                side_effect=lambda body: body) as mock_create_run, patch.object(
+                    client,
+                    '_extract_pipeline_yaml',
+                    wraps=client._extract_pipeline_yaml) as mock_extract:
+            with tempfile.TemporaryDirectory() as tmp_path:
+                pipeline_test_path = os.path.join(tmp_path, 'test.yaml')
+                Compiler().compile(
+                    pipeline_func=pipeline_test_create_runs,
+                    package_path=pipeline_test_path)
+                runs = ({
+                    'experiment_id': 'exp',
+                    'job_name': f'run-{i}',
+                    'pipeline_package_path': pipeline_test_path,
+                    'params': {
+                        'boolean': i % 2 == 0
+                    },
+                    'enable_caching': i % 2 == 0,
+                } for i in range(5))
+                results = self.client.create_runs(runs, max_concurrency=1)
+
+        self.assertEqual(mock_extract.call_count, 1)
+        self.assertEqual(mock_create_run.call_count, 5)
+        runs = {result.item['job_name']: result.result for result in results}
+        self.assertEqual(runs['run-1'].runtime_config.parameters,
+                         {'boolean': False})
+        self.assertFalse(runs['run-1'].pipeline_spec['root']['dag']['tasks']
+                         ['return-bool']['cachingOptions'].get('enableCache'))
+        self.assertTrue(runs['run-2'].pipeline_spec['root']['dag']['tasks']
+                        ['return-bool']['cachingOptions']['enableCache'])
+
+    def test_watch_runs(self):
+        with patch.object(
+                self.client._run_api,
+                'get_run',
+                side_effect=lambda run_id: kfp_server_api.V2beta1Run(
+                    run_id=run_id, state='SUCCEEDED')) as mock_get_run:
+            events = list(self.client.watch_runs(['a', 'b']))
+
+        self.assertEqual([(event.run_id, event.state) for event in events],
+                         [('a', 'SUCCEEDED'), ('b', 'SUCCEEDED')])
+        self.assertEqual(mock_get_run.call_count, 2)
+
     def test_upload_pipeline_with_name(self):
         with patch.object(self.client._upload_api,
                           'upload_pipeline') as mock_upload_pipeline:
@@ -0,0 +1,177 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Watching the state of many runs with a single poller."""
+
+import dataclasses
+import heapq
+import logging
+import random
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import kfp_server_api
+
+TERMINAL_STATES = frozenset(
+    ['SUCCEEDED', 'SKIPPED', 'FAILED', 'CANCELED', 'ERROR'])
+
+# States in which a run is expected to change state soon.
+_PENDING_STATES = frozenset(['RUNTIME_STATE_UNSPECIFIED', 'PENDING', ''])
+
+
+@dataclasses.dataclass
+class PollingBackoff:
+    """The intervals at which the state of a watched run is polled.
+
+    A run is polled after ``initial_interval`` seconds, and then at
+    intervals that grow by ``multiplier`` while its state does not
+    change, up to ``max_pending_interval`` while it is pending and
+    ``max_interval`` afterwards. The interval is reset when the state
+    changes. Each interval is randomized by up to ``jitter`` (a fraction
+    of the interval) so that runs created together are not polled in
+    lockstep.
+    """
+    initial_interval: float = 1.0
+    max_pending_interval: float = 5.0
+    max_interval: float = 60.0
+    multiplier: float = 1.5
+    jitter: float = 0.2
+
+    def next_interval(self, previous_interval: Optional[float],
+                      state: Optional[str]) -> float:
+        """Returns the interval before the next poll, without jitter.
+
+        Args:
+            previous_interval: The previous interval, or None if the state of
+                the run just changed.
+            state: The current state of the run.
+        """
+        if previous_interval is None:
+            return self.initial_interval
+        if (state or '').upper() in _PENDING_STATES:
+            max_interval = self.max_pending_interval
+        else:
+            max_interval = self.max_interval
+        return min(previous_interval * self.multiplier, max_interval)
+
+    def add_jitter(self, interval: float) -> float:
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+@dataclasses.dataclass
+class RunStateEvent:
+    """A change of the state of a watched run.
+
+    Attributes:
+        run_id: ID of the run.
+        previous_state: The previous state of the run, or None if it is the
+            first time the run is polled.
+        state: The new state of the run.
+        run: The run, as of the poll that observed the new state.
+    """
+    run_id: str
+    previous_state: Optional[str]
+    state: Optional[str]
+    run: kfp_server_api.V2beta1Run
+
+    @property
+    def is_terminal(self) -> bool:
+        return (self.state or '').upper() in TERMINAL_STATES
+
+
+def watch_runs(
+    get_run: Callable[[str], kfp_server_api.V2beta1Run],
+    refresh_token: Callable[[], None],
+    run_ids: Iterable[str],
+    timeout: Optional[float] = None,
+    backoff: Optional[PollingBackoff] = None,
+) -> Iterator[RunStateEvent]:
+    """Polls the state of runs until they are all in a terminal state.
+
+    Args:
+        get_run: Gets a run by ID.
+        refresh_token: Refreshes the access token of get_run. Called once
+            when a request fails with 401 Unauthorized after earlier requests
+            succeeded, however many runs are watched.
+        run_ids: IDs of the runs to watch.
+        timeout: Time in seconds after which to stop watching.
+        backoff: The polling intervals.
+
+    Returns:
+        An iterator of the state changes of the runs, starting with the
+        state of each run when it is first polled.
+
+    Raises:
+        TimeoutError: If some runs are not in a terminal state after
+            timeout seconds.
+    """
+    backoff = backoff or PollingBackoff()
+    start_time = time.monotonic()
+    deadline = None if timeout is None else start_time + timeout
+
+    # Heap of (poll time, order, run ID). The order breaks ties so that runs
+    # are first polled in the order they were given.
+    queue: List[Tuple[float, int, str]] = [
+        (start_time, order, run_id)
+        for order, run_id in enumerate(dict.fromkeys(run_ids))
+    ]
+    states: Dict[str, Optional[str]] = {}
+    intervals: Dict[str, Optional[float]] = {}
+    is_valid_token = False
+
+    while queue:
+        poll_time, order, run_id = queue[0]
+        now = time.monotonic()
+        if deadline is not None and now >= deadline:
+            raise TimeoutError(
+                f'Timed out after {timeout} seconds waiting for runs '
+                f'{sorted(run_id for _, _, run_id in queue)}.')
+        if poll_time > now:
+            wake_time = poll_time if deadline is None else min(
+                poll_time, deadline)
+            time.sleep(wake_time - now)
+            continue
+        heapq.heappop(queue)
+
+        try:
+            run = get_run(run_id)
+            is_valid_token = True
+        except kfp_server_api.ApiException as api_ex:
+            # If the token was valid but a request is rejected as
+            # unauthorized, then refresh it once for all the runs.
+            if is_valid_token and api_ex.status == 401:
+                logging.info('Access token has expired !!! Refreshing ...')
+                refresh_token()
+                is_valid_token = False
+                heapq.heappush(queue, (now, order, run_id))
+                continue
+            raise
+
+        previous_state = states.get(run_id)
+        if run_id not in states or run.state != previous_state:
+            states[run_id] = run.state
+            intervals[run_id] = None
+            event = RunStateEvent(
+                run_id=run_id,
+                previous_state=previous_state,
+                state=run.state,
+                run=run)
+            yield event
+            if event.is_terminal:
+                continue
+
+        interval = backoff.next_interval(intervals[run_id], run.state)
+        intervals[run_id] = interval
+        heapq.heappush(
+            queue,
+            (time.monotonic() + backoff.add_jitter(interval), order, run_id))
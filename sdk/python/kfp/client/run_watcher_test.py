@@ -0,0 +1,172 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for kfp.client.run_watcher."""
+
+from typing import Dict, List
+import unittest
+from unittest import mock
+
+from kfp.client import run_watcher
+import kfp_server_api
+
+
+class _FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class _FakeRunApi:
+    """Serves run states from a timeline of (start time, state) per run."""
+
+    def __init__(self, clock: _FakeClock, timelines: Dict[str, List[tuple]]):
+        self.clock = clock
+        self.timelines = timelines
+        self.polls: List[tuple] = []
+
+    def get_run(self, run_id: str) -> kfp_server_api.V2beta1Run:
+        self.polls.append((self.clock.now, run_id))
+        state = None
+        for start_time, timeline_state in self.timelines[run_id]:
+            if self.clock.now >= start_time:
+                state = timeline_state
+        return kfp_server_api.V2beta1Run(run_id=run_id, state=state)
+
+
+class WatchRunsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = _FakeClock()
+        patcher = mock.patch.object(run_watcher, 'time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.backoff = run_watcher.PollingBackoff(jitter=0)
+
+    def test_yields_state_transitions(self):
+        run_api = _FakeRunApi(
+            self.clock, {
+                'a': [(0, 'PENDING'), (3, 'RUNNING'), (100, 'SUCCEEDED')],
+                'b': [(0, 'RUNNING'), (10, 'FAILED')],
+            })
+
+        events = [(event.run_id, event.previous_state, event.state)
+                  for event in run_watcher.watch_runs(
+                      run_api.get_run,
+                      refresh_token=mock.Mock(),
+                      run_ids=['a', 'b'],
+                      backoff=self.backoff)]
+
+        self.assertEqual(events, [
+            ('a', None, 'PENDING'),
+            ('b', None, 'RUNNING'),
+            ('a', 'PENDING', 'RUNNING'),
+            ('b', 'RUNNING', 'FAILED'),
+            ('a', 'RUNNING', 'SUCCEEDED'),
+        ])
+        # Runs are polled less often the longer they run, and not after they
+        # complete.
+        self.assertEqual(
+            [time for time, run_id in run_api.polls if run_id == 'b'],
+            [0, 1, 2.5, 4.75, 8.125, 13.1875])
+        self.assertLess(len(run_api.polls), 25)
+
+    def test_refreshes_token_once_for_all_runs(self):
+        run_api = _FakeRunApi(
+            self.clock, {
+                'a': [(0, 'RUNNING'), (5, 'SUCCEEDED')],
+                'b': [(0, 'RUNNING'), (5, 'SUCCEEDED')],
+            })
+        get_run = run_api.get_run
+        token = {'valid': True}
+
+        def get_run_with_token(run_id):
+            if self.clock.now >= 2 and not token['valid']:
+                raise kfp_server_api.ApiException(status=401)
+            return get_run(run_id)
+
+        def refresh_token():
+            token['valid'] = True
+
+        def expire_token(seconds):
+            if self.clock.now < 2 <= self.clock.now + seconds:
+                token['valid'] = False
+            self.clock.now += seconds
+
+        refresh_token_mock = mock.Mock(side_effect=refresh_token)
+        with mock.patch.object(self.clock, 'sleep', side_effect=expire_token):
+            events = list(
+                run_watcher.watch_runs(
+                    get_run_with_token,
+                    refresh_token=refresh_token_mock,
+                    run_ids=['a', 'b'],
+                    backoff=self.backoff))
+
+        refresh_token_mock.assert_called_once()
+        self.assertEqual([event.state for event in events if event.is_terminal],
+                         ['SUCCEEDED', 'SUCCEEDED'])
+
+    def test_unauthorized_before_any_success_raises(self):
+        with self.assertRaises(kfp_server_api.ApiException):
+            list(
+                run_watcher.watch_runs(
+                    mock.Mock(
+                        side_effect=kfp_server_api.ApiException(status=401)),
+                    refresh_token=mock.Mock(),
+                    run_ids=['a']))
+
+    def test_timeout(self):
+        run_api = _FakeRunApi(self.clock, {'a': [(0, 'RUNNING')]})
+
+        events = run_watcher.watch_runs(
+            run_api.get_run,
+            refresh_token=mock.Mock(),
+            run_ids=['a'],
+            timeout=30,
+            backoff=self.backoff)
+
+        self.assertEqual(next(events).state, 'RUNNING')
+        with self.assertRaisesRegex(TimeoutError, r"\['a'\]"):
+            next(events)
+        self.assertEqual(self.clock.now, 30)
+
+
+class PollingBackoffTest(unittest.TestCase):
+
+    def test_next_interval(self):
+        backoff = run_watcher.PollingBackoff(
+            initial_interval=1,
+            max_pending_interval=2,
+            max_interval=10,
+            multiplier=2)
+
+        self.assertEqual(backoff.next_interval(None, 'RUNNING'), 1)
+        self.assertEqual(backoff.next_interval(1, 'PENDING'), 2)
+        self.assertEqual(backoff.next_interval(2, 'PENDING'), 2)
+        self.assertEqual(backoff.next_interval(2, 'RUNNING'), 4)
+        self.assertEqual(backoff.next_interval(8, 'RUNNING'), 10)
+
+    def test_jitter(self):
+        backoff = run_watcher.PollingBackoff(jitter=0.5)
+        for _ in range(100):
+            self.assertTrue(5 <= backoff.add_jitter(10) <= 15)
+
+
+if __name__ == '__main__':
+    unittest.main()
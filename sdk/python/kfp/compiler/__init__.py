@@ -16,5 +16,7 @@ definitions."""
 
 __all__ = [
     'Compiler',
+    'Wheelhouse',
 ]
 from kfp.compiler.compiler import Compiler
+from kfp.compiler.wheelhouse import Wheelhouse
@@ -0,0 +1,275 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Cache of compiled pipeline specs, keyed on a fingerprint of their
+sources."""
+
+import collections
+import enum
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Dict, Optional, Tuple
+
+from google.protobuf import json_format
+from google.protobuf import message
+import kfp
+from kfp.pipeline_spec import pipeline_spec_pb2
+
+# Directory of the on-disk cache shared across processes. Compiled specs are
+# only cached if it is set, or if a cache is set with `set_default_cache`.
+COMPILATION_CACHE_DIR_ENV_VAR = 'KFP_COMPILATION_CACHE_DIR'
+
+# Bump when the layout of cache entries or the fingerprint changes.
+_CACHE_FORMAT_VERSION = '1'
+_DEFAULT_MAX_ENTRIES = 1024
+_FILE_SUFFIX = '.json'
+
+
+def _message_to_json(msg: message.Message) -> str:
+    # JSON is used rather than the wire format since it is considerably faster
+    # to produce and parse with the pure Python protobuf implementation.
+    return json.dumps(
+        json_format.MessageToDict(msg), sort_keys=True, separators=(',', ':'))
+
+
+class UnfingerprintableObjectError(TypeError):
+    """Raised when an object's content cannot be fingerprinted."""
+
+
+class _Fingerprinter:
+    """Converts an object graph to a canonical JSON-serializable form.
+
+    Objects are expanded to their attributes. Objects that were already
+    visited, including ones on a reference cycle, are replaced with the
+    index at which they were first visited, so that the result depends only
+    on the structure and content of the graph.
+
+    Callables are identified by their qualified name, so only ones defined
+    at the top level of a module or class are accepted: a function defined
+    in another function may close over arbitrary state.
+    """
+
+    def __init__(self):
+        self._visited: Dict[int, int] = {}
+        # Keeps visited objects alive so that their ids are not reused.
+        self._objects = []
+
+    def canonicalize(self, obj: Any) -> Any:
+        if obj is None or isinstance(obj, (bool, int, str)):
+            return obj
+        if isinstance(obj, float):
+            return repr(obj)
+        if isinstance(obj, enum.Enum):
+            return [type(obj).__qualname__, self.canonicalize(obj.value)]
+        if isinstance(obj, (list, tuple)):
+            return [self.canonicalize(item) for item in obj]
+        if isinstance(obj, (set, frozenset)):
+            return sorted(
+                json.dumps(self.canonicalize(item), sort_keys=True)
+                for item in obj)
+
+        if id(obj) in self._visited:
+            return {'__ref__': self._visited[id(obj)]}
+        self._visited[id(obj)] = len(self._visited)
+        self._objects.append(obj)
+
+        if isinstance(obj, dict):
+            return [[self.canonicalize(key),
+                     self.canonicalize(value)] for key, value in obj.items()]
+        if isinstance(obj, message.Message):
+            return {
+                '__proto__':
+                    obj.DESCRIPTOR.full_name,
+                'sha256':
+                    hashlib.sha256(_message_to_json(obj).encode()).hexdigest(),
+            }
+        if callable(obj) and hasattr(obj, '__qualname__'):
+            if '<locals>' in obj.__qualname__:
+                raise UnfingerprintableObjectError(
+                    f'Cannot fingerprint local callable {obj.__qualname__}.')
+            return {
+                '__callable__':
+                    f'{getattr(obj, "__module__", "")}.{obj.__qualname__}'
+            }
+        if hasattr(obj, '__dict__'):
+            return {
+                '__class__':
+                    f'{type(obj).__module__}.{type(obj).__qualname__}',
+                'attributes':
+                    self.canonicalize(
+                        dict(
+                            sorted(vars(obj).items(),
+                                   key=lambda item: item[0]))),
+            }
+        raise UnfingerprintableObjectError(
+            f'Cannot fingerprint object of type {type(obj).__qualname__}.')
+
+
+def fingerprint(*objects: Any) -> str:
+    """Computes a stable hash of the content of objects.
+
+    Args:
+        *objects: The objects to fingerprint, e.g. a ComponentSpec or a traced
+            pipeline.
+
+    Returns:
+        The hex digest of the fingerprint.
+
+    Raises:
+        UnfingerprintableObjectError: If the content of an object cannot be
+            fingerprinted, in which case it must not be cached.
+    """
+    canonical = [_CACHE_FORMAT_VERSION, kfp.__version__]
+    canonical.append(_Fingerprinter().canonicalize(list(objects)))
+    return hashlib.sha256(
+        json.dumps(canonical, sort_keys=True,
+                   separators=(',', ':')).encode()).hexdigest()
+
+
+class CompilationCache:
+    """A cache of compiled PipelineSpecs and PlatformSpecs.
+
+    Entries are kept in memory and, if ``cache_dir`` is specified, on disk so
+    that they are reused across processes, e.g. by successive invocations of
+    ``kfp dsl compile``.
+
+    Args:
+        cache_dir: The directory in which entries are stored. In-memory only
+            if not specified.
+        max_entries: The maximum number of entries kept in memory.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_entries: int = _DEFAULT_MAX_ENTRIES,
+    ):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        # Entries are the JSON serialization of the specs, so that the cached
+        # specs cannot be mutated by callers.
+        self._entries: 'collections.OrderedDict[str, str]' = (
+            collections.OrderedDict())
+
+    def get(
+        self, key: str
+    ) -> Optional[Tuple[pipeline_spec_pb2.PipelineSpec,
+                        pipeline_spec_pb2.PlatformSpec]]:
+        """Looks up an entry.
+
+        Args:
+            key: The key returned by `fingerprint`.
+
+        Returns:
+            New copies of the cached PipelineSpec and PlatformSpec, or None on
+            a cache miss.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        elif self.cache_dir is not None:
+            entry = self._read_entry(key)
+            if entry is not None:
+                self._add_to_memory(key, entry)
+        if entry is None:
+            return None
+
+        entry_dict = json.loads(entry)
+        return (json_format.ParseDict(entry_dict['pipelineSpec'],
+                                      pipeline_spec_pb2.PipelineSpec()),
+                json_format.ParseDict(entry_dict['platformSpec'],
+                                      pipeline_spec_pb2.PlatformSpec()))
+
+    def put(
+        self,
+        key: str,
+        pipeline_spec: pipeline_spec_pb2.PipelineSpec,
+        platform_spec: Optional[pipeline_spec_pb2.PlatformSpec] = None,
+    ) -> None:
+        """Adds an entry.
+
+        Args:
+            key: The key returned by `fingerprint`.
+            pipeline_spec: The compiled PipelineSpec.
+            platform_spec: The compiled PlatformSpec.
+        """
+        platform_spec = platform_spec or pipeline_spec_pb2.PlatformSpec()
+        entry = json.dumps({
+            'pipelineSpec': json_format.MessageToDict(pipeline_spec),
+            'platformSpec': json_format.MessageToDict(platform_spec),
+        })
+        self._add_to_memory(key, entry)
+        if self.cache_dir is not None:
+            self._write_entry(key, entry)
+
+    def clear(self) -> None:
+        """Removes all in-memory entries."""
+        self._entries.clear()
+
+    def _add_to_memory(self, key: str, entry: str) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read_entry(self, key: str) -> Optional[str]:
+        try:
+            with open(os.path.join(self.cache_dir, key + _FILE_SUFFIX)) as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_entry(self, key: str, entry: str) -> None:
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir)
+            with os.fdopen(fd, 'w') as f:
+                f.write(entry)
+            os.replace(temp_path,
+                       os.path.join(self.cache_dir, key + _FILE_SUFFIX))
+        except OSError:
+            # The on-disk cache is best effort.
+            pass
+
+
+_default_cache: Optional[CompilationCache] = None
+
+
+def get_default_cache() -> Optional[CompilationCache]:
+    """Returns the process-wide compilation cache.
+
+    Returns:
+        The cache set with `set_default_cache`, else a cache in the
+        ``KFP_COMPILATION_CACHE_DIR`` directory, or None if that is not set
+        either, in which case compiled specs are not cached.
+    """
+    global _default_cache
+    if _default_cache is None:
+        cache_dir = os.environ.get(COMPILATION_CACHE_DIR_ENV_VAR)
+        if cache_dir:
+            _default_cache = CompilationCache(cache_dir=cache_dir)
+    return _default_cache
+
+
+def set_default_cache(cache: Optional[CompilationCache]) -> None:
+    """Sets the process-wide compilation cache.
+
+    Args:
+        cache: The cache to use. If None, the cache is created on next use
+            from the ``KFP_COMPILATION_CACHE_DIR`` environment variable, if
+            set.
+    """
+    global _default_cache
+    _default_cache = cache
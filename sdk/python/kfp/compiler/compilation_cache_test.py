@@ -0,0 +1,206 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for kfp.compiler.compilation_cache."""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from kfp import dsl
+from kfp.compiler import compilation_cache
+from kfp.compiler import pipeline_spec_builder
+from kfp.components import structures
+from kfp.pipeline_spec import pipeline_spec_pb2
+
+
+@dsl.component
+def add(a: int, b: int) -> int:
+    return a + b
+
+
+class _Node:
+
+    def __init__(self, value):
+        self.value = value
+        self.next = None
+
+
+class _Slotted:
+    __slots__ = ['value']
+
+    def __init__(self, value):
+        self.value = value
+
+
+class FingerprintTest(unittest.TestCase):
+
+    def test_equal_content_has_equal_fingerprint(self):
+        self.assertEqual(
+            compilation_cache.fingerprint({'a': [1, 2.0]}, 'b'),
+            compilation_cache.fingerprint({'a': [1, 2.0]}, 'b'))
+        self.assertNotEqual(
+            compilation_cache.fingerprint({'a': [1, 2.0]}),
+            compilation_cache.fingerprint({'a': [1, 3.0]}))
+
+    def test_reference_cycles(self):
+
+        def make_cycle(value):
+            first, second = _Node(value), _Node(value)
+            first.next, second.next = second, first
+            return first
+
+        self.assertEqual(
+            compilation_cache.fingerprint(make_cycle(1)),
+            compilation_cache.fingerprint(make_cycle(1)))
+        self.assertNotEqual(
+            compilation_cache.fingerprint(make_cycle(1)),
+            compilation_cache.fingerprint(make_cycle(2)))
+
+    def test_protos(self):
+        self.assertNotEqual(
+            compilation_cache.fingerprint(
+                pipeline_spec_pb2.PipelineSpec(sdk_version='a')),
+            compilation_cache.fingerprint(
+                pipeline_spec_pb2.PipelineSpec(sdk_version='b')))
+
+    def test_unknown_objects_are_not_fingerprinted(self):
+        with self.assertRaises(compilation_cache.UnfingerprintableObjectError):
+            compilation_cache.fingerprint(_Slotted(1))
+        with self.assertRaises(compilation_cache.UnfingerprintableObjectError):
+            compilation_cache.fingerprint(b'bytes')
+
+    def test_local_callables_are_not_fingerprinted(self):
+
+        def make_callable(value):
+            return lambda: value
+
+        self.assertEqual(
+            compilation_cache.fingerprint(_Node, os.path.join),
+            compilation_cache.fingerprint(_Node, os.path.join))
+        with self.assertRaises(compilation_cache.UnfingerprintableObjectError):
+            compilation_cache.fingerprint(make_callable(1))
+
+
+class CompilationCacheTest(unittest.TestCase):
+
+    def test_get_returns_copies(self):
+        cache = compilation_cache.CompilationCache()
+        cache.put('key', pipeline_spec_pb2.PipelineSpec(sdk_version='a'))
+
+        pipeline_spec, platform_spec = cache.get('key')
+        pipeline_spec.sdk_version = 'b'
+
+        self.assertEqual(cache.get('key')[0].sdk_version, 'a')
+        self.assertEqual(platform_spec, pipeline_spec_pb2.PlatformSpec())
+        self.assertIsNone(cache.get('other'))
+
+    def test_on_disk_cache_is_shared(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            compilation_cache.CompilationCache(cache_dir=cache_dir).put(
+                'key', pipeline_spec_pb2.PipelineSpec(sdk_version='a'))
+
+            cache = compilation_cache.CompilationCache(cache_dir=cache_dir)
+            self.assertEqual(cache.get('key')[0].sdk_version, 'a')
+
+    def test_max_entries(self):
+        cache = compilation_cache.CompilationCache(max_entries=2)
+        for key in ['a', 'b', 'c']:
+            cache.put(key, pipeline_spec_pb2.PipelineSpec())
+
+        self.assertIsNone(cache.get('a'))
+        self.assertIsNotNone(cache.get('c'))
+
+
+class DefaultCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        compilation_cache.set_default_cache(None)
+        self.addCleanup(compilation_cache.set_default_cache, None)
+
+    def test_disabled_by_default(self):
+        with mock.patch.dict(os.environ):
+            os.environ.pop(compilation_cache.COMPILATION_CACHE_DIR_ENV_VAR,
+                           None)
+            self.assertIsNone(compilation_cache.get_default_cache())
+
+            with mock.patch.object(
+                    structures.ComponentSpec,
+                    'to_pipeline_spec',
+                    autospec=True,
+                    side_effect=structures.ComponentSpec.to_pipeline_spec,
+            ) as mock_build:
+                add.pipeline_spec
+                add.pipeline_spec
+
+        self.assertEqual(mock_build.call_count, 2)
+
+    def test_enabled_by_cache_dir(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            env = {compilation_cache.COMPILATION_CACHE_DIR_ENV_VAR: cache_dir}
+            with mock.patch.dict(os.environ, env):
+                cache = compilation_cache.get_default_cache()
+
+        self.assertEqual(cache.cache_dir, cache_dir)
+        self.assertIs(compilation_cache.get_default_cache(), cache)
+
+
+class GraphComponentCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        compilation_cache.set_default_cache(
+            compilation_cache.CompilationCache())
+        self.addCleanup(compilation_cache.set_default_cache, None)
+
+    def _define_pipeline(self, enable_caching: bool = True):
+
+        @dsl.pipeline
+        def my_pipeline(a: int = 1) -> int:
+            add_task = add(a=a, b=2).set_caching_options(enable_caching)
+            return add(a=add_task.output, b=3).output
+
+        return my_pipeline
+
+    def test_unchanged_pipeline_is_not_recompiled(self):
+        with mock.patch.object(
+                pipeline_spec_builder,
+                'create_pipeline_spec',
+                wraps=pipeline_spec_builder.create_pipeline_spec) as mock_build:
+            first = self._define_pipeline()
+            second = self._define_pipeline()
+            changed = self._define_pipeline(enable_caching=False)
+
+        self.assertEqual(mock_build.call_count, 2)
+        self.assertEqual(first.pipeline_spec, second.pipeline_spec)
+        self.assertNotEqual(first.pipeline_spec, changed.pipeline_spec)
+        self.assertFalse(changed.pipeline_spec.root.dag.tasks['add']
+                         .caching_options.enable_cache)
+
+    def test_component_pipeline_spec(self):
+        with mock.patch.object(
+                structures.ComponentSpec,
+                'to_pipeline_spec',
+                autospec=True,
+                side_effect=structures.ComponentSpec.to_pipeline_spec,
+        ) as mock_build:
+            first = add.pipeline_spec
+            first.sdk_version = 'modified'
+            second = add.pipeline_spec
+
+        self.assertEqual(mock_build.call_count, 1)
+        self.assertNotEqual(second.sdk_version, 'modified')
+
+
+if __name__ == '__main__':
+    unittest.main()
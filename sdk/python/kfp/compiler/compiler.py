@@ -20,8 +20,10 @@ https://docs.google.com/document/d/1PUDuSQ8vmeKSBloli53mp7GIvzekaY7sggg6ywy35Dk/
 from typing import Any, Dict, Optional
 
 from kfp.compiler import pipeline_spec_builder as builder
+from kfp.compiler import wheelhouse as wheelhouse_lib
 from kfp.components import base_component
 from kfp.components.types import type_utils
+from kfp.pipeline_spec import pipeline_spec_pb2
 
 
 class Compiler:
@@ -53,15 +55,19 @@ class Compiler:
         pipeline_name: Optional[str] = None,
         pipeline_parameters: Optional[Dict[str, Any]] = None,
         type_check: bool = True,
+        wheelhouse: Optional[wheelhouse_lib.Wheelhouse] = None,
+        deduplicate_specs: bool = False,
     ) -> None:
         """Compiles the pipeline or component function into IR YAML.
 
         Args:
             pipeline_func: Pipeline function constructed with the ``@dsl.pipeline`` or component constructed with the ``@dsl.component`` decorator.
-            package_path: Output YAML file path. For example, ``'~/my_pipeline.yaml'`` or ``'~/my_component.yaml'``.
+            package_path: Output YAML file path. For example, ``'~/my_pipeline.yaml'`` or ``'~/my_component.yaml'``. A path ending with ``.pb`` writes the PipelineSpec in the binary protobuf format instead, which can be run or uploaded with the ``kfp.Client``.
             pipeline_name: Name of the pipeline.
             pipeline_parameters: Map of parameter names to argument values.
             type_check: Whether to enable type checking of component interfaces during compilation.
+            wheelhouse: If specified, the ``packages_to_install`` of lightweight Python components are downloaded into this wheelhouse at compile time and installed offline from it at runtime.
+            deduplicate_specs: Whether to collapse identical component specs and executors, e.g. of tasks that use the same component, into a single entry each. This makes the pipeline definition of pipelines that use components many times much smaller.
         """
 
         with type_utils.TypeCheckManager(enable=type_check):
@@ -78,9 +84,19 @@ class Compiler:
                 pipeline_parameters=pipeline_parameters,
             )
 
+            if wheelhouse is not None:
+                wheelhouse.update_pipeline_spec(pipeline_spec)
+
+            platform_spec = pipeline_func.platform_spec
+            if deduplicate_specs:
+                platform_spec = pipeline_spec_pb2.PlatformSpec()
+                platform_spec.CopyFrom(pipeline_func.platform_spec)
+                builder.deduplicate_component_specs(
+                    pipeline_spec=pipeline_spec, platform_spec=platform_spec)
+
             builder.write_pipeline_spec_to_file(
                 pipeline_spec=pipeline_spec,
                 pipeline_description=pipeline_func.description,
-                platform_spec=pipeline_func.platform_spec,
+                platform_spec=platform_spec,
                 package_path=package_path,
             )
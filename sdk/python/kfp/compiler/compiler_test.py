@@ -916,6 +916,20 @@ class TestWriteToFileTypes(parameterized.TestCase):
             self.assertEqual(self.pipeline_name,
                              pipeline_spec['pipelineInfo']['name'])
 
+    def test_can_write_to_pb(self):
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pipeline_spec = self.make_pipeline_spec()
+
+            target_file = os.path.join(tmpdir, 'result.pb')
+            compiler.Compiler().compile(
+                pipeline_func=pipeline_spec, package_path=target_file)
+            with open(target_file, 'rb') as f:
+                pipeline_spec_proto = pipeline_spec_pb2.PipelineSpec.FromString(
+                    f.read())
+
+        self.assertEqual(pipeline_spec_proto, pipeline_spec.pipeline_spec)
+
     def test_cannot_write_to_bad_extension(self):
 
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -3785,6 +3799,117 @@ class TestPlatformConfig(unittest.TestCase):
                 foo_platform_set_bar_feature(task, 12)
 
 
+class TestDeduplicateComponentSpecs(unittest.TestCase):
+
+    def compile_to_documents(self, pipeline_func,
+                             **kwargs) -> List[Dict[str, Any]]:
+        with tempfile.TemporaryDirectory() as tempdir:
+            output_yaml = os.path.join(tempdir, 'pipeline.yaml')
+            compiler.Compiler().compile(
+                pipeline_func=pipeline_func, package_path=output_yaml, **kwargs)
+            with open(output_yaml) as f:
+                return list(yaml.safe_load_all(f))
+
+    def get_component_refs(self, pipeline_spec: dict) -> Dict[str, str]:
+        """Returns the component names of all tasks, by task name."""
+        dags = [pipeline_spec['root']['dag']] + [
+            component['dag']
+            for component in pipeline_spec['components'].values()
+            if 'dag' in component
+        ]
+        return {
+            task_name: task['componentRef']['name'] for dag in dags
+            for task_name, task in dag['tasks'].items()
+        }
+
+    def test_identical_specs_are_collapsed(self):
+
+        @dsl.pipeline
+        def inner(message: str):
+            print_op(message=message)
+            return_1()
+
+        @dsl.pipeline
+        def my_pipeline():
+            for message in ['a', 'b']:
+                print_op(message=message)
+            with dsl.ParallelFor([1, 2]) as item:
+                print_op(message=str(item))
+            print_op(message='c')
+            inner(message='d')
+            inner(message='e')
+            return_1()
+
+        [original] = self.compile_to_documents(my_pipeline)
+        [deduplicated] = self.compile_to_documents(
+            my_pipeline, deduplicate_specs=True)
+
+        self.assertEqual({'exec-print-op', 'exec-return-1'},
+                         set(deduplicated['deploymentSpec']['executors']))
+        self.assertEqual(
+            {'comp-for-loop-2', 'comp-inner', 'comp-print-op', 'comp-return-1'},
+            set(deduplicated['components']))
+        original_refs = self.get_component_refs(original)
+        deduplicated_refs = self.get_component_refs(deduplicated)
+        self.assertEqual(set(original_refs), set(deduplicated_refs))
+        for task_name, component_name in deduplicated_refs.items():
+            original_component = original['components'][
+                original_refs[task_name]]
+            deduplicated_component = deduplicated['components'][component_name]
+            for key in ['inputDefinitions', 'outputDefinitions']:
+                self.assertEqual(
+                    original_component.get(key),
+                    deduplicated_component.get(key))
+
+    def test_executors_with_different_platform_configs_are_kept(self):
+
+        @dsl.pipeline
+        def my_pipeline():
+            foo_platform_set_bar_feature(comp(), 1)
+            foo_platform_set_bar_feature(comp(), 1)
+            foo_platform_set_bar_feature(comp(), 2)
+
+        pipeline_spec, platform_spec = self.compile_to_documents(
+            my_pipeline, deduplicate_specs=True)
+
+        self.assertEqual({'exec-comp', 'exec-comp-3'},
+                         set(pipeline_spec['deploymentSpec']['executors']))
+        self.assertEqual({
+            'exec-comp': {
+                'bar': 1
+            },
+            'exec-comp-3': {
+                'bar': 2
+            }
+        }, platform_spec['platforms']['platform_foo']['deploymentSpec']
+                         ['executors'])
+        self.assertEqual(
+            {
+                'comp': 'comp-comp',
+                'comp-2': 'comp-comp',
+                'comp-3': 'comp-comp-3'
+            }, self.get_component_refs(pipeline_spec))
+
+    def test_deduplicated_pipeline_can_be_loaded_and_compiled(self):
+
+        @dsl.pipeline
+        def my_pipeline():
+            for message in ['a', 'b', 'c']:
+                print_op(message=message)
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            output_yaml = os.path.join(tempdir, 'pipeline.yaml')
+            compiler.Compiler().compile(
+                pipeline_func=my_pipeline,
+                package_path=output_yaml,
+                deduplicate_specs=True)
+            loaded_pipeline = components.load_component_from_file(output_yaml)
+
+        self.assertEqual(['comp-print-op'],
+                         list(loaded_pipeline.pipeline_spec.components))
+        self.assertEqual(3, len(loaded_pipeline.pipeline_spec.root.dag.tasks))
+
+
 class ExtractInputOutputDescription(unittest.TestCase):
 
     def test_no_descriptions(self):
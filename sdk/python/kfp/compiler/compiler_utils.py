@@ -13,8 +13,9 @@
 # limitations under the License.
 """Utility methods for compiler implementation that is IR-agnostic."""
 
+from __future__ import annotations
+
 import collections
-from copy import deepcopy
 from typing import DefaultDict, Dict, List, Mapping, Set, Tuple, Union
 
 from kfp.components import for_loop
@@ -23,7 +24,7 @@ from kfp.components import pipeline_context
 from kfp.components import pipeline_task
 from kfp.components import tasks_group
 
-GroupOrTaskType = Union[tasks_group.TasksGroup, pipeline_task.PipelineTask]
+GroupOrTaskType = Union['tasks_group.TasksGroup', 'pipeline_task.PipelineTask']
 
 ILLEGAL_CROSS_DAG_ERROR_PREFIX = 'Illegal task dependency across DSL context managers.'
 
@@ -583,9 +584,13 @@ def _get_uncommon_ancestors(
     else:
         raise ValueError(task2.name + ' does not exist.')
 
-    both_groups = [task1_groups, task2_groups]
-    common_groups_len = sum(
-        1 for x in zip(*both_groups) if x == (x[0],) * len(x))
+    # Names are unique, so the ancestors are common up to the first
+    # mismatch.
+    common_groups_len = 0
+    for group1_name, group2_name in zip(task1_groups, task2_groups):
+        if group1_name != group2_name:
+            break
+        common_groups_len += 1
     group1 = task1_groups[common_groups_len:]
     group2 = task2_groups[common_groups_len:]
     return (group1, group2)
@@ -624,6 +629,9 @@ def get_dependencies(
             group.
     """
     dependencies = collections.defaultdict(set)
+    # The outermost ParallelFor ancestor of each upstream task, computed once
+    # per task rather than once per dependency.
+    task_name_to_outermost_parallel_for = {}
     for task in pipeline.tasks.values():
         upstream_task_names = set()
         task_condition_inputs = list(condition_channels[task.name])
@@ -650,7 +658,7 @@ def get_dependencies(
             )
 
             # uncommon upstream ancestor check
-            uncommon_upstream_groups = deepcopy(upstream_groups)
+            uncommon_upstream_groups = list(upstream_groups)
             uncommon_upstream_groups.remove(
                 upstream_task.name
             )  # because a task's `upstream_groups` contains the task's name
@@ -673,21 +681,25 @@ def get_dependencies(
             # only check when upstream_task is a PipelineTask, since checking
             # for TasksGroup results in catching dsl.Collected cases.
             if isinstance(upstream_task, pipeline_task.PipelineTask):
-                upstream_parent_tasks = task_name_to_parent_groups[
+                if upstream_task.name not in task_name_to_outermost_parallel_for:
+                    task_name_to_outermost_parallel_for[
+                        upstream_task.name] = next(
+                            (parent_task for parent_task in
+                             task_name_to_parent_groups[upstream_task.name]
+                             if isinstance(
+                                 group_name_to_group.get(parent_task, None),
+                                 tasks_group.ParallelFor)), None)
+                parent_task = task_name_to_outermost_parallel_for[
                     upstream_task.name]
 
-                for group in downstream_groups:
-                    if isinstance(
-                            group_name_to_group.get(group, None),
-                            tasks_group.ParallelFor):
-                        for parent_task in upstream_parent_tasks:
-                            if isinstance(
-                                    group_name_to_group.get(parent_task, None),
-                                    tasks_group.ParallelFor):
-
-                                raise InvalidTopologyException(
-                                    f'{ILLEGAL_CROSS_DAG_ERROR_PREFIX} Downstream tasks in a nested {tasks_group.ParallelFor.__name__} group cannot depend on an upstream task in a shallower {tasks_group.ParallelFor.__name__} group. Task {task.name} depends on upstream task {upstream_task.name}, while {group} is nested in {parent_task}.'
-                                )
+                if parent_task is not None:
+                    for group in downstream_groups:
+                        if isinstance(
+                                group_name_to_group.get(group, None),
+                                tasks_group.ParallelFor):
+                            raise InvalidTopologyException(
+                                f'{ILLEGAL_CROSS_DAG_ERROR_PREFIX} Downstream tasks in a nested {tasks_group.ParallelFor.__name__} group cannot depend on an upstream task in a shallower {tasks_group.ParallelFor.__name__} group. Task {task.name} depends on upstream task {upstream_task.name}, while {group} is nested in {parent_task}.'
+                            )
 
             dependencies[downstream_groups[0]].add(upstream_groups[0])
 
@@ -13,7 +13,9 @@
 # limitations under the License.
 """Functions for creating PipelineSpec proto objects."""
 
-import copy
+from __future__ import annotations
+
+import hashlib
 import json
 import typing
 from typing import (Any, DefaultDict, Dict, List, Mapping, Optional, Tuple,
@@ -32,22 +34,25 @@ from kfp.components import placeholders
 from kfp.components import structures
 from kfp.components import tasks_group
 from kfp.components import utils
+from kfp.components import yaml_utils
 from kfp.components.types import artifact_types
 from kfp.components.types import type_utils
 from kfp.pipeline_spec import pipeline_spec_pb2
-import yaml
-
-# must be defined here to avoid circular imports
-group_type_to_dsl_class = {
-    tasks_group.TasksGroupType.PIPELINE: pipeline_context.Pipeline,
-    tasks_group.TasksGroupType.CONDITION: tasks_group.Condition,
-    tasks_group.TasksGroupType.FOR_LOOP: tasks_group.ParallelFor,
-    tasks_group.TasksGroupType.EXIT_HANDLER: tasks_group.ExitHandler,
-}
 
 _SINGLE_OUTPUT_NAME = 'Output'
 
 
+def _get_dsl_class(group_type: str) -> type:
+    # Resolved on use, since tasks_group and pipeline_context may still be
+    # initializing when this module is imported.
+    return {
+        tasks_group.TasksGroupType.PIPELINE: pipeline_context.Pipeline,
+        tasks_group.TasksGroupType.CONDITION: tasks_group.Condition,
+        tasks_group.TasksGroupType.FOR_LOOP: tasks_group.ParallelFor,
+        tasks_group.TasksGroupType.EXIT_HANDLER: tasks_group.ExitHandler,
+    }[group_type]
+
+
 def to_protobuf_value(value: type_utils.PARAMETER_TYPES) -> struct_pb2.Value:
     """Creates a google.protobuf.struct_pb2.Value message out of a provide
     value.
@@ -84,7 +89,7 @@ def to_protobuf_value(value: type_utils.PARAMETER_TYPES) -> struct_pb2.Value:
 def build_task_spec_for_task(
     task: pipeline_task.PipelineTask,
     parent_component_inputs: pipeline_spec_pb2.ComponentInputsSpec,
-    tasks_in_current_dag: List[str],
+    tasks_in_current_dag: typing.Collection[str],
 ) -> pipeline_spec_pb2.PipelineTaskSpec:
     """Builds PipelineTaskSpec for a pipeline task.
 
@@ -107,7 +112,7 @@ def build_task_spec_for_task(
     Args:
         task: The task to build a PipelineTaskSpec for.
         parent_component_inputs: The task's parent component's input specs.
-        tasks_in_current_dag: The list of tasks names for tasks in the same dag.
+        tasks_in_current_dag: The names of the tasks in the same dag.
 
     Returns:
         A PipelineTaskSpec object representing the task.
@@ -880,7 +885,7 @@ def build_task_spec_for_exit_task(
 def build_task_spec_for_group(
     group: tasks_group.TasksGroup,
     pipeline_channels: List[pipeline_channel.PipelineChannel],
-    tasks_in_current_dag: List[str],
+    tasks_in_current_dag: typing.Collection[str],
     is_parent_component_root: bool,
 ) -> pipeline_spec_pb2.PipelineTaskSpec:
     """Builds PipelineTaskSpec for a group.
@@ -888,7 +893,7 @@ def build_task_spec_for_group(
     Args:
         group: The group to build PipelineTaskSpec for.
         pipeline_channels: The list of pipeline channels referenced by the group.
-        tasks_in_current_dag: The list of tasks names for tasks in the same dag.
+        tasks_in_current_dag: The names of the tasks in the same dag.
         is_parent_component_root: Whether the parent component is the pipeline's
             root dag.
 
@@ -1076,13 +1081,16 @@ def build_spec_by_group(
     group_name_to_parent_groups: Mapping[str, List[tasks_group.TasksGroup]],
     name_to_for_loop_group: Mapping[str, tasks_group.ParallelFor],
     platform_spec: pipeline_spec_pb2.PlatformSpec,
+    component_names: Optional[utils.UniqueNameAllocator] = None,
+    executor_labels: Optional[utils.UniqueNameAllocator] = None,
 ) -> None:
     """Generates IR spec given a TasksGroup.
 
     Args:
         pipeline_spec: The pipeline_spec to update in place.
         deployment_config: The deployment_config to hold all executors. The
-            spec is updated in place.
+            spec is updated in place. The caller copies it into the
+            deployment_spec of pipeline_spec once all groups are built.
         group: The TasksGroup to generate spec for.
         inputs: The inputs dictionary. The keys are group/task names and the
             values are lists of tuples (channel, producing_task_name).
@@ -1102,7 +1110,18 @@ def build_spec_by_group(
             itself is the last.
         name_to_for_loop_group: The dict of for loop group name to loop
             group.
+        platform_spec: The PlatformSpec to update in place.
+        component_names: Allocator of unique names in the components of
+            pipeline_spec. Pass the same allocator for all groups.
+        executor_labels: Allocator of unique labels in the executors of
+            deployment_config. Pass the same allocator for all groups.
     """
+    if component_names is None:
+        component_names = utils.UniqueNameAllocator(pipeline_spec.components,
+                                                    '-')
+    if executor_labels is None:
+        executor_labels = utils.UniqueNameAllocator(deployment_config.executors,
+                                                    '-')
     group_component_name = utils.sanitize_component_name(group.name)
 
     if group.name == rootgroup_name:
@@ -1115,6 +1134,9 @@ def build_spec_by_group(
 
     # Generate task specs and component specs for the dag.
     subgroups = group.groups + group.tasks
+    tasks_in_current_dag = {
+        utils.sanitize_task_name(subgroup.name) for subgroup in subgroups
+    }
     for subgroup in subgroups:
 
         subgroup_input_channels = [
@@ -1124,9 +1146,6 @@ def build_spec_by_group(
 
         subgroup_component_name = (utils.sanitize_component_name(subgroup.name))
 
-        tasks_in_current_dag = [
-            utils.sanitize_task_name(subgroup.name) for subgroup in subgroups
-        ]
         is_parent_component_root = (group_component_spec == pipeline_spec.root)
 
         if isinstance(subgroup, pipeline_task.PipelineTask):
@@ -1143,10 +1162,8 @@ def build_spec_by_group(
             task_name_to_component_spec[subgroup.name] = subgroup_component_spec
 
             if subgroup_component_spec.executor_label:
-                executor_label = utils.make_name_unique_by_adding_index(
-                    name=subgroup_component_spec.executor_label,
-                    collection=list(deployment_config.executors.keys()),
-                    delimiter='-')
+                executor_label = executor_labels.make_name_unique(
+                    subgroup_component_spec.executor_label)
                 subgroup_component_spec.executor_label = executor_label
 
             if subgroup.container_spec is not None:
@@ -1179,6 +1196,8 @@ def build_spec_by_group(
                     sub_pipeline_spec=subgroup.pipeline_spec,
                     main_platform_spec=platform_spec,
                     sub_platform_spec=subgroup.platform_spec,
+                    component_names=component_names,
+                    executor_labels=executor_labels,
                 )
                 subgroup_component_spec = sub_pipeline_spec.root
             else:
@@ -1286,10 +1305,8 @@ def build_spec_by_group(
                 [utils.sanitize_task_name(dep) for dep in group_dependencies])
 
         # Add component spec
-        subgroup_component_name = utils.make_name_unique_by_adding_index(
-            name=subgroup_component_name,
-            collection=list(pipeline_spec.components.keys()),
-            delimiter='-')
+        subgroup_component_name = component_names.make_name_unique(
+            subgroup_component_name)
 
         subgroup_task_spec.component_ref.name = subgroup_component_name
         pipeline_spec.components[subgroup_component_name].CopyFrom(
@@ -1299,9 +1316,6 @@ def build_spec_by_group(
         group_component_spec.dag.tasks[subgroup.name].CopyFrom(
             subgroup_task_spec)
 
-    pipeline_spec.deployment_spec.update(
-        json_format.MessageToDict(deployment_config))
-
     # Surface metrics outputs to the top.
     populate_metrics_in_dag_outputs(
         tasks=group.tasks,
@@ -1363,16 +1377,24 @@ def build_exit_handler_groups_recursively(
     pipeline_spec: pipeline_spec_pb2.PipelineSpec,
     deployment_config: pipeline_spec_pb2.PipelineDeploymentConfig,
     platform_spec: pipeline_spec_pb2.PlatformSpec,
+    component_names: Optional[utils.UniqueNameAllocator] = None,
+    executor_labels: Optional[utils.UniqueNameAllocator] = None,
 ) -> None:
     if not parent_group.groups:
         return
+    if component_names is None:
+        component_names = utils.UniqueNameAllocator(pipeline_spec.components,
+                                                    '-')
+    if executor_labels is None:
+        executor_labels = utils.UniqueNameAllocator(deployment_config.executors,
+                                                    '-')
     for group in parent_group.groups:
         if isinstance(group, tasks_group.ExitHandler):
 
             # remove this if block to support nested exit handlers
             if not parent_group.is_root:
                 raise ValueError(
-                    f'{tasks_group.ExitHandler.__name__} can only be used within the outermost scope of a pipeline function definition. Using an {tasks_group.ExitHandler.__name__} within {group_type_to_dsl_class[parent_group.group_type].__name__} {parent_group.name} is not allowed.'
+                    f'{tasks_group.ExitHandler.__name__} can only be used within the outermost scope of a pipeline function definition. Using an {tasks_group.ExitHandler.__name__} within {_get_dsl_class(parent_group.group_type).__name__} {parent_group.name} is not allowed.'
                 )
 
             exit_task = group.exit_task
@@ -1392,10 +1414,8 @@ def build_exit_handler_groups_recursively(
             if exit_task.container_spec is not None:
                 exit_task_container_spec = build_container_spec_for_task(
                     task=exit_task)
-                executor_label = utils.make_name_unique_by_adding_index(
-                    name=exit_task_component_spec.executor_label,
-                    collection=list(deployment_config.executors.keys()),
-                    delimiter='-')
+                executor_label = executor_labels.make_name_unique(
+                    exit_task_component_spec.executor_label)
                 exit_task_component_spec.executor_label = executor_label
                 deployment_config.executors[executor_label].container.CopyFrom(
                     exit_task_container_spec)
@@ -1413,7 +1433,9 @@ def build_exit_handler_groups_recursively(
                     main_deployment_config=deployment_config,
                     sub_pipeline_spec=exit_task.pipeline_spec,
                     main_platform_spec=platform_spec,
-                    sub_platform_spec=exit_task.platform_spec)
+                    sub_platform_spec=exit_task.platform_spec,
+                    component_names=component_names,
+                    executor_labels=executor_labels)
                 exit_task_component_spec = exit_task_pipeline_spec.root
                 # assign the new PlatformSpec data to the existing main PlatformSpec object
                 platform_spec.CopyFrom(updated_platform_spec)
@@ -1423,10 +1445,8 @@ def build_exit_handler_groups_recursively(
                 )
 
             # Add exit task component spec.
-            component_name = utils.make_name_unique_by_adding_index(
-                name=exit_task_task_spec.component_ref.name,
-                collection=list(pipeline_spec.components.keys()),
-                delimiter='-')
+            component_name = component_names.make_name_unique(
+                exit_task_task_spec.component_ref.name)
             exit_task_task_spec.component_ref.name = component_name
             pipeline_spec.components[component_name].CopyFrom(
                 exit_task_component_spec)
@@ -1435,14 +1455,13 @@ def build_exit_handler_groups_recursively(
             parent_dag = pipeline_spec.root.dag
             parent_dag.tasks[exit_task_name].CopyFrom(exit_task_task_spec)
 
-            pipeline_spec.deployment_spec.update(
-                json_format.MessageToDict(deployment_config))
-
         build_exit_handler_groups_recursively(
             parent_group=group,
             pipeline_spec=pipeline_spec,
             deployment_config=deployment_config,
             platform_spec=platform_spec,
+            component_names=component_names,
+            executor_labels=executor_labels,
         )
 
 
@@ -1452,6 +1471,8 @@ def merge_deployment_spec_and_component_spec(
     sub_pipeline_spec: pipeline_spec_pb2.PipelineSpec,
     main_platform_spec: pipeline_spec_pb2.PlatformSpec,
     sub_platform_spec: pipeline_spec_pb2.PlatformSpec,
+    component_names: Optional[utils.UniqueNameAllocator] = None,
+    executor_labels: Optional[utils.UniqueNameAllocator] = None,
 ) -> Tuple[pipeline_spec_pb2.PipelineSpec, pipeline_spec_pb2.PlatformSpec]:
     """Merges deployment spec and component spec from a sub pipeline spec into
     the main spec.
@@ -1471,6 +1492,10 @@ def merge_deployment_spec_and_component_spec(
             specs.
         main_platform_spec: The PlatformSpec corresponding to main_pipeline_spec.
         sub_platform_spec: The PlatformSpec corresponding to sub_pipeline_spec.
+        component_names: Allocator of unique names in the components of
+            main_pipeline_spec.
+        executor_labels: Allocator of unique labels in the executors of
+            main_deployment_config.
 
     Returns:
         The possibly modified version of sub_pipeline_spec and the possibly modified version of the the main_platform_spec. The sub_pipeline_spec is "folded" into the outer pipeline, whereas the main_platform_spec is updated to contain the sub_pipeline_spec's configuration.
@@ -1487,10 +1512,12 @@ def merge_deployment_spec_and_component_spec(
         sub_pipeline_spec=sub_pipeline_spec_copy,
         main_platform_spec=main_platform_spec,
         sub_platform_spec=sub_platform_spec_copy,
+        executor_labels=executor_labels,
     )
     _merge_component_spec(
         main_pipeline_spec=main_pipeline_spec,
         sub_pipeline_spec=sub_pipeline_spec_copy,
+        component_names=component_names,
     )
     return sub_pipeline_spec_copy, main_platform_spec
 
@@ -1500,6 +1527,7 @@ def _merge_deployment_spec(
     sub_pipeline_spec: pipeline_spec_pb2.PipelineSpec,
     main_platform_spec: pipeline_spec_pb2.PlatformSpec,
     sub_platform_spec: pipeline_spec_pb2.PlatformSpec,
+    executor_labels: Optional[utils.UniqueNameAllocator] = None,
 ) -> None:
     """Merges deployment config from a sub pipeline spec into the main config.
 
@@ -1511,67 +1539,49 @@ def _merge_deployment_spec(
         main_deployment_config: The main deployment config to merge into.
         sub_pipeline_spec: The pipeline spec of an inner pipeline whose
             deployment configs need to be merged into the main config.
+        main_platform_spec: The main platform spec to merge into.
+        sub_platform_spec: The platform spec of the inner pipeline.
+        executor_labels: Allocator of unique labels in the executors of
+            main_deployment_config.
     """
-
-    def _rename_executor_labels(
-        pipeline_spec: pipeline_spec_pb2.PipelineSpec,
-        old_executor_label: str,
-        new_executor_label: str,
-    ) -> None:
-        """Renames the old executor_label to the new one in component spec."""
-        for _, component_spec in pipeline_spec.components.items():
-            if component_spec.executor_label == old_executor_label:
-                component_spec.executor_label = new_executor_label
-
-    def _rename_platform_config_executor_labels(
-        sub_platform_spec: pipeline_spec_pb2.PlatformSpec,
-        old_executor_label: str,
-        new_executor_label: str,
-    ) -> None:
-        # make a copy so that map size doesn't change during iteration
-        sub_platform_spec_copy = copy.deepcopy(sub_platform_spec)
-        for platform_key, platform_config in sub_platform_spec_copy.platforms.items(
-        ):
-            for cur_exec_label, task_config in platform_config.deployment_spec.executors.items(
-            ):
-                if cur_exec_label == old_executor_label:
-                    del sub_platform_spec.platforms[
-                        platform_key].deployment_spec.executors[
-                            old_executor_label]
-                    sub_platform_spec.platforms[
-                        platform_key].deployment_spec.executors[
-                            new_executor_label].CopyFrom(task_config)
+    if executor_labels is None:
+        executor_labels = utils.UniqueNameAllocator(
+            main_deployment_config.executors, '-')
 
     sub_deployment_config = pipeline_spec_pb2.PipelineDeploymentConfig()
     json_format.ParseDict(
         json_format.MessageToDict(sub_pipeline_spec.deployment_spec),
         sub_deployment_config)
 
+    old_label_to_new_label = {}
     for executor_label, executor_spec in sub_deployment_config.executors.items(
     ):
-        old_executor_label = executor_label
-        executor_label = utils.make_name_unique_by_adding_index(
-            name=executor_label,
-            collection=list(main_deployment_config.executors.keys()),
-            delimiter='-')
-        if executor_label != old_executor_label:
-            _rename_executor_labels(
-                pipeline_spec=sub_pipeline_spec,
-                old_executor_label=old_executor_label,
-                new_executor_label=executor_label)
-            _rename_platform_config_executor_labels(
-                sub_platform_spec,
-                old_executor_label=old_executor_label,
-                new_executor_label=executor_label)
-
-        main_deployment_config.executors[executor_label].CopyFrom(executor_spec)
-        merge_platform_specs(
-            main_msg=main_platform_spec, sub_msg=sub_platform_spec)
+        new_executor_label = executor_labels.make_name_unique(executor_label)
+        old_label_to_new_label[executor_label] = new_executor_label
+        main_deployment_config.executors[new_executor_label].CopyFrom(
+            executor_spec)
+
+    # Rename all executor labels in a single pass, so that a label is never
+    # renamed twice.
+    for component_spec in sub_pipeline_spec.components.values():
+        if component_spec.executor_label:
+            component_spec.executor_label = old_label_to_new_label.get(
+                component_spec.executor_label, component_spec.executor_label)
+    for platform_config in sub_platform_spec.platforms.values():
+        renamed_deployment_spec = pipeline_spec_pb2.PlatformDeploymentConfig()
+        for executor_label, task_config in platform_config.deployment_spec.executors.items(
+        ):
+            renamed_deployment_spec.executors[old_label_to_new_label.get(
+                executor_label, executor_label)].CopyFrom(task_config)
+        platform_config.deployment_spec.CopyFrom(renamed_deployment_spec)
+
+    merge_platform_specs(main_msg=main_platform_spec, sub_msg=sub_platform_spec)
 
 
 def _merge_component_spec(
     main_pipeline_spec: pipeline_spec_pb2.PipelineSpec,
     sub_pipeline_spec: pipeline_spec_pb2.PipelineSpec,
+    component_names: Optional[utils.UniqueNameAllocator] = None,
 ) -> None:
     """Merges component spec from a sub pipeline spec into the main config.
 
@@ -1583,42 +1593,30 @@ def _merge_component_spec(
         main_pipeline_spec: The main pipeline spec to merge into.
         sub_pipeline_spec: The pipeline spec of an inner pipeline whose
             component specs need to be merged into the global config.
+        component_names: Allocator of unique names in the components of
+            main_pipeline_spec.
     """
+    if component_names is None:
+        component_names = utils.UniqueNameAllocator(
+            main_pipeline_spec.components, '-')
 
-    def _rename_component_refs(
-        pipeline_spec: pipeline_spec_pb2.PipelineSpec,
-        old_component_ref: str,
-        new_component_ref: str,
-    ) -> None:
-        """Renames the old component_ref to the new one in task spec."""
-        for _, component_spec in pipeline_spec.components.items():
-            if not component_spec.dag:
-                continue
-            for _, task_spec in component_spec.dag.tasks.items():
-                if task_spec.component_ref.name == old_component_ref:
-                    task_spec.component_ref.name = new_component_ref
-
-        for _, task_spec in pipeline_spec.root.dag.tasks.items():
-            if task_spec.component_ref.name == old_component_ref:
-                task_spec.component_ref.name = new_component_ref
-
-    # Do all the renaming in place, then do the acutal merge of component specs
-    # in a second pass. This would ensure all component specs are in the final
-    # state at the time of merging.
+    # Reserve all the new names first, so that they are unique among the
+    # components of the sub pipeline too.
     old_name_to_new_name = {}
-    for component_name, component_spec in sub_pipeline_spec.components.items():
-        old_component_name = component_name
-        new_component_name = utils.make_name_unique_by_adding_index(
-            name=component_name,
-            collection=list(main_pipeline_spec.components.keys()),
-            delimiter='-')
-        old_name_to_new_name[old_component_name] = new_component_name
-
-        if new_component_name != old_component_name:
-            _rename_component_refs(
-                pipeline_spec=sub_pipeline_spec,
-                old_component_ref=old_component_name,
-                new_component_ref=new_component_name)
+    for component_name in sub_pipeline_spec.components:
+        new_component_name = component_names.make_name_unique(component_name)
+        old_name_to_new_name[component_name] = new_component_name
+        main_pipeline_spec.components[new_component_name].Clear()
+
+    # Do all the renaming in place in a single pass, then do the actual merge
+    # of component specs. This would ensure all component specs are in the
+    # final state at the time of merging.
+    for component_spec in [
+            sub_pipeline_spec.root, *sub_pipeline_spec.components.values()
+    ]:
+        for task_spec in component_spec.dag.tasks.values():
+            task_spec.component_ref.name = old_name_to_new_name.get(
+                task_spec.component_ref.name, task_spec.component_ref.name)
 
     for old_component_name, component_spec in sub_pipeline_spec.components.items(
     ):
@@ -1696,6 +1694,9 @@ def create_pipeline_spec(
     )
 
     platform_spec = pipeline_spec_pb2.PlatformSpec()
+    component_names = utils.UniqueNameAllocator(pipeline_spec.components, '-')
+    executor_labels = utils.UniqueNameAllocator(deployment_config.executors,
+                                                '-')
     for group in all_groups:
         build_spec_by_group(
             pipeline_spec=pipeline_spec,
@@ -1709,6 +1710,8 @@ def create_pipeline_spec(
             group_name_to_parent_groups=group_name_to_parent_groups,
             name_to_for_loop_group=name_to_for_loop_group,
             platform_spec=platform_spec,
+            component_names=component_names,
+            executor_labels=executor_labels,
         )
 
     build_exit_handler_groups_recursively(
@@ -1716,8 +1719,15 @@ def create_pipeline_spec(
         pipeline_spec=pipeline_spec,
         deployment_config=deployment_config,
         platform_spec=platform_spec,
+        component_names=component_names,
+        executor_labels=executor_labels,
     )
 
+    # Executors are only copied into the pipeline spec once all groups are
+    # built, since copying them per group is quadratic in the number of tasks.
+    pipeline_spec.deployment_spec.update(
+        json_format.MessageToDict(deployment_config))
+
     _build_dag_outputs(
         component_spec=pipeline_spec.root,
         dag_outputs=modified_pipeline_outputs_dict,
@@ -1763,13 +1773,104 @@ def convert_pipeline_outputs_to_dict(
         raise ValueError(f'Got unknown pipeline output: {pipeline_outputs}')
 
 
+def _get_sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def deduplicate_component_specs(
+    pipeline_spec: pipeline_spec_pb2.PipelineSpec,
+    platform_spec: pipeline_spec_pb2.PlatformSpec,
+) -> None:
+    """Collapses identical executors and component specs into single entries.
+
+    Every task gets its own component spec and executor at compile time, even
+    when many tasks use the same component. Executors are identical if their
+    specs and platform-specific configs are equal. Component specs are
+    identical if they are equal once the component references of their DAG
+    tasks are replaced with the hashes of the referenced components, so
+    identical sub-DAGs collapse too. The first name of identical definitions
+    is kept and all references are renamed to it.
+
+    Args:
+        pipeline_spec: The PipelineSpec to update in place.
+        platform_spec: The PlatformSpec of the pipeline to update in place.
+    """
+    deployment_spec = json_format.MessageToDict(pipeline_spec.deployment_spec)
+    executors = deployment_spec.get('executors', {})
+    executor_label_by_hash: Dict[str, str] = {}
+    old_label_to_new_label: Dict[str, str] = {}
+    for executor_label, executor_spec in executors.items():
+        platform_configs = {
+            platform_key: json_format.MessageToDict(
+                single_platform_spec.deployment_spec.executors[executor_label])
+            for platform_key, single_platform_spec in
+            platform_spec.platforms.items()
+            if executor_label in single_platform_spec.deployment_spec.executors
+        }
+        executor_hash = _get_sha256(
+            json.dumps([executor_spec, platform_configs],
+                       sort_keys=True).encode())
+        old_label_to_new_label[executor_label] = (
+            executor_label_by_hash.setdefault(executor_hash, executor_label))
+
+    duplicate_labels = [
+        old_label for old_label, new_label in old_label_to_new_label.items()
+        if old_label != new_label
+    ]
+    if duplicate_labels:
+        for executor_label in duplicate_labels:
+            del executors[executor_label]
+            for single_platform_spec in platform_spec.platforms.values():
+                platform_executors = single_platform_spec.deployment_spec.executors
+                if executor_label in platform_executors:
+                    del platform_executors[executor_label]
+        pipeline_spec.deployment_spec.Clear()
+        pipeline_spec.deployment_spec.update(deployment_spec)
+        for component_spec in pipeline_spec.components.values():
+            if component_spec.executor_label:
+                component_spec.executor_label = old_label_to_new_label.get(
+                    component_spec.executor_label,
+                    component_spec.executor_label)
+
+    component_hashes: Dict[str, str] = {}
+
+    def get_component_hash(component_name: str) -> str:
+        if component_name not in component_hashes:
+            component_spec = pipeline_spec_pb2.ComponentSpec()
+            component_spec.CopyFrom(pipeline_spec.components[component_name])
+            for task_spec in component_spec.dag.tasks.values():
+                if task_spec.component_ref.name in pipeline_spec.components:
+                    task_spec.component_ref.name = get_component_hash(
+                        task_spec.component_ref.name)
+            component_hashes[component_name] = _get_sha256(
+                component_spec.SerializeToString(deterministic=True))
+        return component_hashes[component_name]
+
+    component_name_by_hash: Dict[str, str] = {}
+    old_name_to_new_name = {
+        component_name: component_name_by_hash.setdefault(
+            get_component_hash(component_name), component_name)
+        for component_name in pipeline_spec.components
+    }
+    for component_spec in [
+            pipeline_spec.root, *pipeline_spec.components.values()
+    ]:
+        for task_spec in component_spec.dag.tasks.values():
+            task_spec.component_ref.name = old_name_to_new_name.get(
+                task_spec.component_ref.name, task_spec.component_ref.name)
+    for old_name, new_name in old_name_to_new_name.items():
+        if old_name != new_name:
+            del pipeline_spec.components[old_name]
+
+
 def write_pipeline_spec_to_file(
     pipeline_spec: pipeline_spec_pb2.PipelineSpec,
     pipeline_description: str,
     platform_spec: pipeline_spec_pb2.PlatformSpec,
     package_path: str,
 ) -> None:
-    """Writes PipelineSpec into a YAML or JSON (deprecated) file.
+    """Writes PipelineSpec into a YAML, binary protobuf or JSON (deprecated)
+    file.
 
     Args:
         pipeline_spec: The PipelineSpec.
@@ -1777,10 +1878,20 @@ def write_pipeline_spec_to_file(
         package_path: The path to which to write the PipelineSpec.
         platform_spec: The PlatformSpec.
     """
+    has_platform_specific_features = len(platform_spec.platforms) > 0
+
+    if package_path.endswith('.pb'):
+        if has_platform_specific_features:
+            raise ValueError(
+                f'Platform-specific features are only supported when serializing to YAML. Argument for {"package_path"!r} has file extension {".pb"!r}.'
+            )
+        with open(package_path, 'wb') as pb_file:
+            pb_file.write(pipeline_spec.SerializeToString(deterministic=True))
+        return
+
     pipeline_spec_dict = json_format.MessageToDict(pipeline_spec)
     yaml_comments = extract_comments_from_pipeline_spec(pipeline_spec_dict,
                                                         pipeline_description)
-    has_platform_specific_features = len(platform_spec.platforms) > 0
 
     if package_path.endswith('.json'):
         warnings.warn(
@@ -1803,11 +1914,11 @@ def write_pipeline_spec_to_file(
             documents = [pipeline_spec_dict]
             if has_platform_specific_features:
                 documents.append(json_format.MessageToDict(platform_spec))
-            yaml.dump_all(documents, yaml_file, sort_keys=True)
+            yaml_utils.dump_all(documents, yaml_file)
 
     else:
         raise ValueError(
-            f'The output path {package_path} should end with ".yaml".')
+            f'The output path {package_path} should end with ".yaml" or ".pb".')
 
 
 def extract_comments_from_pipeline_spec(pipeline_spec: dict,
@@ -218,6 +218,89 @@ class PipelineSpecBuilderTest(parameterized.TestCase):
         self.assertEqual(sub_pipeline_spec_copy.root,
                          expected_sub_pipeline_spec_root)
 
+    def test_merge_with_renamed_names_colliding_in_sub_pipeline(self):
+        main_deployment_config = pipeline_spec_pb2.PipelineDeploymentConfig()
+        main_deployment_config.executors['exec-1'].container.image = 'img-1'
+        main_pipeline_spec = pipeline_spec_pb2.PipelineSpec()
+        main_pipeline_spec.components['comp-1'].executor_label = 'exec-1'
+
+        sub_deployment_config = pipeline_spec_pb2.PipelineDeploymentConfig()
+        sub_deployment_config.executors['exec-1'].container.image = 'img-a'
+        sub_deployment_config.executors['exec-1-2'].container.image = 'img-b'
+        sub_pipeline_spec = pipeline_spec_pb2.PipelineSpec()
+        sub_pipeline_spec.deployment_spec.update(
+            json_format.MessageToDict(sub_deployment_config))
+        for name in ['1', '1-2']:
+            sub_pipeline_spec.components[
+                f'comp-{name}'].executor_label = f'exec-{name}'
+            sub_pipeline_spec.root.dag.tasks[
+                f'task-{name}'].component_ref.name = f'comp-{name}'
+        sub_platform_spec = pipeline_spec_pb2.PlatformSpec()
+        json_format.ParseDict(
+            {
+                'platforms': {
+                    'platform_foo': {
+                        'deployment_spec': {
+                            'executors': {
+                                'exec-1': {
+                                    'bar': 'a'
+                                },
+                                'exec-1-2': {
+                                    'bar': 'b'
+                                },
+                            }
+                        }
+                    }
+                }
+            }, sub_platform_spec)
+        main_platform_spec = pipeline_spec_pb2.PlatformSpec()
+
+        sub_pipeline_spec_copy, main_platform_spec = pipeline_spec_builder.merge_deployment_spec_and_component_spec(
+            main_pipeline_spec=main_pipeline_spec,
+            main_deployment_config=main_deployment_config,
+            sub_pipeline_spec=sub_pipeline_spec,
+            main_platform_spec=main_platform_spec,
+            sub_platform_spec=sub_platform_spec,
+        )
+
+        self.assertEqual(
+            {
+                'exec-1': 'img-1',
+                'exec-1-2': 'img-a',
+                'exec-1-2-2': 'img-b'
+            }, {
+                label: executor.container.image
+                for label, executor in main_deployment_config.executors.items()
+            })
+        self.assertEqual(
+            {
+                'comp-1': 'exec-1',
+                'comp-1-2': 'exec-1-2',
+                'comp-1-2-2': 'exec-1-2-2'
+            }, {
+                name: component.executor_label
+                for name, component in main_pipeline_spec.components.items()
+            })
+        self.assertEqual({
+            'task-1': 'comp-1-2',
+            'task-1-2': 'comp-1-2-2'
+        }, {
+            name: task.component_ref.name
+            for name, task in sub_pipeline_spec_copy.root.dag.tasks.items()
+        })
+        self.assertEqual(
+            {
+                'exec-1-2': {
+                    'bar': 'a'
+                },
+                'exec-1-2-2': {
+                    'bar': 'b'
+                }
+            },
+            json_format.MessageToDict(
+                main_platform_spec.platforms['platform_foo'].deployment_spec)
+            ['executors'])
+
 
 class TestPlatformConfigToPlatformSpec(unittest.TestCase):
 
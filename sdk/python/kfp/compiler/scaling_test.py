@@ -0,0 +1,103 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Scaling benchmarks for compiling large pipelines.
+
+Compiles synthetic pipelines of increasing size, with tasks nested in
+alternating dsl.ParallelFor and dsl.Condition groups and data passed
+between tasks across group boundaries, and fails if the number of Python
+function calls made to compile them grows super-linearly in the number
+of tasks. Call counts, unlike compile times, do not depend on the load
+of the machine. Set KFP_SCALING_TEST_NUM_TASKS to a comma-separated list
+of sizes, e.g. 1000,10000, to benchmark larger pipelines.
+"""
+
+import cProfile
+import os
+import pstats
+import unittest
+
+from kfp import dsl
+from kfp.compiler import compilation_cache
+
+_NUM_TASKS_ENV_VAR = 'KFP_SCALING_TEST_NUM_TASKS'
+_DEFAULT_NUM_TASKS = '100,400'
+_NESTING_DEPTH = 6
+_TASKS_PER_LEAF_GROUP = 25
+
+# The number of calls may grow at most this many times faster than the number
+# of tasks. A quadratic compiler exceeds it by a wide margin.
+_MAX_RELATIVE_GROWTH = 1.5
+
+
+@dsl.component
+def increment(x: int) -> int:
+    return x + 1
+
+
+def _define_pipeline(num_tasks: int) -> None:
+    num_added = 0
+
+    def add_nested_tasks(upstream: dsl.PipelineTask, depth: int,
+                         flag: int) -> None:
+        nonlocal num_added
+        if depth == 0:
+            for _ in range(_TASKS_PER_LEAF_GROUP):
+                if num_added == num_tasks:
+                    return
+                upstream = increment(x=upstream.output)
+                num_added += 1
+        elif depth % 2:
+            with dsl.ParallelFor([1, 2]):
+                add_nested_tasks(upstream, depth - 1, flag)
+        else:
+            with dsl.Condition(flag == 1):
+                add_nested_tasks(upstream, depth - 1, flag)
+
+    @dsl.pipeline
+    def large_pipeline(x: int = 1, flag: int = 1):
+        upstream = increment(x=x)
+        while num_added < num_tasks:
+            add_nested_tasks(upstream, _NESTING_DEPTH, flag)
+
+
+class CompilerScalingTest(unittest.TestCase):
+
+    def setUp(self):
+        # Make sure every pipeline is actually compiled.
+        compilation_cache.set_default_cache(
+            compilation_cache.CompilationCache(max_entries=0))
+        self.addCleanup(compilation_cache.set_default_cache, None)
+
+    def test_compile_calls_grow_linearly(self):
+        sizes = [
+            int(size) for size in os.environ.get(_NUM_TASKS_ENV_VAR,
+                                                 _DEFAULT_NUM_TASKS).split(',')
+        ]
+        call_counts = []
+        for num_tasks in sizes:
+            profile = cProfile.Profile()
+            profile.runcall(_define_pipeline, num_tasks)
+            call_counts.append(pstats.Stats(profile).total_calls)
+
+        for i in range(1, len(sizes)):
+            task_growth = sizes[i] / sizes[i - 1]
+            call_growth = call_counts[i] / call_counts[i - 1]
+            self.assertLess(
+                call_growth, _MAX_RELATIVE_GROWTH * task_growth,
+                f'Compiling {sizes[i]} tasks made {call_counts[i]} calls, '
+                f'compared to {call_counts[i - 1]} for {sizes[i - 1]} tasks.')
+
+
+if __name__ == '__main__':
+    unittest.main()
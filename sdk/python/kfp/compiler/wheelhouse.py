@@ -0,0 +1,192 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Pre-resolved dependency wheelhouses for lightweight Python components."""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from typing import List, Optional
+
+from google.protobuf import json_format
+from kfp.components import component_factory
+from kfp.pipeline_spec import pipeline_spec_pb2
+
+
+class Wheelhouse:
+    """A content-addressed directory of pre-downloaded Python packages.
+
+    When passed to ``Compiler.compile``, the ``packages_to_install`` of every
+    lightweight Python component (including the ``kfp`` package) are
+    downloaded at compile time into ``<root>/<key>``, where ``key`` is a
+    digest of the package list. The components' commands then install the
+    packages offline from that directory instead of resolving them against the
+    package index at every task start. Directories are reused across
+    compilations, so only new package lists are downloaded.
+
+    The wheelhouse must be reachable from the task containers, e.g. through a
+    shared volume or a Cloud Storage FUSE mount of the pipeline root. If it is
+    not, tasks fall back to installing from the package index.
+
+    Tasks log a ``kfp-wheelhouse: key=<key> status=<status>`` line, where
+    ``status`` is ``hit`` if the packages were already installed in the image,
+    ``offline`` if they were installed from the wheelhouse and ``miss`` if the
+    wheelhouse was not reachable.
+
+    Example:
+      ::
+
+        compiler.Compiler().compile(
+            pipeline_func=my_pipeline,
+            package_path='pipeline.yaml',
+            wheelhouse=compiler.Wheelhouse(
+                root='/mnt/bucket/wheelhouse',
+                container_root='/gcs/bucket/wheelhouse',
+                pip_download_args=[
+                    '--platform', 'manylinux2014_x86_64',
+                    '--python-version', '3.7', '--only-binary=:all:'
+                ],
+            ),
+        )
+
+    Args:
+        root: The local directory in which packages are downloaded.
+        container_root: The path of ``root`` in the task containers. Defaults
+            to ``root``.
+        pip_download_args: Additional arguments to ``pip download``, e.g. to
+            download packages for the platform and Python version of the
+            components' base image rather than of the compiling machine.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        container_root: Optional[str] = None,
+        pip_download_args: Optional[List[str]] = None,
+    ):
+        self.root = os.path.abspath(os.path.expanduser(root))
+        self.container_root = container_root or self.root
+        self.pip_download_args = list(pip_download_args or [])
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def get_key(
+        self,
+        package_list: List[str],
+        pip_index_urls: Optional[List[str]] = None,
+    ) -> str:
+        """Returns the content address of a package list."""
+        key = {
+            'packages': sorted(package_list),
+            'pip_index_urls': pip_index_urls or [],
+            'pip_download_args': self.pip_download_args,
+        }
+        return hashlib.sha256(json.dumps(key,
+                                         sort_keys=True).encode()).hexdigest()
+
+    def build(
+        self,
+        package_list: List[str],
+        pip_index_urls: Optional[List[str]] = None,
+    ) -> str:
+        """Downloads a package list into the wheelhouse, unless it was
+        downloaded before.
+
+        Args:
+            package_list: The packages to download.
+            pip_index_urls: The package indexes to download from.
+
+        Returns:
+            The key of the package list.
+        """
+        key = self.get_key(package_list, pip_index_urls)
+        wheelhouse_dir = os.path.join(self.root, key)
+        if os.path.exists(
+                os.path.join(wheelhouse_dir,
+                             component_factory.WHEELHOUSE_MANIFEST_FILE)):
+            self.cache_hits += 1
+            logging.info(f'Wheelhouse cache hit for {package_list}: {key}.')
+            return key
+
+        self.cache_misses += 1
+        logging.info(f'Downloading {package_list} into wheelhouse {key}.')
+        os.makedirs(self.root, exist_ok=True)
+        staging_dir = tempfile.mkdtemp(dir=self.root, prefix='.tmp-')
+        try:
+            index_url_options = component_factory.make_index_url_options(
+                pip_index_urls).split()
+            result = subprocess.run(
+                [
+                    sys.executable, '-m', 'pip', 'download', '--quiet',
+                    '--disable-pip-version-check', '--dest', staging_dir
+                ] + index_url_options + self.pip_download_args + package_list,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                universal_newlines=True,
+            )
+            if result.returncode != 0:
+                raise RuntimeError(
+                    f'Failed to download {package_list} into the wheelhouse: '
+                    f'{result.stderr}')
+
+            with open(
+                    os.path.join(staging_dir,
+                                 component_factory.WHEELHOUSE_MANIFEST_FILE),
+                    'w') as f:
+                json.dump(
+                    {
+                        'key': key,
+                        'packages': package_list,
+                        'files': sorted(os.listdir(staging_dir)),
+                    }, f)
+            try:
+                os.rename(staging_dir, wheelhouse_dir)
+            except OSError:
+                # Another compilation populated the same key concurrently.
+                pass
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+        return key
+
+    def update_pipeline_spec(
+            self, pipeline_spec: pipeline_spec_pb2.PipelineSpec) -> None:
+        """Downloads the packages of the lightweight Python components in a
+        pipeline spec and updates their commands to install from the
+        wheelhouse."""
+        deployment_spec = json_format.MessageToDict(
+            pipeline_spec.deployment_spec)
+        for executor in deployment_spec.get('executors', {}).values():
+            container = executor.get('container')
+            if container is None:
+                continue
+            command = container.get('command', [])
+            parsed = component_factory._parse_packages_to_install_command(
+                command)
+            if parsed is None:
+                continue
+            package_list, pip_index_urls = parsed
+            key = self.build(package_list, pip_index_urls)
+            install_command = component_factory._get_packages_to_install_command(
+                package_list=package_list,
+                pip_index_urls=pip_index_urls,
+                wheelhouse_dir=f'{self.container_root.rstrip("/")}/{key}',
+                wheelhouse_key=key,
+            )
+            container['command'] = install_command + command[3:]
+        pipeline_spec.deployment_spec.Clear()
+        pipeline_spec.deployment_spec.update(deployment_spec)
@@ -0,0 +1,116 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for kfp.compiler.wheelhouse."""
+
+import os
+import subprocess
+import tempfile
+import unittest
+from unittest import mock
+
+from kfp import compiler
+from kfp import dsl
+from kfp.components import component_factory
+import yaml
+
+
+def _fake_pip_download(args, **kwargs):
+    dest = args[args.index('--dest') + 1]
+    with open(os.path.join(dest, 'package1-1.0-py3-none-any.whl'), 'w') as f:
+        f.write('wheel')
+    return subprocess.CompletedProcess(args, returncode=0, stderr='')
+
+
+@dsl.component(packages_to_install=['package1'])
+def comp_with_packages():
+    pass
+
+
+@dsl.component(install_kfp_package=False)
+def comp_without_packages():
+    pass
+
+
+@dsl.pipeline
+def my_pipeline():
+    comp_with_packages()
+    comp_with_packages().set_caching_options(False)
+    comp_without_packages()
+
+
+class WheelhouseTest(unittest.TestCase):
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.wheelhouse = compiler.Wheelhouse(
+            root=os.path.join(self._temp_dir.name, 'wheelhouse'),
+            container_root='/gcs/bucket/wheelhouse/')
+        patcher = mock.patch.object(
+            subprocess, 'run', side_effect=_fake_pip_download)
+        self.mock_run = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_build_is_content_addressed(self):
+        key = self.wheelhouse.build(['package1'])
+
+        self.assertEqual(key, self.wheelhouse.build(['package1']))
+        self.assertNotEqual(key, self.wheelhouse.get_key(['package2']))
+        self.assertEqual(self.mock_run.call_count, 1)
+        self.assertEqual(self.wheelhouse.cache_hits, 1)
+        self.assertEqual(self.wheelhouse.cache_misses, 1)
+        self.assertCountEqual(
+            os.listdir(os.path.join(self.wheelhouse.root, key)), [
+                'package1-1.0-py3-none-any.whl',
+                component_factory.WHEELHOUSE_MANIFEST_FILE
+            ])
+
+    def test_failed_download(self):
+        self.mock_run.side_effect = lambda args, **kwargs: (
+            subprocess.CompletedProcess(args, returncode=1, stderr='no match'))
+
+        with self.assertRaisesRegex(RuntimeError, r'no match'):
+            self.wheelhouse.build(['package1'])
+        self.assertEqual(os.listdir(self.wheelhouse.root), [])
+
+    def test_compile_with_wheelhouse(self):
+        package_path = os.path.join(self._temp_dir.name, 'pipeline.yaml')
+        compiler.Compiler().compile(
+            pipeline_func=my_pipeline,
+            package_path=package_path,
+            wheelhouse=self.wheelhouse)
+
+        with open(package_path) as f:
+            pipeline_spec = yaml.safe_load(f)
+        executors = pipeline_spec['deploymentSpec']['executors']
+        command = executors['exec-comp-with-packages']['container']['command']
+        key = self.wheelhouse.get_key(
+            ['package1',
+             component_factory._get_default_kfp_package_path()])
+        self.assertIn(f'--no-index --find-links "/gcs/bucket/wheelhouse/{key}"',
+                      command[2])
+        self.assertEqual(
+            command[3:], comp_with_packages.component_spec.implementation
+            .container.command[3:])
+        self.assertEqual(
+            executors['exec-comp-without-packages']['container']['command'][:2],
+            ['sh', '-ec'])
+        # Identical package lists are downloaded once.
+        self.assertEqual(self.mock_run.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -17,6 +17,7 @@ compiled YAML."""
 __all__ = [
     'load_component_from_file',
     'load_component_from_url',
+    'load_components_from_urls',
     'load_component_from_text',
     'PythonComponent',
     'BaseComponent',
@@ -24,10 +25,30 @@ __all__ = [
     'YamlComponent',
 ]
 
-from kfp.components.base_component import BaseComponent
-from kfp.components.container_component import ContainerComponent
-from kfp.components.python_component import PythonComponent
-from kfp.components.yaml_component import load_component_from_file
-from kfp.components.yaml_component import load_component_from_text
-from kfp.components.yaml_component import load_component_from_url
-from kfp.components.yaml_component import YamlComponent
+import importlib
+from typing import Any, List
+
+# Resolved lazily so that importing a submodule, e.g.
+# `kfp.components.executor_main`, does not import the whole DSL.
+_LAZY_ATTRIBUTES = {
+    'BaseComponent': 'kfp.components.base_component',
+    'ContainerComponent': 'kfp.components.container_component',
+    'PythonComponent': 'kfp.components.python_component',
+    'load_component_from_file': 'kfp.components.yaml_component',
+    'load_component_from_text': 'kfp.components.yaml_component',
+    'load_component_from_url': 'kfp.components.yaml_component',
+    'load_components_from_urls': 'kfp.components.yaml_component',
+    'YamlComponent': 'kfp.components.yaml_component',
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
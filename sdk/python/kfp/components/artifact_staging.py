@@ -0,0 +1,268 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Staging of the artifacts of a component in local scratch space."""
+
+import concurrent.futures
+import dataclasses
+import hashlib
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from kfp.components.types import artifact_io
+from kfp.components.types import artifact_types
+
+_STAGE_INPUTS_ENV_VAR = 'KFP_STAGE_INPUT_ARTIFACTS'
+_STAGE_OUTPUTS_ENV_VAR = 'KFP_STAGE_OUTPUT_ARTIFACTS'
+_MAX_WORKERS_ENV_VAR = 'KFP_STAGING_MAX_WORKERS'
+_MAX_BYTES_PER_SECOND_ENV_VAR = 'KFP_STAGING_MAX_BYTES_PER_SECOND'
+
+
+def _is_true(value: Optional[str]) -> bool:
+    return (value or '').lower() in ('1', 'true', 'yes')
+
+
+@dataclasses.dataclass
+class StagingConfig:
+    """Configuration of the staging of artifacts by the Executor.
+
+    Attributes:
+        stage_inputs: Whether to download the input artifacts to local
+            scratch space before the component function runs, and point
+            their paths at the local copies.
+        stage_outputs: Whether to point the paths of the output artifacts at
+            local scratch space while the component function runs, and
+            upload them after it returns.
+        max_workers: Maximum number of artifacts transferred concurrently.
+        max_bytes_per_second: Maximum average transfer rate across all
+            artifacts, or None for no limit.
+    """
+    stage_inputs: bool = False
+    stage_outputs: bool = False
+    max_workers: int = artifact_io.DEFAULT_MAX_WORKERS
+    max_bytes_per_second: Optional[float] = None
+
+    @classmethod
+    def from_env(cls) -> 'StagingConfig':
+        """Reads the configuration from the ``KFP_STAGE_INPUT_ARTIFACTS``,
+        ``KFP_STAGE_OUTPUT_ARTIFACTS``, ``KFP_STAGING_MAX_WORKERS`` and
+        ``KFP_STAGING_MAX_BYTES_PER_SECOND`` environment variables."""
+        max_bytes_per_second = os.environ.get(_MAX_BYTES_PER_SECOND_ENV_VAR)
+        return cls(
+            stage_inputs=_is_true(os.environ.get(_STAGE_INPUTS_ENV_VAR)),
+            stage_outputs=_is_true(os.environ.get(_STAGE_OUTPUTS_ENV_VAR)),
+            max_workers=int(
+                os.environ.get(_MAX_WORKERS_ENV_VAR,
+                               artifact_io.DEFAULT_MAX_WORKERS)),
+            max_bytes_per_second=float(max_bytes_per_second)
+            if max_bytes_per_second else None,
+        )
+
+
+class _RateLimiter:
+    """Limits the average rate of transfers of a known size.
+
+    Transfers are not throttled while they run. Instead, the next
+    transfer is delayed until the average rate since the first one is
+    under the limit.
+    """
+
+    def __init__(self, max_bytes_per_second: Optional[float]) -> None:
+        self._max_bytes_per_second = max_bytes_per_second
+        self._lock = threading.Lock()
+        self._start_time: Optional[float] = None
+        self._num_bytes = 0
+
+    def wait(self) -> None:
+        if not self._max_bytes_per_second:
+            return
+        with self._lock:
+            if self._start_time is None:
+                self._start_time = time.monotonic()
+                return
+            ready_time = self._start_time + (
+                self._num_bytes / self._max_bytes_per_second)
+        delay = ready_time - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def add(self, num_bytes: int) -> None:
+        with self._lock:
+            self._num_bytes += num_bytes
+
+
+def _get_size(path: str) -> int:
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(path)
+        for name in names)
+
+
+def _get_sha256(path: str) -> str:
+    """Returns the SHA-256 digest of a file, or of the relative paths and
+    contents of the files in a directory."""
+    digest = hashlib.sha256()
+    if os.path.isdir(path):
+        for relative_path in sorted(artifact_io._list_files(path)):
+            digest.update(relative_path.encode() + b'\0')
+            digest.update(
+                bytes.fromhex(_get_sha256(os.path.join(path, relative_path))))
+        return digest.hexdigest()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _is_remote(uri: str) -> bool:
+    return bool(
+        uri) and artifact_io.get_backend(uri).get_local_path(uri) is None
+
+
+def stage_input_artifacts(artifacts: List[artifact_types.Artifact],
+                          config: StagingConfig) -> Dict[str, str]:
+    """Downloads input artifacts concurrently to local scratch space.
+
+    The path of each staged artifact is pointed at its local copy. Artifacts
+    that are already local and artifacts with nothing stored at their URI,
+    e.g. metrics that only have metadata, are left as they are.
+
+    Args:
+        artifacts: The input artifacts, including each artifact of list
+            inputs. Artifacts with the same URI are downloaded once.
+        config: The staging configuration.
+
+    Returns:
+        The local paths of the staged artifacts, by URI.
+    """
+    artifacts_by_uri: Dict[str, List[artifact_types.Artifact]] = {}
+    for artifact in artifacts:
+        if not _is_remote(artifact.uri):
+            continue
+        artifacts_by_uri.setdefault(artifact.uri, []).append(artifact)
+    if not artifacts_by_uri:
+        return {}
+
+    rate_limiter = _RateLimiter(config.max_bytes_per_second)
+
+    def stage(uri: str) -> Optional[str]:
+        rate_limiter.wait()
+        try:
+            local_path = artifact_io.download(uri)
+        except FileNotFoundError:
+            logging.info(f'Nothing to stage for input artifact {uri}.')
+            return None
+        rate_limiter.add(_get_size(local_path))
+        return local_path
+
+    start_time = time.monotonic()
+    with concurrent.futures.ThreadPoolExecutor(
+            max_workers=config.max_workers) as executor:
+        local_paths = dict(
+            zip(artifacts_by_uri, executor.map(stage, artifacts_by_uri)))
+    staged_paths = {
+        uri: local_path
+        for uri, local_path in local_paths.items()
+        if local_path is not None
+    }
+    for uri, local_path in staged_paths.items():
+        for artifact in artifacts_by_uri[uri]:
+            artifact._staged_path = local_path
+
+    num_bytes = sum(_get_size(path) for path in staged_paths.values())
+    logging.info(
+        f'Staged {len(staged_paths)} input artifacts ({num_bytes} bytes) in '
+        f'{time.monotonic() - start_time:.2f} seconds.')
+    return staged_paths
+
+
+def stage_output_artifacts(artifacts: List[artifact_types.Artifact]) -> None:
+    """Points the paths of output artifacts at local scratch space.
+
+    Artifacts that are already local are left as they are.
+
+    Args:
+        artifacts: The output artifacts.
+    """
+    for artifact in artifacts:
+        if not _is_remote(artifact.uri):
+            continue
+        staged_path = artifact_io.get_staging_path(artifact.uri)
+        os.makedirs(os.path.dirname(staged_path), exist_ok=True)
+        artifact._staged_path = staged_path
+
+
+def upload_output_artifacts(artifacts: List[artifact_types.Artifact],
+                            config: StagingConfig) -> None:
+    """Uploads staged output artifacts concurrently.
+
+    The size and SHA-256 digest of each uploaded artifact are recorded in its
+    metadata as ``size_bytes`` and ``sha256``. Staged artifacts that the
+    component did not write, e.g. metrics that only have metadata, are not
+    uploaded.
+
+    Args:
+        artifacts: The output artifacts.
+        config: The staging configuration.
+
+    Raises:
+        RuntimeError: If any upload failed. All uploads are attempted first.
+    """
+    staged_artifacts = [
+        artifact for artifact in artifacts
+        if getattr(artifact, '_staged_path', None) is not None and
+        os.path.exists(artifact._staged_path)
+    ]
+    if not staged_artifacts:
+        return
+
+    rate_limiter = _RateLimiter(config.max_bytes_per_second)
+
+    def upload(artifact: artifact_types.Artifact) -> None:
+        local_path = artifact._staged_path
+        size = _get_size(local_path)
+        sha256 = _get_sha256(local_path)
+        rate_limiter.wait()
+        artifact_io.upload(local_path, artifact.uri)
+        rate_limiter.add(size)
+        artifact.metadata['size_bytes'] = size
+        artifact.metadata['sha256'] = sha256
+
+    start_time = time.monotonic()
+    with concurrent.futures.ThreadPoolExecutor(
+            max_workers=config.max_workers) as executor:
+        futures = {
+            executor.submit(upload, artifact): artifact
+            for artifact in staged_artifacts
+        }
+    errors = []
+    for future, artifact in futures.items():
+        error = future.exception()
+        if error is not None:
+            logging.error(
+                f'Failed to upload output artifact {artifact.uri}: {error!r}')
+            errors.append(artifact.uri)
+    if errors:
+        raise RuntimeError(
+            f'Failed to upload output artifacts: {", ".join(errors)}')
+
+    num_bytes = sum(
+        artifact.metadata['size_bytes'] for artifact in staged_artifacts)
+    logging.info(
+        f'Uploaded {len(staged_artifacts)} output artifacts ({num_bytes} bytes) '
+        f'in {time.monotonic() - start_time:.2f} seconds.')
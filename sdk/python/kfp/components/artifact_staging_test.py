@@ -0,0 +1,202 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for kfp.components.artifact_staging."""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from kfp.components import artifact_staging
+from kfp.components.types import artifact_io
+from kfp.components.types import artifact_types
+
+
+class CountingBackend(artifact_io.LocalBackend):
+    """A LocalBackend that transfers artifacts and counts downloads."""
+
+    def __init__(self, root):
+        super().__init__(root)
+        self.lookups = []
+        self.downloads = []
+
+    def get_local_path(self, uri):
+        return None
+
+    def get_version(self, uri):
+        self.lookups.append(uri)
+        return super().get_version(uri)
+
+    def download(self, uri, local_path):
+        self.downloads.append(uri)
+        self._copy(super().get_local_path(uri), local_path)
+
+    def upload(self, local_path, uri):
+        self._copy(local_path, super().get_local_path(uri))
+
+
+class StagingTest(unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.root = os.path.join(tmp_dir.name, 'root')
+        self.staging_dir = os.path.join(tmp_dir.name, 'staging')
+        self.backend = CountingBackend(self.root)
+        for patcher in [
+                mock.patch.dict(artifact_io._backend_factories,
+                                {'gs': lambda: self.backend}),
+                mock.patch.dict(artifact_io._backends, clear=True),
+                mock.patch.dict(os.environ,
+                                {'KFP_ARTIFACT_STAGING_DIR': self.staging_dir}),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def write_artifact(self, key, data):
+        path = os.path.join(self.root, 'gs', 'bucket', key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(data)
+
+    def test_stage_input_artifacts(self):
+        for i in range(5):
+            self.write_artifact(f'a{i}', f'data {i}')
+        artifacts = [
+            artifact_types.Dataset(uri=f'gs://bucket/a{i}') for i in range(5)
+        ]
+        # An artifact consumed twice is downloaded once.
+        duplicate = artifact_types.Dataset(uri='gs://bucket/a0')
+
+        staged_paths = artifact_staging.stage_input_artifacts(
+            artifacts + [duplicate],
+            artifact_staging.StagingConfig(stage_inputs=True, max_workers=3))
+
+        self.assertEqual(5, len(staged_paths))
+        self.assertCountEqual([f'gs://bucket/a{i}' for i in range(5)],
+                              self.backend.downloads)
+        for i, artifact in enumerate(artifacts):
+            self.assertTrue(artifact.path.startswith(self.staging_dir))
+            with open(artifact.path) as f:
+                self.assertEqual(f'data {i}', f.read())
+        self.assertEqual(artifacts[0].path, duplicate.path)
+
+    def test_missing_and_local_artifacts_are_not_staged(self):
+        missing = artifact_types.Metrics(uri='gs://bucket/metrics')
+        local = artifact_types.Dataset(uri='/local/data')
+
+        staged_paths = artifact_staging.stage_input_artifacts(
+            [missing, local], artifact_staging.StagingConfig(stage_inputs=True))
+
+        self.assertEqual({}, staged_paths)
+        self.assertEqual(['gs://bucket/metrics'], self.backend.lookups)
+        self.assertEqual([], self.backend.downloads)
+        self.assertEqual(
+            artifact_types._GCS_LOCAL_MOUNT_PREFIX + 'bucket/metrics',
+            missing.path)
+        self.assertEqual('/local/data', local.path)
+
+    def test_setting_path_unstages_artifact(self):
+        self.write_artifact('a', 'data')
+        artifact = artifact_types.Dataset(uri='gs://bucket/a')
+        artifact_staging.stage_input_artifacts(
+            [artifact], artifact_staging.StagingConfig(stage_inputs=True))
+
+        path = artifact_types._GCS_LOCAL_MOUNT_PREFIX + 'bucket/b'
+        artifact.path = path
+
+        self.assertEqual('gs://bucket/b', artifact.uri)
+        self.assertEqual(path, artifact.path)
+
+    def test_stage_and_upload_output_artifacts(self):
+        model = artifact_types.Model(uri='gs://bucket/model')
+        metrics = artifact_types.Metrics(uri='gs://bucket/metrics')
+        local = artifact_types.Dataset(uri='/local/data')
+        artifacts = [model, metrics, local]
+
+        artifact_staging.stage_output_artifacts(artifacts)
+        self.assertTrue(model.path.startswith(self.staging_dir))
+        self.assertEqual('/local/data', local.path)
+        os.makedirs(model.path)
+        for name in ['saved_model.pb', 'variables']:
+            with open(os.path.join(model.path, name), 'w') as f:
+                f.write(name)
+        artifact_staging.upload_output_artifacts(
+            artifacts, artifact_staging.StagingConfig(stage_outputs=True))
+
+        with open(
+                os.path.join(self.root, 'gs', 'bucket', 'model',
+                             'variables')) as f:
+            self.assertEqual('variables', f.read())
+        self.assertEqual(23, model.metadata['size_bytes'])
+        self.assertEqual(
+            artifact_staging._get_sha256(model.path), model.metadata['sha256'])
+        self.assertEqual({}, metrics.metadata)
+        self.assertFalse(
+            os.path.exists(os.path.join(self.root, 'gs', 'bucket', 'metrics')))
+
+    def test_sha256_of_directory_depends_on_file_names(self):
+        dirs = [os.path.join(self.staging_dir, name) for name in 'ab']
+        for directory, file_name in zip(dirs, ['x', 'y']):
+            os.makedirs(directory)
+            with open(os.path.join(directory, file_name), 'w') as f:
+                f.write('data')
+
+        self.assertNotEqual(
+            artifact_staging._get_sha256(dirs[0]),
+            artifact_staging._get_sha256(dirs[1]))
+
+    @mock.patch('time.sleep')
+    def test_rate_limit(self, mock_sleep):
+        for i in range(3):
+            self.write_artifact(f'a{i}', 'x' * 100)
+        artifacts = [
+            artifact_types.Dataset(uri=f'gs://bucket/a{i}') for i in range(3)
+        ]
+
+        artifact_staging.stage_input_artifacts(
+            artifacts,
+            artifact_staging.StagingConfig(
+                stage_inputs=True, max_workers=1, max_bytes_per_second=10))
+
+        self.assertEqual(2, mock_sleep.call_count)
+        self.assertAlmostEqual(20, mock_sleep.call_args[0][0], delta=1)
+
+    def test_config_from_env(self):
+        with mock.patch.dict(
+                os.environ, {
+                    'KFP_STAGE_INPUT_ARTIFACTS': 'true',
+                    'KFP_STAGE_OUTPUT_ARTIFACTS': '1',
+                    'KFP_STAGING_MAX_WORKERS': '4',
+                    'KFP_STAGING_MAX_BYTES_PER_SECOND': '1e6',
+                }):
+            config = artifact_staging.StagingConfig.from_env()
+
+        self.assertEqual(
+            artifact_staging.StagingConfig(
+                stage_inputs=True,
+                stage_outputs=True,
+                max_workers=4,
+                max_bytes_per_second=1e6), config)
+
+    def test_config_from_empty_env(self):
+        with mock.patch.dict(os.environ, clear=True):
+            config = artifact_staging.StagingConfig.from_env()
+
+        self.assertEqual(artifact_staging.StagingConfig(), config)
+
+
+if __name__ == '__main__':
+    unittest.main()
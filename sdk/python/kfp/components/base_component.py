@@ -105,8 +105,26 @@ class BaseComponent(abc.ABC):
     @property
     def pipeline_spec(self) -> pipeline_spec_pb2.PipelineSpec:
         """Returns the pipeline spec of the component."""
+        # import here to avoid circular module dependency
+        from kfp.compiler import compilation_cache
+
+        cache = compilation_cache.get_default_cache()
+        cache_key = None
+        if cache is not None:
+            try:
+                cache_key = compilation_cache.fingerprint(self.component_spec)
+            except compilation_cache.UnfingerprintableObjectError:
+                pass
+        if cache_key is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached[0]
+
         with BlockPipelineTaskRegistration():
-            return self.component_spec.to_pipeline_spec()
+            pipeline_spec = self.component_spec.to_pipeline_spec()
+        if cache_key is not None:
+            cache.put(cache_key, pipeline_spec)
+        return pipeline_spec
 
     @property
     def platform_spec(self) -> pipeline_spec_pb2.PlatformSpec:
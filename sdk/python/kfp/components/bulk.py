@@ -0,0 +1,128 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Concurrent execution of bulk operations, e.g. of the API and registry
+clients."""
+
+from concurrent import futures
+import dataclasses
+from typing import (Any, Callable, Dict, Iterable, Iterator, List, Optional,
+                    Tuple)
+
+DEFAULT_MAX_CONCURRENCY = 16
+
+# Number of items submitted ahead of the ones being executed, per worker.
+# Bounds memory use when the items are produced by a long or infinite
+# iterator.
+_SUBMISSION_WINDOW_FACTOR = 2
+
+
+@dataclasses.dataclass
+class BulkOperationResult:
+    """The outcome of one item of a bulk operation.
+
+    Attributes:
+        index: The position of the item in the input.
+        item: The input item, e.g. a run ID.
+        result: The return value of the operation, if it succeeded.
+        error: The exception raised by the operation, if it failed.
+    """
+    index: int
+    item: Any
+    result: Any = None
+    error: Optional[Exception] = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
+def map_concurrently(
+    operation: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> Iterator[BulkOperationResult]:
+    """Applies an operation to items on a thread pool.
+
+    Items are consumed lazily, and operations are only started as the
+    returned iterator is consumed. Results are yielded as soon as they are
+    available, in completion order. A failure is reported in the result of
+    its item and does not stop the other items.
+
+    Args:
+        operation: The operation to apply to each item.
+        items: The items.
+        max_concurrency: The maximum number of operations in flight.
+
+    Returns:
+        An iterator of the result of each item.
+    """
+    if max_concurrency < 1:
+        raise ValueError(
+            f'max_concurrency must be at least 1. Got: {max_concurrency}.')
+
+    indexed_items = enumerate(items)
+    pending: Dict[futures.Future, Tuple[int, Any]] = {}
+    executor = futures.ThreadPoolExecutor(max_workers=max_concurrency)
+
+    def submit(count: int) -> None:
+        for _ in range(count):
+            try:
+                index, item = next(indexed_items)
+            except StopIteration:
+                return
+            pending[executor.submit(operation, item)] = (index, item)
+
+    try:
+        submit(_SUBMISSION_WINDOW_FACTOR * max_concurrency)
+        while pending:
+            done, _ = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+            for future in done:
+                index, item = pending.pop(future)
+                error = future.exception()
+                yield BulkOperationResult(
+                    index=index,
+                    item=item,
+                    result=None if error else future.result(),
+                    error=error)
+            submit(len(done))
+    finally:
+        # If the caller stops iterating early, do not start the remaining
+        # operations.
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def run_concurrently(
+    operation: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> List[BulkOperationResult]:
+    """Applies an operation to items on a thread pool and waits for all of
+    them.
+
+    Unlike ``map_concurrently``, every operation has run when this returns,
+    whether or not the results are read.
+
+    Args:
+        operation: The operation to apply to each item.
+        items: The items.
+        max_concurrency: The maximum number of operations in flight.
+
+    Returns:
+        The result of each item, in the order of the items.
+    """
+    return sorted(
+        map_concurrently(operation, items, max_concurrency),
+        key=lambda result: result.index)
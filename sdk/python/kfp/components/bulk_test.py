@@ -0,0 +1,105 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for kfp.components.bulk."""
+
+import itertools
+import threading
+import time
+import unittest
+
+from kfp.components import bulk
+
+
+class MapConcurrentlyTest(unittest.TestCase):
+
+    def test_results_and_errors(self):
+
+        def operation(item: int) -> int:
+            if item == 2:
+                raise RuntimeError('failed')
+            return item * 10
+
+        results = sorted(
+            bulk.map_concurrently(operation, [0, 1, 2, 3], max_concurrency=2),
+            key=lambda result: result.index)
+
+        self.assertEqual([result.item for result in results], [0, 1, 2, 3])
+        self.assertEqual([result.result for result in results],
+                         [0, 10, None, 30])
+        self.assertEqual([result.succeeded for result in results],
+                         [True, True, False, True])
+        self.assertIsInstance(results[2].error, RuntimeError)
+
+    def test_max_concurrency(self):
+        lock = threading.Lock()
+        in_flight = 0
+        max_in_flight = 0
+
+        def operation(item: int) -> None:
+            nonlocal in_flight, max_in_flight
+            with lock:
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+            time.sleep(0.01)
+            with lock:
+                in_flight -= 1
+
+        results = list(
+            bulk.map_concurrently(operation, range(20), max_concurrency=3))
+
+        self.assertEqual(len(results), 20)
+        self.assertLessEqual(max_in_flight, 3)
+        self.assertGreater(max_in_flight, 1)
+
+    def test_items_are_consumed_lazily(self):
+        consumed = []
+
+        def items():
+            for item in itertools.count():
+                consumed.append(item)
+                yield item
+
+        results = bulk.map_concurrently(lambda x: x, items(), max_concurrency=2)
+        self.assertEqual(consumed, [])
+
+        next(results)
+        results.close()
+        self.assertLess(len(consumed), 10)
+
+    def test_invalid_max_concurrency(self):
+        with self.assertRaisesRegex(ValueError, r'at least 1'):
+            list(bulk.map_concurrently(lambda x: x, [1], max_concurrency=0))
+
+
+class RunConcurrentlyTest(unittest.TestCase):
+
+    def test_runs_all_operations_in_order(self):
+        done = []
+
+        def operation(item: int) -> int:
+            # Later items finish first.
+            time.sleep(0.01 * (5 - item))
+            done.append(item)
+            return item * 10
+
+        results = bulk.run_concurrently(operation, range(5), max_concurrency=5)
+
+        self.assertCountEqual(done, range(5))
+        self.assertEqual([result.index for result in results], list(range(5)))
+        self.assertEqual([result.result for result in results],
+                         [0, 10, 20, 30, 40])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,308 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""On-disk cache of components loaded from URLs, keyed on the URL and the
+digest of the content.
+
+The cache is disabled unless the ``KFP_COMPONENT_CACHE_DIR`` environment
+variable is set or a cache is set with `set_default_cache`.
+"""
+
+import concurrent.futures
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from requests import adapters
+from urllib3.util import retry
+
+# Directory of the on-disk cache. The cache is disabled if it is not set.
+COMPONENT_CACHE_DIR_ENV_VAR = 'KFP_COMPONENT_CACHE_DIR'
+# Serve components from the cache only, without any network access.
+COMPONENT_CACHE_OFFLINE_ENV_VAR = 'KFP_COMPONENT_CACHE_OFFLINE'
+
+_BLOBS_DIR = 'blobs'
+_URLS_DIR = 'urls'
+_DEFAULT_MAX_WORKERS = 8
+_DEFAULT_TIMEOUT = 60
+
+
+def _is_true(value: Optional[str]) -> bool:
+    return (value or '').lower() in ('1', 'true', 'yes')
+
+
+def _sha256(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def _resolve_url(url: str) -> str:
+    if url.startswith('gs://'):
+        # Replacing the gs:// URI with https:// URI (works for public objects)
+        return 'https://storage.googleapis.com/' + url[len('gs://'):]
+    return url
+
+
+def _make_session(pool_maxsize: int) -> requests.Session:
+    session = requests.Session()
+    adapter = adapters.HTTPAdapter(
+        pool_connections=pool_maxsize,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry.Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504)))
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+class ComponentCache:
+    """A cache of component files downloaded from URLs.
+
+    The contents are stored on disk by SHA-256 digest, and each URL maps to
+    the digest of its latest contents along with its ``ETag`` and
+    ``Last-Modified`` headers. Cached URLs are revalidated with conditional
+    requests, so that unchanged components are not downloaded again.
+    Contents pinned by digest are served from the cache without any request.
+    Without a cache directory, nothing is stored and every URL is downloaded.
+
+    Args:
+        cache_dir: The directory in which entries are stored. Defaults to the
+            ``KFP_COMPONENT_CACHE_DIR`` environment variable. If neither is
+            set, the cache is disabled.
+        offline: Whether to serve components from the cache only, and fail
+            for URLs that are not cached. Defaults to the
+            ``KFP_COMPONENT_CACHE_OFFLINE`` environment variable.
+        max_workers: The maximum number of concurrent downloads by
+            `prefetch`, which is also the size of the connection pool.
+        session: The session used for requests. A session with a connection
+            pool and retries on transient errors is created if not
+            specified.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        offline: Optional[bool] = None,
+        max_workers: int = _DEFAULT_MAX_WORKERS,
+        session: Optional[requests.Session] = None,
+    ):
+        self.cache_dir = cache_dir or os.environ.get(
+            COMPONENT_CACHE_DIR_ENV_VAR) or None
+        self.offline = _is_true(
+            os.environ.get(COMPONENT_CACHE_OFFLINE_ENV_VAR)
+        ) if offline is None else offline
+        self.max_workers = max_workers
+        self._session = session
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        with self._session_lock:
+            if self._session is None:
+                self._session = _make_session(self.max_workers)
+            return self._session
+
+    def fetch(
+        self,
+        url: str,
+        auth: Optional[Tuple[str, str]] = None,
+        sha256: Optional[str] = None,
+    ) -> bytes:
+        """Returns the contents at a URL, from the cache if they are unchanged.
+
+        Cached contents are only returned without revalidating them if they
+        are pinned by ``sha256`` or the cache is offline.
+
+        Args:
+            url: The URL. ``gs://`` URIs are read through the public
+                ``https://storage.googleapis.com`` endpoint.
+            auth: A ``('<username>', '<password>')`` tuple of credentials.
+            sha256: The expected SHA-256 digest of the contents. If the
+                contents are cached, they are returned without a request.
+
+        Returns:
+            The contents.
+
+        Raises:
+            ValueError: If the contents do not match ``sha256``.
+            RuntimeError: If offline and the URL is not cached.
+            requests.HTTPError: If the request failed.
+        """
+        if sha256 is not None:
+            content = self._read_blob(sha256)
+            if content is not None:
+                return content
+
+        entry = self._read_entry(url)
+        cached_content = self._read_blob(
+            entry['sha256']) if entry is not None else None
+
+        if self.offline:
+            if cached_content is None:
+                raise RuntimeError(
+                    f'Component {url} is not cached and offline mode is'
+                    ' enabled.')
+            return self._verify(url, cached_content, sha256)
+
+        headers = {}
+        if cached_content is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        response = self.session.get(
+            _resolve_url(url),
+            auth=auth,
+            headers=headers,
+            timeout=_DEFAULT_TIMEOUT)
+
+        if response.status_code == 304 and cached_content is not None:
+            return self._verify(url, cached_content, sha256)
+        response.raise_for_status()
+
+        content = self._verify(url, response.content, sha256)
+        if self.cache_dir is not None:
+            self._write_blob(content)
+            self._write_entry(
+                url, {
+                    'url': url,
+                    'sha256': _sha256(content),
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                })
+        return content
+
+    def prefetch(
+        self,
+        urls: List[str],
+        auth: Optional[Tuple[str, str]] = None,
+    ) -> Dict[str, bytes]:
+        """Fetches the contents at many URLs concurrently.
+
+        Args:
+            urls: The URLs.
+            auth: A ``('<username>', '<password>')`` tuple of credentials.
+
+        Returns:
+            The contents, by URL.
+
+        Raises:
+            RuntimeError: If any URL could not be fetched. All URLs are
+                fetched first.
+        """
+        unique_urls = list(dict.fromkeys(urls))
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_workers) as executor:
+            futures = {
+                url: executor.submit(self.fetch, url, auth=auth)
+                for url in unique_urls
+            }
+        contents = {}
+        errors = []
+        for url, future in futures.items():
+            error = future.exception()
+            if error is not None:
+                logging.error(f'Failed to fetch component {url}: {error!r}')
+                errors.append(url)
+            else:
+                contents[url] = future.result()
+        if errors:
+            raise RuntimeError(
+                f'Failed to fetch components: {", ".join(errors)}')
+        return contents
+
+    def _verify(self, url: str, content: bytes, sha256: Optional[str]) -> bytes:
+        if sha256 is not None and _sha256(content) != sha256:
+            raise ValueError(
+                f'The SHA-256 digest of component {url} is {_sha256(content)},'
+                f' expected {sha256}.')
+        return content
+
+    def _blob_path(self, sha256: str) -> str:
+        return os.path.join(self.cache_dir, _BLOBS_DIR, sha256)
+
+    def _entry_path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, _URLS_DIR,
+                            _sha256(url.encode()) + '.json')
+
+    def _read_blob(self, sha256: str) -> Optional[bytes]:
+        if self.cache_dir is None:
+            return None
+        try:
+            with open(self._blob_path(sha256), 'rb') as f:
+                content = f.read()
+        except OSError:
+            return None
+        # Guards against partially written or corrupted blobs.
+        return content if _sha256(content) == sha256 else None
+
+    def _read_entry(self, url: str) -> Optional[dict]:
+        if self.cache_dir is None:
+            return None
+        try:
+            with open(self._entry_path(url)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_blob(self, content: bytes) -> None:
+        self._write_file(self._blob_path(_sha256(content)), content)
+
+    def _write_entry(self, url: str, entry: dict) -> None:
+        self._write_file(self._entry_path(url), json.dumps(entry).encode())
+
+    def _write_file(self, path: str, content: bytes) -> None:
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            os.replace(temp_path, path)
+        except OSError:
+            # The on-disk cache is best effort.
+            pass
+
+
+_default_cache: Optional[ComponentCache] = None
+
+
+def get_default_cache() -> ComponentCache:
+    """Returns the process-wide component cache.
+
+    Unless a cache was set with `set_default_cache`, it is created from
+    the ``KFP_COMPONENT_CACHE_DIR`` and ``KFP_COMPONENT_CACHE_OFFLINE``
+    environment variables, and is disabled if
+    ``KFP_COMPONENT_CACHE_DIR`` is not set.
+    """
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ComponentCache()
+    return _default_cache
+
+
+def set_default_cache(cache: Optional[ComponentCache]) -> None:
+    """Sets the process-wide component cache.
+
+    Args:
+        cache: The cache to use. If None, a new cache is created on next use
+            from the ``KFP_COMPONENT_CACHE_DIR`` and
+            ``KFP_COMPONENT_CACHE_OFFLINE`` environment variables.
+    """
+    global _default_cache
+    _default_cache = cache
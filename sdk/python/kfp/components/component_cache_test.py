@@ -0,0 +1,206 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for kfp.components.component_cache."""
+
+import hashlib
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from kfp.components import component_cache
+import requests
+
+
+class FakeResponse:
+
+    def __init__(self, status_code, content=b'', headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f'{self.status_code} Error')
+
+
+class FakeSession:
+    """A session that serves contents by URL and honors If-None-Match."""
+
+    def __init__(self):
+        self.contents = {}
+        self.requests = []
+        self.error = None
+        self._lock = threading.Lock()
+
+    def get(self, url, auth=None, headers=None, timeout=None):
+        with self._lock:
+            self.requests.append((url, headers))
+        if self.error is not None:
+            raise self.error
+        if url not in self.contents:
+            return FakeResponse(404)
+        content = self.contents[url]
+        etag = hashlib.md5(content).hexdigest()
+        if (headers or {}).get('If-None-Match') == etag:
+            return FakeResponse(304)
+        return FakeResponse(200, content, {'ETag': etag})
+
+
+class ComponentCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.cache_dir = tmp_dir.name
+        self.session = FakeSession()
+        self.session.contents['https://host/a.yaml'] = b'a'
+
+    def make_cache(self, **kwargs):
+        return component_cache.ComponentCache(
+            cache_dir=self.cache_dir, session=self.session, **kwargs)
+
+    def test_fetch_revalidates_cached_url(self):
+        cache = self.make_cache()
+
+        self.assertEqual(b'a', cache.fetch('https://host/a.yaml'))
+        # A new cache reads the entries on disk.
+        self.assertEqual(b'a', self.make_cache().fetch('https://host/a.yaml'))
+
+        self.assertEqual(2, len(self.session.requests))
+        self.assertEqual({}, self.session.requests[0][1])
+        self.assertEqual(
+            hashlib.md5(b'a').hexdigest(),
+            self.session.requests[1][1]['If-None-Match'])
+
+    def test_fetch_changed_url(self):
+        cache = self.make_cache()
+        cache.fetch('https://host/a.yaml')
+
+        self.session.contents['https://host/a.yaml'] = b'b'
+
+        self.assertEqual(b'b', cache.fetch('https://host/a.yaml'))
+
+    def test_fetch_pinned_content_without_request(self):
+        cache = self.make_cache()
+        sha256 = hashlib.sha256(b'a').hexdigest()
+        cache.fetch('https://host/a.yaml')
+
+        self.assertEqual(b'a',
+                         cache.fetch('https://host/a.yaml', sha256=sha256))
+        self.assertEqual(1, len(self.session.requests))
+
+    def test_fetch_pinned_content_mismatch(self):
+        cache = self.make_cache()
+
+        with self.assertRaisesRegex(ValueError, r'expected 0+'):
+            cache.fetch('https://host/a.yaml', sha256='0' * 64)
+        self.assertFalse(os.path.exists(os.path.join(self.cache_dir, 'urls')))
+
+    def test_fetch_offline(self):
+        self.make_cache().fetch('https://host/a.yaml')
+        cache = self.make_cache(offline=True)
+
+        self.assertEqual(b'a', cache.fetch('https://host/a.yaml'))
+        with self.assertRaisesRegex(RuntimeError, r'not cached'):
+            cache.fetch('https://host/b.yaml')
+        self.assertEqual(1, len(self.session.requests))
+
+    def test_offline_from_env(self):
+        with mock.patch.dict(
+                os.environ,
+            {component_cache.COMPONENT_CACHE_OFFLINE_ENV_VAR: 'true'}):
+            self.assertTrue(self.make_cache().offline)
+
+    def test_fetch_does_not_use_cached_content_on_network_error(self):
+        cache = self.make_cache()
+        cache.fetch('https://host/a.yaml')
+
+        self.session.error = requests.ConnectionError('unreachable')
+
+        with self.assertRaises(requests.ConnectionError):
+            cache.fetch('https://host/a.yaml')
+        self.assertEqual(
+            b'a',
+            cache.fetch(
+                'https://host/a.yaml', sha256=hashlib.sha256(b'a').hexdigest()))
+
+    def test_cache_is_disabled_without_cache_dir(self):
+        with mock.patch.dict(os.environ, clear=True):
+            cache = component_cache.ComponentCache(session=self.session)
+
+        self.assertIsNone(cache.cache_dir)
+        self.assertEqual(b'a', cache.fetch('https://host/a.yaml'))
+        self.assertEqual(b'a', cache.fetch('https://host/a.yaml'))
+        self.assertEqual([('https://host/a.yaml', {})] * 2,
+                         self.session.requests)
+
+    def test_default_cache_dir_from_env(self):
+        self.addCleanup(component_cache.set_default_cache, None)
+        with mock.patch.dict(os.environ, clear=True):
+            component_cache.set_default_cache(None)
+            self.assertIsNone(component_cache.get_default_cache().cache_dir)
+        with mock.patch.dict(
+                os.environ,
+            {component_cache.COMPONENT_CACHE_DIR_ENV_VAR: self.cache_dir}):
+            component_cache.set_default_cache(None)
+            self.assertEqual(self.cache_dir,
+                             component_cache.get_default_cache().cache_dir)
+
+    def test_fetch_missing_url(self):
+        with self.assertRaises(requests.HTTPError):
+            self.make_cache().fetch('https://host/b.yaml')
+
+    def test_fetch_gcs_uri(self):
+        self.session.contents[
+            'https://storage.googleapis.com/bucket/c.yaml'] = b'c'
+
+        self.assertEqual(b'c', self.make_cache().fetch('gs://bucket/c.yaml'))
+
+    def test_corrupted_blob_is_downloaded_again(self):
+        cache = self.make_cache()
+        cache.fetch('https://host/a.yaml')
+        blob_path = os.path.join(self.cache_dir, 'blobs',
+                                 hashlib.sha256(b'a').hexdigest())
+        with open(blob_path, 'wb') as f:
+            f.write(b'corrupted')
+
+        self.assertEqual(b'a', cache.fetch('https://host/a.yaml'))
+        self.assertEqual({}, self.session.requests[-1][1])
+
+    def test_prefetch(self):
+        urls = [f'https://host/{i}.yaml' for i in range(10)]
+        for i, url in enumerate(urls):
+            self.session.contents[url] = str(i).encode()
+
+        contents = self.make_cache(max_workers=4).prefetch(urls + urls[:2])
+
+        self.assertEqual({url: str(i).encode() for i, url in enumerate(urls)},
+                         contents)
+        self.assertEqual(10, len(self.session.requests))
+
+    def test_prefetch_reports_all_failures(self):
+        with self.assertRaisesRegex(
+                RuntimeError, r'https://host/b.yaml, https://host/c.yaml'):
+            self.make_cache().prefetch([
+                'https://host/a.yaml', 'https://host/b.yaml',
+                'https://host/c.yaml'
+            ])
+        self.assertEqual(3, len(self.session.requests))
+
+
+if __name__ == '__main__':
+    unittest.main()
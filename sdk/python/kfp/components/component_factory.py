@@ -11,11 +11,14 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from __future__ import annotations
+
 import dataclasses
 import inspect
 import itertools
 import pathlib
 import re
+import shlex
 import textwrap
 from typing import Callable, List, Mapping, Optional, Tuple, Type, Union
 import warnings
@@ -107,10 +110,47 @@ PIP_DISABLE_PIP_VERSION_CHECK=1 python3 -m pip install --quiet \
     --no-warn-script-location {index_url_options}{concat_package_list} && "$0" "$@"
 '''
 
+_install_python_packages_script_pattern = re.compile(
+    r'python3 -m pip install --quiet\s+--no-warn-script-location (.*) '
+    r'&& "\$0" "\$@"$', re.MULTILINE)
+
+# The file that marks a wheelhouse directory as completely populated.
+WHEELHOUSE_MANIFEST_FILE = 'kfp-wheelhouse.json'
+
+# Installs packages offline from a pre-resolved wheelhouse. Installation is
+# skipped when the marker of the same wheelhouse key is present in the image,
+# e.g. on a retry or in an image built with the packages preinstalled, and
+# falls back to installing from the index when the wheelhouse is not reachable
+# from the container. The status line can be used as a cache-hit metric.
+_install_python_packages_from_wheelhouse_script_template = '''
+KFP_WHEELHOUSE_MARKER="$(python3 -c 'import sys; print(sys.prefix)')/.kfp-wheelhouse-{wheelhouse_key}"
+if [ -f "$KFP_WHEELHOUSE_MARKER" ]; then
+    echo "kfp-wheelhouse: key={wheelhouse_key} status=hit" >&2
+else
+    if ! [ -x "$(command -v pip)" ]; then
+        python3 -m ensurepip || python3 -m ensurepip --user || apt-get install python3-pip
+    fi
+    if [ -f "{wheelhouse_dir}/{manifest_file}" ]; then
+        echo "kfp-wheelhouse: key={wheelhouse_key} status=offline" >&2
+        PIP_DISABLE_PIP_VERSION_CHECK=1 python3 -m pip install --quiet \
+            --no-warn-script-location --no-index --find-links "{wheelhouse_dir}" \
+            {concat_package_list} || exit 1
+        touch "$KFP_WHEELHOUSE_MARKER" 2>/dev/null
+    else
+        echo "kfp-wheelhouse: key={wheelhouse_key} status=miss" >&2
+        PIP_DISABLE_PIP_VERSION_CHECK=1 python3 -m pip install --quiet \
+            --no-warn-script-location {index_url_options}{concat_package_list} || exit 1
+    fi
+fi
+"$0" "$@"
+'''
+
 
 def _get_packages_to_install_command(
         package_list: Optional[List[str]] = None,
-        pip_index_urls: Optional[List[str]] = None) -> List[str]:
+        pip_index_urls: Optional[List[str]] = None,
+        wheelhouse_dir: Optional[str] = None,
+        wheelhouse_key: Optional[str] = None) -> List[str]:
 
     if not package_list:
         return []
@@ -118,12 +158,48 @@ def _get_packages_to_install_command(
     concat_package_list = ' '.join(
         [repr(str(package)) for package in package_list])
     index_url_options = make_index_url_options(pip_index_urls)
-    install_python_packages_script = _install_python_packages_script_template.format(
-        index_url_options=index_url_options,
-        concat_package_list=concat_package_list)
+    if wheelhouse_dir is not None:
+        install_python_packages_script = _install_python_packages_from_wheelhouse_script_template.format(
+            wheelhouse_dir=wheelhouse_dir,
+            wheelhouse_key=wheelhouse_key,
+            manifest_file=WHEELHOUSE_MANIFEST_FILE,
+            index_url_options=index_url_options,
+            concat_package_list=concat_package_list)
+    else:
+        install_python_packages_script = _install_python_packages_script_template.format(
+            index_url_options=index_url_options,
+            concat_package_list=concat_package_list)
     return ['sh', '-c', install_python_packages_script]
 
 
+def _parse_packages_to_install_command(
+        command: List[str]) -> Optional[Tuple[List[str], List[str]]]:
+    """Parses a command generated by _get_packages_to_install_command without a
+    wheelhouse.
+
+    Returns:
+        A tuple of the packages to install and the pip index urls, or None if
+        the command does not start with a package installation script.
+    """
+    if len(command) < 3 or command[:2] != ['sh', '-c']:
+        return None
+    match = _install_python_packages_script_pattern.search(command[2])
+    if match is None:
+        return None
+
+    package_list = []
+    pip_index_urls = []
+    tokens = iter(shlex.split(match.group(1)))
+    for token in tokens:
+        if token in ('--index-url', '--extra-index-url'):
+            pip_index_urls.append(next(tokens))
+        elif token == '--trusted-host':
+            next(tokens)
+        else:
+            package_list.append(token)
+    return package_list, pip_index_urls
+
+
 def _get_default_kfp_package_path() -> str:
     import kfp
     return f'kfp=={kfp.__version__}'
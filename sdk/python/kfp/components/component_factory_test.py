@@ -54,6 +54,32 @@ class TestGetPackagesToInstallCommand(unittest.TestCase):
         for package in packages_to_install + pip_index_urls:
             self.assertTrue(package in concat_command)
 
+    def test_with_wheelhouse(self):
+        command = component_factory._get_packages_to_install_command(
+            ['package1'],
+            wheelhouse_dir='/wheelhouse/abc',
+            wheelhouse_key='abc')
+        concat_command = ' '.join(command)
+        self.assertIn('--no-index --find-links "/wheelhouse/abc"',
+                      concat_command)
+        self.assertIn('.kfp-wheelhouse-abc', concat_command)
+        self.assertIsNone(
+            component_factory._parse_packages_to_install_command(command))
+
+    def test_parse_packages_to_install_command(self):
+        packages_to_install = ['package1', 'package2>=1.0']
+        pip_index_urls = ['https://myurl.org/simple', 'https://other.org']
+
+        command = component_factory._get_packages_to_install_command(
+            packages_to_install, pip_index_urls)
+
+        self.assertEqual(
+            component_factory._parse_packages_to_install_command(command),
+            (packages_to_install, pip_index_urls))
+        self.assertIsNone(
+            component_factory._parse_packages_to_install_command(
+                ['python3', '-m', 'kfp.components.executor_main']))
+
 
 class TestInvalidParameterName(unittest.TestCase):
 
@@ -14,26 +14,35 @@
 import inspect
 import json
 import os
-from typing import Any, Callable, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, TYPE_CHECKING, Union
 
-from kfp.components import python_component
+from kfp.components import artifact_staging
 from kfp.components import task_final_status
 from kfp.components.types import artifact_types
 from kfp.components.types import type_annotations
 
+if TYPE_CHECKING:
+    from kfp.components import python_component
+
 
 class Executor():
     """Executor executes v2-based Python function components."""
 
-    def __init__(self, executor_input: Dict,
-                 function_to_execute: Union[Callable,
-                                            python_component.PythonComponent]):
+    def __init__(
+            self,
+            executor_input: Dict,
+            function_to_execute: Union[Callable,
+                                       'python_component.PythonComponent'],
+            staging_config: Optional[artifact_staging.StagingConfig] = None):
         if hasattr(function_to_execute, 'python_func'):
             self._func = function_to_execute.python_func
         else:
             self._func = function_to_execute
 
         self._input = executor_input
+        if staging_config is None:
+            staging_config = artifact_staging.StagingConfig()
+        self._staging_config = staging_config
         self._input_artifacts: Dict[str,
                                     Union[artifact_types.Artifact,
                                           List[artifact_types.Artifact]]] = {}
@@ -72,6 +81,8 @@ class Executor():
                     self._func,
                 )
                 self._output_artifacts[name] = output_artifact
+                if self._staging_config.stage_outputs:
+                    artifact_staging.stage_output_artifacts([output_artifact])
                 self.makedirs_recursively(output_artifact.path)
 
         self._return_annotation = inspect.signature(
@@ -108,6 +119,19 @@ class Executor():
     def _get_output_artifact(self, name: str):
         return self._output_artifacts.get(name)
 
+    def _stage_input_artifacts(self) -> None:
+        artifacts = []
+        for artifact in self._input_artifacts.values():
+            artifacts.extend(
+                artifact if isinstance(artifact, list) else [artifact])
+        artifact_staging.stage_input_artifacts(
+            [
+                artifact for artifact in artifacts
+                if isinstance(artifact, artifact_types.Artifact)
+            ],
+            self._staging_config,
+        )
+
     def _get_input_parameter_value(self, parameter_name: str):
         parameter_values = self._input.get('inputs',
                                            {}).get('parameterValues', None)
@@ -236,19 +260,6 @@ class Executor():
             )
 
     def _write_executor_output(self, func_output: Optional[Any] = None):
-        if self._output_artifacts:
-            self._executor_output['artifacts'] = {}
-
-        for name, artifact in self._output_artifacts.items():
-            runtime_artifact = {
-                'name': artifact.name,
-                'uri': artifact.uri,
-                'metadata': artifact.metadata,
-            }
-            artifacts_list = {'artifacts': [runtime_artifact]}
-
-            self._executor_output['artifacts'][name] = artifacts_list
-
         if func_output is not None:
             if self._is_parameter(self._return_annotation) or self._is_artifact(
                     self._return_annotation):
@@ -275,6 +286,26 @@ class Executor():
                     f'Unknown return type: {self._return_annotation}. Must be one of `str`, `int`, `float`, a subclass of `Artifact`, or a NamedTuple collection of these types.'
                 )
 
+        # Output artifacts are uploaded after return values are written to
+        # them, and the executor output is only written once all uploads
+        # succeeded.
+        if self._staging_config.stage_outputs:
+            artifact_staging.upload_output_artifacts(
+                list(self._output_artifacts.values()), self._staging_config)
+
+        if self._output_artifacts:
+            self._executor_output['artifacts'] = {}
+
+        for name, artifact in self._output_artifacts.items():
+            runtime_artifact = {
+                'name': artifact.name,
+                'uri': artifact.uri,
+                'metadata': artifact.metadata,
+            }
+            artifacts_list = {'artifacts': [runtime_artifact]}
+
+            self._executor_output['artifacts'][name] = artifacts_list
+
         # This check is to ensure only one worker (in a mirrored, distributed training/compute strategy) attempts to write to the same executor output file at the same time using gcsfuse, which enforces immutability of files.
         write_file = True
 
@@ -292,6 +323,9 @@ class Executor():
                 f.write(json.dumps(self._executor_output))
 
     def execute(self):
+        if self._staging_config.stage_inputs:
+            self._stage_input_artifacts()
+
         annotations = inspect.getfullargspec(self._func).annotations
 
         # Function arguments.
@@ -12,15 +12,25 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import argparse
+import contextlib
+import hashlib
 import json
 import logging
 import os
+import socket
 import sys
+import traceback
+import types
+from typing import Any, Callable, Dict, IO, Optional, Tuple
 
+from kfp.components import artifact_staging
 from kfp.components import executor as component_executor
 from kfp.components import kfp_config
 from kfp.components import utils
 
+# Modules loaded by a warm executor, keyed by module name and source digest.
+_module_cache: Dict[Tuple[str, str], types.ModuleType] = {}
+
 
 def _setup_logging():
     logging_format = '[KFP Executor %(asctime)s %(levelname)s]: %(message)s'
@@ -40,7 +50,6 @@ def executor_main():
     parser.add_argument(
         '--function_to_execute',
         type=str,
-        required=True,
         help='The name of the component function in '
         '--component_module_path file that is to be executed.')
 
@@ -50,20 +59,59 @@ def executor_main():
         help='JSON-serialized ExecutorInput from the orchestrator. '
         'This should contain inputs and placeholders for outputs.')
 
+    parser.add_argument(
+        '--worker_address',
+        type=str,
+        help='Run as a warm executor that executes a stream of requests in '
+        'this interpreter. Requests are read from the Unix socket at this '
+        'path, or from stdin if set to "-".')
+
     args, _ = parser.parse_known_args()
 
-    func_name = args.function_to_execute
+    if args.worker_address is not None:
+        serve(args.worker_address)
+        return
+
+    if args.function_to_execute is None:
+        parser.error('the following arguments are required: '
+                     '--function_to_execute')
+
+    run_executor(
+        executor_input=json.loads(args.executor_input),
+        function_to_execute=args.function_to_execute,
+        component_module_path=args.component_module_path,
+    )
+
+
+def load_function(
+    function_to_execute: str,
+    component_module_path: Optional[str] = None,
+    cache_modules: bool = False,
+) -> Callable:
+    """Loads the component function to execute.
+
+    Args:
+        function_to_execute: The name of the component function.
+        component_module_path: Path to a module containing the component. If
+            not specified, the module is looked up in `kfp_config.ini`.
+        cache_modules: Whether to reuse a module previously loaded in this
+            interpreter from a file with the same name and source.
+
+    Returns:
+        The component function.
+    """
+    func_name = function_to_execute
     module_path = None
     module_directory = None
     module_name = None
 
-    if args.component_module_path is not None:
+    if component_module_path is not None:
         logging.info(
-            f'Looking for component `{func_name}` in --component_module_path `{args.component_module_path}`'
+            f'Looking for component `{func_name}` in --component_module_path `{component_module_path}`'
         )
-        module_path = args.component_module_path
-        module_directory = os.path.dirname(args.component_module_path)
-        module_name = os.path.basename(args.component_module_path)[:-len('.py')]
+        module_path = component_module_path
+        module_directory = os.path.dirname(component_module_path)
+        module_name = os.path.basename(component_module_path)[:-len('.py')]
     else:
         # Look for module directory using kfp_config.ini
         logging.info(
@@ -87,19 +135,127 @@ def executor_main():
         f'Loading KFP component "{func_name}" from {module_path} (directory "{module_directory}" and module name "{module_name}")'
     )
 
-    module = utils.load_module(
-        module_name=module_name, module_directory=module_directory)
+    if not cache_modules:
+        module = utils.load_module(
+            module_name=module_name, module_directory=module_directory)
+        return getattr(module, func_name)
 
-    executor_input = json.loads(args.executor_input)
-    function_to_execute = getattr(module, func_name)
+    with open(module_path, 'rb') as f:
+        cache_key = (module_name, hashlib.sha256(f.read()).hexdigest())
+    if cache_key not in _module_cache:
+        _module_cache[cache_key] = utils.load_module(
+            module_name=module_name, module_directory=module_directory)
+    return getattr(_module_cache[cache_key], func_name)
+
+
+def run_executor(
+    executor_input: Dict[str, Any],
+    function_to_execute: str,
+    component_module_path: Optional[str] = None,
+    cache_modules: bool = False,
+) -> None:
+    """Loads the component function and executes it against an ExecutorInput.
+
+    Args:
+        executor_input: The ExecutorInput from the orchestrator, as a dict.
+        function_to_execute: The name of the component function.
+        component_module_path: Path to a module containing the component. If
+            not specified, the module is looked up in `kfp_config.ini`.
+        cache_modules: Whether to reuse a module previously loaded in this
+            interpreter from a file with the same name and source.
+    """
+    function = load_function(
+        function_to_execute=function_to_execute,
+        component_module_path=component_module_path,
+        cache_modules=cache_modules,
+    )
 
     logging.info(f'Got executor_input:\n{json.dumps(executor_input, indent=4)}')
 
     executor = component_executor.Executor(
-        executor_input=executor_input, function_to_execute=function_to_execute)
+        executor_input=executor_input,
+        function_to_execute=function,
+        staging_config=artifact_staging.StagingConfig.from_env())
 
     executor.execute()
 
 
+def _handle_request(request: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        run_executor(
+            executor_input=request['executor_input'],
+            function_to_execute=request['function_to_execute'],
+            component_module_path=request.get('component_module_path'),
+            cache_modules=True,
+        )
+    except (Exception, SystemExit):
+        logging.error(traceback.format_exc())
+        return {'status': 'error', 'error': traceback.format_exc()}
+    return {'status': 'ok'}
+
+
+def _serve_stream(requests: IO[bytes], responses: IO[bytes]) -> bool:
+    """Executes newline-delimited JSON requests until the stream is closed.
+
+    Returns:
+        True if a shutdown request was received.
+    """
+    for line in requests:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        if request.get('shutdown'):
+            return True
+        response = _handle_request(request)
+        responses.write(json.dumps(response).encode() + b'\n')
+        responses.flush()
+    return False
+
+
+def serve(address: str) -> None:
+    """Runs a warm executor that executes many tasks in this interpreter.
+
+    Each request is a newline-delimited JSON object with the keys
+    `executor_input`, `function_to_execute` and, optionally,
+    `component_module_path`. A JSON response of the form `{"status": "ok"}`
+    or `{"status": "error", "error": "<traceback>"}` is written for each
+    request. A request of the form `{"shutdown": true}` stops the executor.
+
+    Component modules are loaded once per distinct source and reused across
+    requests, so module-level state in component code persists between tasks.
+
+    Args:
+        address: The path of the Unix socket to listen on, or "-" to read
+            requests from stdin and write responses to stdout. In the latter
+            case, anything the component prints is redirected to stderr.
+    """
+    if address == '-':
+        responses = sys.stdout.buffer
+        with contextlib.redirect_stdout(sys.stderr):
+            for handler in logging.getLogger().handlers:
+                if getattr(handler, 'stream', None) is sys.__stdout__:
+                    handler.setStream(sys.stderr)
+            _serve_stream(sys.stdin.buffer, responses)
+        return
+
+    if os.path.exists(address):
+        os.remove(address)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        server.bind(address)
+        server.listen()
+        logging.info(f'Warm executor listening on {address}')
+        shutdown = False
+        while not shutdown:
+            connection, _ = server.accept()
+            with connection, connection.makefile('rb') as requests, \
+                    connection.makefile('wb') as responses:
+                shutdown = _serve_stream(requests, responses)
+    finally:
+        server.close()
+        if os.path.exists(address):
+            os.remove(address)
+
+
 if __name__ == '__main__':
     executor_main()
@@ -0,0 +1,141 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for kfp.components.executor_main."""
+
+import io
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from kfp.components import executor_main
+from kfp.components import utils
+
+_COMPONENT_SOURCE = """
+def add(a: int, b: int) -> int:
+    return a + b
+
+def fail():
+    raise ValueError('boom')
+"""
+
+
+class WarmExecutorTest(unittest.TestCase):
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.module_path = os.path.join(self._temp_dir.name,
+                                        'warm_component.py')
+        with open(self.module_path, 'w') as f:
+            f.write(_COMPONENT_SOURCE)
+        executor_main._module_cache.clear()
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _make_request(self, a: int, b: int) -> dict:
+        output_file = os.path.join(self._temp_dir.name, f'{a}_{b}',
+                                   'executor_output.json')
+        return {
+            'executor_input': {
+                'inputs': {
+                    'parameterValues': {
+                        'a': a,
+                        'b': b
+                    }
+                },
+                'outputs': {
+                    'parameters': {
+                        'Output': {
+                            'outputFile': output_file
+                        }
+                    },
+                    'outputFile': output_file,
+                },
+            },
+            'function_to_execute': 'add',
+            'component_module_path': self.module_path,
+        }
+
+    def _read_output(self, request: dict) -> dict:
+        with open(request['executor_input']['outputs']['outputFile']) as f:
+            return json.load(f)
+
+    def test_serve_stream_reuses_loaded_module(self):
+        requests = [self._make_request(1, 2), self._make_request(3, 4)]
+        failing_request = {
+            'executor_input': {},
+            'function_to_execute': 'fail',
+            'component_module_path': self.module_path,
+        }
+        stream = io.BytesIO(b'\n'.join(
+            json.dumps(request).encode()
+            for request in requests + [failing_request]))
+        responses = io.BytesIO()
+
+        with mock.patch.object(
+                utils, 'load_module',
+                wraps=utils.load_module) as mock_load_module:
+            shutdown = executor_main._serve_stream(stream, responses)
+
+        self.assertFalse(shutdown)
+        mock_load_module.assert_called_once()
+        self.assertEqual(
+            self._read_output(requests[0]), {'parameterValues': {
+                'Output': 3
+            }})
+        self.assertEqual(
+            self._read_output(requests[1]), {'parameterValues': {
+                'Output': 7
+            }})
+        results = [
+            json.loads(line) for line in responses.getvalue().splitlines()
+        ]
+        self.assertEqual([result['status'] for result in results],
+                         ['ok', 'ok', 'error'])
+        self.assertIn('boom', results[2]['error'])
+
+    def test_serve_on_unix_socket(self):
+        address = os.path.join(self._temp_dir.name, 'executor.sock')
+        server = threading.Thread(target=executor_main.serve, args=(address,))
+        server.start()
+        while not os.path.exists(address):
+            time.sleep(0.01)
+
+        request = self._make_request(2, 5)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(address)
+            with client.makefile('rwb') as stream:
+                stream.write(json.dumps(request).encode() + b'\n')
+                stream.flush()
+                response = json.loads(stream.readline())
+                stream.write(json.dumps({'shutdown': True}).encode() + b'\n')
+                stream.flush()
+        server.join(timeout=10)
+
+        self.assertEqual(response, {'status': 'ok'})
+        self.assertEqual(
+            self._read_output(request), {'parameterValues': {
+                'Output': 7
+            }})
+        self.assertFalse(server.is_alive())
+        self.assertFalse(os.path.exists(address))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -13,6 +13,7 @@
 # limitations under the License.
 """Tests for kfp.components.executor."""
 
+import hashlib
 import json
 import os
 import tempfile
@@ -21,8 +22,10 @@ import unittest
 from unittest import mock
 
 from absl.testing import parameterized
+from kfp.components import artifact_staging
 from kfp.components import executor
 from kfp.components.task_final_status import PipelineTaskFinalStatus
+from kfp.components.types import artifact_io
 from kfp.components.types import artifact_types
 from kfp.components.types.artifact_types import Artifact
 from kfp.components.types.artifact_types import Dataset
@@ -44,17 +47,27 @@ class ExecutorTest(unittest.TestCase):
         artifact_types._MINIO_LOCAL_MOUNT_PREFIX = cls._test_dir + '/minio/'
         artifact_types._S3_LOCAL_MOUNT_PREFIX = cls._test_dir + '/s3/'
 
-    def execute(self, func: Callable, executor_input: str) -> None:
+    def execute(
+        self,
+        func: Callable,
+        executor_input: str,
+        staging_config: Optional[artifact_staging.StagingConfig] = None
+    ) -> None:
         executor_input_dict = json.loads(executor_input %
                                          {'test_dir': self._test_dir})
 
         executor.Executor(
             executor_input=executor_input_dict,
-            function_to_execute=func).execute()
+            function_to_execute=func,
+            staging_config=staging_config).execute()
 
-    def execute_and_load_output_metadata(self, func: Callable,
-                                         executor_input: str) -> dict:
-        self.execute(func, executor_input)
+    def execute_and_load_output_metadata(
+        self,
+        func: Callable,
+        executor_input: str,
+        staging_config: Optional[artifact_staging.StagingConfig] = None
+    ) -> dict:
+        self.execute(func, executor_input, staging_config)
         with open(os.path.join(self._test_dir, 'output_metadata.json'),
                   'r') as f:
             return json.loads(f.read())
@@ -1183,6 +1196,223 @@ class ExecutorTest(unittest.TestCase):
 
         self.assertDictEqual(output_metadata, {})
 
+    def _use_transferring_backend(self):
+        """Transfers gs:// artifacts to and from a local storage root instead
+        of a mount, and returns the storage root and staging directory."""
+        storage_root = os.path.join(self._test_dir, 'storage')
+        staging_dir = os.path.join(self._test_dir, 'staging')
+
+        class TransferringLocalBackend(artifact_io.LocalBackend):
+
+            def get_local_path(self, uri):
+                return None
+
+            def download(self, uri, local_path):
+                self._copy(super().get_local_path(uri), local_path)
+
+            def upload(self, local_path, uri):
+                if uri.endswith('fail'):
+                    raise IOError('Upload failed.')
+                self._copy(local_path, super().get_local_path(uri))
+
+        for patcher in [
+                mock.patch.dict(
+                    artifact_io._backend_factories,
+                    {'gs': lambda: TransferringLocalBackend(storage_root)}),
+                mock.patch.dict(artifact_io._backends, clear=True),
+                mock.patch.dict(os.environ,
+                                {'KFP_ARTIFACT_STAGING_DIR': staging_dir}),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        return storage_root, staging_dir
+
+    def test_stage_input_artifacts(self):
+        executor_input = """\
+    {
+      "inputs": {
+        "artifacts": {
+          "input_list": {
+            "artifacts": [
+              {
+                "metadata": {},
+                "name": "input_list/0",
+                "type": {
+                  "schemaTitle": "system.Dataset"
+                },
+                "uri": "gs://some-bucket/output/input_list/0"
+              },
+              {
+                "metadata": {},
+                "name": "input_list/1",
+                "type": {
+                  "schemaTitle": "system.Dataset"
+                },
+                "uri": "gs://some-bucket/output/input_list/1"
+              }
+            ]
+          },
+          "input_path": {
+            "artifacts": [
+              {
+                "metadata": {},
+                "name": "input_path",
+                "type": {
+                  "schemaTitle": "system.Dataset"
+                },
+                "uri": "gs://some-bucket/output/input_list/0"
+              }
+            ]
+          }
+        }
+      },
+      "outputs": {
+        "outputFile": "%(test_dir)s/output_metadata.json"
+      }
+    }
+    """
+        storage_root, staging_dir = self._use_transferring_backend()
+        for i in range(2):
+            path = os.path.join(storage_root, 'gs', 'some-bucket', 'output',
+                                'input_list', str(i))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                f.write(f'data {i}')
+
+        def test_func(input_list: Input[List[Dataset]],
+                      input_path: InputPath('Dataset')):
+            for i, artifact in enumerate(input_list):
+                self.assertTrue(artifact.path.startswith(staging_dir))
+                self.assertEqual(f'gs://some-bucket/output/input_list/{i}',
+                                 artifact.uri)
+                with open(artifact.path) as f:
+                    self.assertEqual(f'data {i}', f.read())
+            self.assertEqual(input_list[0].path, input_path)
+
+        executor.Executor(
+            executor_input=json.loads(executor_input %
+                                      {'test_dir': self._test_dir}),
+            function_to_execute=test_func,
+            staging_config=artifact_staging.StagingConfig(
+                stage_inputs=True)).execute()
+
+        self.assertEqual(2, len(os.listdir(staging_dir)))
+
+    def test_stage_output_artifacts(self):
+        executor_input = """\
+    {
+      "outputs": {
+        "artifacts": {
+          "model": {
+            "artifacts": [
+              {
+                "metadata": {},
+                "name": "model",
+                "type": {
+                  "schemaTitle": "system.Model"
+                },
+                "uri": "gs://some-bucket/output/model"
+              }
+            ]
+          },
+          "metrics": {
+            "artifacts": [
+              {
+                "metadata": {},
+                "name": "metrics",
+                "type": {
+                  "schemaTitle": "system.Metrics"
+                },
+                "uri": "gs://some-bucket/output/metrics"
+              }
+            ]
+          },
+          "Output": {
+            "artifacts": [
+              {
+                "metadata": {},
+                "name": "Output",
+                "type": {
+                  "schemaTitle": "system.Dataset"
+                },
+                "uri": "gs://some-bucket/output/Output"
+              }
+            ]
+          }
+        },
+        "outputFile": "%(test_dir)s/output_metadata.json"
+      }
+    }
+    """
+        storage_root, staging_dir = self._use_transferring_backend()
+
+        def test_func(model: Output[Model],
+                      metrics: Output[Metrics]) -> Dataset:
+            self.assertTrue(model.path.startswith(staging_dir))
+            os.makedirs(model.path)
+            with open(os.path.join(model.path, 'saved_model.pb'), 'w') as f:
+                f.write('model')
+            metrics.log_metric('accuracy', 0.9)
+            return 'dataset'
+
+        output_metadata = self.execute_and_load_output_metadata(
+            test_func, executor_input,
+            artifact_staging.StagingConfig(stage_outputs=True))
+
+        with open(
+                os.path.join(storage_root, 'gs', 'some-bucket', 'output',
+                             'model', 'saved_model.pb')) as f:
+            self.assertEqual('model', f.read())
+        with open(
+                os.path.join(storage_root, 'gs', 'some-bucket', 'output',
+                             'Output')) as f:
+            self.assertEqual('dataset', f.read())
+        artifacts = output_metadata['artifacts']
+        self.assertEqual(
+            {
+                'size_bytes': 7,
+                'sha256': hashlib.sha256(b'dataset').hexdigest(),
+            }, artifacts['Output']['artifacts'][0]['metadata'])
+        self.assertEqual(
+            5, artifacts['model']['artifacts'][0]['metadata']['size_bytes'])
+        self.assertEqual({'accuracy': 0.9},
+                         artifacts['metrics']['artifacts'][0]['metadata'])
+
+    def test_failed_output_upload_does_not_write_executor_output(self):
+        executor_input = """\
+    {
+      "outputs": {
+        "artifacts": {
+          "Output": {
+            "artifacts": [
+              {
+                "metadata": {},
+                "name": "Output",
+                "type": {
+                  "schemaTitle": "system.Dataset"
+                },
+                "uri": "gs://some-bucket/output/fail"
+              }
+            ]
+          }
+        },
+        "outputFile": "%(test_dir)s/output_metadata.json"
+      }
+    }
+    """
+        self._use_transferring_backend()
+
+        def test_func() -> Dataset:
+            return 'dataset'
+
+        with self.assertRaisesRegex(RuntimeError,
+                                    r'gs://some-bucket/output/fail'):
+            self.execute(test_func, executor_input,
+                         artifact_staging.StagingConfig(stage_outputs=True))
+        self.assertFalse(
+            os.path.exists(
+                os.path.join(self._test_dir, 'output_metadata.json')))
+
 
 class VertexDataset:
     schema_title = 'google.VertexDataset'
@@ -14,9 +14,10 @@
 """Pipeline as a component (aka graph component)."""
 
 import inspect
-from typing import Callable, Optional
+from typing import Any, Callable, Optional
 import uuid
 
+from kfp.compiler import compilation_cache
 from kfp.compiler import pipeline_spec_builder as builder
 from kfp.components import base_component
 from kfp.components import pipeline_channel
@@ -25,6 +26,23 @@ from kfp.components import structures
 from kfp.pipeline_spec import pipeline_spec_pb2
 
 
+def _get_cache_key(
+    component_spec: structures.ComponentSpec,
+    dsl_pipeline: 'pipeline_context.Pipeline',
+    pipeline_outputs: Any,
+) -> Optional[str]:
+    """Fingerprints a traced pipeline, or returns None if it cannot be
+    fingerprinted."""
+    try:
+        # Tasks are visited in creation order first so that the upstream
+        # tasks of a task are visited before it, which keeps recursion shallow.
+        return compilation_cache.fingerprint(component_spec,
+                                             list(dsl_pipeline.tasks.values()),
+                                             dsl_pipeline, pipeline_outputs)
+    except (RecursionError, compilation_cache.UnfingerprintableObjectError):
+        return None
+
+
 class GraphComponent(base_component.BaseComponent):
     """A component defined via @dsl.pipeline decorator.
 
@@ -60,16 +78,31 @@ class GraphComponent(base_component.BaseComponent):
         if not dsl_pipeline.tasks:
             raise ValueError('Task is missing from pipeline.')
 
+        # The traced pipeline is fingerprinted before the group is renamed
+        # below, so that unchanged pipelines, including ones whose
+        # sub-pipelines are unchanged, are not recompiled.
+        cache = compilation_cache.get_default_cache()
+        cache_key = None
+        if cache is not None:
+            cache_key = _get_cache_key(self.component_spec, dsl_pipeline,
+                                       pipeline_outputs)
+        cached = cache.get(cache_key) if cache_key is not None else None
+
         # Making the pipeline group name unique to prevent name clashes with
         # templates
         pipeline_group = dsl_pipeline.groups[0]
         pipeline_group.name = uuid.uuid4().hex
 
-        pipeline_spec, platform_spec = builder.create_pipeline_spec(
-            pipeline=dsl_pipeline,
-            component_spec=self.component_spec,
-            pipeline_outputs=pipeline_outputs,
-        )
+        if cached is not None:
+            pipeline_spec, platform_spec = cached
+        else:
+            pipeline_spec, platform_spec = builder.create_pipeline_spec(
+                pipeline=dsl_pipeline,
+                component_spec=self.component_spec,
+                pipeline_outputs=pipeline_outputs,
+            )
+            if cache_key is not None:
+                cache.put(cache_key, pipeline_spec, platform_spec)
 
         pipeline_root = getattr(pipeline_func, 'pipeline_root', None)
         if pipeline_root is not None:
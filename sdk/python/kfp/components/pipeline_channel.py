@@ -13,6 +13,8 @@
 # limitations under the License.
 """Definition of PipelineChannel."""
 
+from __future__ import annotations
+
 import abc
 import contextlib
 import dataclasses
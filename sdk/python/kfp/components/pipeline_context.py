@@ -117,6 +117,7 @@ class Pipeline:
                 is_root=True)
         ]
         self._group_id = 0
+        self._task_names = utils.UniqueNameAllocator(self.tasks, '-')
 
     def __enter__(self):
 
@@ -162,11 +163,9 @@ class Pipeline:
         # serialization of PipelineChannels make unsanitized names problematic.
         task_name = utils.maybe_rename_for_k8s(task.component_spec.name)
         #If there is an existing task with this name then generate a new name.
-        task_name = utils.make_name_unique_by_adding_index(
-            task_name, list(self.tasks.keys()), '-')
+        task_name = self._task_names.make_name_unique(task_name)
         if task_name == '':
-            task_name = utils.make_name_unique_by_adding_index(
-                'task', list(self.tasks.keys()), '-')
+            task_name = self._task_names.make_name_unique('task')
 
         self.tasks[task_name] = task
         if add_to_group:
@@ -13,6 +13,8 @@
 # limitations under the License.
 """Definitions for component spec."""
 
+from __future__ import annotations
+
 import ast
 import collections
 import dataclasses
@@ -23,17 +25,16 @@ import uuid
 
 from google.protobuf import json_format
 import kfp
+from kfp.components import container_component_artifact_channel
 from kfp.components import placeholders
 from kfp.components import utils
 from kfp.components import v1_components
 from kfp.components import v1_structures
-from kfp.components.container_component_artifact_channel import \
-    ContainerComponentArtifactChannel
+from kfp.components import yaml_utils
 from kfp.components.types import artifact_types
 from kfp.components.types import type_annotations
 from kfp.components.types import type_utils
 from kfp.pipeline_spec import pipeline_spec_pb2
-import yaml
 
 
 @dataclasses.dataclass
@@ -503,7 +504,9 @@ def check_placeholder_references_valid_io_name(
         TypeError: if any argument is neither a str nor a placeholder
             instance.
     """
-    if isinstance(arg, ContainerComponentArtifactChannel):
+    if isinstance(
+            arg, container_component_artifact_channel
+            .ContainerComponentArtifactChannel):
         raise ValueError(
             'Cannot access artifact by itself in the container definition. Please use .uri or .path instead to access the artifact.'
         )
@@ -1001,6 +1004,8 @@ class ComponentSpec:
             platform_spec=pipeline_spec_pb2.PlatformSpec(
             ),  # no PlatformSpec single-component pipeline
         )
+        pipeline_spec.deployment_spec.update(
+            json_format.MessageToDict(deployment_config))
 
         return pipeline_spec
 
@@ -1059,7 +1064,7 @@ def load_documents_from_yaml(component_yaml: str) -> Tuple[dict, dict]:
     First document must always be present. If second document is
     present, it is returned as a dict, else an empty dict.
     """
-    documents = list(yaml.safe_load_all(component_yaml))
+    documents = list(yaml_utils.safe_load_all(component_yaml))
     num_docs = len(documents)
     if num_docs == 1:
         pipeline_spec_dict = documents[0]
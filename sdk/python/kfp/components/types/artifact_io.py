@@ -0,0 +1,611 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Reading and writing artifacts directly from their storage.
+
+By default, artifacts are read and written through the local paths at
+which their storage is mounted (e.g. ``/gcs/`` for ``gs://`` URIs). The
+backends in this module instead transfer artifacts with the native client
+of the storage, using parallel ranged downloads and multipart uploads, and
+stage them in a local directory.
+
+A backend is registered for each URI scheme with ``register_backend``. The
+``LocalBackend`` can stand in for an object store in tests::
+
+    artifact_io.register_backend('gs', lambda: artifact_io.LocalBackend(root))
+"""
+
+import abc
+import concurrent.futures
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from typing import Callable, Dict, IO, List, Optional, Tuple
+
+DEFAULT_CHUNK_SIZE = 32 * 1024 * 1024
+DEFAULT_MAX_WORKERS = 8
+
+_STAGING_DIR_ENV_VAR = 'KFP_ARTIFACT_STAGING_DIR'
+_MINIO_ENDPOINT_ENV_VAR = 'KFP_MINIO_ENDPOINT'
+_DEFAULT_MINIO_ENDPOINT = 'http://minio-service.kubeflow:9000'
+
+
+def split_uri(uri: str) -> Tuple[str, str, str]:
+    """Splits a URI into its scheme, bucket and key.
+
+    Args:
+        uri: URI such as ``gs://bucket/path/to/file``. A URI without a scheme
+            is a local path, with the scheme ``file``.
+
+    Returns:
+        The scheme, bucket and key of the URI. The bucket is empty for local
+        paths, whose key is the path.
+    """
+    if '://' not in uri:
+        return 'file', '', uri
+    scheme, rest = uri.split('://', 1)
+    if scheme == 'file':
+        return scheme, '', rest
+    bucket, _, key = rest.partition('/')
+    return scheme, bucket, key
+
+
+def _run_concurrently(functions: List[Callable[[], None]],
+                      max_workers: int) -> None:
+    if len(functions) == 1:
+        functions[0]()
+        return
+    with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers) as executor:
+        futures = [executor.submit(function) for function in functions]
+        for future in concurrent.futures.as_completed(futures):
+            future.result()
+
+
+def _list_files(local_dir: str) -> List[str]:
+    """Returns the paths of the files in a directory, relative to it."""
+    return sorted(
+        os.path.relpath(os.path.join(root, name), local_dir)
+        for root, _, names in os.walk(local_dir)
+        for name in names)
+
+
+class ArtifactIOBackend(abc.ABC):
+    """Transfers artifacts between their storage and local files.
+
+    The URI of an artifact may refer to a single file or to a directory,
+    i.e. all the objects whose key starts with the key of the URI
+    followed by ``/``.
+    """
+
+    @abc.abstractmethod
+    def download(self, uri: str, local_path: str) -> None:
+        """Downloads the file or directory at a URI to a local path.
+
+        Raises:
+            FileNotFoundError: If nothing is stored at the URI.
+        """
+
+    @abc.abstractmethod
+    def upload(self, local_path: str, uri: str) -> None:
+        """Uploads a local file or directory to a URI."""
+
+    def get_version(self, uri: str) -> Optional[str]:
+        """Returns a version of the artifact at a URI that changes whenever the
+        artifact is rewritten, or None if it cannot be determined.
+
+        Staged copies of an artifact are only reused while its version is
+        unchanged.
+
+        Raises:
+            FileNotFoundError: If nothing is stored at the URI.
+        """
+        return None
+
+    def get_local_path(self, uri: str) -> Optional[str]:
+        """Returns the local path at which the artifact at a URI can be
+        accessed directly, or None if it must be transferred."""
+        return None
+
+
+class LocalBackend(ArtifactIOBackend):
+    """Stores artifacts on the local file system.
+
+    Local paths and ``file://`` URIs are used as is. Other URIs such as
+    ``gs://bucket/key`` are stored at ``<root>/gs/bucket/key``, so that this
+    backend can stand in for an object store in tests.
+
+    Args:
+        root: Directory in which artifacts with URIs of other schemes are
+            stored.
+    """
+
+    def __init__(self, root: Optional[str] = None) -> None:
+        self.root = root
+
+    def get_local_path(self, uri: str) -> Optional[str]:
+        return self._get_path(uri)
+
+    def _get_path(self, uri: str) -> str:
+        scheme, bucket, key = split_uri(uri)
+        if scheme == 'file':
+            return key
+        if self.root is None:
+            raise ValueError(
+                f'LocalBackend can only store {scheme}:// URIs if it has a '
+                'root directory.')
+        return os.path.join(self.root, scheme, bucket, key)
+
+    def download(self, uri: str, local_path: str) -> None:
+        self._copy(self._get_path(uri), local_path)
+
+    def get_version(self, uri: str) -> Optional[str]:
+        path = self._get_path(uri)
+        if os.path.isdir(path):
+            files = [os.path.join(path, name) for name in _list_files(path)]
+        elif os.path.exists(path):
+            files = [path]
+        else:
+            raise FileNotFoundError(f'No artifact found at {path}.')
+        version = []
+        for f in files:
+            stat = os.stat(f)
+            version.append(
+                [os.path.relpath(f, path), stat.st_size, stat.st_mtime_ns])
+        return json.dumps(version)
+
+    def upload(self, local_path: str, uri: str) -> None:
+        self._copy(local_path, self._get_path(uri))
+
+    def _copy(self, source: str, destination: str) -> None:
+        if os.path.abspath(source) == os.path.abspath(destination):
+            return
+        if os.path.isdir(source):
+            files = [(os.path.join(source,
+                                   name), os.path.join(destination, name))
+                     for name in _list_files(source)]
+        elif os.path.exists(source):
+            files = [(source, destination)]
+        else:
+            raise FileNotFoundError(f'No artifact found at {source}.')
+        for file_source, file_destination in files:
+            os.makedirs(
+                os.path.dirname(os.path.abspath(file_destination)),
+                exist_ok=True)
+            shutil.copyfile(file_source, file_destination)
+
+
+class GCSBackend(ArtifactIOBackend):
+    """Transfers artifacts to and from Google Cloud Storage.
+
+    Files larger than ``chunk_size`` are downloaded as concurrent ranged
+    reads and uploaded as concurrent multipart uploads. The files of a
+    directory are transferred concurrently.
+
+    Args:
+        client: The ``google.cloud.storage.Client`` to use. A client with
+            the default credentials is created if None.
+        chunk_size: Size in bytes of the ranges in which files are
+            transferred.
+        max_workers: Maximum number of concurrent transfers.
+    """
+
+    def __init__(self,
+                 client=None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 max_workers: int = DEFAULT_MAX_WORKERS) -> None:
+        self._client = client
+        self._client_lock = threading.Lock()
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+
+    @property
+    def client(self):
+        with self._client_lock:
+            if self._client is None:
+                from google.cloud import storage
+                self._client = storage.Client()
+            return self._client
+
+    def get_version(self, uri: str) -> Optional[str]:
+        _, bucket_name, key = split_uri(uri)
+        bucket = self.client.bucket(bucket_name)
+        blob = bucket.get_blob(key) if key else None
+        if blob is not None:
+            return str(blob.generation)
+        _, blobs = self._list_blobs(uri, bucket, key)
+        return json.dumps([[blob.name, blob.generation] for blob in blobs])
+
+    def download(self, uri: str, local_path: str) -> None:
+        _, bucket_name, key = split_uri(uri)
+        bucket = self.client.bucket(bucket_name)
+        blob = bucket.get_blob(key) if key else None
+        if blob is not None:
+            self._download_blob(blob, local_path)
+            return
+
+        prefix, blobs = self._list_blobs(uri, bucket, key)
+        _run_concurrently([
+            lambda blob=blob: self._download_blob(
+                blob,
+                os.path.join(local_path, blob.name[len(prefix):]),
+                parallel=False) for blob in blobs
+        ], self.max_workers)
+
+    def _list_blobs(self, uri: str, bucket, key: str) -> Tuple[str, list]:
+        """Returns the prefix of the objects in the directory at a URI, and the
+        objects."""
+        prefix = key.rstrip('/') + '/' if key else ''
+        blobs = [
+            blob for blob in self.client.list_blobs(bucket, prefix=prefix)
+            if not blob.name.endswith('/')
+        ]
+        if not blobs:
+            raise FileNotFoundError(f'No artifact found at {uri}.')
+        return prefix, blobs
+
+    def _download_blob(self,
+                       blob,
+                       local_path: str,
+                       parallel: bool = True) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(local_path)), exist_ok=True)
+        size = blob.size or 0
+        if not parallel or size <= self.chunk_size:
+            blob.download_to_filename(local_path)
+            return
+
+        with open(local_path, 'wb') as f:
+            f.truncate(size)
+
+        def download_range(start: int) -> None:
+            end = min(start + self.chunk_size, size) - 1
+            # Pin the generation so that all ranges are read from the same
+            # version of the object.
+            data = blob.download_as_bytes(
+                start=start, end=end, if_generation_match=blob.generation)
+            with open(local_path, 'r+b') as f:
+                f.seek(start)
+                f.write(data)
+
+        _run_concurrently([
+            lambda start=start: download_range(start)
+            for start in range(0, size, self.chunk_size)
+        ], self.max_workers)
+
+    def upload(self, local_path: str, uri: str) -> None:
+        _, bucket_name, key = split_uri(uri)
+        bucket = self.client.bucket(bucket_name)
+        if not os.path.isdir(local_path):
+            self._upload_file(local_path, bucket.blob(key))
+            return
+
+        prefix = key.rstrip('/') + '/' if key else ''
+        _run_concurrently([
+            lambda name=name: self._upload_file(
+                os.path.join(local_path, name),
+                bucket.blob(prefix + name.replace(os.sep, '/')),
+                parallel=False) for name in _list_files(local_path)
+        ], self.max_workers)
+
+    def _upload_file(self,
+                     local_path: str,
+                     blob,
+                     parallel: bool = True) -> None:
+        if parallel and os.path.getsize(local_path) > self.chunk_size:
+            try:
+                from google.cloud.storage import transfer_manager
+                upload_chunks_concurrently = transfer_manager.upload_chunks_concurrently
+            except (ImportError, AttributeError):
+                # Versions of google-cloud-storage before 2.10 do not
+                # support multipart uploads.
+                pass
+            else:
+                upload_chunks_concurrently(
+                    local_path,
+                    blob,
+                    chunk_size=self.chunk_size,
+                    max_workers=self.max_workers,
+                    worker_type=transfer_manager.THREAD)
+                return
+        blob.upload_from_filename(local_path)
+
+
+class S3Backend(ArtifactIOBackend):
+    """Transfers artifacts to and from S3 or S3-compatible storage such as
+    MinIO.
+
+    Requires ``boto3``, whose transfer manager downloads and uploads files
+    larger than ``chunk_size`` in concurrent parts. Credentials are read from
+    the environment as usual for ``boto3``.
+
+    Args:
+        endpoint_url: URL of the S3-compatible storage. The AWS endpoint is
+            used if None.
+        chunk_size: Size in bytes of the parts in which files are
+            transferred.
+        max_workers: Maximum number of concurrent transfers.
+    """
+
+    def __init__(self,
+                 endpoint_url: Optional[str] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 max_workers: int = DEFAULT_MAX_WORKERS) -> None:
+        try:
+            import boto3
+            from boto3.s3.transfer import TransferConfig
+        except ImportError as e:
+            raise ImportError(
+                'boto3 is required to read and write s3:// and minio:// '
+                'artifacts. Please install it with `pip install boto3`.') from e
+        self._client = boto3.client('s3', endpoint_url=endpoint_url)
+        self._transfer_config = TransferConfig(
+            multipart_threshold=chunk_size,
+            multipart_chunksize=chunk_size,
+            max_concurrency=max_workers)
+        self.max_workers = max_workers
+
+    def _list_objects(self, uri: str) -> List[dict]:
+        """Returns the object at a URI, or the objects in the directory at
+        it."""
+        _, bucket, key = split_uri(uri)
+        prefix = key.rstrip('/') + '/' if key else ''
+        objects = []
+        paginator = self._client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=bucket, Prefix=key):
+            for obj in page.get('Contents', []):
+                if obj['Key'] == key:
+                    return [obj]
+                if obj['Key'].startswith(
+                        prefix) and not obj['Key'].endswith('/'):
+                    objects.append(obj)
+        if not objects:
+            raise FileNotFoundError(f'No artifact found at {uri}.')
+        return objects
+
+    def get_version(self, uri: str) -> Optional[str]:
+        return json.dumps(
+            [[obj['Key'], obj['ETag']] for obj in self._list_objects(uri)])
+
+    def download(self, uri: str, local_path: str) -> None:
+        _, bucket, key = split_uri(uri)
+        prefix = key.rstrip('/') + '/' if key else ''
+        keys = [obj['Key'] for obj in self._list_objects(uri)]
+        if keys == [key]:
+            os.makedirs(
+                os.path.dirname(os.path.abspath(local_path)), exist_ok=True)
+            self._client.download_file(
+                bucket, key, local_path, Config=self._transfer_config)
+            return
+
+        def download_file(object_key: str) -> None:
+            path = os.path.join(local_path, object_key[len(prefix):])
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._client.download_file(
+                bucket, object_key, path, Config=self._transfer_config)
+
+        _run_concurrently([lambda k=k: download_file(k) for k in keys],
+                          self.max_workers)
+
+    def upload(self, local_path: str, uri: str) -> None:
+        _, bucket, key = split_uri(uri)
+        if not os.path.isdir(local_path):
+            self._client.upload_file(
+                local_path, bucket, key, Config=self._transfer_config)
+            return
+
+        prefix = key.rstrip('/') + '/' if key else ''
+        _run_concurrently([
+            lambda name=name: self._client.upload_file(
+                os.path.join(local_path, name),
+                bucket,
+                prefix + name.replace(os.sep, '/'),
+                Config=self._transfer_config)
+            for name in _list_files(local_path)
+        ], self.max_workers)
+
+
+_backend_factories: Dict[str, Callable[[], ArtifactIOBackend]] = {
+    'file':
+        LocalBackend,
+    'gs':
+        GCSBackend,
+    's3':
+        S3Backend,
+    'minio':
+        lambda: S3Backend(
+            endpoint_url=os.environ.get(_MINIO_ENDPOINT_ENV_VAR,
+                                        _DEFAULT_MINIO_ENDPOINT)),
+}
+_backends: Dict[str, ArtifactIOBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def register_backend(scheme: str, factory: Callable[[],
+                                                    ArtifactIOBackend]) -> None:
+    """Registers the backend of the artifacts with URIs of a scheme.
+
+    Args:
+        scheme: URI scheme, such as ``gs``.
+        factory: Creates the backend when it is first used.
+    """
+    with _backends_lock:
+        _backend_factories[scheme] = factory
+        _backends.pop(scheme, None)
+
+
+def get_backend(uri: str) -> ArtifactIOBackend:
+    """Returns the backend of the artifact at a URI.
+
+    Raises:
+        ValueError: If no backend is registered for the scheme of the URI.
+    """
+    scheme, _, _ = split_uri(uri)
+    with _backends_lock:
+        if scheme not in _backends:
+            if scheme not in _backend_factories:
+                raise ValueError(
+                    f'No artifact I/O backend is registered for {scheme}:// '
+                    f'URIs. Registered schemes are: '
+                    f'{sorted(_backend_factories)}.')
+            _backends[scheme] = _backend_factories[scheme]()
+        return _backends[scheme]
+
+
+def get_staging_dir() -> str:
+    """Returns the local directory in which artifacts are staged.
+
+    It is set with the ``KFP_ARTIFACT_STAGING_DIR`` environment
+    variable.
+    """
+    return os.environ.get(_STAGING_DIR_ENV_VAR,
+                          os.path.join(tempfile.gettempdir(), 'kfp-artifacts'))
+
+
+def get_staging_path(uri: str, version: Optional[str] = None) -> str:
+    """Returns the local path at which the artifact at a URI is staged.
+
+    Args:
+        uri: URI of the artifact.
+        version: Version of the artifact returned by its backend. Downloaded
+            artifacts are staged per version, so that an artifact rewritten
+            at the same URI is not read from a stale copy. Artifacts that are
+            written locally are staged without a version.
+    """
+    _, _, key = split_uri(uri)
+    staging_key = uri if version is None else json.dumps([uri, version])
+    uri_hash = hashlib.sha256(staging_key.encode()).hexdigest()[:16]
+    return os.path.join(get_staging_dir(), uri_hash,
+                        os.path.basename(key.rstrip('/')) or 'artifact')
+
+
+def download(uri: str, local_path: Optional[str] = None) -> str:
+    """Downloads the artifact at a URI.
+
+    Args:
+        uri: URI of the artifact.
+        local_path: Local path to download the artifact to. If None, the
+            artifact is downloaded to its staging path, unless the same
+            version of it has already been staged.
+
+    Returns:
+        The local path of the downloaded artifact.
+    """
+    backend = get_backend(uri)
+    if local_path is None:
+        local_path = backend.get_local_path(uri)
+        if local_path is not None:
+            return local_path
+        version = backend.get_version(uri)
+        local_path = get_staging_path(uri, version)
+        if version is not None and os.path.exists(local_path):
+            return local_path
+        # Download to a temporary path first so that a partially downloaded
+        # artifact is never mistaken for a staged one.
+        staging_parent = os.path.dirname(local_path)
+        os.makedirs(staging_parent, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(dir=staging_parent)
+        tmp_path = os.path.join(tmp_dir, os.path.basename(local_path))
+        try:
+            backend.download(uri, tmp_path)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        if version is None:
+            # A staged copy of an artifact without a version cannot be
+            # revalidated, so every download is staged at a new path.
+            return tmp_path
+        try:
+            os.replace(tmp_path, local_path)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        return local_path
+    backend.download(uri, local_path)
+    return local_path
+
+
+def upload(local_path: str, uri: str) -> None:
+    """Uploads a local file or directory as the artifact at a URI."""
+    get_backend(uri).upload(local_path, uri)
+
+
+class _UploadOnClose:
+    """Wraps a file open for writing that is uploaded when closed."""
+
+    def __init__(self, file: IO, local_path: str, uri: str) -> None:
+        self._file = file
+        self._local_path = local_path
+        self._uri = uri
+
+    def __getattr__(self, name: str):
+        return getattr(self._file, name)
+
+    def __iter__(self):
+        return iter(self._file)
+
+    def __enter__(self) -> '_UploadOnClose':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            # Do not upload a partially written artifact.
+            self._file.close()
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self._file.close()
+        upload(self._local_path, self._uri)
+
+
+def open_uri(uri: str, mode: str = 'r', **kwargs) -> IO:
+    """Opens the artifact file at a URI.
+
+    In read mode, the file is first downloaded to its staging path. In write
+    or append mode, a staged file is opened and uploaded when it is closed.
+    Artifacts that the backend can access locally are opened directly.
+
+    Args:
+        uri: URI of the artifact file.
+        mode: Mode in which to open the file, as for ``open``.
+        **kwargs: Additional arguments to ``open``.
+
+    Returns:
+        The open file.
+    """
+    backend = get_backend(uri)
+    local_path = backend.get_local_path(uri)
+    if local_path is not None:
+        if any(m in mode for m in 'wax'):
+            os.makedirs(
+                os.path.dirname(os.path.abspath(local_path)), exist_ok=True)
+        return open(local_path, mode, **kwargs)
+
+    if not any(m in mode for m in 'wax+'):
+        return open(download(uri), mode, **kwargs)
+
+    local_path = get_staging_path(uri)
+    os.makedirs(os.path.dirname(local_path), exist_ok=True)
+    if 'a' in mode or '+' in mode:
+        # Start from the stored artifact rather than a previously staged
+        # copy, which may be stale.
+        try:
+            download(uri, local_path)
+        except FileNotFoundError:
+            if os.path.isfile(local_path):
+                os.remove(local_path)
+    return _UploadOnClose(open(local_path, mode, **kwargs), local_path, uri)
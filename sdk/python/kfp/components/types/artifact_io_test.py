@@ -0,0 +1,321 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for kfp.components.types.artifact_io."""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from kfp.components.types import artifact_io
+from kfp.components.types import artifact_types
+
+
+class FakeBlob:
+
+    def __init__(self, name, data=b'', generation=1):
+        self.name = name
+        self.data = data
+        self.size = len(data)
+        self.generation = generation
+        self.ranges = []
+
+    def download_to_filename(self, filename):
+        with open(filename, 'wb') as f:
+            f.write(self.data)
+
+    def download_as_bytes(self, start, end, if_generation_match):
+        assert if_generation_match == self.generation
+        self.ranges.append((start, end))
+        return self.data[start:end + 1]
+
+    def upload_from_filename(self, filename):
+        with open(filename, 'rb') as f:
+            self.data = f.read()
+        self.size = len(self.data)
+
+
+class FakeBucket:
+
+    def __init__(self):
+        self.blobs = {}
+
+    def blob(self, name):
+        return self.blobs.setdefault(name, FakeBlob(name))
+
+    def get_blob(self, name):
+        return self.blobs.get(name)
+
+
+class FakeStorageClient:
+
+    def __init__(self):
+        self._bucket = FakeBucket()
+
+    def bucket(self, name):
+        return self._bucket
+
+    def list_blobs(self, bucket, prefix):
+        return [
+            blob for name, blob in sorted(bucket.blobs.items())
+            if name.startswith(prefix)
+        ]
+
+
+class StagedLocalBackend(artifact_io.LocalBackend):
+    """A LocalBackend whose artifacts are transferred through staging."""
+
+    def __init__(self, root):
+        super().__init__(root)
+        self.downloads = 0
+
+    def get_local_path(self, uri):
+        return None
+
+    def download(self, uri, local_path):
+        self.downloads += 1
+        super().download(uri, local_path)
+
+
+class ArtifactIOTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = tmp_dir.name
+        self.root = os.path.join(self.tmp_dir, 'root')
+        env_patcher = mock.patch.dict(
+            os.environ,
+            {'KFP_ARTIFACT_STAGING_DIR': os.path.join(self.tmp_dir, 'staging')})
+        env_patcher.start()
+        self.addCleanup(env_patcher.stop)
+        factories_patcher = mock.patch.dict(artifact_io._backend_factories)
+        factories_patcher.start()
+        self.addCleanup(factories_patcher.stop)
+        backends_patcher = mock.patch.dict(artifact_io._backends, clear=True)
+        backends_patcher.start()
+        self.addCleanup(backends_patcher.stop)
+        artifact_io.register_backend(
+            'gs', lambda: artifact_io.LocalBackend(self.root))
+
+
+class TestLocalBackendArtifactIO(ArtifactIOTestCase):
+
+    def test_write_and_read(self):
+        artifact = artifact_types.Dataset(uri='gs://bucket/data/file.txt')
+
+        with artifact.open('w') as f:
+            f.write('data')
+
+        self.assertTrue(
+            os.path.exists(
+                os.path.join(self.root, 'gs', 'bucket', 'data', 'file.txt')))
+        with artifact.open() as f:
+            self.assertEqual('data', f.read())
+
+    def test_append(self):
+        artifact = artifact_types.Dataset(uri='gs://bucket/file.txt')
+        artifact_io.register_backend('gs',
+                                     lambda: StagedLocalBackend(self.root))
+
+        with artifact.open('w') as f:
+            f.write('a')
+        with artifact.open('a') as f:
+            f.write('b')
+
+        with open(os.path.join(self.root, 'gs', 'bucket', 'file.txt')) as f:
+            self.assertEqual('ab', f.read())
+
+    def test_write_is_not_uploaded_on_error(self):
+        artifact = artifact_types.Dataset(uri='gs://bucket/file.txt')
+        artifact_io.register_backend('gs',
+                                     lambda: StagedLocalBackend(self.root))
+
+        with self.assertRaises(RuntimeError):
+            with artifact.open('w') as f:
+                f.write('partial')
+                raise RuntimeError()
+
+        self.assertFalse(
+            os.path.exists(os.path.join(self.root, 'gs', 'bucket', 'file.txt')))
+
+    def test_upload_and_download_directory(self):
+        local_dir = os.path.join(self.tmp_dir, 'model')
+        os.makedirs(os.path.join(local_dir, 'variables'))
+        for name in ['saved_model.pb', 'variables/variables.index']:
+            with open(os.path.join(local_dir, name), 'w') as f:
+                f.write(name)
+        artifact = artifact_types.Model(uri='gs://bucket/model')
+        backend = StagedLocalBackend(self.root)
+        artifact_io.register_backend('gs', lambda: backend)
+
+        artifact.upload_from(local_dir)
+        staged_path = artifact.download_to()
+
+        self.assertEqual(
+            artifact_io.get_staging_path(
+                'gs://bucket/model', backend.get_version('gs://bucket/model')),
+            staged_path)
+        with open(os.path.join(staged_path, 'variables',
+                               'variables.index')) as f:
+            self.assertEqual('variables/variables.index', f.read())
+
+    def test_rewritten_artifact_is_downloaded_again(self):
+        artifact = artifact_types.Dataset(uri='gs://bucket/file.txt')
+        backend = StagedLocalBackend(self.root)
+        artifact_io.register_backend('gs', lambda: backend)
+        stored_path = os.path.join(self.root, 'gs', 'bucket', 'file.txt')
+        with artifact.open('w') as f:
+            f.write('a')
+        os.utime(stored_path, ns=(1, 1))
+
+        with artifact.open() as f:
+            self.assertEqual('a', f.read())
+        with artifact.open() as f:
+            self.assertEqual('a', f.read())
+        self.assertEqual(1, backend.downloads)
+
+        # Rewrite the artifact with contents of the same size.
+        with open(stored_path, 'w') as f:
+            f.write('b')
+        os.utime(stored_path, ns=(2, 2))
+
+        with artifact.open() as f:
+            self.assertEqual('b', f.read())
+        self.assertEqual(2, backend.downloads)
+
+    def test_append_to_rewritten_artifact(self):
+        artifact = artifact_types.Dataset(uri='gs://bucket/file.txt')
+        artifact_io.register_backend('gs',
+                                     lambda: StagedLocalBackend(self.root))
+        stored_path = os.path.join(self.root, 'gs', 'bucket', 'file.txt')
+        with artifact.open('w') as f:
+            f.write('a')
+        with open(stored_path, 'w') as f:
+            f.write('b')
+
+        with artifact.open('a') as f:
+            f.write('c')
+
+        with open(stored_path) as f:
+            self.assertEqual('bc', f.read())
+
+    def test_download_missing_artifact(self):
+        artifact_io.register_backend('gs',
+                                     lambda: StagedLocalBackend(self.root))
+
+        with self.assertRaises(FileNotFoundError):
+            artifact_types.Artifact(uri='gs://bucket/missing').download_to()
+        self.assertFalse(
+            os.path.exists(artifact_io.get_staging_path('gs://bucket/missing')))
+
+    def test_local_uri_is_opened_directly(self):
+        path = os.path.join(self.tmp_dir, 'local.txt')
+        artifact = artifact_types.Artifact(uri=path)
+
+        with artifact.open('w') as f:
+            f.write('local')
+
+        self.assertEqual(path, artifact.download_to())
+        with open(path) as f:
+            self.assertEqual('local', f.read())
+
+    def test_unregistered_scheme(self):
+        with self.assertRaisesRegex(ValueError,
+                                    r'No artifact I/O backend .* hdfs://'):
+            artifact_types.Artifact(uri='hdfs://bucket/file').open()
+
+
+class TestGCSBackend(ArtifactIOTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client = FakeStorageClient()
+        self.backend = artifact_io.GCSBackend(
+            client=self.client, chunk_size=4, max_workers=3)
+
+    def test_download_file_in_ranges(self):
+        blob = self.client.bucket('bucket').blob('file')
+        blob.data = b'0123456789'
+        blob.size = 10
+        local_path = os.path.join(self.tmp_dir, 'file')
+
+        self.backend.download('gs://bucket/file', local_path)
+
+        with open(local_path, 'rb') as f:
+            self.assertEqual(b'0123456789', f.read())
+        self.assertCountEqual([(0, 3), (4, 7), (8, 9)], blob.ranges)
+
+    def test_download_directory(self):
+        bucket = self.client.bucket('bucket')
+        for name in ['dir/a', 'dir/sub/b', 'other']:
+            bucket.blobs[name] = FakeBlob(name, name.encode())
+        local_dir = os.path.join(self.tmp_dir, 'dir')
+
+        self.backend.download('gs://bucket/dir', local_dir)
+
+        self.assertEqual(['a', 'sub/b'],
+                         sorted(artifact_io._list_files(local_dir)))
+
+    def test_download_missing(self):
+        with self.assertRaises(FileNotFoundError):
+            self.backend.download('gs://bucket/missing',
+                                  os.path.join(self.tmp_dir, 'missing'))
+
+    def test_get_version(self):
+        bucket = self.client.bucket('bucket')
+        for name in ['dir/a', 'dir/sub/b', 'file']:
+            bucket.blobs[name] = FakeBlob(name, name.encode())
+        file_version = self.backend.get_version('gs://bucket/file')
+        dir_version = self.backend.get_version('gs://bucket/dir')
+
+        bucket.blobs['dir/sub/b'].generation = 2
+
+        self.assertEqual(file_version,
+                         self.backend.get_version('gs://bucket/file'))
+        self.assertNotEqual(dir_version,
+                            self.backend.get_version('gs://bucket/dir'))
+        with self.assertRaises(FileNotFoundError):
+            self.backend.get_version('gs://bucket/missing')
+
+    def test_upload_directory(self):
+        local_dir = os.path.join(self.tmp_dir, 'dir')
+        os.makedirs(os.path.join(local_dir, 'sub'))
+        for name in ['a', 'sub/b']:
+            with open(os.path.join(local_dir, name), 'wb') as f:
+                f.write(name.encode())
+
+        self.backend.upload(local_dir, 'gs://bucket/out/')
+
+        blobs = self.client.bucket('bucket').blobs
+        self.assertEqual(b'a', blobs['out/a'].data)
+        self.assertEqual(b'sub/b', blobs['out/sub/b'].data)
+
+    def test_upload_large_file_in_parts(self):
+        local_path = os.path.join(self.tmp_dir, 'file')
+        with open(local_path, 'wb') as f:
+            f.write(b'0123456789')
+
+        with mock.patch(
+                'google.cloud.storage.transfer_manager.upload_chunks_concurrently'
+        ) as mock_upload:
+            self.backend.upload(local_path, 'gs://bucket/file')
+
+        mock_upload.assert_called_once()
+        self.assertEqual(4, mock_upload.call_args[1]['chunk_size'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -16,13 +16,43 @@
 These are only compatible with v2 Pipelines.
 """
 
-from typing import Dict, List, Optional, Type
+from typing import Any, Dict, IO, List, Optional, Sequence, Type
+
+from kfp.components.types import artifact_io
 
 _GCS_LOCAL_MOUNT_PREFIX = '/gcs/'
 _MINIO_LOCAL_MOUNT_PREFIX = '/minio/'
 _S3_LOCAL_MOUNT_PREFIX = '/s3/'
 
 
+def _to_list(values: Sequence) -> list:
+    """Converts a sequence to a list of Python scalars (or nested lists).
+
+    NumPy arrays, ``array.array`` and ``memoryview`` objects are
+    converted with their ``tolist`` method, which copies the whole
+    buffer at once and yields JSON-serializable Python numbers.
+    """
+    if isinstance(values, list):
+        return values
+    tolist = getattr(values, 'tolist', None)
+    if tolist is not None:
+        return tolist()
+    return list(values)
+
+
+def _downsample_indices(num_points: int, max_points: int) -> Sequence[int]:
+    """Returns the indices of at most max_points evenly spaced points.
+
+    The first and last points are always kept.
+    """
+    if max_points < 2:
+        raise ValueError(f'max_points must be at least 2, got {max_points}.')
+    if num_points <= max_points:
+        return range(num_points)
+    step = (num_points - 1) / (max_points - 1)
+    return [round(i * step) for i in range(max_points)]
+
+
 class Artifact:
     """Represents a generic machine learning artifact.
 
@@ -84,15 +114,23 @@ class Artifact:
         self._set_path(path)
 
     def _get_path(self) -> Optional[str]:
+        # Set when the executor staged the artifact in local scratch space.
+        staged_path = getattr(self, '_staged_path', None)
+        if staged_path is not None:
+            return staged_path
         if self.uri.startswith('gs://'):
             return _GCS_LOCAL_MOUNT_PREFIX + self.uri[len('gs://'):]
         elif self.uri.startswith('minio://'):
             return _MINIO_LOCAL_MOUNT_PREFIX + self.uri[len('minio://'):]
         elif self.uri.startswith('s3://'):
             return _S3_LOCAL_MOUNT_PREFIX + self.uri[len('s3://'):]
+        elif self.uri and '://' not in self.uri:
+            # uri is already a local path, e.g. when running with kfp.local.
+            return self.uri
         return None
 
     def _set_path(self, path: str) -> None:
+        self.__dict__.pop('_staged_path', None)
         if path.startswith(_GCS_LOCAL_MOUNT_PREFIX):
             path = 'gs://' + path[len(_GCS_LOCAL_MOUNT_PREFIX):]
         elif path.startswith(_MINIO_LOCAL_MOUNT_PREFIX):
@@ -101,6 +139,46 @@ class Artifact:
             path = 's3://' + path[len(_S3_LOCAL_MOUNT_PREFIX):]
         self.uri = path
 
+    def open(self, mode: str = 'r', **kwargs) -> IO:
+        """Opens the artifact file through the I/O backend of its URI scheme
+        instead of its mounted ``path``.
+
+        In read mode, the artifact is first downloaded to a local staging
+        directory. In write or append mode, a staged file is opened and
+        uploaded when it is closed. See ``kfp.components.types.artifact_io``.
+
+        Args:
+            mode: Mode in which to open the file, as for ``open``.
+            **kwargs: Additional arguments to ``open``.
+
+        Returns:
+            The open file.
+        """
+        return artifact_io.open_uri(self.uri, mode, **kwargs)
+
+    def download_to(self, local_path: Optional[str] = None) -> str:
+        """Downloads the artifact file or directory through the I/O backend of
+        its URI scheme.
+
+        Args:
+            local_path: Local path to download the artifact to. If None, the
+                artifact is downloaded to a local staging directory, unless it
+                has already been.
+
+        Returns:
+            The local path of the downloaded artifact.
+        """
+        return artifact_io.download(self.uri, local_path)
+
+    def upload_from(self, local_path: str) -> None:
+        """Uploads a local file or directory as the artifact through the I/O
+        backend of its URI scheme.
+
+        Args:
+            local_path: Local path of the file or directory to upload.
+        """
+        artifact_io.upload(local_path, self.uri)
+
 
 class Model(Artifact):
     """An artifact representing a machine learning model.
@@ -212,27 +290,91 @@ class ClassificationMetrics(Artifact):
 
         self.metadata['confidenceMetrics'].append(roc_reading)
 
-    def log_roc_curve(self, fpr: List[float], tpr: List[float],
-                      threshold: List[float]) -> None:
+    def log_roc_curve(self,
+                      fpr: Sequence[float],
+                      tpr: Sequence[float],
+                      threshold: Sequence[float],
+                      max_points: Optional[int] = None) -> None:
         """Logs an ROC curve to metadata.
 
+        The curve may be given as lists, NumPy arrays or any other sequences
+        of numbers.
+
         Args:
-          fpr: List of false positive rate values.
-          tpr: List of true positive rate values.
-          threshold: List of threshold values.
+          fpr: False positive rate values.
+          tpr: True positive rate values.
+          threshold: Threshold values.
+          max_points: If set, the curve is downsampled to at most this many
+            evenly spaced points, keeping the first and last points.
 
         Raises:
-          ValueError: If the lists ``fpr``, ``tpr`` and ``threshold`` are not the same length.
+          ValueError: If ``fpr``, ``tpr`` and ``threshold`` are not the same length.
         """
+        fpr = _to_list(fpr)
+        tpr = _to_list(tpr)
+        threshold = _to_list(threshold)
         if len(fpr) != len(tpr) or len(fpr) != len(threshold) or len(
                 tpr) != len(threshold):
             raise ValueError(
                 f'Length of fpr, tpr and threshold must be the same. Got lengths {len(fpr)}, {len(tpr)} and {len(threshold)} respectively.'
             )
 
-        for i in range(len(fpr)):
-            self.log_roc_data_point(
-                fpr=fpr[i], tpr=tpr[i], threshold=threshold[i])
+        self._log_confidence_metrics(
+            {
+                'confidenceThreshold': threshold,
+                'recall': tpr,
+                'falsePositiveRate': fpr
+            },
+            max_points=max_points)
+
+    def log_pr_curve(self,
+                     precision: Sequence[float],
+                     recall: Sequence[float],
+                     threshold: Sequence[float],
+                     max_points: Optional[int] = None) -> None:
+        """Logs a precision-recall curve to metadata.
+
+        The curve may be given as lists, NumPy arrays or any other sequences
+        of numbers.
+
+        Args:
+          precision: Precision values.
+          recall: Recall values.
+          threshold: Threshold values.
+          max_points: If set, the curve is downsampled to at most this many
+            evenly spaced points, keeping the first and last points.
+
+        Raises:
+          ValueError: If ``precision``, ``recall`` and ``threshold`` are not the same length.
+        """
+        precision = _to_list(precision)
+        recall = _to_list(recall)
+        threshold = _to_list(threshold)
+        if len(precision) != len(recall) or len(precision) != len(threshold):
+            raise ValueError(
+                f'Length of precision, recall and threshold must be the same. Got lengths {len(precision)}, {len(recall)} and {len(threshold)} respectively.'
+            )
+
+        self._log_confidence_metrics(
+            {
+                'confidenceThreshold': threshold,
+                'recall': recall,
+                'precision': precision
+            },
+            max_points=max_points)
+
+    def _log_confidence_metrics(self,
+                                columns: Dict[str, List[Any]],
+                                max_points: Optional[int] = None) -> None:
+        """Appends the rows of same-length columns to confidenceMetrics."""
+        keys = list(columns)
+        values = list(columns.values())
+        if max_points is not None:
+            indices = _downsample_indices(len(values[0]), max_points)
+            values = [[column[i] for i in indices] for column in values]
+
+        readings = [dict(zip(keys, point)) for point in zip(*values)]
+        self.metadata.setdefault('confidenceMetrics', []).extend(readings)
 
     def set_confusion_matrix_categories(self, categories: List[str]) -> None:
         """Stores confusion matrix categories to metadata.
@@ -241,16 +383,18 @@ class ClassificationMetrics(Artifact):
           categories: List of strings specifying the categories.
         """
 
-        self._categories = []
-        annotation_specs = []
-        for category in categories:
-            annotation_spec = {'displayName': category}
-            self._categories.append(category)
-            annotation_specs.append(annotation_spec)
+        self._categories = list(categories)
+        self._category_indices = {
+            category: index for index, category in enumerate(self._categories)
+        }
+        annotation_specs = [{
+            'displayName': category
+        } for category in self._categories]
 
-        self._matrix = []
-        for row in range(len(self._categories)):
-            self._matrix.append({'row': [0] * len(self._categories)})
+        num_categories = len(self._categories)
+        self._matrix = [{
+            'row': [0] * num_categories
+        } for _ in range(num_categories)]
 
         self._confusion_matrix = {
             'annotationSpecs': annotation_specs,
@@ -259,29 +403,35 @@ class ClassificationMetrics(Artifact):
 
         self.metadata['confusionMatrix'] = self._confusion_matrix
 
+    def _get_category_index(self, category: str) -> int:
+        try:
+            return self._category_indices[category]
+        except KeyError:
+            raise ValueError(
+                f'Invalid category: {category} passed. Expected one of: {self._categories}'
+            ) from None
+
     def log_confusion_matrix_row(self, row_category: str,
-                                 row: List[float]) -> None:
+                                 row: Sequence[float]) -> None:
         """Logs a confusion matrix row to metadata.
 
         Args:
           row_category: Category to which the row belongs.
-          row: List of integers specifying the values for the row.
+          row: List or array of integers specifying the values for the row.
 
         Raises:
           ValueError: If ``row_category`` is not in the list of categories
             set in ``set_categories`` call.
         """
-        if row_category not in self._categories:
-            raise ValueError(
-                f'Invalid category: {row_category} passed. Expected one of: {self._categories}'
-            )
+        row_index = self._get_category_index(row_category)
+        row = _to_list(row)
 
         if len(row) != len(self._categories):
             raise ValueError(
                 f'Invalid row. Expected size: {len(self._categories)} got: {len(row)}'
             )
 
-        self._matrix[self._categories.index(row_category)] = {'row': row}
+        self._matrix[row_index] = {'row': row}
         self.metadata['confusionMatrix'] = self._confusion_matrix
 
     def log_confusion_matrix_cell(self, row_category: str, col_category: str,
@@ -297,45 +447,35 @@ class ClassificationMetrics(Artifact):
           ValueError: If ``row_category`` or ``col_category`` is not in the list of
            categories set in ``set_categories``.
         """
-        if row_category not in self._categories:
-            raise ValueError(
-                f'Invalid category: {row_category} passed. Expected one of: {self._categories}'
-            )
-
-        if col_category not in self._categories:
-            raise ValueError(
-                f'Invalid category: {row_category} passed. Expected one of: {self._categories}'
-            )
+        row_index = self._get_category_index(row_category)
+        col_index = self._get_category_index(col_category)
 
-        self._matrix[self._categories.index(row_category)]['row'][
-            self._categories.index(col_category)] = value
+        self._matrix[row_index]['row'][col_index] = value
         self.metadata['confusionMatrix'] = self._confusion_matrix
 
     def log_confusion_matrix(self, categories: List[str],
-                             matrix: List[List[int]]) -> None:
+                             matrix: Sequence[Sequence[int]]) -> None:
         """Logs a confusion matrix to metadata.
 
         Args:
           categories: List of the category names.
-          matrix: Complete confusion matrix.
+          matrix: Complete confusion matrix, as nested lists or a 2-dimensional
+            NumPy array.
 
         Raises:
           ValueError: If the length of ``categories`` does not match number of rows or columns of ``matrix``.
         """
         self.set_confusion_matrix_categories(categories)
+        matrix = [_to_list(row) for row in _to_list(matrix)]
 
-        if len(matrix) != len(categories):
+        num_categories = len(self._categories)
+        if len(matrix) != num_categories or any(
+                len(row) != num_categories for row in matrix):
             raise ValueError(
-                f'Invalid matrix: {matrix} passed for categories: {categories}')
-
-        for index in range(len(categories)):
-            if len(matrix[index]) != len(categories):
-                raise ValueError(
-                    f'Invalid matrix: {matrix} passed for categories: {categories}'
-                )
-
-            self.log_confusion_matrix_row(categories[index], matrix[index])
+                f'Invalid matrix of {len(matrix)} rows passed for {num_categories} categories: {categories}'
+            )
 
+        self._matrix[:] = [{'row': row} for row in matrix]
         self.metadata['confusionMatrix'] = self._confusion_matrix
 
 
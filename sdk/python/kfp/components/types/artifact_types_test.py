@@ -13,6 +13,7 @@
 # limitations under the License.
 """Tests for kfp.components.types.artifact_types."""
 
+import array
 import json
 import os
 import unittest
@@ -56,6 +57,87 @@ class ArtifactsTest(parameterized.TestCase):
             expected_json = json.load(json_file)
             self.assertEqual(expected_json, metrics.metadata)
 
+    def test_complex_metrics_bulk_loading_from_buffers(self):
+        metrics = artifact_types.ClassificationMetrics()
+        metrics.log_roc_curve(
+            fpr=array.array('d', [85.1, 85.1, 85.1]),
+            tpr=memoryview(array.array('d', [52.6, 52.6, 52.6])),
+            threshold=(53.6, 53.6, 53.6))
+        metrics.log_confusion_matrix(['dog', 'cat', 'horses'],
+                                     (array.array('q', [2, 6, 0]),
+                                      (3, 5, 6), [5, 7, 8]))
+        with open(
+                os.path.join(
+                    os.path.dirname(__file__), 'test_data',
+                    'expected_io_types_bulk_load_classification_metrics.json')
+        ) as json_file:
+            expected_json = json.load(json_file)
+            self.assertEqual(expected_json, metrics.metadata)
+
+    def test_log_roc_curve_downsampled(self):
+        metrics = artifact_types.ClassificationMetrics()
+        metrics.log_roc_curve(
+            fpr=[i / 100 for i in range(101)],
+            tpr=[i / 100 for i in range(101)],
+            threshold=[1 - i / 100 for i in range(101)],
+            max_points=5)
+        self.assertEqual(
+            [
+                reading['falsePositiveRate']
+                for reading in metrics.metadata['confidenceMetrics']
+            ],
+            [0.0, 0.25, 0.5, 0.75, 1.0],
+        )
+
+    def test_log_roc_curve_invalid_max_points(self):
+        metrics = artifact_types.ClassificationMetrics()
+        with self.assertRaisesRegex(ValueError, r'max_points'):
+            metrics.log_roc_curve(
+                fpr=[0.0, 1.0],
+                tpr=[0.0, 1.0],
+                threshold=[1.0, 0.0],
+                max_points=1)
+
+    def test_log_pr_curve(self):
+        metrics = artifact_types.ClassificationMetrics()
+        metrics.log_pr_curve(
+            precision=[0.5, 1.0], recall=[1.0, 0.2], threshold=[0.1, 0.9])
+        self.assertEqual(metrics.metadata['confidenceMetrics'], [
+            {
+                'confidenceThreshold': 0.1,
+                'recall': 1.0,
+                'precision': 0.5
+            },
+            {
+                'confidenceThreshold': 0.9,
+                'recall': 0.2,
+                'precision': 1.0
+            },
+        ])
+
+    def test_log_confusion_matrix_invalid(self):
+        metrics = artifact_types.ClassificationMetrics()
+        with self.assertRaisesRegex(ValueError, r'Invalid matrix'):
+            metrics.log_confusion_matrix(['dog', 'cat'], [[1, 2], [3]])
+        metrics.set_confusion_matrix_categories(['dog', 'cat'])
+        with self.assertRaisesRegex(ValueError,
+                                    r'Invalid category: horses passed'):
+            metrics.log_confusion_matrix_cell('dog', 'horses', 1)
+
+    @parameterized.parameters(
+        {
+            'uri': '/local/dir/file',
+            'expected_path': '/local/dir/file',
+        },
+        {
+            'uri': 'https://example.com/file',
+            'expected_path': None,
+        },
+    )
+    def test_path(self, uri, expected_path):
+        artifact = artifact_types.Artifact(uri=uri)
+        self.assertEqual(artifact.path, expected_path)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -21,7 +21,6 @@ from typing import List, Type, TypeVar, Union
 
 from kfp.components.types import artifact_types
 from kfp.components.types import type_annotations
-from kfp.components.types import type_utils
 
 
 class OutputPath:
@@ -100,6 +99,10 @@ class InputPath:
 
 def construct_type_for_inputpath_or_outputpath(
         type_: Union[str, Type, None]) -> Union[str, None]:
+    # Imported here since type_utils pulls in the pipeline spec and the
+    # structures module, which the executor does not otherwise need.
+    from kfp.components.types import type_utils
+
     if type_annotations.is_artifact_class(type_):
         return type_utils.create_bundled_artifact_type(type_.schema_title,
                                                        type_.schema_version)
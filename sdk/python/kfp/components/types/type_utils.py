@@ -13,6 +13,8 @@
 # limitations under the License.
 """Utilities for component I/O type mapping."""
 
+from __future__ import annotations
+
 from distutils import util
 import inspect
 import json
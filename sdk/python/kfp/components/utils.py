@@ -18,7 +18,7 @@ import os
 import re
 import sys
 import types
-from typing import List
+from typing import Collection, Dict
 
 _COMPONENT_NAME_PREFIX = 'comp-'
 _EXECUTOR_LABEL_PREFIX = 'exec-'
@@ -84,7 +84,7 @@ def sanitize_executor_label(label: str) -> str:
 
 def make_name_unique_by_adding_index(
     name: str,
-    collection: List[str],
+    collection: Collection[str],
     delimiter: str,
 ) -> str:
     """Makes a unique name by adding index.
@@ -93,7 +93,8 @@ def make_name_unique_by_adding_index(
 
     Args:
         name: The original name.
-        collection: The collection of existing names.
+        collection: The collection of existing names. Prefer a set or a
+            mapping over a list, since it is probed for every index.
         delimiter: The delimiter to connect the original name and an index.
 
     Returns:
@@ -108,6 +109,36 @@ def make_name_unique_by_adding_index(
     return unique_name
 
 
+class UniqueNameAllocator:
+    """Makes names unique in a collection by adding an index, like
+    make_name_unique_by_adding_index, in amortized constant time.
+
+    The next index of each name is remembered, so the collection is not
+    probed from index 2 every time the same name is made unique. Names are
+    expected to be added to the collection before the next call and never
+    removed.
+
+    Args:
+        collection: The collection of existing names.
+        delimiter: The delimiter to connect the original name and an index.
+    """
+
+    def __init__(self, collection: Collection[str], delimiter: str) -> None:
+        self._collection = collection
+        self._delimiter = delimiter
+        self._next_indices: Dict[str, int] = {}
+
+    def make_name_unique(self, name: str) -> str:
+        """Makes a unique name by adding the next free index."""
+        if name not in self._collection:
+            return name
+        index = self._next_indices.get(name, 2)
+        while name + self._delimiter + str(index) in self._collection:
+            index += 1
+        self._next_indices[name] = index + 1
+        return name + self._delimiter + str(index)
+
+
 def validate_pipeline_name(name: str) -> None:
     """Validate pipeline name.
 
@@ -86,6 +86,18 @@ class UtilsTest(parameterized.TestCase):
                 delimiter=delimiter,
             ))
 
+    def test_unique_name_allocator(self):
+        collection = {'name': None, 'name-3': None}
+        allocator = utils.UniqueNameAllocator(collection, '-')
+
+        names = []
+        for _ in range(3):
+            names.append(allocator.make_name_unique('name'))
+            collection[names[-1]] = None
+
+        self.assertEqual(['name-2', 'name-4', 'name-5'], names)
+        self.assertEqual('other', allocator.make_name_unique('other'))
+
     @parameterized.parameters(
         {
             'pipeline_name': 'my-pipeline',
@@ -16,12 +16,12 @@ import hashlib
 import warnings
 
 from kfp.components import v1_structures
-import yaml
+from kfp.components import yaml_utils
 
 
 def _load_component_spec_from_component_text(
         text) -> v1_structures.ComponentSpec:
-    component_dict = yaml.safe_load(text)
+    component_dict = yaml_utils.safe_load(text)
     component_spec = v1_structures.ComponentSpec.from_dict(component_dict)
 
     if isinstance(component_spec.implementation,
@@ -13,13 +13,13 @@
 # limitations under the License.
 """Functions for loading components from compiled YAML."""
 
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 from google.protobuf import json_format
 from kfp import components
+from kfp.components import component_cache
 from kfp.components import structures
 from kfp.pipeline_spec import pipeline_spec_pb2
-import requests
 
 
 class YamlComponent(components.BaseComponent):
@@ -92,13 +92,19 @@ def load_component_from_file(file_path: str) -> YamlComponent:
 
 
 def load_component_from_url(url: str,
-                            auth: Optional[Tuple[str,
-                                                 str]] = None) -> YamlComponent:
+                            auth: Optional[Tuple[str, str]] = None,
+                            sha256: Optional[str] = None) -> YamlComponent:
     """Loads a component from a URL.
 
+    If the ``KFP_COMPONENT_CACHE_DIR`` environment variable is set,
+    downloaded components are cached on disk and revalidated with
+    conditional requests. See ``kfp.components.component_cache`` for how to
+    configure the cache and its offline mode.
+
     Args:
         url (str): URL to a YAML component.
         auth (Tuple[str, str], optional): A ``('<username>', '<password>')`` tuple of authentication credentials necessary for URL access. See `Requests Authorization <https://requests.readthedocs.io/en/latest/user/authentication/#authentication>`_ for more information.
+        sha256 (str, optional): The expected SHA-256 digest of the component YAML. If specified, the component is loaded from the cache without a request when it was downloaded before.
 
     Returns:
         Component loaded from YAML.
@@ -115,11 +121,34 @@ def load_component_from_url(url: str,
     if url is None:
         raise ValueError('url must be a string.')
 
-    if url.startswith('gs://'):
-        #Replacing the gs:// URI with https:// URI (works for public objects)
-        url = 'https://storage.googleapis.com/' + url[len('gs://'):]
+    content = component_cache.get_default_cache().fetch(
+        url, auth=auth, sha256=sha256)
+    return load_component_from_text(content.decode('utf-8'))
+
+
+def load_components_from_urls(
+        urls: List[str],
+        auth: Optional[Tuple[str, str]] = None) -> List[YamlComponent]:
+    """Loads components from URLs, downloading them concurrently.
+
+    Args:
+        urls (List[str]): URLs to YAML components.
+        auth (Tuple[str, str], optional): A ``('<username>', '<password>')`` tuple of authentication credentials necessary for URL access.
+
+    Returns:
+        Components loaded from YAML, in the order of ``urls``.
+
+    Example:
+      ::
 
-    resp = requests.get(url, auth=auth)
-    resp.raise_for_status()
+        from kfp import components
 
-    return load_component_from_text(resp.content.decode('utf-8'))
+        preprocess, train = components.load_components_from_urls([
+            'gs://path/to/preprocess.yaml',
+            'gs://path/to/train.yaml',
+        ])
+    """
+    contents = component_cache.get_default_cache().prefetch(urls, auth=auth)
+    return [
+        load_component_from_text(contents[url].decode('utf-8')) for url in urls
+    ]
@@ -17,7 +17,9 @@ import os
 import tempfile
 import textwrap
 import unittest
+from unittest import mock
 
+from kfp.components import component_cache
 from kfp.components import structures
 from kfp.components import yaml_component
 
@@ -123,6 +125,40 @@ class YamlComponentTest(unittest.TestCase):
             component.component_spec.implementation.container.image,
             'python:3.7')
 
+    def test_load_components_from_urls(self):
+        cache = mock.create_autospec(
+            component_cache.ComponentCache, instance=True)
+        cache.prefetch.return_value = {
+            'gs://bucket/a.yaml':
+                SAMPLE_YAML.encode(),
+            'gs://bucket/b.yaml':
+                SAMPLE_YAML.replace('component-1', 'component-2').encode(),
+        }
+        component_cache.set_default_cache(cache)
+        self.addCleanup(component_cache.set_default_cache, None)
+
+        components = yaml_component.load_components_from_urls(
+            ['gs://bucket/b.yaml', 'gs://bucket/a.yaml'])
+
+        cache.prefetch.assert_called_once_with(
+            ['gs://bucket/b.yaml', 'gs://bucket/a.yaml'], auth=None)
+        self.assertEqual(['component-2', 'component-1'],
+                         [component.name for component in components])
+
+    def test_load_component_from_url_with_sha256(self):
+        cache = mock.create_autospec(
+            component_cache.ComponentCache, instance=True)
+        cache.fetch.return_value = SAMPLE_YAML.encode()
+        component_cache.set_default_cache(cache)
+        self.addCleanup(component_cache.set_default_cache, None)
+
+        component = yaml_component.load_component_from_url(
+            'gs://bucket/a.yaml', sha256='abc')
+
+        cache.fetch.assert_called_once_with(
+            'gs://bucket/a.yaml', auth=None, sha256='abc')
+        self.assertEqual('component-1', component.name)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,73 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Fast YAML loading and dumping for pipeline and component specs."""
+
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Union
+
+import yaml
+
+# Parse with libyaml if PyYAML was built with it. The C parser constructs the
+# same documents as the pure Python one.
+_SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+class _SafeDumper(yaml.SafeDumper):
+    """A SafeDumper that memoizes the analysis of scalars.
+
+    The libyaml emitter is not used since it folds long double-quoted
+    scalars differently than the pure Python emitter, which would change
+    the compiled YAML of existing pipelines. Analyzing a scalar is a
+    pure function of its value and dominates the time to dump specs, in
+    which keys and values are highly repetitive.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._scalar_analyses: Dict[str, yaml.emitter.ScalarAnalysis] = {}
+
+    def analyze_scalar(self, scalar: str) -> yaml.emitter.ScalarAnalysis:
+        analysis = self._scalar_analyses.get(scalar)
+        if analysis is None:
+            analysis = super().analyze_scalar(scalar)
+            self._scalar_analyses[scalar] = analysis
+        return analysis
+
+
+def safe_load(stream: Union[str, bytes, TextIO]) -> Any:
+    """Parses the first YAML document in a stream."""
+    return yaml.load(stream, Loader=_SafeLoader)
+
+
+def safe_load_all(stream: Union[str, bytes, TextIO]) -> Iterator[Any]:
+    """Parses all YAML documents in a stream."""
+    return yaml.load_all(stream, Loader=_SafeLoader)
+
+
+def dump_all(
+    documents: List[Any],
+    stream: Optional[TextIO] = None,
+) -> Optional[str]:
+    """Serializes documents to YAML with sorted keys.
+
+    The output is identical to ``yaml.dump_all(documents, stream,
+    sort_keys=True)``.
+
+    Args:
+        documents: The documents to serialize.
+        stream: The stream to write to. If None, the YAML is returned.
+
+    Returns:
+        The YAML if stream is None.
+    """
+    return yaml.dump_all(documents, stream, Dumper=_SafeDumper, sort_keys=True)
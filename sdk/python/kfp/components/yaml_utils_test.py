@@ -0,0 +1,63 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for kfp.components.yaml_utils."""
+
+import glob
+import io
+import os
+import unittest
+
+from absl.testing import parameterized
+from kfp.components import yaml_utils
+import yaml
+
+_TEST_DATA_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'test_data')
+
+_GOLDEN_FILES = sorted(
+    glob.glob(os.path.join(_TEST_DATA_DIR, '**', '*.yaml'), recursive=True))
+
+
+class YamlUtilsTest(parameterized.TestCase):
+
+    def test_golden_files_exist(self):
+        self.assertNotEmpty(_GOLDEN_FILES)
+
+    @parameterized.parameters(*_GOLDEN_FILES)
+    def test_golden_file_round_trip_is_unchanged(self, path: str):
+        with open(path) as f:
+            text = f.read()
+
+        documents = list(yaml_utils.safe_load_all(text))
+        self.assertEqual(documents, list(yaml.safe_load_all(text)))
+
+        stream = io.StringIO()
+        yaml_utils.dump_all(documents, stream)
+        self.assertEqual(stream.getvalue(),
+                         yaml.dump_all(documents, sort_keys=True))
+
+    def test_safe_load_does_not_construct_objects(self):
+        with self.assertRaises(yaml.constructor.ConstructorError):
+            yaml_utils.safe_load('!!python/object/apply:os.getcwd []')
+
+    def test_dump_all_returns_yaml_without_stream(self):
+        self.assertEqual(
+            yaml_utils.dump_all([{
+                'b': 1,
+                'a': ['x']
+            }, {}]), 'a:\n- x\nb: 1\n--- {}\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Startup benchmarks for the kfp entry points.
+
+Runs `python -X importtime` in a fresh interpreter and fails if an entry
+point starts importing modules it does not need, or becomes slow
+relative to importing the DSL.
+"""
+
+import os
+import re
+import subprocess
+import sys
+from typing import Dict
+import unittest
+
+from absl.testing import parameterized
+
+_IMPORT_TIME_PATTERN = re.compile(
+    r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s+(\s*)(\S+)$')
+
+# The executor entry point may take at most this fraction of the time it takes
+# to import kfp.dsl in the same interpreter. A relative budget is robust to the
+# speed of the machine the benchmark runs on.
+_EXECUTOR_MAIN_BUDGET_FRACTION = 0.5
+
+_CLIENT_MODULES = [
+    'kfp.client',
+    'kfp_server_api',
+    'kubernetes',
+    'requests_toolbelt',
+]
+
+
+def _get_cumulative_import_times(*modules: str) -> Dict[str, int]:
+    """Imports modules in a fresh interpreter and returns the cumulative import
+    time of every module that was loaded, in microseconds."""
+    # Run from the package root so that the local kfp package is imported.
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [
+            sys.executable, '-X', 'importtime', '-c',
+            f'import {", ".join(modules)}'
+        ],
+        cwd=package_root,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    import_times = {}
+    for line in result.stderr.splitlines():
+        match = _IMPORT_TIME_PATTERN.match(line)
+        if match:
+            import_times[match.group(4)] = int(match.group(2))
+    return import_times
+
+
+class ImportTimeTest(parameterized.TestCase):
+
+    @parameterized.parameters(
+        {
+            'module':
+                'kfp.components.executor_main',
+            'unexpected_modules':
+                _CLIENT_MODULES + [
+                    'kfp.compiler',
+                    'kfp.dsl',
+                    'kfp.pipeline_spec',
+                    'google.auth',
+                    'yaml',
+                    'distutils',
+                ],
+        },
+        {
+            'module': 'kfp.dsl',
+            'unexpected_modules': _CLIENT_MODULES,
+        },
+        {
+            'module': 'kfp.registry',
+            'unexpected_modules': _CLIENT_MODULES,
+        },
+    )
+    def test_unexpected_imports(self, module, unexpected_modules):
+        import_times = _get_cumulative_import_times(module)
+
+        imported = {
+            name for name in import_times for unexpected in unexpected_modules
+            if name == unexpected or name.startswith(f'{unexpected}.')
+        }
+        self.assertEqual(
+            imported, set(),
+            f'Importing {module} should not import {sorted(imported)}.')
+
+    def test_executor_main_import_time(self):
+        import_times = _get_cumulative_import_times(
+            'kfp.components.executor_main', 'kfp.dsl')
+
+        executor_main_time = import_times['kfp.components.executor_main']
+        # kfp.dsl is imported second, so its time excludes the modules
+        # it shares with the executor.
+        dsl_time = executor_main_time + import_times['kfp.dsl']
+        self.assertLess(
+            executor_main_time, _EXECUTOR_MAIN_BUDGET_FRACTION * dsl_time,
+            f'Importing kfp.components.executor_main took '
+            f'{executor_main_time}us, compared to {dsl_time}us for kfp.dsl.')
+
+    def test_namespace_is_lazy(self):
+        result = subprocess.run(
+            [
+                sys.executable, '-c',
+                'import sys, kfp; assert "kfp.client" not in sys.modules; '
+                'assert "kfp.dsl" not in sys.modules'
+            ],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    @parameterized.parameters(
+        'Client',
+        'client',
+        'compiler',
+        'components',
+        'dsl',
+        'pipeline_spec',
+    )
+    def test_lazy_attribute(self, name):
+        # Each attribute is read first in a fresh interpreter, as in
+        # `import kfp; kfp.components`.
+        result = subprocess.run(
+            [sys.executable, '-c', f'import kfp; kfp.{name}'],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    @parameterized.parameters(
+        'from kfp.components import load_component_from_file',
+        'from kfp.components import PythonComponent',
+        'import kfp.components.structures',
+        'import kfp.components.placeholders',
+        'import kfp.components.types.type_utils',
+        'import kfp.components.pipeline_context',
+        'import kfp.components.tasks_group',
+    )
+    def test_entry_point_imports_without_dsl(self, statement):
+        # Modules used to be initialized in the order kfp.dsl imports them,
+        # which hid circular imports when a module is imported first.
+        result = subprocess.run(
+            [sys.executable, '-c', statement],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
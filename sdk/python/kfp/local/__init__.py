@@ -0,0 +1,32 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+__all__ = [
+    'ExecutionCache',
+    'LocalRunner',
+    'PipelineRunResult',
+    'TaskResult',
+    'SUCCEEDED',
+    'FAILED',
+    'SKIPPED',
+    'CANCELED',
+]
+from kfp.local.cache import ExecutionCache
+from kfp.local.local_runner import CANCELED
+from kfp.local.local_runner import FAILED
+from kfp.local.local_runner import LocalRunner
+from kfp.local.local_runner import PipelineRunResult
+from kfp.local.local_runner import SKIPPED
+from kfp.local.local_runner import SUCCEEDED
+from kfp.local.local_runner import TaskResult
@@ -0,0 +1,277 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Content-addressed cache for local task executions."""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple
+
+from google.protobuf import json_format
+from kfp.pipeline_spec import pipeline_spec_pb2
+
+_DEFAULT_CACHE_ROOT = os.path.join(
+    os.path.expanduser('~'), '.cache', 'kfp', 'local')
+_ENTRY_FILE = 'entry.json'
+_CHUNK_SIZE = 1024 * 1024
+
+
+def _hash_path(path: str) -> str:
+    """Hashes the contents of a file, or of all files under a directory."""
+    digest = hashlib.sha256()
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for file_name in sorted(files):
+                file_path = os.path.join(root, file_name)
+                digest.update(os.path.relpath(file_path, path).encode())
+                digest.update(_hash_path(file_path).encode())
+    else:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _get_size(path: str) -> int:
+    if os.path.isdir(path):
+        return sum(
+            os.path.getsize(os.path.join(root, file_name))
+            for root, _, files in os.walk(path)
+            for file_name in files)
+    return os.path.getsize(path)
+
+
+def _copy(src: str, dst: str) -> None:
+    """Copies a file or directory.
+
+    Files are never hard-linked, so that writing to the outputs of a
+    task or to restored artifacts cannot change cache entries.
+    """
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    if os.path.isdir(src):
+        shutil.copytree(src, dst)
+    else:
+        shutil.copy2(src, dst)
+
+
+def _remove(path: str) -> None:
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+class ExecutionCache:
+    """An on-disk, content-addressed cache of task executions.
+
+    Tasks are fingerprinted from the digest of their component and executor
+    specs, their resolved parameter values and the content hashes of their
+    input artifacts. On a hit, the recorded output parameters are returned and
+    the recorded output artifacts are restored to the task's output URIs.
+
+    When the total size of the cache exceeds ``max_size_bytes``, the least
+    recently used entries are evicted.
+
+    Args:
+        cache_root: The directory in which cache entries are stored. Defaults
+            to ``~/.cache/kfp/local``.
+        max_size_bytes: The maximum total size of the cache. Unbounded if not
+            specified.
+    """
+
+    def __init__(
+        self,
+        cache_root: Optional[str] = None,
+        max_size_bytes: Optional[int] = None,
+    ):
+        self.cache_root = os.path.abspath(cache_root or _DEFAULT_CACHE_ROOT)
+        self.max_size_bytes = max_size_bytes
+        os.makedirs(self.cache_root, exist_ok=True)
+        # Avoids rehashing an input artifact consumed by many tasks.
+        self._content_hashes: Dict[Tuple[str, int, int], str] = {}
+
+    def fingerprint(
+        self,
+        component_spec: pipeline_spec_pb2.ComponentSpec,
+        executor_spec: Dict[str, Any],
+        executor_input: Dict[str, Any],
+    ) -> str:
+        """Computes the cache key of a task.
+
+        Args:
+            component_spec: The component spec of the task.
+            executor_spec: The executor spec of the task's component.
+            executor_input: The task's ExecutorInput. Only its inputs are
+                taken into account.
+
+        Returns:
+            The cache key.
+        """
+        inputs = executor_input.get('inputs', {})
+        artifacts = {
+            name: [
+                self._artifact_fingerprint(artifact)
+                for artifact in value.get('artifacts', [])
+            ] for name, value in inputs.get('artifacts', {}).items()
+        }
+        key = {
+            'component_spec': json_format.MessageToDict(component_spec),
+            'executor_spec': executor_spec,
+            'parameters': inputs.get('parameterValues', {}),
+            'artifacts': artifacts,
+        }
+        return hashlib.sha256(json.dumps(key,
+                                         sort_keys=True).encode()).hexdigest()
+
+    def _artifact_fingerprint(self, artifact: Dict[str, Any]) -> Dict[str, Any]:
+        uri = artifact.get('uri', '')
+        fingerprint = {
+            'type': artifact.get('type', {}),
+            'metadata': artifact.get('metadata', {}),
+        }
+        if uri and '://' not in uri and os.path.exists(uri):
+            stat = os.stat(uri)
+            stat_key = (uri, stat.st_mtime_ns, stat.st_size)
+            if stat_key not in self._content_hashes:
+                self._content_hashes[stat_key] = _hash_path(uri)
+            fingerprint['sha256'] = self._content_hashes[stat_key]
+        else:
+            # Remote artifacts are identified by their URI.
+            fingerprint['uri'] = uri
+        return fingerprint
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.cache_root, key)
+
+    def get(
+        self,
+        key: str,
+        executor_input: Dict[str, Any],
+    ) -> Optional[Dict[str, Any]]:
+        """Looks up a cache entry and restores its output artifacts.
+
+        Args:
+            key: The cache key returned by `fingerprint`.
+            executor_input: The task's ExecutorInput. Recorded output artifacts
+                are restored to the URIs of its output artifacts.
+
+        Returns:
+            The recorded ExecutorOutput, or None on a cache miss.
+        """
+        entry_dir = self._entry_dir(key)
+        entry_path = os.path.join(entry_dir, _ENTRY_FILE)
+        try:
+            with open(entry_path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        output_artifacts = executor_input['outputs'].get('artifacts', {})
+        if not set(entry.get('artifacts', {})).issubset(output_artifacts):
+            return None
+
+        executor_output = {
+            'parameterValues': entry.get('parameterValues', {}),
+            'artifacts': {},
+        }
+        for name, recorded in entry.get('artifacts', {}).items():
+            artifacts = []
+            for i, artifact in enumerate(output_artifacts[name]['artifacts']):
+                if i >= len(recorded):
+                    break
+                restored = dict(artifact)
+                restored['metadata'] = recorded[i]['metadata']
+                stored_path = recorded[i].get('path')
+                if stored_path is not None:
+                    _remove(restored['uri'])
+                    _copy(os.path.join(entry_dir, stored_path), restored['uri'])
+                artifacts.append(restored)
+            executor_output['artifacts'][name] = {'artifacts': artifacts}
+
+        # Mark the entry as recently used for LRU eviction.
+        os.utime(entry_path)
+        return executor_output
+
+    def put(
+        self,
+        key: str,
+        executor_input: Dict[str, Any],
+        parameter_values: Dict[str, Any],
+        artifacts: Dict[str, List[Dict[str, Any]]],
+    ) -> None:
+        """Records a successful task execution.
+
+        Args:
+            key: The cache key returned by `fingerprint`.
+            executor_input: The task's ExecutorInput.
+            parameter_values: The task's output parameter values.
+            artifacts: The task's output artifacts, keyed by output name.
+        """
+        entry_dir = self._entry_dir(key)
+        if os.path.exists(entry_dir):
+            return
+
+        staging_dir = tempfile.mkdtemp(dir=self.cache_root, prefix='.tmp-')
+        try:
+            entry = {'parameterValues': parameter_values, 'artifacts': {}}
+            for name, output_artifacts in artifacts.items():
+                recorded = []
+                for i, artifact in enumerate(output_artifacts):
+                    record = {'metadata': artifact.get('metadata', {})}
+                    uri = artifact.get('uri', '')
+                    if uri and '://' not in uri and os.path.exists(uri):
+                        record['path'] = os.path.join('artifacts', name, str(i))
+                        _copy(uri, os.path.join(staging_dir, record['path']))
+                    recorded.append(record)
+                entry['artifacts'][name] = recorded
+            with open(os.path.join(staging_dir, _ENTRY_FILE), 'w') as f:
+                json.dump(entry, f)
+            os.rename(staging_dir, entry_dir)
+        except OSError as e:
+            _remove(staging_dir)
+            # Another process may have recorded the same entry concurrently.
+            if not os.path.exists(entry_dir):
+                logging.warning(
+                    f'Failed to record local cache entry {key}: {e}')
+            return
+
+        if self.max_size_bytes is not None:
+            self.evict(self.max_size_bytes)
+
+    def evict(self, max_size_bytes: int) -> None:
+        """Evicts least recently used entries until the cache fits in
+        max_size_bytes.
+
+        Args:
+            max_size_bytes: The maximum total size of the cache.
+        """
+        entries = []
+        for key in os.listdir(self.cache_root):
+            entry_path = os.path.join(self.cache_root, key, _ENTRY_FILE)
+            if not os.path.exists(entry_path):
+                continue
+            entries.append((os.path.getmtime(entry_path), key,
+                            _get_size(os.path.join(self.cache_root, key))))
+
+        total_size = sum(size for _, _, size in entries)
+        for _, key, size in sorted(entries):
+            if total_size <= max_size_bytes:
+                break
+            logging.info(f'Evicting local cache entry {key}.')
+            _remove(self._entry_dir(key))
+            total_size -= size
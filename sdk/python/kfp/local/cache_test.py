@@ -0,0 +1,195 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for kfp.local.cache."""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from kfp.local import cache
+from kfp.pipeline_spec import pipeline_spec_pb2
+
+
+def _make_executor_input(task_dir: str, input_uri: str, param: int):
+    return {
+        'inputs': {
+            'parameterValues': {
+                'param': param
+            },
+            'artifacts': {
+                'in_dataset': {
+                    'artifacts': [{
+                        'name': 'in_dataset',
+                        'uri': input_uri,
+                        'type': {
+                            'schemaTitle': 'system.Dataset'
+                        },
+                        'metadata': {},
+                    }]
+                }
+            },
+        },
+        'outputs': {
+            'artifacts': {
+                'out_dataset': {
+                    'artifacts': [{
+                        'name': 'out_dataset',
+                        'uri': os.path.join(task_dir, 'out_dataset'),
+                        'type': {
+                            'schemaTitle': 'system.Dataset'
+                        },
+                        'metadata': {},
+                    }]
+                }
+            },
+            'outputFile': os.path.join(task_dir, 'executor_output.json'),
+        },
+    }
+
+
+class ExecutionCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.cache = cache.ExecutionCache(
+            cache_root=os.path.join(self._temp_dir.name, 'cache'))
+        self.input_uri = os.path.join(self._temp_dir.name, 'input')
+        with open(self.input_uri, 'w') as f:
+            f.write('input')
+        self.component_spec = pipeline_spec_pb2.ComponentSpec(
+            executor_label='exec-foo')
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _fingerprint(self, param: int = 1) -> str:
+        return self.cache.fingerprint(
+            self.component_spec, {'container': {
+                'image': 'python:3.7'
+            }}, _make_executor_input(self._temp_dir.name, self.input_uri,
+                                     param))
+
+    def test_fingerprint_depends_on_inputs(self):
+        key = self._fingerprint()
+        self.assertEqual(key, self._fingerprint())
+        self.assertNotEqual(key, self._fingerprint(param=2))
+
+        with open(self.input_uri, 'w') as f:
+            f.write('changed input')
+        self.assertNotEqual(key, self._fingerprint())
+
+    def test_put_and_get_restores_artifacts(self):
+        key = self._fingerprint()
+        producer_dir = os.path.join(self._temp_dir.name, 'producer')
+        executor_input = _make_executor_input(producer_dir, self.input_uri, 1)
+        output_uri = executor_input['outputs']['artifacts']['out_dataset'][
+            'artifacts'][0]['uri']
+        os.makedirs(producer_dir)
+        with open(output_uri, 'w') as f:
+            f.write('output')
+
+        self.assertIsNone(self.cache.get(key, executor_input))
+        self.cache.put(
+            key,
+            executor_input,
+            parameter_values={'Output': 3},
+            artifacts={
+                'out_dataset': [{
+                    'uri': output_uri,
+                    'metadata': {
+                        'rows': 1
+                    }
+                }]
+            })
+
+        consumer_dir = os.path.join(self._temp_dir.name, 'consumer')
+        executor_output = self.cache.get(
+            key, _make_executor_input(consumer_dir, self.input_uri, 1))
+
+        self.assertEqual(executor_output['parameterValues'], {'Output': 3})
+        restored = executor_output['artifacts']['out_dataset']['artifacts'][0]
+        self.assertEqual(restored['uri'],
+                         os.path.join(consumer_dir, 'out_dataset'))
+        self.assertEqual(restored['metadata'], {'rows': 1})
+        with open(restored['uri']) as f:
+            self.assertEqual(f.read(), 'output')
+
+    def test_writes_to_outputs_do_not_change_entry(self):
+        key = self._fingerprint()
+        producer_dir = os.path.join(self._temp_dir.name, 'producer')
+        executor_input = _make_executor_input(producer_dir, self.input_uri, 1)
+        output_uri = executor_input['outputs']['artifacts']['out_dataset'][
+            'artifacts'][0]['uri']
+        os.makedirs(producer_dir)
+        with open(output_uri, 'w') as f:
+            f.write('output')
+        self.cache.put(key, executor_input, {},
+                       {'out_dataset': [{
+                           'uri': output_uri
+                       }]})
+
+        # Both the output of the recorded run and a restored artifact are
+        # written in place.
+        with open(output_uri, 'w') as f:
+            f.write('changed')
+        first_consumer = _make_executor_input(
+            os.path.join(self._temp_dir.name, 'first'), self.input_uri, 1)
+        restored_uri = self.cache.get(
+            key,
+            first_consumer)['artifacts']['out_dataset']['artifacts'][0]['uri']
+        with open(restored_uri, 'w') as f:
+            f.write('changed')
+        second_consumer = _make_executor_input(
+            os.path.join(self._temp_dir.name, 'second'), self.input_uri, 1)
+        restored_uri = self.cache.get(
+            key,
+            second_consumer)['artifacts']['out_dataset']['artifacts'][0]['uri']
+
+        with open(restored_uri) as f:
+            self.assertEqual(f.read(), 'output')
+
+    def test_put_logs_errors(self):
+        executor_input = _make_executor_input(self._temp_dir.name,
+                                              self.input_uri, 1)
+
+        with self.assertLogs(level='WARNING') as logs, mock.patch.object(
+                shutil, 'copy2', side_effect=OSError('No space left')):
+            self.cache.put('a', executor_input, {},
+                           {'out_dataset': [{
+                               'uri': self.input_uri
+                           }]})
+
+        self.assertIn('Failed to record local cache entry a', logs.output[0])
+        self.assertIsNone(self.cache.get('a', executor_input))
+
+    def test_evict_least_recently_used(self):
+        executor_input = _make_executor_input(self._temp_dir.name,
+                                              self.input_uri, 1)
+        for key in ['a', 'b', 'c']:
+            self.cache.put(key, executor_input, {'Output': 'x' * 100}, {})
+            time.sleep(0.01)
+        self.assertIsNotNone(self.cache.get('a', executor_input))
+
+        self.cache.evict(max_size_bytes=350)
+
+        self.assertIsNotNone(self.cache.get('a', executor_input))
+        self.assertIsNone(self.cache.get('b', executor_input))
+        self.assertIsNotNone(self.cache.get('c', executor_input))
+
+
+if __name__ == '__main__':
+    unittest.main()
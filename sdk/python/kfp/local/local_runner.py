@@ -0,0 +1,1030 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Local runner that executes compiled pipelines on a process pool."""
+
+import ast
+import collections
+from concurrent import futures
+import dataclasses
+import json
+import logging
+import operator
+import os
+import re
+import traceback
+from typing import Any, Callable, Deque, Dict, List, Optional, Union
+import uuid
+
+from google.protobuf import json_format
+from kfp.components import base_component
+from kfp.components import executor
+from kfp.components import executor_main
+from kfp.components import yaml_utils
+from kfp.local import cache as cache_lib
+from kfp.pipeline_spec import pipeline_spec_pb2
+
+SUCCEEDED = 'SUCCEEDED'
+FAILED = 'FAILED'
+SKIPPED = 'SKIPPED'
+CANCELED = 'CANCELED'
+
+_DEFAULT_PIPELINE_ROOT = 'local_outputs'
+_EXECUTOR_MAIN_MODULE = 'kfp.components.executor_main'
+_COMPONENT_MODULE_NAME = 'ephemeral_component'
+
+_ParameterType = pipeline_spec_pb2.ParameterType.ParameterTypeEnum
+_TriggerStrategy = pipeline_spec_pb2.PipelineTaskSpec.TriggerPolicy.TriggerStrategy
+
+
+@dataclasses.dataclass
+class TaskResult:
+    """The result of a single task execution.
+
+    Attributes:
+        name: The fully-qualified task name, e.g. `for-loop-2/0/print-text`.
+        state: One of SUCCEEDED, FAILED, SKIPPED or CANCELED.
+        error: The error message if the task failed.
+        cached: Whether the task outputs were restored from the cache.
+    """
+    name: str
+    state: str
+    error: Optional[str] = None
+    cached: bool = False
+
+
+@dataclasses.dataclass
+class PipelineRunResult:
+    """The result of a local pipeline run.
+
+    Attributes:
+        run_id: The ID of the run.
+        state: SUCCEEDED if all tasks succeeded or were skipped, else FAILED.
+        outputs: The pipeline outputs. Parameters are returned as Python values
+            and artifacts as Artifact instances (or lists of them).
+        tasks: The results of all tasks in the run, keyed by the
+            fully-qualified task name.
+    """
+    run_id: str
+    state: str
+    outputs: Dict[str, Any]
+    tasks: Dict[str, TaskResult]
+
+
+class _Collected(list):
+    """A list of values fanned in from the iterations of a ParallelFor."""
+
+
+class _MissingInputError(KeyError):
+    pass
+
+
+@dataclasses.dataclass
+class _Outputs:
+    parameters: Dict[str, Any] = dataclasses.field(default_factory=dict)
+    artifacts: Dict[str,
+                    List[Dict[str,
+                              Any]]] = dataclasses.field(default_factory=dict)
+
+
+class _DagExecution:
+    """Scheduling state for a single DAG (the root, a sub-pipeline, a condition
+    or one ParallelFor iteration)."""
+
+    def __init__(
+        self,
+        path: List[str],
+        component_spec: pipeline_spec_pb2.ComponentSpec,
+        parameters: Dict[str, Any],
+        artifacts: Dict[str, List[Dict[str, Any]]],
+        on_done: Callable[['_DagExecution'], None],
+    ):
+        self.path = path
+        self.dag = component_spec.dag
+        self.parameters = parameters
+        self.artifacts = artifacts
+        self.on_done = on_done
+
+        self.upstream_tasks: Dict[str, set] = {}
+        for task_name, task_spec in self.dag.tasks.items():
+            upstream = set(task_spec.dependent_tasks)
+            for param in task_spec.inputs.parameters.values():
+                if param.HasField('task_output_parameter'):
+                    upstream.add(param.task_output_parameter.producer_task)
+                elif param.HasField('task_final_status'):
+                    upstream.add(param.task_final_status.producer_task)
+            for artifact in task_spec.inputs.artifacts.values():
+                if artifact.HasField('task_output_artifact'):
+                    upstream.add(artifact.task_output_artifact.producer_task)
+            self.upstream_tasks[task_name] = upstream
+
+        self.started: set = set()
+        self.states: Dict[str, str] = {}
+        self.errors: Dict[str, str] = {}
+        self.outputs: Dict[str, _Outputs] = {}
+        self.notified = False
+
+    @property
+    def done(self) -> bool:
+        return len(self.states) == len(self.dag.tasks)
+
+    @property
+    def state(self) -> str:
+        if any(state in (FAILED, CANCELED) for state in self.states.values()):
+            return FAILED
+        return SUCCEEDED
+
+    def ready_tasks(self) -> List[str]:
+        return [
+            task_name for task_name in self.dag.tasks
+            if task_name not in self.started and all(
+                upstream in self.states
+                for upstream in self.upstream_tasks[task_name])
+        ]
+
+    def collect_outputs(self) -> _Outputs:
+        """Resolves the DAG outputs from the outputs of its tasks."""
+        outputs = _Outputs()
+        for name, spec in self.dag.outputs.parameters.items():
+            selector = spec.value_from_parameter
+            producer = self.outputs.get(selector.producer_subtask)
+            if producer and selector.output_parameter_key in producer.parameters:
+                outputs.parameters[name] = producer.parameters[
+                    selector.output_parameter_key]
+        for name, spec in self.dag.outputs.artifacts.items():
+            for selector in spec.artifact_selectors:
+                producer = self.outputs.get(selector.producer_subtask)
+                if producer and selector.output_artifact_key in producer.artifacts:
+                    outputs.artifacts[name] = producer.artifacts[
+                        selector.output_artifact_key]
+                    break
+        return outputs
+
+
+@dataclasses.dataclass
+class _LoopExecution:
+    """Scheduling state for the iterations of a ParallelFor task."""
+    dag: _DagExecution
+    task_name: str
+    items: List[Any]
+    parallelism: int
+    next_index: int = 0
+    running: int = 0
+    finished: int = 0
+    failed: bool = False
+    iteration_outputs: Dict[int,
+                            _Outputs] = dataclasses.field(default_factory=dict)
+
+
+@dataclasses.dataclass
+class _ExecutorTask:
+    """A task submitted to the process pool."""
+    dag: _DagExecution
+    task_name: str
+    task_spec: pipeline_spec_pb2.PipelineTaskSpec
+    component_spec: pipeline_spec_pb2.ComponentSpec
+    executor_input: Dict[str, Any]
+    function_to_execute: str
+    component_module_path: str
+    cache_key: Optional[str] = None
+    attempt: int = 0
+
+
+def _execute_task(
+    executor_input: Dict[str, Any],
+    function_to_execute: str,
+    component_module_path: str,
+) -> None:
+    """Executes a task in a worker process."""
+    try:
+        executor_main.run_executor(
+            executor_input=executor_input,
+            function_to_execute=function_to_execute,
+            component_module_path=component_module_path,
+            cache_modules=True,
+        )
+    except BaseException:
+        # User exceptions are not guaranteed to be picklable, so we return the
+        # formatted traceback instead.
+        raise RuntimeError(traceback.format_exc()) from None
+
+
+def _load_pipeline_spec(
+    pipeline: Union[str, base_component.BaseComponent]
+) -> pipeline_spec_pb2.PipelineSpec:
+    if isinstance(pipeline, base_component.BaseComponent):
+        return pipeline.pipeline_spec
+
+    if pipeline.endswith('.pb'):
+        with open(pipeline, 'rb') as f:
+            return pipeline_spec_pb2.PipelineSpec.FromString(f.read())
+    with open(pipeline) as f:
+        documents = list(yaml_utils.safe_load_all(f))
+    if not documents:
+        raise ValueError(f'No pipeline spec found in {pipeline}.')
+    return json_format.ParseDict(documents[0], pipeline_spec_pb2.PipelineSpec())
+
+
+def _value_to_python(value: Any) -> Any:
+    return json_format.MessageToDict(value)
+
+
+def _parse_parameter_file(text: str, parameter_type: int) -> Any:
+    if parameter_type == _ParameterType.NUMBER_INTEGER:
+        return int(text)
+    elif parameter_type == _ParameterType.NUMBER_DOUBLE:
+        return float(text)
+    elif parameter_type == _ParameterType.BOOLEAN:
+        return json.loads(text.lower())
+    elif parameter_type in (_ParameterType.LIST, _ParameterType.STRUCT):
+        return json.loads(text)
+    return text
+
+
+_PARSE_JSON_SELECTOR = re.compile(r'\["([^"]*)"\]')
+_CEL_STRING_LITERAL = re.compile(r"('(?:[^'\\]|\\.)*')")
+
+
+def _apply_expression_selector(value: Any, selector: str) -> Any:
+    """Applies a parameterExpressionSelector emitted by the compiler, e.g.
+    `parseJson(string_value)["A_a"]`."""
+    if isinstance(value, str):
+        value = json.loads(value)
+    for key in _PARSE_JSON_SELECTOR.findall(selector):
+        value = value[key]
+    return value
+
+
+_CEL_COMPARISONS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+}
+_CEL_CASTS = {'int': int, 'float': float}
+# Python 3.7 parses literals into Str, Num and NameConstant nodes.
+_CEL_LITERALS = (ast.Constant, ast.Str, ast.Num, ast.NameConstant)
+
+
+def _evaluate_cel_node(node: ast.AST, parameter_values: Dict[str, Any]) -> Any:
+    if isinstance(node, _CEL_LITERALS):
+        return ast.literal_eval(node)
+    if isinstance(node, ast.BoolOp):
+        values = (
+            _evaluate_cel_node(value, parameter_values)
+            for value in node.values)
+        return all(values) if isinstance(node.op, ast.And) else any(values)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op,
+                                                    (ast.Not, ast.USub)):
+        operand = _evaluate_cel_node(node.operand, parameter_values)
+        return not operand if isinstance(node.op, ast.Not) else -operand
+    if isinstance(node, ast.Compare) and all(
+            type(op) in _CEL_COMPARISONS for op in node.ops):
+        left = _evaluate_cel_node(node.left, parameter_values)
+        for op, comparator in zip(node.ops, node.comparators):
+            right = _evaluate_cel_node(comparator, parameter_values)
+            if not _CEL_COMPARISONS[type(op)](left, right):
+                return False
+            left = right
+        return True
+    if isinstance(node, ast.Subscript):
+        # inputs.parameter_values['<name>']
+        value = node.value
+        key = node.slice.value if isinstance(node.slice,
+                                             ast.Index) else node.slice
+        if (isinstance(value, ast.Attribute) and
+                value.attr == 'parameter_values' and
+                isinstance(value.value, ast.Name) and
+                value.value.id == 'inputs' and isinstance(key, _CEL_LITERALS)):
+            return parameter_values[ast.literal_eval(key)]
+    if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and
+            node.func.id in _CEL_CASTS and len(node.args) == 1 and
+            not node.keywords):
+        return _CEL_CASTS[node.func.id](
+            _evaluate_cel_node(node.args[0], parameter_values))
+    raise ValueError(f'Unsupported expression: {ast.dump(node)}')
+
+
+def _evaluate_condition(condition: str, parameter_values: Dict[str,
+                                                               Any]) -> bool:
+    """Evaluates the CEL condition of a dsl.Condition group.
+
+    Only the subset of CEL emitted by the compiler is supported:
+    comparisons between `inputs.parameter_values[...]`, literals and
+    `int()`/`double()` casts. The condition is rewritten into a Python
+    expression, which is evaluated node by node without `eval`.
+
+    Raises:
+        ValueError: If the condition is not supported.
+    """
+    parts = _CEL_STRING_LITERAL.split(condition)
+    for i in range(0, len(parts), 2):
+        part = parts[i]
+        part = re.sub(r'\btrue\b', 'True', part)
+        part = re.sub(r'\bfalse\b', 'False', part)
+        part = re.sub(r'\bdouble\(', 'float(', part)
+        part = part.replace('&&', ' and ').replace('||', ' or ')
+        part = re.sub(r'!(?!=)', ' not ', part)
+        parts[i] = part
+    try:
+        expression = ast.parse(''.join(parts).strip(), mode='eval')
+        return bool(_evaluate_cel_node(expression.body, parameter_values))
+    except (SyntaxError, ValueError) as e:
+        raise ValueError(
+            f'Unsupported condition {condition!r} in local execution: {e}'
+        ) from e
+
+
+def _get_lightweight_python_program(
+        container: Dict[str, Any]) -> Optional[Dict[str, str]]:
+    """Returns the component source and function name of a lightweight Python
+    component container, or None if the container is not one."""
+    command = container.get('command', [])
+    args = container.get('args', [])
+    for i, part in enumerate(command[:-1]):
+        if _EXECUTOR_MAIN_MODULE in part:
+            if '--function_to_execute' not in args:
+                return None
+            return {
+                'source':
+                    command[i + 1],
+                'function_to_execute':
+                    args[args.index('--function_to_execute') + 1],
+            }
+    return None
+
+
+class _PipelineRun:
+    """Executes one run of a pipeline spec."""
+
+    def __init__(
+        self,
+        pipeline_spec: pipeline_spec_pb2.PipelineSpec,
+        run_id: str,
+        run_dir: str,
+        max_workers: Optional[int],
+        cache: Optional[cache_lib.ExecutionCache] = None,
+        enable_caching: Optional[bool] = None,
+    ):
+        self._pipeline_spec = pipeline_spec
+        self._run_id = run_id
+        self._run_dir = run_dir
+        self._max_workers = max_workers
+        self._cache = cache
+        self._enable_caching = enable_caching
+        self._executors = json_format.MessageToDict(
+            pipeline_spec.deployment_spec).get('executors', {})
+
+        self._pool: Optional[futures.ProcessPoolExecutor] = None
+        self._running: Dict[futures.Future, _ExecutorTask] = {}
+        self._finished_tasks: Deque = collections.deque()
+        self._component_modules: Dict[str, str] = {}
+        self._results: Dict[str, TaskResult] = {}
+        self._root: Optional[_DagExecution] = None
+        self._root_outputs: Optional[_Outputs] = None
+
+    def execute(self, arguments: Dict[str, Any]) -> PipelineRunResult:
+        root_spec = self._pipeline_spec.root
+        parameters = self._resolve_pipeline_arguments(arguments)
+
+        with futures.ProcessPoolExecutor(
+                max_workers=self._max_workers) as self._pool:
+            self._root = _DagExecution(
+                path=[],
+                component_spec=root_spec,
+                parameters=parameters,
+                artifacts={},
+                on_done=self._on_root_done,
+            )
+            self._schedule(self._root)
+            self._drain()
+            while self._running:
+                done, _ = futures.wait(
+                    self._running, return_when=futures.FIRST_COMPLETED)
+                for future in done:
+                    self._on_executor_done(self._running.pop(future), future)
+                self._drain()
+
+        outputs = {}
+        for name, value in self._root_outputs.parameters.items():
+            outputs[name] = list(value) if isinstance(value,
+                                                      _Collected) else value
+        for name, artifacts in self._root_outputs.artifacts.items():
+            instances = [
+                executor.create_artifact_instance(artifact)
+                for artifact in artifacts
+            ]
+            is_list = root_spec.output_definitions.artifacts[
+                name].is_artifact_list
+            outputs[name] = instances if is_list else instances[0]
+
+        return PipelineRunResult(
+            run_id=self._run_id,
+            state=self._root.state,
+            outputs=outputs,
+            tasks=self._results,
+        )
+
+    def _resolve_pipeline_arguments(
+            self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        input_definitions = self._pipeline_spec.root.input_definitions
+        if input_definitions.artifacts:
+            raise ValueError(
+                'Local execution does not support pipelines with input artifacts.'
+            )
+
+        unknown_arguments = set(arguments) - set(input_definitions.parameters)
+        if unknown_arguments:
+            raise ValueError(
+                f'Unexpected pipeline arguments: {sorted(unknown_arguments)}.')
+
+        parameters = {}
+        for name, spec in input_definitions.parameters.items():
+            if name in arguments:
+                parameters[name] = arguments[name]
+            elif spec.HasField('default_value'):
+                parameters[name] = _value_to_python(spec.default_value)
+            elif not spec.is_optional:
+                raise ValueError(f'Missing required pipeline argument: {name}.')
+        return parameters
+
+    def _on_root_done(self, dag: _DagExecution) -> None:
+        self._root_outputs = dag.collect_outputs()
+
+    def _task_path(self, dag: _DagExecution, task_name: str) -> List[str]:
+        return dag.path + [task_name]
+
+    def _drain(self) -> None:
+        """Propagates finished tasks until the scheduling state is stable."""
+        while self._finished_tasks:
+            dag = self._finished_tasks.popleft()
+            self._schedule(dag)
+
+    def _finish_task(
+        self,
+        dag: _DagExecution,
+        task_name: str,
+        state: str,
+        outputs: Optional[_Outputs] = None,
+        error: Optional[str] = None,
+        cached: bool = False,
+    ) -> None:
+        dag.states[task_name] = state
+        dag.outputs[task_name] = outputs or _Outputs()
+        if error is not None:
+            dag.errors[task_name] = error
+        full_name = '/'.join(self._task_path(dag, task_name))
+        self._results[full_name] = TaskResult(
+            name=full_name, state=state, error=error, cached=cached)
+        if state == FAILED:
+            logging.error(f'Task {full_name} failed:\n{error}')
+        elif cached:
+            logging.info(f'Task {full_name} restored from cache.')
+        else:
+            logging.info(f'Task {full_name} {state.lower()}.')
+        self._finished_tasks.append(dag)
+
+    def _schedule(self, dag: _DagExecution) -> None:
+        for task_name in dag.ready_tasks():
+            dag.started.add(task_name)
+            task_spec = dag.dag.tasks[task_name]
+            upstream_failed = any(dag.states[upstream] in (FAILED, CANCELED)
+                                  for upstream in dag.upstream_tasks[task_name])
+            if upstream_failed and (
+                    task_spec.trigger_policy.strategy !=
+                    _TriggerStrategy.ALL_UPSTREAM_TASKS_COMPLETED):
+                self._finish_task(dag, task_name, CANCELED)
+                continue
+            try:
+                self._launch_task(dag, task_name, task_spec)
+            except Exception as e:
+                self._finish_task(dag, task_name, FAILED, error=str(e))
+
+        if dag.done and not dag.notified:
+            dag.notified = True
+            dag.on_done(dag)
+
+    def _resolve_inputs(
+        self,
+        dag: _DagExecution,
+        task_spec: pipeline_spec_pb2.PipelineTaskSpec,
+        component_spec: pipeline_spec_pb2.ComponentSpec,
+    ) -> _Outputs:
+        inputs = _Outputs()
+        for name, spec in task_spec.inputs.parameters.items():
+            try:
+                inputs.parameters[name] = self._resolve_parameter(dag, spec)
+            except _MissingInputError:
+                pass
+
+        for name, spec in task_spec.inputs.artifacts.items():
+            kind = spec.WhichOneof('kind')
+            if kind == 'component_input_artifact':
+                artifacts = dag.artifacts.get(spec.component_input_artifact)
+            else:
+                producer = dag.outputs.get(
+                    spec.task_output_artifact.producer_task, _Outputs())
+                artifacts = producer.artifacts.get(
+                    spec.task_output_artifact.output_artifact_key)
+            if artifacts is not None:
+                inputs.artifacts[name] = artifacts
+
+        input_definitions = component_spec.input_definitions
+        for name, spec in input_definitions.parameters.items():
+            # Loop items are only resolved per iteration.
+            if (name in inputs.parameters or
+                    name == task_spec.parameter_iterator.item_input):
+                continue
+            if spec.HasField('default_value'):
+                inputs.parameters[name] = _value_to_python(spec.default_value)
+            elif not spec.is_optional:
+                raise ValueError(f'Could not resolve input parameter {name!r}.')
+        for name, spec in input_definitions.artifacts.items():
+            if name not in inputs.artifacts and not spec.is_optional:
+                raise ValueError(f'Could not resolve input artifact {name!r}.')
+        return inputs
+
+    def _resolve_parameter(
+        self,
+        dag: _DagExecution,
+        spec: pipeline_spec_pb2.TaskInputsSpec.InputParameterSpec,
+    ) -> Any:
+        kind = spec.WhichOneof('kind')
+        if kind == 'component_input_parameter':
+            if spec.component_input_parameter not in dag.parameters:
+                raise _MissingInputError(spec.component_input_parameter)
+            value = dag.parameters[spec.component_input_parameter]
+        elif kind == 'task_output_parameter':
+            selector = spec.task_output_parameter
+            producer = dag.outputs.get(selector.producer_task, _Outputs())
+            if selector.output_parameter_key not in producer.parameters:
+                raise _MissingInputError(selector.output_parameter_key)
+            value = producer.parameters[selector.output_parameter_key]
+        elif kind == 'runtime_value':
+            value = _value_to_python(spec.runtime_value.constant)
+        elif kind == 'task_final_status':
+            producer_task = spec.task_final_status.producer_task
+            state = dag.states[producer_task]
+            error = {}
+            if state != SUCCEEDED:
+                failed = [
+                    name for name, result in self._results.items()
+                    if result.state == FAILED
+                ]
+                error = {
+                    'code': 13,
+                    'message': f'Failed tasks: {", ".join(failed)}',
+                }
+            value = {
+                'state': state if state == SUCCEEDED else FAILED,
+                'pipelineJobResourceName': self._run_id,
+                'pipelineTaskName': producer_task,
+                'error': error,
+            }
+        else:
+            raise _MissingInputError(kind)
+
+        if spec.parameter_expression_selector:
+            value = _apply_expression_selector(
+                value, spec.parameter_expression_selector)
+        return value
+
+    def _launch_task(
+        self,
+        dag: _DagExecution,
+        task_name: str,
+        task_spec: pipeline_spec_pb2.PipelineTaskSpec,
+    ) -> None:
+        component_spec = self._pipeline_spec.components[
+            task_spec.component_ref.name]
+        inputs = self._resolve_inputs(dag, task_spec, component_spec)
+
+        if component_spec.WhichOneof('implementation') == 'dag':
+            self._launch_dag_task(dag, task_name, task_spec, component_spec,
+                                  inputs)
+        else:
+            self._launch_executor_task(dag, task_name, task_spec,
+                                       component_spec, inputs)
+
+    def _launch_dag_task(
+        self,
+        dag: _DagExecution,
+        task_name: str,
+        task_spec: pipeline_spec_pb2.PipelineTaskSpec,
+        component_spec: pipeline_spec_pb2.ComponentSpec,
+        inputs: _Outputs,
+    ) -> None:
+        condition = task_spec.trigger_policy.condition
+        if condition and not _evaluate_condition(condition, inputs.parameters):
+            self._finish_task(dag, task_name, SKIPPED)
+            return
+
+        if task_spec.HasField('artifact_iterator'):
+            raise ValueError(
+                'Local execution does not support iterating over artifacts.')
+
+        if not task_spec.HasField('parameter_iterator'):
+
+            def on_done(child: _DagExecution) -> None:
+                self._finish_task(
+                    dag,
+                    task_name,
+                    child.state,
+                    outputs=child.collect_outputs(),
+                )
+
+            child = _DagExecution(
+                path=self._task_path(dag, task_name),
+                component_spec=component_spec,
+                parameters=inputs.parameters,
+                artifacts=inputs.artifacts,
+                on_done=on_done,
+            )
+            self._schedule(child)
+            return
+
+        iterator = task_spec.parameter_iterator
+        if iterator.items.WhichOneof('kind') == 'raw':
+            items = json.loads(iterator.items.raw)
+        else:
+            items = inputs.parameters[iterator.items.input_parameter]
+        if isinstance(items, str):
+            items = json.loads(items)
+
+        loop = _LoopExecution(
+            dag=dag,
+            task_name=task_name,
+            items=list(items),
+            parallelism=task_spec.iterator_policy.parallelism_limit or
+            len(items),
+        )
+        if not loop.items:
+            self._finish_task(dag, task_name, SUCCEEDED, outputs=_Outputs())
+            return
+
+        def start_iterations() -> None:
+            while (loop.next_index < len(loop.items) and
+                   loop.running < loop.parallelism):
+                index = loop.next_index
+                loop.next_index += 1
+                loop.running += 1
+                parameters = dict(inputs.parameters)
+                parameters[iterator.item_input] = loop.items[index]
+                child = _DagExecution(
+                    path=self._task_path(dag, task_name) + [str(index)],
+                    component_spec=component_spec,
+                    parameters=parameters,
+                    artifacts=inputs.artifacts,
+                    on_done=lambda child, index=index: on_iteration_done(
+                        child, index),
+                )
+                self._schedule(child)
+
+        def on_iteration_done(child: _DagExecution, index: int) -> None:
+            loop.running -= 1
+            loop.finished += 1
+            loop.failed = loop.failed or child.state == FAILED
+            loop.iteration_outputs[index] = child.collect_outputs()
+            if loop.finished == len(loop.items):
+                self._finish_task(
+                    dag,
+                    task_name,
+                    FAILED if loop.failed else SUCCEEDED,
+                    outputs=_fan_in(loop.iteration_outputs),
+                )
+            else:
+                start_iterations()
+
+        start_iterations()
+
+    def _launch_executor_task(
+        self,
+        dag: _DagExecution,
+        task_name: str,
+        task_spec: pipeline_spec_pb2.PipelineTaskSpec,
+        component_spec: pipeline_spec_pb2.ComponentSpec,
+        inputs: _Outputs,
+    ) -> None:
+        executor_label = component_spec.executor_label
+        executor_spec = self._executors[executor_label]
+        task_dir = os.path.join(self._run_dir, *self._task_path(dag, task_name))
+
+        if 'importer' in executor_spec:
+            self._finish_task(
+                dag,
+                task_name,
+                SUCCEEDED,
+                outputs=_run_importer(executor_spec['importer'], inputs,
+                                      task_dir),
+            )
+            return
+
+        program = _get_lightweight_python_program(
+            executor_spec.get('container', {}))
+        if program is None:
+            raise ValueError(
+                f'Local execution only supports lightweight Python components and importers. Got executor {executor_label!r}.'
+            )
+
+        executor_input = _build_executor_input(component_spec, inputs, task_dir)
+
+        cache_key = None
+        enable_caching = task_spec.caching_options.enable_cache
+        if self._enable_caching is not None:
+            enable_caching = self._enable_caching
+        if self._cache is not None and enable_caching:
+            cache_key = self._cache.fingerprint(component_spec, executor_spec,
+                                                executor_input)
+            executor_output = self._cache.get(cache_key, executor_input)
+            if executor_output is not None:
+                output_file = executor_input['outputs']['outputFile']
+                os.makedirs(os.path.dirname(output_file), exist_ok=True)
+                with open(output_file, 'w') as f:
+                    json.dump(executor_output, f)
+                self._finish_task(
+                    dag,
+                    task_name,
+                    SUCCEEDED,
+                    outputs=_read_executor_outputs(component_spec,
+                                                   executor_input),
+                    cached=True,
+                )
+                return
+
+        task = _ExecutorTask(
+            dag=dag,
+            task_name=task_name,
+            task_spec=task_spec,
+            component_spec=component_spec,
+            executor_input=executor_input,
+            function_to_execute=program['function_to_execute'],
+            component_module_path=self._write_component_module(
+                executor_label, program['source']),
+            cache_key=cache_key,
+        )
+        self._submit(task)
+
+    def _write_component_module(self, executor_label: str, source: str) -> str:
+        if executor_label not in self._component_modules:
+            module_dir = os.path.join(self._run_dir, '.components',
+                                      executor_label)
+            os.makedirs(module_dir, exist_ok=True)
+            module_path = os.path.join(module_dir,
+                                       f'{_COMPONENT_MODULE_NAME}.py')
+            with open(module_path, 'w') as f:
+                f.write(source)
+            self._component_modules[executor_label] = module_path
+        return self._component_modules[executor_label]
+
+    def _submit(self, task: _ExecutorTask) -> None:
+        future = self._pool.submit(
+            _execute_task,
+            task.executor_input,
+            task.function_to_execute,
+            task.component_module_path,
+        )
+        self._running[future] = task
+
+    def _on_executor_done(self, task: _ExecutorTask,
+                          future: futures.Future) -> None:
+        error = future.exception()
+        if error is None:
+            try:
+                outputs = _read_executor_outputs(task.component_spec,
+                                                 task.executor_input)
+            except Exception as e:
+                error = e
+        if error is None:
+            if task.cache_key is not None:
+                self._cache.put(
+                    task.cache_key,
+                    task.executor_input,
+                    parameter_values=outputs.parameters,
+                    artifacts=outputs.artifacts,
+                )
+            self._finish_task(task.dag, task.task_name, SUCCEEDED, outputs)
+        elif task.attempt < task.task_spec.retry_policy.max_retry_count:
+            task.attempt += 1
+            logging.warning(
+                f'Retrying task {task.task_name} (attempt {task.attempt + 1}).')
+            self._submit(task)
+        else:
+            self._finish_task(
+                task.dag, task.task_name, FAILED, error=str(error))
+
+
+def _fan_in(iteration_outputs: Dict[int, _Outputs]) -> _Outputs:
+    """Collects the outputs of all ParallelFor iterations into lists."""
+    outputs = _Outputs()
+    for index in sorted(iteration_outputs):
+        iteration = iteration_outputs[index]
+        for name, value in iteration.parameters.items():
+            collected = outputs.parameters.setdefault(name, _Collected())
+            if isinstance(value, _Collected):
+                collected.extend(value)
+            else:
+                collected.append(value)
+        for name, artifacts in iteration.artifacts.items():
+            outputs.artifacts.setdefault(name, []).extend(artifacts)
+    return outputs
+
+
+def _build_executor_input(
+    component_spec: pipeline_spec_pb2.ComponentSpec,
+    inputs: _Outputs,
+    task_dir: str,
+) -> Dict[str, Any]:
+    parameter_values = {
+        name: list(value) if isinstance(value, _Collected) else value
+        for name, value in inputs.parameters.items()
+    }
+    executor_input = {
+        'inputs': {
+            'parameterValues': parameter_values,
+            'artifacts': {
+                name: {
+                    'artifacts': artifacts
+                } for name, artifacts in inputs.artifacts.items()
+            },
+        },
+        'outputs': {
+            'parameters': {},
+            'artifacts': {},
+            'outputFile': os.path.join(task_dir, 'executor_output.json'),
+        },
+    }
+    output_definitions = component_spec.output_definitions
+    for name in output_definitions.parameters:
+        executor_input['outputs']['parameters'][name] = {
+            'outputFile': os.path.join(task_dir, 'parameters', name)
+        }
+    for name, spec in output_definitions.artifacts.items():
+        executor_input['outputs']['artifacts'][name] = {
+            'artifacts': [{
+                'name': name,
+                'uri': os.path.join(task_dir, 'artifacts', name),
+                'type': {
+                    'schemaTitle': spec.artifact_type.schema_title,
+                    'schemaVersion': spec.artifact_type.schema_version,
+                },
+                'metadata': {},
+            }]
+        }
+    return executor_input
+
+
+def _read_executor_outputs(
+    component_spec: pipeline_spec_pb2.ComponentSpec,
+    executor_input: Dict[str, Any],
+) -> _Outputs:
+    executor_output = {}
+    executor_output_path = executor_input['outputs']['outputFile']
+    if os.path.exists(executor_output_path):
+        with open(executor_output_path) as f:
+            executor_output = json.load(f)
+
+    outputs = _Outputs()
+    parameter_values = executor_output.get('parameterValues', {})
+    for name, spec in component_spec.output_definitions.parameters.items():
+        if name in parameter_values:
+            outputs.parameters[name] = parameter_values[name]
+            continue
+        output_file = executor_input['outputs']['parameters'][name][
+            'outputFile']
+        if not os.path.exists(output_file):
+            raise RuntimeError(f'Output parameter {name!r} was not written.')
+        with open(output_file) as f:
+            outputs.parameters[name] = _parse_parameter_file(
+                f.read(), spec.parameter_type)
+
+    output_artifacts = executor_output.get('artifacts', {})
+    for name, spec in executor_input['outputs']['artifacts'].items():
+        artifacts = []
+        written = output_artifacts.get(name, {}).get('artifacts', [])
+        for i, artifact in enumerate(spec['artifacts']):
+            artifact = dict(artifact)
+            if i < len(written):
+                artifact.update(written[i])
+            artifacts.append(artifact)
+        outputs.artifacts[name] = artifacts
+    return outputs
+
+
+def _run_importer(
+    importer: Dict[str, Any],
+    inputs: _Outputs,
+    task_dir: str,
+) -> _Outputs:
+    artifact_uri = importer.get('artifactUri', {})
+    if 'constant' in artifact_uri:
+        uri = artifact_uri['constant']
+    else:
+        uri = inputs.parameters[artifact_uri['runtimeParameter']]
+    type_schema = importer.get('typeSchema', {})
+    return _Outputs(
+        artifacts={
+            'artifact': [{
+                'name': 'artifact',
+                'uri': uri,
+                'type': {
+                    'schemaTitle':
+                        type_schema.get('schemaTitle', 'system.Artifact'),
+                    'schemaVersion':
+                        type_schema.get('schemaVersion', '0.0.1'),
+                },
+                'metadata': importer.get('metadata', {}),
+            }]
+        })
+
+
+class LocalRunner:
+    """Runs compiled pipelines locally.
+
+    Every task whose upstream tasks have finished, including each
+    iteration of a ``dsl.ParallelFor``, is scheduled concurrently on a
+    bounded process pool. Tasks are executed in-process in the pool
+    workers via ``kfp.components.executor_main`` in the current Python
+    environment, so only lightweight Python components (and importers)
+    are supported.
+
+    Example:
+      ::
+
+        from kfp import local
+
+        runner = local.LocalRunner(max_workers=8)
+        result = runner.run('pipeline.yaml', arguments={'text': 'hi'})
+        assert result.state == local.SUCCEEDED
+
+    Args:
+        pipeline_root: The local directory under which task outputs are
+            written. Defaults to ``local_outputs`` in the working directory
+            at the time each run starts.
+        max_workers: The maximum number of tasks to run concurrently. Defaults
+            to the number of processors on the machine.
+        cache: The cache used to reuse the results of previous executions of
+            tasks with caching enabled. Caching is disabled if not specified.
+    """
+
+    def __init__(
+        self,
+        pipeline_root: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        cache: Optional[cache_lib.ExecutionCache] = None,
+    ):
+        self.pipeline_root = os.path.abspath(
+            pipeline_root) if pipeline_root else None
+        self.max_workers = max_workers
+        self.cache = cache
+
+    def run(
+        self,
+        pipeline: Union[str, base_component.BaseComponent],
+        arguments: Optional[Dict[str, Any]] = None,
+        run_id: Optional[str] = None,
+        enable_caching: Optional[bool] = None,
+    ) -> PipelineRunResult:
+        """Runs a pipeline locally and waits for it to finish.
+
+        Args:
+            pipeline: The path to a compiled pipeline YAML or binary protobuf
+                (.pb) file, or a pipeline (or component) object.
+            arguments: The pipeline arguments.
+            run_id: The ID of the run. Outputs are written to
+                ``<pipeline_root>/<run_id>``. Generated if not specified.
+            enable_caching: Whether or not to enable caching for the run. If
+                not set, the caching options of each task are respected. Has
+                no effect if the runner has no cache.
+
+        Returns:
+            The result of the run.
+        """
+        pipeline_spec = _load_pipeline_spec(pipeline)
+        run_id = run_id or f'{pipeline_spec.pipeline_info.name}-{uuid.uuid4().hex[:8]}'
+        pipeline_root = self.pipeline_root or os.path.abspath(
+            _DEFAULT_PIPELINE_ROOT)
+        run_dir = os.path.join(pipeline_root, run_id)
+        os.makedirs(run_dir, exist_ok=True)
+        logging.info(f'Running pipeline {pipeline_spec.pipeline_info.name!r} '
+                     f'locally. Outputs are written to {run_dir}.')
+
+        return _PipelineRun(
+            pipeline_spec=pipeline_spec,
+            run_id=run_id,
+            run_dir=run_dir,
+            max_workers=self.max_workers,
+            cache=self.cache,
+            enable_caching=enable_caching,
+        ).execute(arguments or {})
@@ -0,0 +1,240 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for kfp.local.local_runner."""
+
+import os
+import tempfile
+from typing import List
+import unittest
+
+from kfp import compiler
+from kfp import dsl
+from kfp import local
+from kfp.dsl import Dataset
+from kfp.dsl import Input
+from kfp.dsl import Output
+from kfp.local import local_runner
+
+
+@dsl.component
+def double(num: int) -> int:
+    return 2 * num
+
+
+@dsl.component
+def add(nums: List[int]) -> int:
+    return sum(nums)
+
+
+@dsl.component
+def write_dataset(num: int, out_dataset: Output[Dataset]):
+    with open(out_dataset.path, 'w') as f:
+        f.write(str(num))
+
+
+@dsl.component
+def sum_datasets(in_datasets: Input[List[Dataset]]) -> int:
+    total = 0
+    for dataset in in_datasets:
+        with open(dataset.path) as f:
+            total += int(f.read())
+    return total
+
+
+@dsl.component
+def fail_op(message: str):
+    raise RuntimeError(message)
+
+
+@dsl.component
+def exit_op(status: dsl.PipelineTaskFinalStatus) -> str:
+    return status.state
+
+
+class LocalRunnerTest(unittest.TestCase):
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.runner = local.LocalRunner(
+            pipeline_root=self._temp_dir.name, max_workers=2)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_parallel_for_with_fan_in(self):
+
+        @dsl.pipeline
+        def my_pipeline(nums: List[int]) -> int:
+            with dsl.ParallelFor(nums) as num:
+                double_task = double(num=num)
+            return add(nums=dsl.Collected(double_task.output)).output
+
+        result = self.runner.run(my_pipeline, arguments={'nums': [1, 2, 3]})
+
+        self.assertEqual(result.state, local.SUCCEEDED)
+        self.assertEqual(result.outputs, {'Output': 12})
+        self.assertEqual(result.tasks['for-loop-1/1/double'].state,
+                         local.SUCCEEDED)
+
+    def test_default_pipeline_root_is_resolved_when_run_starts(self):
+
+        @dsl.pipeline
+        def my_pipeline(num: int) -> int:
+            return double(num=num).output
+
+        runner = local.LocalRunner(max_workers=1)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self._temp_dir.name)
+
+        result = runner.run(my_pipeline, arguments={'num': 1}, run_id='run')
+
+        self.assertEqual(result.state, local.SUCCEEDED)
+        self.assertTrue(
+            os.path.isdir(
+                os.path.join(self._temp_dir.name, 'local_outputs', 'run')))
+
+    def test_compiled_yaml_with_artifacts_and_condition(self):
+
+        @dsl.pipeline
+        def my_pipeline(threshold: int = 2) -> int:
+            with dsl.ParallelFor([1, 2, 3]) as num:
+                with dsl.Condition(num >= threshold):
+                    write_task = write_dataset(num=num)
+            return sum_datasets(
+                in_datasets=dsl.Collected(
+                    write_task.outputs['out_dataset'])).output
+
+        package_path = os.path.join(self._temp_dir.name, 'pipeline.yaml')
+        compiler.Compiler().compile(
+            pipeline_func=my_pipeline, package_path=package_path)
+
+        result = self.runner.run(package_path)
+
+        self.assertEqual(result.state, local.SUCCEEDED)
+        self.assertEqual(result.outputs, {'Output': 5})
+        self.assertEqual(result.tasks['for-loop-2/0/condition-3'].state,
+                         local.SKIPPED)
+
+    def test_failed_task_triggers_exit_handler(self):
+
+        @dsl.pipeline
+        def my_pipeline():
+            exit_task = exit_op()
+            with dsl.ExitHandler(exit_task):
+                fail_task = fail_op(message='boom')
+                double(num=1).after(fail_task)
+
+        result = self.runner.run(my_pipeline)
+
+        self.assertEqual(result.state, local.FAILED)
+        self.assertEqual(result.tasks['exit-handler-1/fail-op'].state,
+                         local.FAILED)
+        self.assertIn('boom', result.tasks['exit-handler-1/fail-op'].error)
+        self.assertEqual(result.tasks['exit-handler-1/double'].state,
+                         local.CANCELED)
+        self.assertEqual(result.tasks['exit-op'].state, local.SUCCEEDED)
+
+    def test_cached_tasks_are_not_rerun(self):
+
+        @dsl.pipeline
+        def my_pipeline() -> int:
+            with dsl.ParallelFor([1, 2]) as item:
+                write_task = write_dataset(num=item)
+            return sum_datasets(
+                in_datasets=dsl.Collected(
+                    write_task.outputs['out_dataset'])).output
+
+        runner = local.LocalRunner(
+            pipeline_root=self._temp_dir.name,
+            cache=local.ExecutionCache(
+                os.path.join(self._temp_dir.name, 'cache')))
+
+        first_run = runner.run(my_pipeline)
+        second_run = runner.run(my_pipeline)
+        uncached_run = runner.run(my_pipeline, enable_caching=False)
+
+        self.assertFalse(first_run.tasks['for-loop-2/0/write-dataset'].cached)
+        self.assertTrue(second_run.tasks['for-loop-2/0/write-dataset'].cached)
+        self.assertTrue(second_run.tasks['sum-datasets'].cached)
+        self.assertEqual(second_run.outputs, {'Output': 3})
+        self.assertFalse(
+            uncached_run.tasks['for-loop-2/0/write-dataset'].cached)
+
+    def test_missing_argument(self):
+
+        @dsl.pipeline
+        def my_pipeline(num: int):
+            double(num=num)
+
+        with self.assertRaisesRegex(ValueError,
+                                    r'Missing required pipeline argument'):
+            self.runner.run(my_pipeline)
+
+    def test_unsupported_container_component(self):
+
+        @dsl.container_component
+        def echo():
+            return dsl.ContainerSpec(image='alpine', command=['echo', 'hi'])
+
+        @dsl.pipeline
+        def my_pipeline():
+            echo()
+
+        result = self.runner.run(my_pipeline)
+
+        self.assertEqual(result.state, local.FAILED)
+        self.assertIn('only supports lightweight Python components',
+                      result.tasks['echo'].error)
+
+
+class EvaluateConditionTest(unittest.TestCase):
+
+    def test_evaluate_condition(self):
+        parameter_values = {'x': 3, 'flip': 'heads', 'b': True}
+        self.assertTrue(
+            local_runner._evaluate_condition(
+                "int(inputs.parameter_values['x']) >= 2", parameter_values))
+        self.assertFalse(
+            local_runner._evaluate_condition(
+                "inputs.parameter_values['flip'] == 'tails'", parameter_values))
+        self.assertTrue(
+            local_runner._evaluate_condition(
+                "inputs.parameter_values['b'] == true", parameter_values))
+        self.assertTrue(
+            local_runner._evaluate_condition(
+                "double(inputs.parameter_values['x']) > -1.5 && "
+                "!(inputs.parameter_values['flip'] != 'heads')",
+                parameter_values))
+        self.assertTrue(
+            local_runner._evaluate_condition(
+                "inputs.parameter_values['s'] == 'a && !b' || false",
+                {'s': 'a && !b'}))
+
+    def test_evaluate_condition_rejects_unsupported_expressions(self):
+        for condition in [
+                "__import__('os').getcwd() == ''",
+                "inputs.parameter_values.__class__ == ''",
+                "inputs.parameter_values['x'] + 1 == 4",
+                "int(inputs.parameter_values['x'], base=2) == 3",
+                "inputs.parameter_values['x'] in [3]",
+                "inputs.parameter_values['x'] ==",
+        ]:
+            with self.subTest(condition=condition):
+                with self.assertRaisesRegex(ValueError,
+                                            'Unsupported condition'):
+                    local_runner._evaluate_condition(condition, {'x': 3})
+
+
+if __name__ == '__main__':
+    unittest.main()
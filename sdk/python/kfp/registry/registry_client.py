@@ -13,15 +13,22 @@
 # limitations under the License.
 """Class for KFP Registry Client."""
 
+import hashlib
 import json
 import logging
 import os
 import re
-from typing import Any, Dict, List, Optional, Tuple, Union
+import shutil
+import tempfile
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import google.auth
 from google.auth import credentials
+from kfp.components import bulk
 import requests
+from requests import adapters
+from urllib3.util import retry
 
 _KNOWN_HOSTS_REGEX = {
     'kfp_pkg_dev': (
@@ -35,6 +42,13 @@ _DEFAULT_JSON_HEADER = {
 
 _VERSION_PREFIX = 'sha256:'
 
+_DEFAULT_PAGE_SIZE = 100
+_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+_PARTIAL_DOWNLOAD_SUFFIX = '.part'
+# Holds the URL and the ETag or Last-Modified header of a partial download,
+# which are checked before it is resumed.
+_PARTIAL_DOWNLOAD_VALIDATOR_SUFFIX = '.part.json'
+
 LOCAL_REGISTRY_CREDENTIAL = os.path.expanduser(
     '~/.config/kfp/registry_credentials.json')
 LOCAL_REGISTRY_CONTEXT = os.path.expanduser(
@@ -43,6 +57,40 @@ DEFAULT_REGISTRY_CONTEXT = os.path.join(
     os.path.dirname(__file__), 'context/default_pkg_dev.json')
 
 
+def _make_session(pool_maxsize: int) -> requests.Session:
+    """Creates a session with a connection pool that retries idempotent
+    requests on transient errors."""
+    session = requests.Session()
+    adapter = adapters.HTTPAdapter(
+        pool_connections=pool_maxsize,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry.Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            raise_on_status=False))
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def _get_sha256(file_name: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_name, 'rb') as f:
+        for chunk in iter(lambda: f.read(_DOWNLOAD_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _get_if_range(validator: Dict[str, Any]) -> Optional[str]:
+    """Returns the If-Range header to resume a download, if any."""
+    etag = validator.get('etag')
+    # If-Range only accepts strong ETags.
+    if etag and not etag.startswith('W/'):
+        return etag
+    return validator.get('last_modified')
+
+
 class _SafeDict(dict):
     """Class for safely handling missing keys in .format_map."""
 
@@ -89,6 +137,8 @@ class RegistryClient:
         auth: Authentication using ``requests.auth.AuthBase`` or ``google.auth.credentials.Credentials``.
         config_file: The location of the local config file. If not specified, defaults to ``'~/.config/kfp/context.json'`` (if it exists).
         auth_file: The location of the local config file that contains the authentication token. If not specified, defaults to ``'~/.config/kfp/registry_credentials.json'`` (if it exists).
+        cache_dir: A directory in which downloaded pipelines are cached by the SHA-256 digest of their contents, so that versions that were downloaded before are not downloaded again. Downloads are not cached if not specified.
+        pool_maxsize: The maximum number of connections to the host that are kept open for reuse. Should be at least the ``max_concurrency`` of bulk operations such as ``download_pipelines``.
     """
 
     def __init__(self,
@@ -96,18 +146,25 @@ class RegistryClient:
                  auth: Optional[Union[requests.auth.AuthBase,
                                       credentials.Credentials]] = None,
                  config_file: Optional[str] = None,
-                 auth_file: Optional[str] = None) -> None:
+                 auth_file: Optional[str] = None,
+                 cache_dir: Optional[str] = None,
+                 pool_maxsize: int = bulk.DEFAULT_MAX_CONCURRENCY) -> None:
         """Initializes the RegistryClient."""
         self._host = ''
         self._known_host_key = ''
         self._config = self._load_config(host, config_file)
         self._auth = self._load_auth(auth, auth_file)
+        self._cache_dir = cache_dir
+        self._session = _make_session(pool_maxsize)
+        self._refresh_lock = threading.Lock()
 
     def _request(self,
                  request_url: str,
                  request_body: Optional[str] = '',
                  http_request: Optional[str] = None,
-                 extra_headers: Optional[dict] = None) -> requests.Response:
+                 extra_headers: Optional[dict] = None,
+                 params: Optional[dict] = None,
+                 stream: bool = False) -> requests.Response:
         """Calls the HTTP request.
 
         Args:
@@ -115,6 +172,9 @@ class RegistryClient:
             request_body: Body of the request.
             http_request: Type of HTTP request (post, get, delete etc, defaults to get).
             extra_headers: Any extra headers required.
+            params: Query parameters to add to the URL.
+            stream: Whether to defer downloading the response body until it is
+                read, e.g. with ``iter_content``.
 
         Returns:
             Response from the request.
@@ -122,13 +182,19 @@ class RegistryClient:
         self._refresh_creds()
         auth = self._get_auth()
         http_request = http_request or 'get'
-        http_request_fn = getattr(requests, http_request)
+        http_request_fn = getattr(self._session, http_request)
 
+        kwargs = {}
+        if params:
+            kwargs['params'] = params
+        if stream:
+            kwargs['stream'] = True
         response = http_request_fn(
             url=request_url,
             data=request_body,
             headers=extra_headers,
-            auth=auth)
+            auth=auth,
+            **kwargs)
         response.raise_for_status()
 
         return response
@@ -312,9 +378,13 @@ class RegistryClient:
 
     def _refresh_creds(self) -> None:
         """Helper function to refresh google credentials if needed."""
-        if self._is_ar_host() and isinstance(
-                self._auth, credentials.Credentials) and not self._auth.valid:
-            self._auth.refresh(google.auth.transport.requests.Request())
+        if not (self._is_ar_host() and
+                isinstance(self._auth, credentials.Credentials)):
+            return
+        # Concurrent requests of bulk operations share the credentials.
+        with self._refresh_lock:
+            if not self._auth.valid:
+                self._auth.refresh(google.auth.transport.requests.Request())
 
     def upload_pipeline(
             self,
@@ -343,7 +413,7 @@ class RegistryClient:
 
         with open(file_name, 'rb') as f:
             files = {'content': f}
-            response = requests.post(
+            response = self._session.post(
                 url=url,
                 data=request_body,
                 headers=extra_headers,
@@ -385,6 +455,133 @@ class RegistryClient:
                     package_name=package_name, tag=tag)
         return url
 
+    def _get_default_file_name(self,
+                               package_name: str,
+                               version: Optional[str] = None,
+                               tag: Optional[str] = None) -> str:
+        file_name = package_name + '_'
+        if version:
+            self._validate_version(version)
+            file_name += version[len(_VERSION_PREFIX):]
+        elif tag:
+            self._validate_tag(tag)
+            file_name += tag
+        return file_name + '.yaml'
+
+    def _copy_from_cache(self, version: str, file_name: str) -> bool:
+        """Copies a cached pipeline version to a file.
+
+        Returns:
+            Whether the version was cached.
+        """
+        if not self._cache_dir:
+            return False
+        digest = version[len(_VERSION_PREFIX):]
+        cache_path = os.path.join(self._cache_dir, digest)
+        try:
+            if _get_sha256(cache_path) != digest:
+                return False
+            shutil.copyfile(cache_path, file_name)
+        except OSError:
+            return False
+        return True
+
+    def _add_to_cache(self, file_name: str) -> None:
+        if not self._cache_dir:
+            return
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self._cache_dir)
+            os.close(fd)
+            shutil.copyfile(file_name, temp_path)
+            os.replace(temp_path,
+                       os.path.join(self._cache_dir, _get_sha256(file_name)))
+        except OSError:
+            # The cache is best effort.
+            pass
+
+    def _remove_partial_download(self, file_name: str) -> None:
+        for suffix in (_PARTIAL_DOWNLOAD_SUFFIX,
+                       _PARTIAL_DOWNLOAD_VALIDATOR_SUFFIX):
+            try:
+                os.remove(file_name + suffix)
+            except FileNotFoundError:
+                pass
+
+    def _download(self,
+                  url: str,
+                  file_name: str,
+                  sha256: Optional[str] = None) -> None:
+        """Streams a file to disk, resuming a previous partial download.
+
+        The file is written to a ``.part`` file first, which is kept if the
+        download fails so that the next download resumes from its end. It is
+        only resumed if it was downloaded from the same URL and the file has
+        not changed since, according to its ``ETag`` or ``Last-Modified``
+        header.
+
+        Args:
+            url: The URL of the file.
+            file_name: File name to be saved as.
+            sha256: The expected SHA-256 digest of the file, if known.
+
+        Raises:
+            ValueError: If the file does not match ``sha256``.
+        """
+        partial_file_name = file_name + _PARTIAL_DOWNLOAD_SUFFIX
+        validator_file_name = file_name + _PARTIAL_DOWNLOAD_VALIDATOR_SUFFIX
+        headers = None
+        if os.path.exists(partial_file_name):
+            try:
+                with open(validator_file_name) as f:
+                    validator = json.load(f)
+            except (OSError, ValueError):
+                validator = {}
+            if_range = _get_if_range(validator) if validator.get(
+                'url') == url else None
+            offset = os.path.getsize(partial_file_name)
+            if if_range and offset:
+                headers = {'Range': f'bytes={offset}-', 'If-Range': if_range}
+
+        try:
+            response = self._request(
+                request_url=url, extra_headers=headers, stream=True)
+        except requests.HTTPError as e:
+            if headers is None or e.response is None or e.response.status_code != 416:
+                raise
+            # The partial download is not a prefix of the file.
+            self._remove_partial_download(file_name)
+            self._download(url, file_name, sha256)
+            return
+
+        # The host sends the whole file if it changed since the partial
+        # download, or if it does not support ranges.
+        resumed = response.status_code == 206
+        if not resumed:
+            with open(validator_file_name, 'w') as f:
+                json.dump(
+                    {
+                        'url': url,
+                        'etag': response.headers.get('ETag'),
+                        'last_modified': response.headers.get('Last-Modified'),
+                    }, f)
+        with response, open(partial_file_name, 'ab' if resumed else 'wb') as f:
+            for chunk in response.iter_content(chunk_size=_DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+
+        if sha256 is not None:
+            digest = _get_sha256(partial_file_name)
+            if digest != sha256:
+                self._remove_partial_download(file_name)
+                if resumed:
+                    self._download(url, file_name, sha256)
+                    return
+                raise ValueError(
+                    f'The SHA-256 digest of {url} is {digest}, expected '
+                    f'{sha256}.')
+        os.replace(partial_file_name, file_name)
+        self._remove_partial_download(file_name)
+
     def download_pipeline(self,
                           package_name: str,
                           version: Optional[str] = None,
@@ -392,6 +589,12 @@ class RegistryClient:
                           file_name: Optional[str] = None) -> str:
         """Downloads a pipeline. Either version or tag must be specified.
 
+        The pipeline is streamed to disk. An interrupted download is resumed
+        by the next download of the same version or tag to the same file.
+        Versions are checked against their SHA-256 digest. If the client has
+        a ``cache_dir``, versions that were downloaded before are copied from
+        the cache instead.
+
         Args:
             package_name: Name of the package.
             version: Version of the package.
@@ -403,23 +606,90 @@ class RegistryClient:
             The file name of the downloaded pipeline.
         """
         url = self._get_download_url(package_name, version, tag)
-        response = self._request(request_url=url)
 
         if not file_name:
-            file_name = package_name + '_'
-            if version:
-                self._validate_version(version)
-                file_name += version[len(_VERSION_PREFIX):]
-            elif tag:
-                self._validate_tag(tag)
-                file_name += tag
-            file_name += '.yaml'
+            file_name = self._get_default_file_name(package_name, version, tag)
 
-        with open(file_name, 'wb') as f:
-            f.write(response.content)
+        if version and self._copy_from_cache(version, file_name):
+            return file_name
+        self._download(
+            url,
+            file_name,
+            sha256=version[len(_VERSION_PREFIX):] if version else None)
+        self._add_to_cache(file_name)
 
         return file_name
 
+    def download_pipelines(
+        self,
+        package_name: str,
+        versions: Optional[Iterable[str]] = None,
+        tags: Optional[Iterable[str]] = None,
+        output_dir: str = '.',
+        max_concurrency: int = bulk.DEFAULT_MAX_CONCURRENCY,
+    ) -> List[bulk.BulkOperationResult]:
+        """Downloads versions or tags of a pipeline concurrently and waits for
+        all of them.
+
+        Each pipeline is saved under ``output_dir`` with the file name that
+        ``download_pipeline`` uses by default.
+
+        Args:
+            package_name: Name of the package.
+            versions: Versions of the package. If neither versions nor tags
+                are specified, all versions of the package are downloaded.
+            tags: Tags attached to the package.
+            output_dir: Directory to save the pipelines in.
+            max_concurrency: The maximum number of concurrent downloads.
+
+        Returns:
+            The result of each version or tag, in the order of ``versions``
+            or ``tags``. The ``result`` of a successful download is the file
+            name.
+        """
+        if versions is not None and tags is not None:
+            raise ValueError('Only one of versions or tags can be specified.')
+        os.makedirs(output_dir, exist_ok=True)
+
+        if tags is not None:
+
+            def download(tag: str) -> str:
+                return self.download_pipeline(
+                    package_name,
+                    tag=tag,
+                    file_name=os.path.join(
+                        output_dir,
+                        self._get_default_file_name(package_name, tag=tag)))
+
+            return bulk.run_concurrently(download, tags, max_concurrency)
+
+        if versions is None:
+            versions = (
+                version['name'].rsplit('/', 1)[-1]
+                for version in self.list_all_versions(package_name))
+
+        def download(version: str) -> str:
+            return self.download_pipeline(
+                package_name,
+                version=version,
+                file_name=os.path.join(
+                    output_dir,
+                    self._get_default_file_name(package_name, version=version)))
+
+        return bulk.run_concurrently(download, versions, max_concurrency)
+
+    def _list_all(self, url: str, key: str, page_size: int) -> Iterator[dict]:
+        page_token = None
+        while True:
+            params = {'pageSize': page_size}
+            if page_token:
+                params['pageToken'] = page_token
+            response_json = self._request(request_url=url, params=params).json()
+            yield from response_json.get(key, [])
+            page_token = response_json.get('nextPageToken')
+            if not page_token:
+                return
+
     def get_package(self, package_name: str) -> Dict[str, Any]:
         """Gets package metadata.
 
@@ -446,6 +716,19 @@ class RegistryClient:
 
         return response_json.get('packages', {})
 
+    def list_all_packages(
+            self, page_size: int = _DEFAULT_PAGE_SIZE) -> Iterator[dict]:
+        """Lists all packages, fetching pages as they are consumed.
+
+        Args:
+            page_size: Number of packages to fetch per request.
+
+        Returns:
+            An iterator of packages in the repository.
+        """
+        return self._list_all(self._config['list_packages_url'], 'packages',
+                              page_size)
+
     def delete_package(self, package_name: str) -> bool:
         """Deletes a package.
 
@@ -495,6 +778,23 @@ class RegistryClient:
 
         return response_json.get('versions', {})
 
+    def list_all_versions(
+            self,
+            package_name: str,
+            page_size: int = _DEFAULT_PAGE_SIZE) -> Iterator[dict]:
+        """Lists all package versions, fetching pages as they are consumed.
+
+        Args:
+            package_name: Name of the package.
+            page_size: Number of versions to fetch per request.
+
+        Returns:
+            An iterator of package versions.
+        """
+        url = self._config['list_versions_url'].format(
+            package_name=package_name)
+        return self._list_all(url, 'versions', page_size)
+
     def delete_version(self, package_name: str, version: str) -> bool:
         """Deletes package version.
 
@@ -607,6 +907,21 @@ class RegistryClient:
 
         return response_json.get('tags', {})
 
+    def list_all_tags(self,
+                      package_name: str,
+                      page_size: int = _DEFAULT_PAGE_SIZE) -> Iterator[dict]:
+        """Lists all package tags, fetching pages as they are consumed.
+
+        Args:
+            package_name: Name of the package.
+            page_size: Number of tags to fetch per request.
+
+        Returns:
+            An iterator of tags.
+        """
+        url = self._config['list_tags_url'].format(package_name=package_name)
+        return self._list_all(url, 'tags', page_size)
+
     def delete_tag(self, package_name: str, tag: str) -> Dict[str, Any]:
         """Deletes package tag.
 
@@ -13,8 +13,11 @@
 # limitations under the License.
 """Tests for KFP Registry RegistryClient."""
 
+import hashlib
 import json
 import os
+import tempfile
+import threading
 from unittest import mock
 
 from absl.testing import parameterized
@@ -158,17 +161,18 @@ class RegistryClientTest(parameterized.TestCase):
                 'pipeline.yaml'
         },
     )
-    @mock.patch('requests.get', autospec=True)
-    def test_download_pipeline(self, mock_get, version, tag, file_name,
+    @mock.patch.object(RegistryClient, '_download', autospec=True)
+    def test_download_pipeline(self, mock_download, version, tag, file_name,
                                expected_url, expected_file_name):
         host = _DEFAULT_HOST
         client = RegistryClient(host=host, auth=ApiAuth(''))
         client.download_pipeline(
             package_name='pack', version=version, tag=tag, file_name=file_name)
-        mock_get.assert_called_once_with(
-            url=expected_url, data='', headers=None, auth=mock.ANY)
-        self.assertEqual(self._mock_open.call_args_list[1][0],
-                         (expected_file_name, 'wb'))
+        mock_download.assert_called_once_with(
+            client,
+            expected_url,
+            expected_file_name,
+            sha256=version[len('sha256:'):] if version else None)
 
     def test_download_pipeline_version_error(self):
         client = RegistryClient(host=_DEFAULT_HOST, auth=ApiAuth(''))
@@ -191,7 +195,7 @@ class RegistryClientTest(parameterized.TestCase):
             'expected_tags': 'tag1,tag2'
         },
     )
-    @mock.patch('requests.post', autospec=True)
+    @mock.patch.object(requests.Session, 'post', autospec=True)
     def test_upload_pipeline(self, mock_post, tags, expected_tags):
         mock_post.return_value.text = 'package_name/sha256:abcde12345'
         host = _DEFAULT_HOST
@@ -201,6 +205,7 @@ class RegistryClientTest(parameterized.TestCase):
             tags=tags,
             extra_headers={'description': 'nothing'})
         mock_post.assert_called_once_with(
+            mock.ANY,
             url=host,
             data={'tags': expected_tags},
             headers={'description': 'nothing'},
@@ -211,12 +216,13 @@ class RegistryClientTest(parameterized.TestCase):
         self.assertEqual(package_name, 'package_name')
         self.assertEqual(version, 'sha256:abcde12345')
 
-    @mock.patch('requests.get', autospec=True)
+    @mock.patch.object(requests.Session, 'get', autospec=True)
     def test_get_package(self, mock_get):
         host = _DEFAULT_HOST
         client = RegistryClient(host=host, auth=ApiAuth(''))
         client.get_package('pack')
         mock_get.assert_called_once_with(
+            mock.ANY,
             url=('https://artifactregistry.googleapis.com/v1/projects/'
                  'proj/locations/us-central1/repositories'
                  '/repo/packages/pack'),
@@ -224,12 +230,13 @@ class RegistryClientTest(parameterized.TestCase):
             headers=None,
             auth=mock.ANY)
 
-    @mock.patch('requests.get', autospec=True)
+    @mock.patch.object(requests.Session, 'get', autospec=True)
     def test_list_packages(self, mock_get):
         host = _DEFAULT_HOST
         client = RegistryClient(host=host, auth=ApiAuth(''))
         client.list_packages()
         mock_get.assert_called_once_with(
+            mock.ANY,
             url=('https://artifactregistry.googleapis.com/v1/projects/'
                  'proj/locations/us-central1/repositories'
                  '/repo/packages'),
@@ -237,7 +244,7 @@ class RegistryClientTest(parameterized.TestCase):
             headers=None,
             auth=mock.ANY)
 
-    @mock.patch('requests.get', autospec=True)
+    @mock.patch.object(requests.Session, 'get', autospec=True)
     def test_list_packages_empty(self, mock_get):
         host = _DEFAULT_HOST
         mock_response = requests.Response()
@@ -248,6 +255,7 @@ class RegistryClientTest(parameterized.TestCase):
         packages = client.list_packages()
         self.assertEqual(packages, {})
         mock_get.assert_called_once_with(
+            mock.ANY,
             url=('https://artifactregistry.googleapis.com/v1/projects/'
                  'proj/locations/us-central1/repositories'
                  '/repo/packages'),
@@ -255,12 +263,13 @@ class RegistryClientTest(parameterized.TestCase):
             headers=None,
             auth=mock.ANY)
 
-    @mock.patch('requests.delete', autospec=True)
+    @mock.patch.object(requests.Session, 'delete', autospec=True)
     def test_delete_package(self, mock_delete):
         host = _DEFAULT_HOST
         client = RegistryClient(host=host, auth=ApiAuth(''))
         client.delete_package('pack')
         mock_delete.assert_called_once_with(
+            mock.ANY,
             url=('https://artifactregistry.googleapis.com/v1/projects/'
                  'proj/locations/us-central1/repositories'
                  '/repo/packages/pack'),
@@ -268,12 +277,13 @@ class RegistryClientTest(parameterized.TestCase):
             headers=None,
             auth=mock.ANY)
 
-    @mock.patch('requests.get', autospec=True)
+    @mock.patch.object(requests.Session, 'get', autospec=True)
     def test_get_version(self, mock_get):
         host = _DEFAULT_HOST
         client = RegistryClient(host=host, auth=ApiAuth(''))
         client.get_version('pack', 'sha256:abcde12345')
         mock_get.assert_called_once_with(
+            mock.ANY,
             url=('https://artifactregistry.googleapis.com/v1/projects/'
                  'proj/locations/us-central1/repositories'
                  '/repo/packages/pack/versions/sha256:abcde12345?view=FULL'),
@@ -281,12 +291,13 @@ class RegistryClientTest(parameterized.TestCase):
             headers=None,
             auth=mock.ANY)
 
-    @mock.patch('requests.get', autospec=True)
+    @mock.patch.object(requests.Session, 'get', autospec=True)
     def test_list_versions(self, mock_get):
         host = _DEFAULT_HOST
         client = RegistryClient(host=host, auth=ApiAuth(''))
         client.list_versions('pack')
         mock_get.assert_called_once_with(
+            mock.ANY,
             url=('https://artifactregistry.googleapis.com/v1/projects/'
                  'proj/locations/us-central1/repositories'
                  '/repo/packages/pack/versions?view=FULL'),
@@ -294,7 +305,7 @@ class RegistryClientTest(parameterized.TestCase):
             headers=None,
             auth=mock.ANY)
 
-    @mock.patch('requests.get', autospec=True)
+    @mock.patch.object(requests.Session, 'get', autospec=True)
     def test_list_versions_empty(self, mock_get):
         host = _DEFAULT_HOST
         mock_response = requests.Response()
@@ -305,6 +316,7 @@ class RegistryClientTest(parameterized.TestCase):
         versions = client.list_versions('pack')
         self.assertEqual(versions, {})
         mock_get.assert_called_once_with(
+            mock.ANY,
             url=('https://artifactregistry.googleapis.com/v1/projects/'
                  'proj/locations/us-central1/repositories'
                  '/repo/packages/pack/versions?view=FULL'),
@@ -312,12 +324,13 @@ class RegistryClientTest(parameterized.TestCase):
             headers=None,
             auth=mock.ANY)
 
-    @mock.patch('requests.delete', autospec=True)
+    @mock.patch.object(requests.Session, 'delete', autospec=True)
     def test_delete_version(self, mock_delete):
         host = _DEFAULT_HOST
         client = RegistryClient(host=host, auth=ApiAuth(''))
         client.delete_version('pack', 'sha256:abcde12345')
         mock_delete.assert_called_once_with(
+            mock.ANY,
             url=('https://artifactregistry.googleapis.com/v1/projects/'
                  'proj/locations/us-central1/repositories'
                  '/repo/packages/pack/versions/sha256:abcde12345'),
@@ -325,12 +338,13 @@ class RegistryClientTest(parameterized.TestCase):
             headers=None,
             auth=mock.ANY)
 
-    @mock.patch('requests.get', autospec=True)
+    @mock.patch.object(requests.Session, 'get', autospec=True)
     def test_get_tag(self, mock_get):
         host = _DEFAULT_HOST
         client = RegistryClient(host=host, auth=ApiAuth(''))
         client.get_tag('pack', 'tag1')
         mock_get.assert_called_once_with(
+            mock.ANY,
             url=('https://artifactregistry.googleapis.com/v1/projects/'
                  'proj/locations/us-central1/repositories'
                  '/repo/packages/pack/tags/tag1'),
@@ -338,12 +352,13 @@ class RegistryClientTest(parameterized.TestCase):
             headers=None,
             auth=mock.ANY)
 
-    @mock.patch('requests.get', autospec=True)
+    @mock.patch.object(requests.Session, 'get', autospec=True)
     def test_list_tags(self, mock_get):
         host = _DEFAULT_HOST
         client = RegistryClient(host=host, auth=ApiAuth(''))
         client.list_tags('pack')
         mock_get.assert_called_once_with(
+            mock.ANY,
             url=('https://artifactregistry.googleapis.com/v1/projects/'
                  'proj/locations/us-central1/repositories'
                  '/repo/packages/pack/tags'),
@@ -351,7 +366,7 @@ class RegistryClientTest(parameterized.TestCase):
             headers=None,
             auth=mock.ANY)
 
-    @mock.patch('requests.get', autospec=True)
+    @mock.patch.object(requests.Session, 'get', autospec=True)
     def test_list_tags_empty(self, mock_get):
         host = _DEFAULT_HOST
         mock_response = requests.Response()
@@ -362,6 +377,7 @@ class RegistryClientTest(parameterized.TestCase):
         tags = client.list_tags('pack')
         self.assertEqual(tags, {})
         mock_get.assert_called_once_with(
+            mock.ANY,
             url=('https://artifactregistry.googleapis.com/v1/projects/'
                  'proj/locations/us-central1/repositories'
                  '/repo/packages/pack/tags'),
@@ -369,12 +385,13 @@ class RegistryClientTest(parameterized.TestCase):
             headers=None,
             auth=mock.ANY)
 
-    @mock.patch('requests.delete', autospec=True)
+    @mock.patch.object(requests.Session, 'delete', autospec=True)
     def test_delete_tag(self, mock_delete):
         host = _DEFAULT_HOST
         client = RegistryClient(host=host, auth=ApiAuth(''))
         client.delete_tag('pack', 'tag1')
         mock_delete.assert_called_once_with(
+            mock.ANY,
             url=('https://artifactregistry.googleapis.com/v1/projects/'
                  'proj/locations/us-central1/repositories'
                  '/repo/packages/pack/tags/tag1'),
@@ -382,7 +399,7 @@ class RegistryClientTest(parameterized.TestCase):
             headers=None,
             auth=mock.ANY)
 
-    @mock.patch('requests.post', autospec=True)
+    @mock.patch.object(requests.Session, 'post', autospec=True)
     def test_create_tag(self, mock_post):
         host = _DEFAULT_HOST
         client = RegistryClient(host=host, auth=ApiAuth(''))
@@ -394,6 +411,7 @@ class RegistryClientTest(parameterized.TestCase):
                         '/repo/packages/pack/versions/sha256:abcde12345')
         })
         mock_post.assert_called_once_with(
+            mock.ANY,
             url=('https://artifactregistry.googleapis.com/v1/projects/'
                  'proj/locations/us-central1/repositories'
                  '/repo/packages/pack/tags?tagId=tag1'),
@@ -403,7 +421,7 @@ class RegistryClientTest(parameterized.TestCase):
             },
             auth=mock.ANY)
 
-    @mock.patch('requests.patch', autospec=True)
+    @mock.patch.object(requests.Session, 'patch', autospec=True)
     def test_update_tag(self, mock_patch):
         host = _DEFAULT_HOST
         client = RegistryClient(host=host, auth=ApiAuth(''))
@@ -415,6 +433,7 @@ class RegistryClientTest(parameterized.TestCase):
                         '/repo/packages/pack/versions/sha256:abcde12345')
         })
         mock_patch.assert_called_once_with(
+            mock.ANY,
             url=('https://artifactregistry.googleapis.com/v1/projects/'
                  'proj/locations/us-central1/repositories'
                  '/repo/packages/pack/tags/tag1?updateMask=version'),
@@ -423,3 +442,277 @@ class RegistryClientTest(parameterized.TestCase):
                 'Content-type': 'application/json',
             },
             auth=mock.ANY)
+
+
+class FakeResponse:
+
+    def __init__(self, status_code, content=b'', json_data=None, headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self._json_data = json_data
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f'{self.status_code} Error', response=self)
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def json(self):
+        return self._json_data
+
+
+class FakeSession:
+    """A session that serves files by URL and honors Range and If-Range
+    headers."""
+
+    def __init__(self):
+        self.contents = {}
+        self.pages = {}
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def get(self, url, data, headers, auth, params=None, stream=False):
+        with self._lock:
+            self.requests.append((url, headers, params))
+        if url in self.pages:
+            page_token = (params or {}).get('pageToken')
+            return FakeResponse(200, json_data=self.pages[url][page_token])
+        if url not in self.contents:
+            return FakeResponse(404)
+        content = self.contents[url]
+        etag = f'"{hashlib.md5(content).hexdigest()}"'
+        headers = headers or {}
+        range_header = headers.get('Range')
+        if range_header is None or headers.get('If-Range') != etag:
+            return FakeResponse(200, content, headers={'ETag': etag})
+        offset = int(range_header[len('bytes='):-1])
+        if offset >= len(content):
+            return FakeResponse(416)
+        return FakeResponse(206, content[offset:], headers={'ETag': etag})
+
+
+class RegistryClientTransferTest(parameterized.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = tmp_dir.name
+        self.session = FakeSession()
+        self.content = b'pipeline'
+        self.version = 'sha256:' + hashlib.sha256(self.content).hexdigest()
+        self.version_url = f'{_DEFAULT_HOST}/pack/{self.version}'
+        self.session.contents[self.version_url] = self.content
+
+    def make_client(self, **kwargs):
+        client = RegistryClient(host=_DEFAULT_HOST, auth=ApiAuth(''), **kwargs)
+        client._session = self.session
+        return client
+
+    def read(self, file_name):
+        with open(file_name, 'rb') as f:
+            return f.read()
+
+    def write_partial_download(self, file_name, content, url, etag):
+        with open(file_name + '.part', 'wb') as f:
+            f.write(content)
+        if url is not None:
+            with open(file_name + '.part.json', 'w') as f:
+                json.dump({'url': url, 'etag': etag}, f)
+
+    def etag(self, content):
+        return f'"{hashlib.md5(content).hexdigest()}"'
+
+    def test_download_pipeline_resumes_partial_download(self):
+        file_name = os.path.join(self.tmp_dir, 'pipeline.yaml')
+        self.write_partial_download(file_name, self.content[:3],
+                                    self.version_url, self.etag(self.content))
+
+        self.make_client().download_pipeline(
+            'pack', version=self.version, file_name=file_name)
+
+        self.assertEqual(self.content, self.read(file_name))
+        self.assertEqual(['pipeline.yaml'], os.listdir(self.tmp_dir))
+        self.assertEqual(
+            {
+                'Range': 'bytes=3-',
+                'If-Range': self.etag(self.content)
+            }, self.session.requests[0][1])
+
+    def test_download_pipeline_restarts_partial_download_of_moved_tag(self):
+        file_name = os.path.join(self.tmp_dir, 'pipeline.yaml')
+        tag_url = f'{_DEFAULT_HOST}/pack/tag1'
+        self.write_partial_download(file_name, b'old', tag_url,
+                                    self.etag(b'old pipeline'))
+        self.session.contents[tag_url] = b'new, longer pipeline'
+
+        self.make_client().download_pipeline(
+            'pack', tag='tag1', file_name=file_name)
+
+        self.assertEqual(b'new, longer pipeline', self.read(file_name))
+        self.assertEqual(1, len(self.session.requests))
+
+    @parameterized.parameters(
+        {'url': None},
+        {'url': f'{_DEFAULT_HOST}/pack/tag1'},
+    )
+    def test_download_pipeline_discards_unverifiable_partial_download(
+            self, url):
+        file_name = os.path.join(self.tmp_dir, 'pipeline.yaml')
+        self.write_partial_download(file_name, b'pip', url,
+                                    self.etag(self.content))
+
+        self.make_client().download_pipeline(
+            'pack', version=self.version, file_name=file_name)
+
+        self.assertEqual(self.content, self.read(file_name))
+        self.assertIsNone(self.session.requests[0][1])
+
+    def test_download_pipeline_restarts_stale_partial_download(self):
+        file_name = os.path.join(self.tmp_dir, 'pipeline.yaml')
+        self.write_partial_download(file_name, b'stale partial download',
+                                    self.version_url, self.etag(self.content))
+
+        self.make_client().download_pipeline(
+            'pack', version=self.version, file_name=file_name)
+
+        self.assertEqual(self.content, self.read(file_name))
+        self.assertEqual(2, len(self.session.requests))
+        self.assertIsNone(self.session.requests[1][1])
+
+    def test_download_pipeline_checks_version_digest(self):
+        file_name = os.path.join(self.tmp_dir, 'pipeline.yaml')
+        self.session.contents[self.version_url] = b'corrupted'
+
+        with self.assertRaisesRegex(ValueError, r'expected [0-9a-f]{64}'):
+            self.make_client().download_pipeline(
+                'pack', version=self.version, file_name=file_name)
+        self.assertEqual([], os.listdir(self.tmp_dir))
+
+    def test_download_pipeline_keeps_partial_download_on_error(self):
+        file_name = os.path.join(self.tmp_dir, 'pipeline.yaml')
+
+        with self.assertRaises(requests.HTTPError):
+            self.make_client().download_pipeline(
+                'pack', tag='missing', file_name=file_name)
+        self.assertFalse(os.path.exists(file_name))
+
+    def test_download_pipeline_from_cache(self):
+        cache_dir = os.path.join(self.tmp_dir, 'cache')
+        client = self.make_client(cache_dir=cache_dir)
+        self.session.contents[f'{_DEFAULT_HOST}/pack/tag1'] = self.content
+
+        # Downloads by tag populate the cache for the tagged version.
+        client.download_pipeline(
+            'pack', tag='tag1', file_name=os.path.join(self.tmp_dir, 'a.yaml'))
+        file_name = client.download_pipeline(
+            'pack',
+            version=self.version,
+            file_name=os.path.join(self.tmp_dir, 'b.yaml'))
+
+        self.assertEqual(self.content, self.read(file_name))
+        self.assertEqual(1, len(self.session.requests))
+
+    def test_download_pipeline_ignores_corrupted_cache_entry(self):
+        cache_dir = os.path.join(self.tmp_dir, 'cache')
+        os.makedirs(cache_dir)
+        with open(os.path.join(cache_dir, self.version[len('sha256:'):]),
+                  'wb') as f:
+            f.write(b'corrupted')
+
+        file_name = self.make_client(cache_dir=cache_dir).download_pipeline(
+            'pack',
+            version=self.version,
+            file_name=os.path.join(self.tmp_dir, 'pipeline.yaml'))
+
+        self.assertEqual(self.content, self.read(file_name))
+        self.assertEqual(1, len(self.session.requests))
+
+    def test_list_all_versions(self):
+        url = ('https://artifactregistry.googleapis.com/v1/projects/proj/'
+               'locations/us-central1/repositories/repo/packages/pack/versions'
+               '?view=FULL')
+        self.session.pages[url] = {
+            None: {
+                'versions': [{
+                    'name': 'v1'
+                }, {
+                    'name': 'v2'
+                }],
+                'nextPageToken': 'token'
+            },
+            'token': {
+                'versions': [{
+                    'name': 'v3'
+                }]
+            },
+        }
+
+        versions = self.make_client().list_all_versions('pack', page_size=2)
+
+        self.assertEqual(['v1', 'v2', 'v3'],
+                         [version['name'] for version in versions])
+        self.assertEqual([{
+            'pageSize': 2
+        }, {
+            'pageSize': 2,
+            'pageToken': 'token'
+        }], [params for _, _, params in self.session.requests])
+
+    def test_download_pipelines_all_versions(self):
+        url = ('https://artifactregistry.googleapis.com/v1/projects/proj/'
+               'locations/us-central1/repositories/repo/packages/pack/versions'
+               '?view=FULL')
+        versions = []
+        for i in range(5):
+            content = f'pipeline {i}'.encode()
+            version = 'sha256:' + hashlib.sha256(content).hexdigest()
+            self.session.contents[f'{_DEFAULT_HOST}/pack/{version}'] = content
+            versions.append(version)
+        self.session.pages[url] = {
+            None: {
+                'versions': [{
+                    'name': f'projects/proj/packages/pack/versions/{version}'
+                } for version in versions]
+            }
+        }
+        output_dir = os.path.join(self.tmp_dir, 'out')
+
+        results = self.make_client().download_pipelines(
+            'pack', output_dir=output_dir, max_concurrency=3)
+
+        self.assertEqual(versions, [result.item for result in results])
+        for result in results:
+            self.assertIsNone(result.error)
+            self.assertEqual(
+                os.path.join(output_dir,
+                             f'pack_{result.item[len("sha256:"):]}.yaml'),
+                result.result)
+            self.assertEqual(
+                self.session.contents[f'{_DEFAULT_HOST}/pack/{result.item}'],
+                self.read(result.result))
+
+    def test_download_pipelines_tags(self):
+        self.session.contents[f'{_DEFAULT_HOST}/pack/tag1'] = b'tag1'
+        output_dir = os.path.join(self.tmp_dir, 'out')
+
+        results = self.make_client().download_pipelines(
+            'pack', tags=['tag1', 'missing'], output_dir=output_dir)
+
+        self.assertEqual(
+            os.path.join(output_dir, 'pack_tag1.yaml'), results[0].result)
+        self.assertIsInstance(results[1].error, requests.HTTPError)
+
+    def test_download_pipelines_versions_and_tags(self):
+        with self.assertRaisesRegex(ValueError, r'Only one of'):
+            self.make_client().download_pipelines(
+                'pack', versions=[self.version], tags=['tag1'])